@@ -1,5 +1,6 @@
 ﻿from nicegui import ui
-from agenda_obras import AgendaObras
+from agenda_obras import AgendaObras, AnaliseSLAPage, AgendaPrazosPage
+from app_logger import configurar_logging
 import sys
 import os
 
@@ -9,10 +10,21 @@ if getattr(sys, 'frozen', False):
 else:
     application_path = os.path.dirname(os.path.abspath(__file__))
 
+# Logs em console + arquivo rotativo (nível via AGENDAOBRAS_LOG_NIVEL)
+configurar_logging()
+
 @ui.page('/')
 def index():
     AgendaObras()
 
+@ui.page('/analise')
+def analise():
+    AnaliseSLAPage()
+
+@ui.page('/agenda')
+def agenda():
+    AgendaPrazosPage()
+
 if __name__ in {"__main__", "__mp_main__"}:
     ui.run(
         title='AgendaObras - Rastreador de Obras',
@@ -3,21 +3,71 @@ Módulo da interface principal do sistema AgendaObras.
 Contém a classe AgendaObras com toda a lógica da interface gráfica usando NiceGUI.
 """
 
-from nicegui import ui
+from nicegui import run, ui
 import datetime
-from typing import Dict
-from database import Database
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, List, Tuple
+from database import obter_database
 from email_service import EmailService
 from obras_helper import ObrasHelper
 from gerador_tarefas_recorrentes import GeradorTarefasRecorrentes
+from importador_obras import importar_conteudo
+from exportador import exportar, formatos_disponiveis
+from analise_sla import DIMENSOES, obter_analise
 from notificador_prazos import NotificadorPrazos
 from version_checker import VersionChecker
 from config import VERSION
+from datas import formatar_data, formatar_data_hora, hoje_dia, data_do_dia
 from error_logger import log_error
 
+# Quantidade de cards carregados por página no dashboard
+TAMANHO_PAGINA_OBRAS = 24
+
 # Valores de status padrão (usado tanto no banco quanto na interface)
 STATUS_OPTIONS = ['Não Iniciada', 'Em Andamento', 'Atrasada', 'Concluída']
 
+# Datas-base que disparam recálculo de prazos -> nome exibido na notificação
+NOMES_DATAS_BASE = {
+    'data_inicio': 'data de início',
+    'data_acionamento': 'data de acionamento',
+    'data_assinatura': 'data de assinatura',
+    'data_aio': 'data da AIO',
+}
+
+# Diretório único das exportações: cada nova exportação apaga os arquivos da anterior
+DIRETORIO_EXPORTACAO = os.path.join(tempfile.gettempdir(), 'agendaobras_exportacao')
+
+# Banco e serviços compartilhados por todas as páginas abertas no processo
+_servicos = None
+_servicos_lock = threading.Lock()
+
+
+def obter_servicos() -> Tuple:
+    """Retorna (database, email_service, gerador_recorrentes, notificador), criados uma única vez.
+    Abrir ou recarregar uma aba reutiliza as mesmas instâncias (sem DDL nem leitura de configuração).
+    """
+    global _servicos
+    with _servicos_lock:
+        if _servicos is None:
+            database = obter_database()
+            email_service = EmailService(database)
+            gerador_recorrentes = GeradorTarefasRecorrentes(database)
+            notificador = NotificadorPrazos(database, email_service, gerador_recorrentes)
+            notificador.iniciar_verificacao()
+            _servicos = (database, email_service, gerador_recorrentes, notificador)
+        return _servicos
+
+
+def exportar_para_download(db, nome_arquivo: str, incluir_historico: bool, incluir_arquivadas: bool) -> Dict:
+    """Recria DIRETORIO_EXPORTACAO (removendo exportações anteriores, já baixadas) e exporta nele"""
+    shutil.rmtree(DIRETORIO_EXPORTACAO, ignore_errors=True)
+    os.makedirs(DIRETORIO_EXPORTACAO, exist_ok=True)
+    caminho = os.path.join(DIRETORIO_EXPORTACAO, nome_arquivo)
+    return exportar(db, caminho, incluir_historico, incluir_arquivadas)
+
 
 class AgendaObras:
     def __init__(self):
@@ -25,21 +75,20 @@ class AgendaObras:
         self.description = "Rastreador de Demandas de Engenharia"
         self.timeout_padrao = 3
         
-        # Inicializa banco de dados
-        self.db = Database()
+        # Banco e serviços compartilhados entre páginas (notificador já iniciado)
+        self.db, self.email_service, self.gerador_recorrentes, self.notificador = obter_servicos()
         self.helper = ObrasHelper()
         
-        # Inicializa serviços
-        self.email_service = EmailService(self.db)
-        self.gerador_recorrentes = GeradorTarefasRecorrentes(self.db)
-        
-        # Inicializa notificador de prazos
-        self.notificador = NotificadorPrazos(self.db, self.email_service, self.gerador_recorrentes)
-        self.notificador.iniciar_verificacao()
-        
         # Container do body (para atualização dinâmica)
         self.body_container = None
         self.filtro_pesquisa = ""
+        self.incluir_arquivadas = False
+        
+        # Estado da listagem paginada de obras
+        self.grid_obras = None
+        self.botao_carregar_mais = None
+        self.cursor_obras = None
+        self.carregando_obras = False
         
         # Verifica atualização antes de construir UI
         self.verificar_atualizacao()
@@ -69,20 +118,8 @@ class AgendaObras:
         if not tentativas or tentativas == 0 or not ultima_notif:
             return ''
         
-        try:
-            # Verifica se tem horário (formato: YYYY-MM-DD HH:MM:SS)
-            if ' ' in ultima_notif:
-                # Tem horário - formata data e hora
-                dt = datetime.datetime.strptime(ultima_notif, '%Y-%m-%d %H:%M:%S')
-                data_notif_formatada = dt.strftime('%d/%m/%Y às %H:%M')
-            else:
-                # Só tem data - formata apenas data
-                dt = datetime.datetime.strptime(ultima_notif, '%Y-%m-%d')
-                data_notif_formatada = dt.strftime('%d/%m/%Y')
-        except Exception as e:
-            # Fallback se houver erro no parse
-            log_error(e, "agenda_obras", "Parse de data em formatar_info_reiteracao")
-            data_notif_formatada = ultima_notif
+        # YYYY-MM-DD HH:MM:SS -> data e hora; só a data se não houver horário
+        data_notif_formatada = formatar_data_hora(ultima_notif)
         
         # Monta mensagem baseada no número de tentativas
         if tentativas == 1:
@@ -127,29 +164,8 @@ class AgendaObras:
         Retorna string vazia se data_str for vazio
         Aceita tanto formato ISO quanto brasileiro
         """
-        if not data_str or not data_str.strip():
-            return ''
-        
-        data_str = data_str.strip()
-        
-        # Tenta formato ISO (aaaa-mm-dd)
-        if '-' in data_str:
-            try:
-                dt = datetime.datetime.strptime(data_str, '%Y-%m-%d')
-                return dt.strftime('%d/%m/%Y')
-            except ValueError:
-                pass
-        
-        # Tenta formato brasileiro (dd/mm/aaaa) - já está correto
-        if '/' in data_str:
-            try:
-                dt = datetime.datetime.strptime(data_str, '%d/%m/%Y')
-                return dt.strftime('%d/%m/%Y')  # Valida e retorna
-            except ValueError:
-                pass
-        
-        # Se não conseguiu converter, retorna original
-        return data_str
+        # Memorizado em datas.formatar_data: os cards repetem as mesmas datas
+        return formatar_data(data_str)
     
     def verificar_atualizacao(self):
         """Verifica se há atualização disponível e exige atualização se necessário"""
@@ -250,6 +266,22 @@ class AgendaObras:
                 'color: white; font-weight: bold; margin-right: 10px;'
             )
             
+            ui.button('📥 Importar', on_click=self.importar_planilha).props('flat').style(
+                'color: white; font-weight: bold; margin-right: 10px;'
+            ).tooltip('Importar obras de uma planilha CSV ou XLSX')
+            
+            ui.button('📤 Exportar', on_click=self.exportar_carteira).props('flat').style(
+                'color: white; font-weight: bold; margin-right: 10px;'
+            ).tooltip('Exportar obras e checklists (CSV, JSON Lines ou Parquet)')
+            
+            ui.button('📊 Análise', on_click=lambda: ui.navigate.to('/analise')).props('flat').style(
+                'color: white; font-weight: bold; margin-right: 10px;'
+            ).tooltip('Cumprimento de prazos por tarefa, cliente e mês')
+            
+            ui.button('📅 Agenda', on_click=lambda: ui.navigate.to('/agenda')).props('flat').style(
+                'color: white; font-weight: bold; margin-right: 10px;'
+            ).tooltip('Prazos da semana ou do mês em todas as obras')
+            
             # Campo de pesquisa
             self.input_pesquisa = ui.input(placeholder='🔍 Pesquisar obras...').props('outlined dense').style(
                 'background-color: white; border-radius: 4px; margin-right: 10px; width: 300px;'
@@ -257,6 +289,10 @@ class AgendaObras:
             self.input_pesquisa.on('input', lambda: self.pesquisa(self.input_pesquisa.value))
             self.input_pesquisa.on('keydown.enter', lambda: self.pesquisa(self.input_pesquisa.value))
             
+            ui.checkbox('Incluir arquivadas', on_change=self.alternar_arquivadas).style(
+                'color: white; margin-right: 10px;'
+            ).tooltip('Também busca obras concluídas movidas para o arquivo morto')
+            
             ui.space()
             
             ui.button('🔄 Atualizar', on_click=self.atualizar_dados).props('flat').style(
@@ -265,10 +301,7 @@ class AgendaObras:
     
     def footer(self):
         """Rodapé da aplicação"""
-        with ui.footer().style('background-color: #f5f5f5; padding: 15px; text-align: center;'):
-            ui.label(f'AgendaObras v{VERSION} | © {datetime.datetime.now().year}').style(
-                'color: #666; font-size: 12px;'
-            )
+        rodape()
     
     def body(self):
         """Corpo principal com grid de obras"""
@@ -295,7 +328,10 @@ class AgendaObras:
                             ui.label(f'Pesquisando por: "{self.filtro_pesquisa}"').style('color: #1976d2; font-weight: bold;')
                         ui.button('✕ Limpar pesquisa', on_click=self.atualizar_dados).props('flat').style('color: #1976d2;')
             
-            obras = self.db.listar_obras(self.filtro_pesquisa if self.filtro_pesquisa else None)
+            filtro = self.filtro_pesquisa if self.filtro_pesquisa else None
+            pagina = self.db.listar_obras_pagina(limite=TAMANHO_PAGINA_OBRAS, filtro=filtro)
+            obras = pagina['obras']
+            self.cursor_obras = pagina['proximo_cursor']
             
             if not obras:
                 with ui.card().classes('w-full').style('padding: 40px; text-align: center;'):
@@ -309,26 +345,85 @@ class AgendaObras:
                         ui.label('Clique em "Nova Obra" para começar').style('font-size: 14px; color: #bbb;')
             else:
                 # Contador de resultados
-                total = len(obras)
                 if self.filtro_pesquisa:
+                    total = self.db.contar_obras(filtro) if self.cursor_obras else len(obras)
                     ui.label(f'{total} obra{"s" if total != 1 else ""} encontrada{"s" if total != 1 else ""}').style(
                         'font-size: 14px; color: #666; margin-bottom: 10px; font-weight: 500;'
                     )
                 
-                # Grid responsivo de 4 colunas (ajustado para cards mais compactos)
-                with ui.grid(columns='repeat(auto-fit, minmax(330px, 1fr))').classes('w-full gap-4'):
-                    for obra in obras:
-                        self.criar_card_obra(obra)
+                # Área rolável: carrega a próxima página ao se aproximar do fim
+                with ui.scroll_area(on_scroll=self.verificar_rolagem_obras).classes('w-full').style(
+                    'height: calc(100vh - 230px);'
+                ):
+                    # Grid responsivo de 4 colunas (ajustado para cards mais compactos)
+                    self.grid_obras = ui.grid(columns='repeat(auto-fit, minmax(330px, 1fr))').classes('w-full gap-4')
+                    with self.grid_obras:
+                        for obra in obras:
+                            self.criar_card_obra(obra)
+                    
+                    self.botao_carregar_mais = ui.button('Carregar mais obras', on_click=self.carregar_mais_obras).props(
+                        'flat'
+                    ).classes('w-full').style('margin-top: 10px; color: #1976d2;')
+                    self.botao_carregar_mais.set_visibility(self.cursor_obras is not None)
+            
+            if self.filtro_pesquisa and self.incluir_arquivadas:
+                self.renderizar_obras_arquivadas(filtro)
+    
+    def renderizar_obras_arquivadas(self, filtro: str):
+        """Lista compacta das obras do arquivo morto que correspondem à pesquisa"""
+        arquivadas = self.db.listar_obras_arquivadas(filtro)
+        if not arquivadas:
+            return
+        
+        with ui.card().classes('w-full').style('background-color: #f5f5f5; margin-top: 10px;'):
+            ui.label(f'🗄️ Obras arquivadas ({len(arquivadas)})').style('font-size: 16px; font-weight: bold; color: #666;')
+            for obra in arquivadas:
+                with ui.row().classes('w-full items-center justify-between'):
+                    ui.label(f"{obra['nome_contrato']} - {obra['cliente']}").style('color: #555;')
+                    ui.label(f"Concluída em {self.formatar_data_exibicao(obra.get('data_conclusao')) or '-'}").style(
+                        'color: #999; font-size: 12px;'
+                    )
+                    ui.button('Ver detalhes', on_click=lambda obra_id=obra['id']: self.abrir_detalhes_obra(obra_id)).props(
+                        'flat dense'
+                    ).style('color: #1976d2;')
+    
+    def verificar_rolagem_obras(self, e):
+        """Carrega mais obras quando a rolagem chega perto do fim da lista"""
+        if e.vertical_percentage >= 0.9:
+            self.carregar_mais_obras()
+    
+    def carregar_mais_obras(self):
+        """Adiciona a próxima página de cards ao grid"""
+        if self.cursor_obras is None or self.carregando_obras:
+            return
+        
+        self.carregando_obras = True
+        try:
+            filtro = self.filtro_pesquisa if self.filtro_pesquisa else None
+            pagina = self.db.listar_obras_pagina(cursor=self.cursor_obras, limite=TAMANHO_PAGINA_OBRAS, filtro=filtro)
+            with self.grid_obras:
+                for obra in pagina['obras']:
+                    self.criar_card_obra(obra)
+            self.cursor_obras = pagina['proximo_cursor']
+            self.botao_carregar_mais.set_visibility(self.cursor_obras is not None)
+        except Exception as e:
+            log_error(e, "agenda_obras", "Carregar mais obras")
+            self.notificar(f'❌ Erro ao carregar obras: {str(e)}', tipo='negative')
+        finally:
+            self.carregando_obras = False
     
     def criar_card_obra(self, obra: Dict):
-        """Cria um card individual de obra"""
-        # Obtém checklist e calcula status
-        checklist = self.db.obter_checklist(obra['id'])
-        progresso = self.helper.calcular_progresso(checklist)
-        cor, icone, status_texto = self.helper.obter_status_visual(obra, checklist)
+        """Cria um card individual de obra a partir do resumo de listar_obras_com_resumo"""
+        progresso = self.helper.calcular_progresso_resumo(obra)
+        cor, icone, status_texto = self.helper.obter_status_visual_resumo(obra)
         
-        # Encontra próxima tarefa pendente
-        proxima_tarefa = next((item for item in checklist if not item['concluido'] and not item['bloqueado']), None)
+        # Próxima tarefa pendente (já calculada no resumo)
+        proxima_tarefa = None
+        if obra.get('proxima_tarefa_descricao'):
+            proxima_tarefa = {
+                'descricao': obra['proxima_tarefa_descricao'],
+                'data_limite': obra['proxima_tarefa_data_limite'],
+            }
         
         # Card da obra
         with ui.card().classes('hover:shadow-lg transition-shadow').style(
@@ -377,18 +472,7 @@ class AgendaObras:
                         if obra.get('data_criacao'):
                             with ui.row().classes('items-center'):
                                 ui.icon('add_circle').style('color: #666; font-size: 16px;')
-                                try:
-                                    data_criacao_formatada = datetime.datetime.strptime(
-                                        obra['data_criacao'], '%Y-%m-%d %H:%M:%S'
-                                    ).strftime('%d/%m/%Y %H:%M')
-                                except Exception as e1:
-                                    try:
-                                        data_criacao_formatada = datetime.datetime.strptime(
-                                            obra['data_criacao'], '%Y-%m-%d'
-                                        ).strftime('%d/%m/%Y')
-                                    except Exception as e2:
-                                        log_error(e2, "agenda_obras", "Parse de data_criacao em renderizar_obras")
-                                        data_criacao_formatada = obra['data_criacao']
+                                data_criacao_formatada = formatar_data_hora(obra['data_criacao'], ' ')
                                 ui.label(f'Criado em: {data_criacao_formatada}').style('color: #666; font-size: 13px;')
                         
                         with ui.row().classes('items-center'):
@@ -422,72 +506,91 @@ class AgendaObras:
                                     f'font-size: 11px; color: {cor_prazo}; margin-left: 20px;'
                                 )
                 
-                # Aba de Checklist
+                # Aba de Checklist (carregada somente quando aberta)
                 with ui.tab_panel(tab_checklist).style('max-height: 250px; overflow-y: auto;'):
-                    with ui.column().classes('w-full gap-1'):
-                        tarefas_concluidas = sum(1 for item in checklist if item['concluido'])
-                        ui.label(f'Total: {tarefas_concluidas}/{len(checklist)} tarefas concluídas').style(
+                    container_checklist = ui.column().classes('w-full gap-1')
+                    with container_checklist:
+                        ui.label(f'Total: {obra["tarefas_concluidas"]}/{obra["total_tarefas"]} tarefas concluídas').style(
                             'font-size: 11px; color: #666; font-weight: bold; margin-bottom: 5px;'
                         )
-                        
-                        for item in checklist:
-                            # Determina tooltip baseado no estado
-                            if item['concluido']:
-                                data_conclusao = item.get('data_conclusao')
-                                data_conclusao_fmt = self.formatar_data_exibicao(data_conclusao) if data_conclusao else ''
-                                tooltip_text = f"✅ Concluída" + (f" em {data_conclusao_fmt}" if data_conclusao_fmt else "")
-                            elif item.get('bloqueado'):
-                                base_calculo = item.get('base_calculo', '')
-                                if base_calculo == 'assinatura':
-                                    tooltip_text = '🔒 Aguardando data de assinatura do contrato'
-                                elif base_calculo == 'aio':
-                                    tooltip_text = '🔒 Aguardando data da AIO'
-                                elif base_calculo == 'fim_tarefa':
-                                    tooltip_text = '🔒 Aguardando conclusão de tarefa anterior'
-                                else:
-                                    tooltip_text = '🔒 Tarefa bloqueada'
-                            elif item.get('data_limite'):
-                                dias_restantes = self.helper.calcular_dias_restantes(item['data_limite'])
-                                data_formatada = self.formatar_data_exibicao(item['data_limite'])
-                                if dias_restantes < 0:
-                                    tooltip_text = f"⚠️ Atrasada: {abs(dias_restantes)} dias - Prazo: {data_formatada}"
-                                    # Adiciona info de reiteração se houver
-                                    info_reiteracao = self.formatar_info_reiteracao(item)
-                                    if info_reiteracao:
-                                        tooltip_text += f"\n{info_reiteracao}"
-                                elif dias_restantes == 0:
-                                    tooltip_text = f"Prazo: {data_formatada} (HOJE!)"
-                                else:
-                                    tooltip_text = f"Prazo: {data_formatada} ({dias_restantes} dias restantes)"
-                            else:
-                                tooltip_text = "Tarefa pendente"
-                            
-                            # Estilo com hover suave usando CSS puro
-                            with ui.row().classes('items-center gap-2').style(
-                                'padding: 4px 8px; border-radius: 4px; cursor: default;'
-                            ).tooltip(tooltip_text):
-                                if item['concluido']:
-                                    ui.icon('check_circle').style('color: green; font-size: 14px;')
-                                    with ui.column().classes('gap-0'):
-                                        ui.label(item['descricao']).style('font-size: 11px; color: #999; text-decoration: line-through;')
-                                        if item.get('data_conclusao'):
-                                            data_concl_fmt = self.formatar_data_exibicao(item['data_conclusao'])
-                                            if data_concl_fmt:
-                                                ui.label(f'✓ Concluída em {data_concl_fmt}').style('font-size: 9px; color: #999; font-style: italic;')
-                                elif item['bloqueado']:
-                                    ui.icon('lock').style('color: #ccc; font-size: 14px;')
-                                    ui.label(item['descricao']).style('font-size: 11px; color: #ccc;')
-                                else:
-                                    ui.icon('radio_button_unchecked').style('color: #ff9800; font-size: 14px;')
-                                    with ui.column().classes('gap-0'):
-                                        ui.label(item['descricao']).style('font-size: 11px; color: #666;')
-                                        # Mostra info de reiteração se tarefa atrasada
-                                        if item.get('data_limite'):
-                                            dias_restantes = self.helper.calcular_dias_restantes(item['data_limite'])
-                                            if dias_restantes < 0:
-                                                info_reiteracao = self.formatar_info_reiteracao(item)
-                                                if info_reiteracao:
-                                                    ui.label(info_reiteracao).style('font-size: 9px; color: #ff5722; font-style: italic;')
+            
+            estado_checklist = {'carregado': False}
+            
+            def carregar_checklist():
+                if estado_checklist['carregado']:
+                    return
+                estado_checklist['carregado'] = True
+                container_checklist.clear()
+                with container_checklist:
+                    self.renderizar_checklist_card(self.db.obter_checklist(obra['id']))
+            
+            tab_checklist.on('click', carregar_checklist)
+    
+    def renderizar_checklist_card(self, checklist: List[Dict]):
+        """Renderiza os itens do checklist na aba do card"""
+        tarefas_concluidas = sum(1 for item in checklist if item['concluido'])
+        ui.label(f'Total: {tarefas_concluidas}/{len(checklist)} tarefas concluídas').style(
+            'font-size: 11px; color: #666; font-weight: bold; margin-bottom: 5px;'
+        )
+        
+        for item in checklist:
+            # Determina tooltip baseado no estado
+            if item['concluido']:
+                data_conclusao = item.get('data_conclusao')
+                data_conclusao_fmt = self.formatar_data_exibicao(data_conclusao) if data_conclusao else ''
+                tooltip_text = f"✅ Concluída" + (f" em {data_conclusao_fmt}" if data_conclusao_fmt else "")
+            elif item.get('bloqueado'):
+                base_calculo = item.get('base_calculo', '')
+                if base_calculo == 'assinatura':
+                    tooltip_text = '🔒 Aguardando data de assinatura do contrato'
+                elif base_calculo == 'aio':
+                    tooltip_text = '🔒 Aguardando data da AIO'
+                elif base_calculo == 'fim_tarefa':
+                    tooltip_text = '🔒 Aguardando conclusão de tarefa anterior'
+                else:
+                    tooltip_text = '🔒 Tarefa bloqueada'
+            elif item.get('data_limite'):
+                dias_restantes = self.helper.calcular_dias_restantes(item['data_limite'])
+                data_formatada = self.formatar_data_exibicao(item['data_limite'])
+                if dias_restantes < 0:
+                    tooltip_text = f"⚠️ Atrasada: {abs(dias_restantes)} dias - Prazo: {data_formatada}"
+                    # Adiciona info de reiteração se houver
+                    info_reiteracao = self.formatar_info_reiteracao(item)
+                    if info_reiteracao:
+                        tooltip_text += f"\n{info_reiteracao}"
+                elif dias_restantes == 0:
+                    tooltip_text = f"Prazo: {data_formatada} (HOJE!)"
+                else:
+                    tooltip_text = f"Prazo: {data_formatada} ({dias_restantes} dias restantes)"
+            else:
+                tooltip_text = "Tarefa pendente"
+            
+            # Estilo com hover suave usando CSS puro
+            with ui.row().classes('items-center gap-2').style(
+                'padding: 4px 8px; border-radius: 4px; cursor: default;'
+            ).tooltip(tooltip_text):
+                if item['concluido']:
+                    ui.icon('check_circle').style('color: green; font-size: 14px;')
+                    with ui.column().classes('gap-0'):
+                        ui.label(item['descricao']).style('font-size: 11px; color: #999; text-decoration: line-through;')
+                        if item.get('data_conclusao'):
+                            data_concl_fmt = self.formatar_data_exibicao(item['data_conclusao'])
+                            if data_concl_fmt:
+                                ui.label(f'✓ Concluída em {data_concl_fmt}').style('font-size: 9px; color: #999; font-style: italic;')
+                elif item['bloqueado']:
+                    ui.icon('lock').style('color: #ccc; font-size: 14px;')
+                    ui.label(item['descricao']).style('font-size: 11px; color: #ccc;')
+                else:
+                    ui.icon('radio_button_unchecked').style('color: #ff9800; font-size: 14px;')
+                    with ui.column().classes('gap-0'):
+                        ui.label(item['descricao']).style('font-size: 11px; color: #666;')
+                        # Mostra info de reiteração se tarefa atrasada
+                        if item.get('data_limite'):
+                            dias_restantes = self.helper.calcular_dias_restantes(item['data_limite'])
+                            if dias_restantes < 0:
+                                info_reiteracao = self.formatar_info_reiteracao(item)
+                                if info_reiteracao:
+                                    ui.label(info_reiteracao).style('font-size: 9px; color: #ff5722; font-style: italic;')
     
     # ========== Dialogs ========== #
     def nova_entrada(self):
@@ -637,10 +740,99 @@ class AgendaObras:
             log_error(e, "agenda_obras", f"Criar obra: {nome}")
             self.notificar(f'❌ Erro ao criar obra: {str(e)}', tipo='negative')
     
+    def importar_planilha(self):
+        """Dialog para importar obras em lote a partir de planilha CSV/XLSX"""
+        with ui.dialog() as dialog, ui.card().style('min-width: 600px; padding: 20px; max-height: 90vh; overflow-y: auto;'):
+            ui.label('📥 Importar Obras').style('font-size: 22px; font-weight: bold; margin-bottom: 10px;')
+            ui.label('A primeira linha deve conter os nomes das colunas. Obrigatórias: Nome do Contrato, Cliente e Valor.').style(
+                'font-size: 13px; color: #666;'
+            )
+            ui.label('Opcionais: Contrato (IC), Pedido SAP, Prefixo Agência, Serviço, Data de Início, Data de Acionamento, etc.').style(
+                'font-size: 12px; color: #999; margin-bottom: 10px;'
+            )
+            
+            resultado_container = ui.column().classes('w-full gap-1')
+            
+            async def processar_upload(e):
+                resultado_container.clear()
+                try:
+                    # Leitura da planilha e gravação fora do loop de eventos (a interface continua respondendo)
+                    resultado = await run.io_bound(importar_conteudo, e.name, e.content.read(), self.db)
+                except Exception as erro:
+                    log_error(erro, "agenda_obras", f"Importar planilha: {e.name}")
+                    self.notificar(f'❌ Erro ao importar: {str(erro)}', tipo='negative')
+                    return
+                
+                total_criadas = len(resultado['criadas'])
+                with resultado_container:
+                    ui.label(f'✅ {total_criadas} obra(s) importada(s)').style('font-weight: bold; color: #2e7d32;')
+                    if resultado['erros']:
+                        ui.label(f'⚠️ {len(resultado["erros"])} linha(s) ignorada(s):').style('font-weight: bold; color: #f57c00;')
+                        with ui.column().classes('w-full gap-0').style('max-height: 250px; overflow-y: auto;'):
+                            for erro in resultado['erros']:
+                                ui.label(f'Linha {erro["linha"]}: {erro["erro"]}').style('font-size: 12px; color: #666;')
+                
+                if total_criadas:
+                    self.renderizar_obras()
+                    self.notificar(f'✅ {total_criadas} obra(s) importada(s) com sucesso!', tipo='positive')
+            
+            ui.upload(on_upload=processar_upload, auto_upload=True, max_files=1).props(
+                'accept=".csv,.xlsx" label="Selecionar planilha"'
+            ).classes('w-full')
+            
+            with ui.row().classes('w-full justify-end mt-4'):
+                ui.button('Fechar', on_click=dialog.close).props('flat')
+        
+        dialog.open()
+    
+    def exportar_carteira(self):
+        """Dialog para exportar obras, checklists e (opcionalmente) histórico para download"""
+        formatos = formatos_disponiveis()
+        with ui.dialog() as dialog, ui.card().style('min-width: 450px; padding: 20px;'):
+            ui.label('📤 Exportar Obras').style('font-size: 22px; font-weight: bold; margin-bottom: 10px;')
+            ui.label('Uma linha por tarefa do checklist, com os dados da obra.').style(
+                'font-size: 13px; color: #666;'
+            )
+            
+            formato_input = ui.select(formatos, label='Formato', value=formatos[0]).classes('w-full').props('outlined')
+            if 'parquet' not in formatos:
+                ui.label('Parquet requer o pacote pyarrow (pip install pyarrow).').style('font-size: 12px; color: #999;')
+            historico_input = ui.checkbox('Incluir histórico de notificações (arquivo separado)')
+            arquivadas_input = ui.checkbox('Incluir obras arquivadas', value=self.incluir_arquivadas)
+            
+            async def gerar_exportacao():
+                data = datetime.date.today().strftime('%Y-%m-%d')
+                nome_arquivo = f'agendaobras_{data}.{formato_input.value}'
+                try:
+                    # Consulta e gravação do arquivo fora do loop de eventos (a interface continua respondendo)
+                    resultado = await run.io_bound(exportar_para_download, self.db, nome_arquivo,
+                                                   historico_input.value, arquivadas_input.value)
+                except Exception as e:
+                    log_error(e, "agenda_obras", f"Exportar carteira: {nome_arquivo}")
+                    self.notificar(f'❌ Erro ao exportar: {str(e)}', tipo='negative')
+                    return
+                
+                ui.download(resultado['arquivo'])
+                if resultado['arquivo_historico']:
+                    ui.download(resultado['arquivo_historico'])
+                dialog.close()
+                self.notificar(f'✅ {resultado["linhas"]} linha(s) exportada(s)', tipo='positive')
+            
+            with ui.row().classes('w-full justify-end mt-4'):
+                ui.button('Cancelar', on_click=dialog.close).props('flat')
+                ui.button('Exportar', on_click=gerar_exportacao).props('color=primary')
+        
+        dialog.open()
+    
     def abrir_detalhes_obra(self, obra_id: int):
         """Dialog para visualizar e editar obra com checklist"""
         obra = self.db.obter_obra(obra_id)
         checklist = self.db.obter_checklist(obra_id)
+        
+        if obra.get('arquivada'):
+            # Obras do arquivo morto não podem ser alteradas: abre só para consulta
+            self.abrir_detalhes_obra_arquivada(obra, checklist)
+            return
 
         # Verificar se tarefas críticas estão concluídas para habilitar campos
         contrato_assinado_concluido = any(
@@ -765,6 +957,10 @@ class AgendaObras:
             
             ui.separator()
             
+            self.painel_historico_obra(obra_id)
+            
+            ui.separator()
+            
             # Botões de ação
             with ui.row().classes('w-full justify-between'):
                 ui.button('🗑️ Excluir Obra', on_click=lambda: self.confirmar_exclusao(dialog, obra_id)).props('color=negative flat')
@@ -775,6 +971,7 @@ class AgendaObras:
                         dialog, obra_id, nome_input.value, cliente_input.value,
                         valor_input.value, data_input.value, status_input.value, checklist_estados,
                         checklist_container,  # << PASSA O CONTAINER
+                        obra_original=obra,
                         contrato_ic=contrato_ic_input.value,
                         pedido_sap=pedido_sap_input.value or None,
                         prefixo_agencia=prefixo_agencia_input.value,
@@ -802,11 +999,98 @@ class AgendaObras:
         for campo in datas_pendentes:
             self.abrir_dialog_data_critica(obra_id, campo, atualizar_checklist)
 
+    def abrir_detalhes_obra_arquivada(self, obra: Dict, checklist: List[Dict]):
+        """Dialog somente leitura para obras do arquivo morto (sem salvar, excluir ou marcar tarefas)"""
+        campos = [
+            ('Cliente', obra.get('cliente')),
+            ('Contrato (IC)', obra.get('contrato_ic')),
+            ('Pedido SAP', obra.get('pedido_sap')),
+            ('Prefixo Agência', obra.get('prefixo_agencia')),
+            ('Serviço', obra.get('servico')),
+            ('Valor do Contrato', self.helper.formatar_valor(obra['valor_contrato'])),
+            ('Status', obra.get('status')),
+            ('Data de Acionamento', self.formatar_data_exibicao(obra.get('data_acionamento') or '')),
+            ('Data de Assinatura do Contrato', self.formatar_data_exibicao(obra.get('data_assinatura') or '')),
+            ('Data da AIO', self.formatar_data_exibicao(obra.get('data_aio') or '')),
+            ('Data de início da obra', self.formatar_data_exibicao(obra.get('data_inicio') or '')),
+            ('Data de conclusão', self.formatar_data_exibicao(obra.get('data_conclusao') or '')),
+        ]
+        
+        with ui.dialog() as dialog, ui.card().style('min-width: 700px; max-width: 900px; padding: 20px; max-height: 90vh; overflow-y: auto;'):
+            with ui.row().classes('w-full items-center justify-between'):
+                ui.label(f'🗄️ {obra["nome_contrato"]}').style('font-size: 22px; font-weight: bold;')
+                ui.button(icon='close', on_click=dialog.close).props('flat round')
+            ui.label('Obra arquivada: somente consulta.').style('font-size: 13px; color: #666;')
+            
+            ui.separator()
+            
+            with ui.grid(columns=2).classes('w-full gap-x-6 gap-y-1').style('margin-top: 10px;'):
+                for rotulo, valor in campos:
+                    ui.label(rotulo).style('color: #666; font-size: 13px;')
+                    ui.label(valor or '-').style('font-size: 13px;')
+            
+            ui.separator()
+            
+            ui.label('📋 Checklist de Atividades').style('font-size: 18px; font-weight: bold; margin-top: 10px;')
+            with ui.column().classes('w-full gap-2'):
+                for item in checklist:
+                    self.criar_item_checklist_editavel(item, {}, obra['id'], somente_leitura=True)
+            
+            ui.separator()
+            
+            self.painel_historico_obra(obra['id'])
+            
+            with ui.row().classes('w-full justify-end mt-4'):
+                ui.button('Fechar', on_click=dialog.close).props('flat')
+        
+        dialog.open()
+    
+    def painel_historico_obra(self, obra_id: int):
+        """Painel recolhível com as notificações enviadas para a obra (carregado ao abrir, por páginas)"""
+        estado = {'cursor': None, 'carregado': False}
+        
+        def carregar():
+            try:
+                pagina = self.db.listar_historico(obra_id=obra_id, cursor=estado['cursor'], limite=20)
+            except Exception as e:
+                log_error(e, "agenda_obras", f"Carregar histórico de notificações - obra_id: {obra_id}")
+                self.notificar(f'❌ Erro ao carregar histórico: {str(e)}', tipo='negative')
+                return
+            
+            with lista:
+                if not pagina['registros'] and estado['cursor'] is None:
+                    ui.label('Nenhuma notificação enviada para esta obra').style('color: #999; font-size: 13px;')
+                for registro in pagina['registros']:
+                    data, _, hora = registro['data_envio'].partition(' ')
+                    icone = '✅' if registro['sucesso'] else '❌'
+                    with ui.row().classes('w-full items-center gap-2').style('font-size: 13px;'):
+                        ui.label(f"{icone} {self.formatar_data_exibicao(data)} {hora[:5]}").style('color: #666; min-width: 130px;')
+                        ui.label(registro['tipo_notificacao']).style('color: #1976d2; min-width: 120px;')
+                        ui.label(registro['tarefa_descricao'] or f"Tarefa #{registro['tarefa_id']}").style('color: #333;')
+                        if registro['mensagem_erro']:
+                            ui.label(registro['mensagem_erro']).style('color: #c62828;')
+                    if registro['destinatarios']:
+                        ui.label(f"Para: {registro['destinatarios']}").style('color: #999; font-size: 12px; margin-left: 22px;')
+            
+            estado['cursor'] = pagina['proximo_cursor']
+            botao_mais.set_visibility(estado['cursor'] is not None)
+        
+        def ao_abrir(e):
+            if e.value and not estado['carregado']:
+                estado['carregado'] = True
+                carregar()
+        
+        with ui.expansion('📨 Histórico de Notificações', on_value_change=ao_abrir).classes('w-full'):
+            lista = ui.column().classes('w-full gap-1')
+            botao_mais = ui.button('Carregar mais', on_click=carregar).props('flat dense').style('color: #1976d2;')
+            botao_mais.set_visibility(False)
+    
     def criar_item_checklist_editavel(self, item: Dict, checklist_estados: Dict, obra_id: int,
-                                       atualizar_checklist_fn=None):
+                                       atualizar_checklist_fn=None, somente_leitura: bool = False):
         """Cria um item do checklist no modo de edição.
         Renderiza diretamente a partir dos dados já carregados (sem query extra).
         Ao marcar/desmarcar, atualiza TODO o checklist via atualizar_checklist_fn.
+        Com somente_leitura (obras arquivadas), o checkbox fica desabilitado e nada é gravado.
         """
         
         # Verifica se está bloqueado e determina motivo
@@ -863,15 +1147,15 @@ class AgendaObras:
                     if bloqueado:
                         ui.icon('lock').style('color: #999; font-size: 18px;')
                     
-                    # Checkbox - desabilitado se bloqueado
-                    checkbox_props = 'disable' if bloqueado else ''
+                    # Checkbox - desabilitado se bloqueado ou somente leitura
+                    checkbox_props = 'disable' if bloqueado or somente_leitura else ''
                     checkbox = ui.checkbox(value=bool(item['concluido'])).props(checkbox_props)
                     
                     # Armazena referência para uso posterior no "Salvar"
                     checklist_estados[item['id']] = checkbox
                     
                     # Evento: ao marcar/desmarcar, salva e atualiza TODO o checklist
-                    if not bloqueado:
+                    if not bloqueado and not somente_leitura:
                         def on_change(e, item_id=item['id']):
                             novo_valor = bool(e.value)
                             # Salva no banco imediatamente
@@ -1069,8 +1353,10 @@ class AgendaObras:
     
     def atualizar_obra_dialog(self, dialog, obra_id: int, nome: str, cliente: str,
                             valor: float, data_inicio: str, status: str, checklist_estados: Dict = None, 
-                            checklist_container = None, **kwargs):
-        """Atualiza obra e checklist a partir do dialog de detalhes"""
+                            checklist_container = None, obra_original: Dict = None, **kwargs):
+        """Atualiza obra e checklist a partir do dialog de detalhes.
+        Envia ao banco só os campos alterados em relação à obra carregada ao abrir o dialog,
+        para não sobrescrever o que outro usuário editou nos demais campos."""
         if not nome or not cliente:
             self.notificar('⚠️ Nome e cliente são obrigatórios!', tipo='warning')
             return
@@ -1091,41 +1377,16 @@ class AgendaObras:
             if 'data_acionamento' in kwargs:
                 kwargs['data_acionamento'] = self.converter_data_para_iso(kwargs['data_acionamento'])
             
-            # Busca dados antigos para comparação
-            obra_antiga = self.db.obter_obra(obra_id)
-            
-            # Atualiza dados da obra com todos os campos
-            requer_recalculo = self.db.atualizar_obra(obra_id, nome, cliente, valor, data_inicio, status, **kwargs)
+            novos = {'nome_contrato': nome, 'cliente': cliente, 'valor_contrato': valor,
+                     'data_inicio': data_inicio, 'status': status, **kwargs}
+            referencia = obra_original or self.db.obter_obra(obra_id)
+            alteracoes = {campo: valor_novo for campo, valor_novo in novos.items()
+                          if (valor_novo or None) != (referencia.get(campo) or None)}
             
-            # Verifica se precisa recalcular datas
-            recalculou = False
-            datas_recalculadas = []
-
-            if obra_antiga['data_inicio'] != data_inicio:
-                self.db.recalcular_checklist(obra_id, 'data_inicio', data_inicio)
-                datas_recalculadas.append('data de início')
-                recalculou = True
-            
-            # Verifica se data_acionamento foi alterada
-            data_acionamento_nova = kwargs.get('data_acionamento')
-            if data_acionamento_nova and obra_antiga.get('data_acionamento') != data_acionamento_nova:
-                self.db.recalcular_checklist(obra_id, 'data_acionamento', data_acionamento_nova)
-                datas_recalculadas.append('data de acionamento')
-                recalculou = True
-
-            # Verifica se data_assinatura foi alterada
-            data_assinatura_nova = kwargs.get('data_assinatura')
-            if data_assinatura_nova and obra_antiga.get('data_assinatura') != data_assinatura_nova:
-                self.db.recalcular_checklist(obra_id, 'data_assinatura', data_assinatura_nova)
-                datas_recalculadas.append('data de assinatura')
-                recalculou = True
-            
-            # Verifica se data_aio foi alterada
-            data_aio_nova = kwargs.get('data_aio')
-            if data_aio_nova and obra_antiga.get('data_aio') != data_aio_nova:
-                self.db.recalcular_checklist(obra_id, 'data_aio', data_aio_nova)
-                datas_recalculadas.append('data da AIO')
-                recalculou = True
+            # Grava os campos alterados e recalcula os prazos das datas-base na mesma transação
+            resultado = self.db.atualizar_campos_obra(obra_id, alteracoes)
+            recalculou = bool(resultado['recalculados'])
+            datas_recalculadas = [NOMES_DATAS_BASE[campo] for campo in resultado['recalculados']]
 
             if datas_recalculadas:
                 bases = ' e '.join(datas_recalculadas) if len(datas_recalculadas) <= 2 else ', '.join(datas_recalculadas[:-1]) + ' e ' + datas_recalculadas[-1]
@@ -1148,8 +1409,13 @@ class AgendaObras:
                 
                 atualizar_checklist_local()
             
+            # Próximos salvamentos do dialog comparam com os valores já gravados
+            if obra_original is not None:
+                obra_original.update(alteracoes)
+            
             # Notifica sucesso
-            self.notificar('✅ Obra atualizada!', tipo='positive', timeout=3)
+            self.notificar('✅ Obra atualizada!' if alteracoes else 'Nenhuma alteração para salvar',
+                           tipo='positive' if alteracoes else 'info', timeout=3)
             
             # NÃO fecha o dialog
             # O dialog permanece aberto
@@ -1191,6 +1457,12 @@ class AgendaObras:
         self.filtro_pesquisa = texto.strip()
         self.renderizar_obras()
     
+    def alternar_arquivadas(self, e):
+        """Inclui/remove as obras arquivadas da pesquisa"""
+        self.incluir_arquivadas = e.value
+        if self.filtro_pesquisa:
+            self.renderizar_obras()
+    
     def atualizar_dados(self):
         """Atualiza a lista de obras"""
         self.filtro_pesquisa = ""
@@ -1198,3 +1470,200 @@ class AgendaObras:
             self.input_pesquisa.value = ""
         self.notificar('🔄 Dados atualizados!', tipo='info')
         self.renderizar_obras()
+
+
+def cabecalho_pagina(titulo: str):
+    """Cabeçalho das páginas secundárias, com retorno ao dashboard"""
+    with ui.header().classes('items-center').style('background-color: #1976d2; padding: 15px;'):
+        ui.button('⬅️ Obras', on_click=lambda: ui.navigate.to('/')).props('flat').style(
+            'color: white; font-weight: bold; margin-right: 20px;'
+        )
+        ui.label(titulo).style('font-size: 24px; color: white; font-weight: bold;')
+
+
+def rodape():
+    """Rodapé comum a todas as páginas"""
+    with ui.footer().style('background-color: #f5f5f5; padding: 15px; text-align: center;'):
+        ui.label(f'AgendaObras v{VERSION} | © {datetime.datetime.now().year}').style(
+            'color: #666; font-size: 12px;'
+        )
+
+
+# Colunas da tabela de análise de SLA: (campo, título)
+COLUNAS_ANALISE = [
+    ('tarefas', 'Tarefas'),
+    ('concluidas', 'Concluídas'),
+    ('taxa_no_prazo', 'No prazo (%)'),
+    ('fora_do_prazo', 'Fora do prazo'),
+    ('vencidas', 'Vencidas'),
+    ('atraso_medio_dias', 'Atraso médio (dias)'),
+    ('duracao_media_dias', 'Execução média (dias)'),
+    ('p50_dias', 'Execução p50'),
+    ('p90_dias', 'Execução p90'),
+    ('reiteracoes', 'Reiterações'),
+    ('notificacoes', 'Notificações'),
+]
+
+
+class AnaliseSLAPage:
+    """Página /analise: cumprimento de prazos do checklist por tarefa, cliente ou mês"""
+    
+    def __init__(self):
+        self.db = obter_servicos()[0]
+        self.analise = obter_analise(self.db)
+        self.dimensao = 'template'
+        self.tabela_container = None
+        
+        cabecalho_pagina('📊 Análise de Prazos')
+        
+        with ui.column().classes('w-full p-0'):
+            with ui.card().classes('w-full').style('background-color: #fafafa;'):
+                with ui.row().classes('w-full items-center justify-between'):
+                    ui.toggle({chave: titulo for chave, (_, _, titulo) in DIMENSOES.items()},
+                              value=self.dimensao, on_change=lambda e: self.renderizar(e.value))
+                    ui.button('🔄 Atualizar', on_click=lambda: self.renderizar(self.dimensao)).props('flat')
+                ui.label('Tarefas com prazo definido. Execução = dias entre a data-base e a conclusão; '
+                         'vencidas = pendentes com prazo já passado.').style('font-size: 12px; color: #999;')
+                self.tabela_container = ui.column().classes('w-full')
+        
+        rodape()
+        
+        self.renderizar(self.dimensao)
+    
+    def renderizar(self, dimensao: str):
+        """Renderiza a tabela da dimensão escolhida (do cache se os dados não mudaram)"""
+        self.dimensao = dimensao
+        self.tabela_container.clear()
+        try:
+            linhas = self.analise.obter(dimensao)
+        except Exception as e:
+            log_error(e, "agenda_obras", f"Análise de SLA: {dimensao}")
+            with self.tabela_container:
+                ui.label(f'❌ Erro ao calcular a análise: {str(e)}').style('color: #c62828;')
+            return
+        
+        colunas = [{'name': 'rotulo', 'label': DIMENSOES[dimensao][2], 'field': 'rotulo',
+                    'align': 'left', 'sortable': True}]
+        colunas += [{'name': campo, 'label': titulo, 'field': campo, 'sortable': True}
+                    for campo, titulo in COLUNAS_ANALISE]
+        with self.tabela_container:
+            if not linhas:
+                ui.label('Nenhuma tarefa com prazo definido.').style('color: #666;')
+                return
+            ui.table(columns=colunas, rows=linhas, row_key='grupo',
+                     pagination={'rowsPerPage': 25}).classes('w-full').props('dense flat')
+
+
+DIAS_SEMANA = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
+
+
+class AgendaPrazosPage:
+    """Página /agenda: tarefas pendentes de todas as obras, por dia, na semana ou no mês"""
+    
+    def __init__(self):
+        self.db = obter_servicos()[0]
+        self.modo = 'semana'
+        self.referencia = datetime.date.today()
+        self.filtro_cliente = ''
+        self.titulo_periodo = None
+        self.agenda_container = None
+        
+        cabecalho_pagina('📅 Agenda de Prazos')
+        
+        with ui.column().classes('w-full p-0'):
+            with ui.card().classes('w-full').style('background-color: #fafafa;'):
+                with ui.row().classes('w-full items-center gap-2'):
+                    ui.toggle({'semana': 'Semana', 'mes': 'Mês'}, value=self.modo,
+                              on_change=lambda e: self.alterar_modo(e.value))
+                    ui.button(icon='chevron_left', on_click=lambda: self.navegar(-1)).props('flat round')
+                    ui.button('Hoje', on_click=self.ir_para_hoje).props('flat')
+                    ui.button(icon='chevron_right', on_click=lambda: self.navegar(1)).props('flat round')
+                    self.titulo_periodo = ui.label().style('font-size: 18px; font-weight: bold; margin-left: 10px;')
+                    ui.space()
+                    cliente_input = ui.input(placeholder='Filtrar por cliente').props('outlined dense clearable')
+                    cliente_input.on('keydown.enter', lambda: self.filtrar_cliente(cliente_input.value))
+                    cliente_input.on('clear', lambda: self.filtrar_cliente(''))
+                self.agenda_container = ui.column().classes('w-full gap-2')
+        
+        rodape()
+        
+        self.renderizar()
+    
+    def periodo(self) -> Tuple[datetime.date, datetime.date]:
+        """(primeiro dia, último dia) do período visível"""
+        if self.modo == 'semana':
+            inicio = self.referencia - datetime.timedelta(days=self.referencia.weekday())
+            return inicio, inicio + datetime.timedelta(days=6)
+        inicio = self.referencia.replace(day=1)
+        proximo_mes = (inicio + datetime.timedelta(days=32)).replace(day=1)
+        return inicio, proximo_mes - datetime.timedelta(days=1)
+    
+    def alterar_modo(self, modo: str):
+        self.modo = modo
+        self.renderizar()
+    
+    def navegar(self, passo: int):
+        """Avança ou recua uma semana/um mês"""
+        if self.modo == 'semana':
+            self.referencia += datetime.timedelta(weeks=passo)
+        else:
+            inicio, fim = self.periodo()
+            self.referencia = (fim + datetime.timedelta(days=1) if passo > 0
+                               else inicio - datetime.timedelta(days=1)).replace(day=1)
+        self.renderizar()
+    
+    def ir_para_hoje(self):
+        self.referencia = datetime.date.today()
+        self.renderizar()
+    
+    def filtrar_cliente(self, cliente: str):
+        self.filtro_cliente = (cliente or '').strip()
+        self.renderizar()
+    
+    def renderizar(self):
+        """Lista as tarefas do período agrupadas por dia de prazo"""
+        inicio, fim = self.periodo()
+        self.titulo_periodo.set_text(f'{inicio.strftime("%d/%m/%Y")} a {fim.strftime("%d/%m/%Y")}')
+        self.agenda_container.clear()
+        
+        try:
+            tarefas = self.db.obter_tarefas_por_periodo(inicio.isoformat(), fim.isoformat(),
+                                                        {'cliente': self.filtro_cliente})
+            hoje = hoje_dia()
+            total = 0
+            dia_atual = None
+            with self.agenda_container:
+                # As tarefas chegam ordenadas por prazo: um cabeçalho a cada novo dia
+                for tarefa in tarefas:
+                    if tarefa['dia_limite'] != dia_atual:
+                        dia_atual = tarefa['dia_limite']
+                        self._cabecalho_dia(tarefa['data_limite'], dia_atual, hoje)
+                    self._linha_tarefa(tarefa)
+                    total += 1
+                
+                if not total:
+                    ui.label('Nenhuma tarefa pendente no período.').style('color: #666; margin-top: 10px;')
+        except Exception as e:
+            log_error(e, "agenda_obras", f"Agenda de prazos: {inicio} a {fim}")
+            with self.agenda_container:
+                ui.label(f'❌ Erro ao carregar a agenda: {str(e)}').style('color: #c62828;')
+    
+    @staticmethod
+    def _cabecalho_dia(data_limite: str, dia: int, hoje: int):
+        data = data_do_dia(dia)
+        cor = '#c62828' if dia < hoje else '#1976d2' if dia == hoje else '#333'
+        sufixo = ' (hoje)' if dia == hoje else ' (vencido)' if dia < hoje else ''
+        ui.label(f'{DIAS_SEMANA[data.weekday()]}, {formatar_data(data_limite)}{sufixo}').style(
+            f'font-size: 15px; font-weight: bold; color: {cor}; margin-top: 12px;'
+        )
+    
+    @staticmethod
+    def _linha_tarefa(tarefa: Dict):
+        with ui.row().classes('w-full items-center gap-3').style(
+            'padding: 6px 10px; background-color: white; border-radius: 4px; border-left: 4px solid #1976d2;'
+        ):
+            ui.label(f'Tipo {tarefa["tipo"]}').style('font-size: 11px; color: #999; min-width: 45px;')
+            ui.label(tarefa['descricao']).style('font-weight: 500;')
+            ui.label(f'{tarefa["nome_contrato"]} · {tarefa["cliente"]}').style('color: #666; font-size: 13px;')
+            if tarefa['tentativas_reiteracao']:
+                ui.label(f'📧 {tarefa["tentativas_reiteracao"]} reiteração(ões)').style('color: #f57c00; font-size: 12px;')
@@ -0,0 +1,182 @@
+"""
+Módulo de análise de SLA (cumprimento de prazos) do checklist das obras.
+Agrupa as tarefas por template, cliente ou mês do prazo e calcula, em uma única consulta com
+funções de janela do SQLite:
+    - taxa de conclusão no prazo (data_conclusao <= data_limite)
+    - distribuição do tempo de execução (dias entre data_base_calculo e data_conclusao): média, p50, p90
+    - atraso médio das tarefas concluídas fora do prazo e pendências já vencidas
+    - reiterações (tentativas_reiteracao) e notificações enviadas (historico_notificacoes)
+
+Os resultados ficam em cache por banco e agrupamento, associados a uma versão dos dados
+(PRAGMA data_version de uma conexão de monitoramento + mtime/tamanho do arquivo): enquanto
+ninguém gravar no banco, abrir a página de análise não refaz a consulta.
+Considera apenas o banco principal (obras do arquivo morto ficam de fora).
+
+EXEMPLO DE USO:
+    analise = obter_analise(database)
+    for linha in analise.obter('template'):
+        print(linha['rotulo'], linha['taxa_no_prazo'], linha['p90_dias'])
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+from app_logger import obter_logger
+from datas import SQL_DIA_EPOCA, hoje_dia
+from pool_conexoes import TIMEOUT_CONEXAO
+
+logger = obter_logger("analise_sla")
+
+# Agrupamentos disponíveis: chave -> (expressão do grupo, rótulo a partir de r.grupo, título).
+# O rótulo é resolvido depois da agregação (uma vez por grupo, não por tarefa)
+DIMENSOES: Dict[str, Tuple[str, str, str]] = {
+    'template': ('oc.template_id',
+                 "IFNULL((SELECT nome FROM checklist_templates WHERE id = r.grupo), 'Template ' || r.grupo)",
+                 'Tarefa'),
+    'cliente': ("IFNULL(o.cliente, '')", 'r.grupo', 'Cliente'),
+    'mes': ('substr(oc.data_limite, 1, 7)', 'r.grupo', 'Mês do prazo'),
+}
+
+# Tarefas sem prazo (bloqueadas ou sem data-base) não entram na análise
+SQL_ANALISE = f'''
+    WITH notificacoes AS (
+        SELECT tarefa_id, COUNT(*) AS enviadas
+        FROM historico_notificacoes
+        GROUP BY tarefa_id
+    ),
+    base AS (
+        SELECT {{grupo}} AS grupo,
+               oc.concluido,
+               oc.dia_limite,
+               oc.dia_conclusao - oc.dia_limite AS atraso,
+               oc.dia_conclusao - {SQL_DIA_EPOCA.format(coluna='oc.data_base_calculo')} AS duracao,
+               IFNULL(oc.tentativas_reiteracao, 0) AS reiteracoes,
+               IFNULL(n.enviadas, 0) AS notificacoes
+        FROM obra_checklist oc
+        JOIN obras o ON o.id = oc.obra_id
+        LEFT JOIN notificacoes n ON n.tarefa_id = oc.id
+        WHERE oc.dia_limite IS NOT NULL
+    ),
+    posicoes AS (
+        SELECT grupo, duracao,
+               ROW_NUMBER() OVER (PARTITION BY grupo ORDER BY duracao) AS posicao,
+               COUNT(*) OVER (PARTITION BY grupo) AS total
+        FROM base
+        WHERE duracao IS NOT NULL
+    ),
+    percentis AS (
+        -- Percentil pelo posto mais próximo: primeira posição >= ceil(total * p / 100)
+        SELECT grupo,
+               AVG(duracao) AS duracao_media,
+               MIN(CASE WHEN posicao * 100 >= total * 50 THEN duracao END) AS p50,
+               MIN(CASE WHEN posicao * 100 >= total * 90 THEN duracao END) AS p90
+        FROM posicoes
+        GROUP BY grupo
+    ),
+    resumo AS (
+        SELECT grupo,
+               COUNT(*) AS tarefas,
+               SUM(concluido = 1) AS concluidas,
+               IFNULL(SUM(concluido = 1 AND atraso <= 0), 0) AS no_prazo,
+               IFNULL(SUM(concluido = 1 AND atraso > 0), 0) AS fora_do_prazo,
+               SUM(concluido = 0 AND dia_limite < :hoje) AS vencidas,
+               AVG(CASE WHEN atraso > 0 THEN atraso END) AS atraso_medio,
+               SUM(reiteracoes) AS reiteracoes,
+               MAX(reiteracoes) AS reiteracoes_max,
+               SUM(notificacoes) AS notificacoes
+        FROM base
+        GROUP BY grupo
+    )
+    SELECT r.*,
+           {{rotulo}} AS rotulo,
+           ROUND(100.0 * r.no_prazo / NULLIF(r.no_prazo + r.fora_do_prazo, 0), 1) AS taxa_no_prazo,
+           ROUND(p.duracao_media, 1) AS duracao_media_dias,
+           p.p50 AS p50_dias,
+           p.p90 AS p90_dias,
+           ROUND(r.atraso_medio, 1) AS atraso_medio_dias,
+           RANK() OVER (ORDER BY r.fora_do_prazo + r.vencidas DESC) AS posicao_atraso
+    FROM resumo r
+    LEFT JOIN percentis p ON p.grupo = r.grupo
+    ORDER BY {{ordem}}
+'''
+
+# Ordenação de cada agrupamento (meses em ordem cronológica, demais pelos mais atrasados)
+ORDENS = {
+    'template': 'posicao_atraso, rotulo',
+    'cliente': 'posicao_atraso, rotulo',
+    'mes': 'r.grupo DESC',
+}
+
+# Análises por banco (compartilham o cache entre páginas abertas)
+_analises: Dict[str, 'AnaliseSLA'] = {}
+_analises_lock = threading.Lock()
+
+
+class AnaliseSLA:
+    """Calcula e mantém em cache as estatísticas de SLA de um banco"""
+
+    def __init__(self, database: 'Database'):
+        self.database = database
+        self.db_name = database.db_name
+        self.calculos = 0
+        # (dimensão, dia de hoje) -> (versão dos dados, linhas)
+        self._cache: Dict[Tuple[str, int], Tuple[Tuple, List[Dict]]] = {}
+        self._monitor: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def versao_dados(self) -> Tuple:
+        """Muda sempre que alguma conexão (deste ou de outro processo) grava no banco"""
+        assinatura = []
+        for caminho in (self.db_name, f'{self.db_name}-wal'):
+            try:
+                estado = os.stat(caminho)
+                assinatura.append((estado.st_mtime_ns, estado.st_size))
+            except FileNotFoundError:
+                assinatura.append(None)
+
+        with self._lock:
+            if self._monitor is None:
+                self._monitor = sqlite3.connect(self.db_name, timeout=TIMEOUT_CONEXAO, check_same_thread=False)
+            data_version = self._monitor.execute('PRAGMA data_version').fetchone()[0]
+        return (data_version, *assinatura)
+
+    def obter(self, dimensao: str) -> List[Dict]:
+        """Estatísticas por grupo da dimensão (template, cliente ou mes), do cache se os dados não mudaram"""
+        if dimensao not in DIMENSOES:
+            raise ValueError(f"Dimensão de análise desconhecida: {dimensao}")
+
+        chave = (dimensao, hoje_dia())
+        versao = self.versao_dados()
+        cache = self._cache.get(chave)
+        if cache and cache[0] == versao:
+            return cache[1]
+
+        linhas = self.calcular(dimensao, chave[1])
+        self._cache[chave] = (versao, linhas)
+        return linhas
+
+    def calcular(self, dimensao: str, hoje: int = None) -> List[Dict]:
+        """Executa a consulta de análise (sem cache)"""
+        grupo, rotulo, _ = DIMENSOES[dimensao]
+        sql = SQL_ANALISE.format(grupo=grupo, rotulo=rotulo, ordem=ORDENS[dimensao])
+        with self.database.conexao_leitura() as conn:
+            linhas = [dict(row) for row in conn.execute(sql, {'hoje': hoje_dia() if hoje is None else hoje})]
+        self.calculos += 1
+        logger.debug("Análise de SLA por %s: %s grupo(s)", dimensao, len(linhas))
+        return linhas
+
+    def fechar(self):
+        with self._lock:
+            if self._monitor is not None:
+                self._monitor.close()
+                self._monitor = None
+
+
+def obter_analise(database: 'Database') -> AnaliseSLA:
+    """Retorna a análise compartilhada do banco (criada na primeira chamada)"""
+    with _analises_lock:
+        analise = _analises.get(database.db_name)
+        if analise is None:
+            analise = _analises[database.db_name] = AnaliseSLA(database)
+        return analise
@@ -0,0 +1,133 @@
+"""
+Logging centralizado do AgendaObras.
+
+Os módulos obtêm seu logger com obter_logger("nome_modulo") e registram mensagens com
+formatação preguiçosa (logger.debug("Tarefa %s", tarefa_id)): o texto só é montado se o
+nível estiver habilitado. A gravação em disco é feita por uma thread própria
+(QueueHandler/QueueListener), então quem registra não espera pelo arquivo no Google Drive.
+
+Erros com traceback continuam indo para error_logger.log_error.
+
+CONFIGURAÇÃO (variáveis de ambiente):
+    AGENDAOBRAS_LOG_NIVEL   nível geral e, opcionalmente, níveis por módulo
+                            ex: "INFO" ou "WARNING,database=DEBUG,notificador_prazos=INFO"
+    AGENDAOBRAS_LOG_DIR     diretório dos arquivos de log (padrão: LOG_DIR)
+
+Sem configurar_logging(), apenas avisos e erros aparecem no console (padrão do logging).
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Dict, Optional, Tuple
+
+# Caminho padrão para salvar os logs de execução
+LOG_DIR = r"G:\Meu Drive\17 - MODELOS\PROGRAMAS\AgendaObras\app\logs"
+
+NOME_RAIZ = 'agendaobras'
+NIVEL_PADRAO = 'INFO'
+
+TAMANHO_MAXIMO_ARQUIVO = 5 * 1024 * 1024
+ARQUIVOS_BACKUP = 5
+
+FORMATO_ARQUIVO = '%(asctime)s %(levelname)-8s %(name)s: %(message)s'
+FORMATO_CONSOLE = '%(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def obter_logger(modulo: str) -> logging.Logger:
+    """Retorna o logger do módulo (ex: obter_logger("database") -> agendaobras.database)"""
+    return logging.getLogger(f'{NOME_RAIZ}.{modulo}')
+
+
+def interpretar_niveis(especificacao: str) -> Tuple[int, Dict[str, int]]:
+    """Converte "INFO,database=DEBUG" em (nível geral, {módulo: nível})"""
+    nivel_geral = logging.getLevelName(NIVEL_PADRAO)
+    por_modulo = {}
+    for parte in (especificacao or '').split(','):
+        parte = parte.strip()
+        if not parte:
+            continue
+        modulo, _, nome_nivel = parte.rpartition('=')
+        nivel = logging.getLevelName(nome_nivel.strip().upper())
+        if not isinstance(nivel, int):
+            raise ValueError(f"Nível de log inválido: {nome_nivel}")
+        if modulo:
+            por_modulo[modulo.strip()] = nivel
+        else:
+            nivel_geral = nivel
+    return nivel_geral, por_modulo
+
+
+def configurar_logging(niveis: str = None, diretorio: str = None, console: bool = True) -> logging.Logger:
+    """Configura níveis e handlers (console + arquivo rotativo via fila). Pode ser chamada de novo
+    para trocar a configuração.
+
+    Args:
+        niveis: especificação de níveis (padrão: AGENDAOBRAS_LOG_NIVEL ou INFO)
+        diretorio: diretório do arquivo agendaobras.log (padrão: AGENDAOBRAS_LOG_DIR ou LOG_DIR)
+        console: também exibe as mensagens no console
+    """
+    global _listener
+    encerrar_logging()
+
+    nivel_geral, por_modulo = interpretar_niveis(niveis or os.environ.get('AGENDAOBRAS_LOG_NIVEL', NIVEL_PADRAO))
+    raiz = logging.getLogger(NOME_RAIZ)
+    raiz.setLevel(nivel_geral)
+    raiz.propagate = False
+    for nome, logger in logging.Logger.manager.loggerDict.items():
+        if nome.startswith(f'{NOME_RAIZ}.') and isinstance(logger, logging.Logger):
+            logger.setLevel(logging.NOTSET)
+    for modulo, nivel in por_modulo.items():
+        obter_logger(modulo).setLevel(nivel)
+
+    destinos = []
+    if console:
+        handler_console = logging.StreamHandler(sys.stdout)
+        handler_console.setFormatter(logging.Formatter(FORMATO_CONSOLE))
+        destinos.append(handler_console)
+
+    handler_arquivo = _criar_handler_arquivo(diretorio or os.environ.get('AGENDAOBRAS_LOG_DIR', LOG_DIR))
+    if handler_arquivo:
+        destinos.append(handler_arquivo)
+
+    fila = queue.SimpleQueue()
+    raiz.addHandler(logging.handlers.QueueHandler(fila))
+    _listener = logging.handlers.QueueListener(fila, *destinos, respect_handler_level=True)
+    _listener.start()
+    return raiz
+
+
+def _criar_handler_arquivo(diretorio: str) -> Optional[logging.Handler]:
+    """Arquivo rotativo; se o diretório não estiver acessível, segue apenas com o console"""
+    try:
+        os.makedirs(diretorio, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            os.path.join(diretorio, 'agendaobras.log'), maxBytes=TAMANHO_MAXIMO_ARQUIVO,
+            backupCount=ARQUIVOS_BACKUP, encoding='utf-8', delay=True)
+    except OSError as e:
+        print(f"⚠️ Logs em arquivo desativados ({diretorio}): {e}")
+        return None
+    handler.setFormatter(logging.Formatter(FORMATO_ARQUIVO))
+    return handler
+
+
+def encerrar_logging():
+    """Esvazia a fila, fecha os arquivos e remove os handlers configurados"""
+    global _listener
+    raiz = logging.getLogger(NOME_RAIZ)
+    if _listener:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    for handler in list(raiz.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            raiz.removeHandler(handler)
+
+
+atexit.register(encerrar_logging)
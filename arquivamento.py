@@ -0,0 +1,218 @@
+"""
+Arquivo morto do sistema AgendaObras.
+Move obras concluídas há mais de DIAS_CARENCIA_OBRAS dias (com checklist e histórico) e o
+histórico de notificações mais antigo que DIAS_RETENCAO_HISTORICO dias para um segundo
+arquivo SQLite, anexado (ATTACH) às conexões do banco principal como "arquivo".
+No arquivo, o histórico é mantido por DIAS_EXPURGO_HISTORICO dias; depois é excluído e o
+arquivo compactado (VACUUM).
+
+As tabelas principais ficam apenas com os dados em uso, o que reduz as varreduras do
+notificador e da listagem. A leitura continua transparente: Database.obter_obra e
+obter_checklist recorrem ao arquivo quando a obra não está no banco principal, e a busca
+aceita incluir_arquivadas=True.
+
+USO (linha de comando):
+    python arquivamento.py
+    python arquivamento.py --dias 180 --historico 365 --expurgo 1825 --db "caminho/agendaobras.db"
+"""
+
+import argparse
+import datetime
+import os
+import sqlite3
+from typing import Dict, List, Optional
+from error_logger import log_error
+from app_logger import obter_logger
+from pool_conexoes import TIMEOUT_CONEXAO
+
+logger = obter_logger("arquivamento")
+
+# Nome do banco anexado às conexões (arquivo.obras, arquivo.obra_checklist...)
+ALIAS_ARQUIVO = 'arquivo'
+
+# Dias após a conclusão até a obra ir para o arquivo
+DIAS_CARENCIA_OBRAS = 90
+
+# Dias que o histórico de notificações permanece no banco principal
+DIAS_RETENCAO_HISTORICO = 365
+
+# Dias que o histórico de notificações permanece no arquivo morto (None = para sempre)
+DIAS_EXPURGO_HISTORICO = 5 * 365
+
+# Tabelas copiadas para o arquivo e índices usados na leitura (nome, tabela(colunas))
+TABELAS_ARQUIVO = ['obras', 'obra_checklist', 'historico_notificacoes']
+INDICES_ARQUIVO = [
+    ('idx_arquivo_obras_id', 'obras(id)', True),
+    ('idx_arquivo_checklist_id', 'obra_checklist(id)', True),
+    ('idx_arquivo_checklist_obra', 'obra_checklist(obra_id)', False),
+    ('idx_arquivo_historico_id', 'historico_notificacoes(id)', True),
+    ('idx_arquivo_historico_obra_data', 'historico_notificacoes(obra_id, data_envio)', False),
+]
+
+# Obras concluídas cuja conclusão (da obra ou, sem data, da última tarefa) é anterior a :limite
+SQL_OBRAS_ARQUIVAVEIS = '''
+    SELECT o.id FROM main.obras o
+    WHERE o.status = 'Concluída'
+    AND COALESCE(NULLIF(o.data_conclusao, ''),
+                 (SELECT MAX(oc.data_conclusao) FROM main.obra_checklist oc WHERE oc.obra_id = o.id),
+                 o.data_criacao) < :limite
+'''
+
+
+def caminho_arquivo(db_name: str) -> str:
+    """Arquivo morto ao lado do banco principal (agendaobras.db -> agendaobras_arquivo.db)"""
+    base, extensao = os.path.splitext(db_name)
+    return f'{base}_arquivo{extensao or ".db"}'
+
+
+def colunas_tabela(conn, tabela: str, esquema: str = 'main') -> List[str]:
+    """Colunas armazenadas da tabela (ignora colunas geradas, que não aceitam INSERT)"""
+    return [row[1] for row in conn.execute(f'PRAGMA {esquema}.table_xinfo({tabela})') if row[6] == 0]
+
+
+def preparar_arquivo(conn):
+    """Cria as tabelas do arquivo com as colunas atuais do banco principal.
+    Colunas acrescentadas por migrações posteriores são adicionadas ao arquivo.
+    """
+    for tabela in TABELAS_ARQUIVO:
+        colunas = colunas_tabela(conn, tabela)
+        existentes = colunas_tabela(conn, tabela, ALIAS_ARQUIVO)
+        if not existentes:
+            conn.execute(f'''
+                CREATE TABLE {ALIAS_ARQUIVO}.{tabela} AS
+                SELECT {', '.join(colunas)} FROM main.{tabela} WHERE 0
+            ''')
+            continue
+        for coluna in colunas:
+            if coluna not in existentes:
+                conn.execute(f'ALTER TABLE {ALIAS_ARQUIVO}.{tabela} ADD COLUMN {coluna}')
+
+    for nome, definicao, unico in INDICES_ARQUIVO:
+        conn.execute(f'CREATE {"UNIQUE " if unico else ""}INDEX IF NOT EXISTS '
+                     f'{ALIAS_ARQUIVO}.{nome} ON {definicao}')
+
+
+class ArquivadorObras:
+    """Move obras concluídas e histórico antigo para o arquivo morto"""
+
+    def __init__(self, database: 'Database', dias_carencia: int = DIAS_CARENCIA_OBRAS,
+                 dias_historico: int = DIAS_RETENCAO_HISTORICO,
+                 dias_expurgo: Optional[int] = DIAS_EXPURGO_HISTORICO):
+        self.database = database
+        self.dias_carencia = dias_carencia
+        self.dias_historico = dias_historico
+        self.dias_expurgo = dias_expurgo
+
+    def arquivar(self, hoje: datetime.date = None) -> Dict[str, int]:
+        """Executa o arquivamento em uma única transação.
+
+        Returns:
+            {'obras': n, 'itens': n, 'historico': n} linhas movidas para o arquivo
+        """
+        hoje = hoje or datetime.date.today()
+        limite_obras = (hoje - datetime.timedelta(days=self.dias_carencia)).strftime('%Y-%m-%d')
+        limite_historico = (hoje - datetime.timedelta(days=self.dias_historico)).strftime('%Y-%m-%d')
+
+        def gravar(conn):
+            preparar_arquivo(conn)
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS obras_arquivar (id INTEGER PRIMARY KEY)')
+            conn.execute('DELETE FROM temp.obras_arquivar')
+            conn.execute(f'INSERT INTO temp.obras_arquivar {SQL_OBRAS_ARQUIVAVEIS}', {'limite': limite_obras})
+
+            filtros = {
+                'obras': 'id IN (SELECT id FROM temp.obras_arquivar)',
+                'obra_checklist': 'obra_id IN (SELECT id FROM temp.obras_arquivar)',
+                'historico_notificacoes': ('obra_id IN (SELECT id FROM temp.obras_arquivar) '
+                                           'OR data_envio < :limite_historico'),
+            }
+            params = {'limite_historico': limite_historico}
+
+            movidas = {}
+            for tabela in TABELAS_ARQUIVO:
+                colunas = ', '.join(colunas_tabela(conn, tabela))
+                conn.execute(f'''
+                    INSERT OR REPLACE INTO {ALIAS_ARQUIVO}.{tabela} ({colunas})
+                    SELECT {colunas} FROM main.{tabela} WHERE {filtros[tabela]}
+                ''', params)
+            # Obras antes do checklist: os triggers de resumo ignoram itens de obras já removidas
+            for tabela in TABELAS_ARQUIVO:
+                movidas[tabela] = conn.execute(
+                    f'DELETE FROM main.{tabela} WHERE {filtros[tabela]}', params
+                ).rowcount
+            conn.execute('DELETE FROM temp.obras_arquivar')
+
+            return {'obras': movidas['obras'], 'itens': movidas['obra_checklist'],
+                    'historico': movidas['historico_notificacoes']}
+
+        try:
+            self.database.anexar_arquivo()
+            resultado = self.database._escrever(gravar)
+        except Exception as e:
+            log_error(e, "arquivamento", "Arquivar obras concluídas e histórico")
+            raise
+
+        if any(resultado.values()):
+            logger.info("🗄️ Arquivadas %s obra(s), %s item(ns) de checklist e %s registro(s) de histórico",
+                        resultado['obras'], resultado['itens'], resultado['historico'])
+        return resultado
+
+    def expurgar_historico(self, hoje: datetime.date = None) -> int:
+        """Exclui do arquivo o histórico mais antigo que dias_expurgo e compacta o arquivo.
+        Retorna a quantidade de registros excluídos.
+        """
+        if self.dias_expurgo is None or not self.database.arquivo_anexado:
+            return 0
+
+        hoje = hoje or datetime.date.today()
+        limite = (hoje - datetime.timedelta(days=self.dias_expurgo)).strftime('%Y-%m-%d')
+
+        def gravar(conn):
+            return conn.execute(
+                f'DELETE FROM {ALIAS_ARQUIVO}.historico_notificacoes WHERE data_envio < ?', (limite,)
+            ).rowcount
+
+        try:
+            excluidos = self.database._escrever(gravar)
+            if excluidos:
+                self.compactar_arquivo()
+                logger.info("🧹 %s registro(s) de histórico expurgado(s) do arquivo", excluidos)
+        except Exception as e:
+            log_error(e, "arquivamento", "Expurgar histórico do arquivo")
+            raise
+        return excluidos
+
+    def compactar_arquivo(self):
+        """Devolve ao disco o espaço liberado no arquivo. VACUUM não pode rodar dentro de
+        transação, por isso usa uma conexão própria em vez da thread de escrita."""
+        conn = sqlite3.connect(self.database.caminho_arquivo, timeout=TIMEOUT_CONEXAO)
+        try:
+            conn.execute('VACUUM')
+        finally:
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move obras concluídas e histórico antigo para o arquivo morto')
+    parser.add_argument('--dias', type=int, default=DIAS_CARENCIA_OBRAS,
+                        help='Dias após a conclusão até arquivar a obra')
+    parser.add_argument('--historico', type=int, default=DIAS_RETENCAO_HISTORICO,
+                        help='Dias de histórico de notificações mantidos no banco principal')
+    parser.add_argument('--expurgo', type=int, default=DIAS_EXPURGO_HISTORICO,
+                        help='Dias de histórico de notificações mantidos no arquivo morto')
+    parser.add_argument('--db', help='Arquivo do banco de dados (padrão: banco configurado em database.py)')
+    args = parser.parse_args()
+
+    from database import Database, CAMINHO_DB
+    database = Database(args.db or CAMINHO_DB)
+
+    arquivador = ArquivadorObras(database, args.dias, args.historico, args.expurgo)
+    resultado = arquivador.arquivar()
+    print(f"✅ {resultado['obras']} obra(s), {resultado['itens']} item(ns) e "
+          f"{resultado['historico']} registro(s) de histórico arquivados em {database.caminho_arquivo}")
+    excluidos = arquivador.expurgar_historico()
+    if excluidos:
+        print(f"🧹 {excluidos} registro(s) de histórico expurgado(s) do arquivo")
+
+
+if __name__ == '__main__':
+    main()
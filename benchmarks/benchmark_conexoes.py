@@ -0,0 +1,132 @@
+"""
+Benchmark de latência por chamada: conexão aberta a cada operação (comportamento
+antigo do Database.get_connection) versus conexões reutilizadas pelo pool.
+
+USO:
+    python benchmarks/benchmark_conexoes.py
+    python benchmarks/benchmark_conexoes.py --obras 5000 --repeticoes 500
+    python benchmarks/benchmark_conexoes.py --caminho "G:\\Meu Drive\\...\\bench.db"
+
+Por padrão cria um banco temporário com 3000 obras (e seus checklists). Use
+--caminho para medir em outro disco (ex: o Google Drive, onde a diferença é maior).
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+
+def popular_banco(db: Database, total_obras: int):
+    """Insere obras sintéticas com checklist completo em uma única transação"""
+    with db.conexao() as conn:
+        templates = conn.execute('SELECT * FROM checklist_templates ORDER BY ordem').fetchall()
+        hoje = datetime.date.today()
+
+        obras = []
+        for i in range(total_obras):
+            data_inicio = (hoje + datetime.timedelta(days=random.randint(-180, 90))).strftime('%Y-%m-%d')
+            obras.append((f'Obra Benchmark {i:05d}', f'Cliente {i % 50:02d}',
+                          round(random.uniform(50000, 500000), 2), data_inicio, 'Em Andamento'))
+        conn.executemany('''
+            INSERT INTO obras (nome_contrato, cliente, valor_contrato, data_inicio, status)
+            VALUES (?, ?, ?, ?, ?)
+        ''', obras)
+
+        obra_ids = [row['id'] for row in conn.execute('SELECT id FROM obras')]
+        itens = []
+        for obra_id in obra_ids:
+            for template in templates:
+                itens.append((obra_id, template['id'], template['nome'], template['prazo_dias'],
+                              template['tipo'], template['base_calculo'], template['recorrencia']))
+        conn.executemany('''
+            INSERT INTO obra_checklist (obra_id, template_id, descricao, prazo_dias, tipo, base_calculo, recorrencia)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', itens)
+
+    return obra_ids
+
+
+def conexao_antiga(db_name: str) -> sqlite3.Connection:
+    """Reproduz o Database.get_connection anterior ao pool (connect + PRAGMAs por chamada)"""
+    conn = sqlite3.connect(db_name, timeout=30.0, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA busy_timeout=30000')
+    return conn
+
+
+def operacao_antiga(db_name: str, obra_id: int):
+    conn = conexao_antiga(db_name)
+    conn.execute('SELECT * FROM obras WHERE id = ?', (obra_id,)).fetchone()
+    conn.execute('SELECT * FROM obra_checklist WHERE obra_id = ? ORDER BY id', (obra_id,)).fetchall()
+    conn.close()
+
+
+def operacao_pool(db: Database, obra_id: int):
+    with db.conexao() as conn:
+        conn.execute('SELECT * FROM obras WHERE id = ?', (obra_id,)).fetchone()
+        conn.execute('SELECT * FROM obra_checklist WHERE obra_id = ? ORDER BY id', (obra_id,)).fetchall()
+
+
+def medir(funcao, obra_ids, repeticoes: int):
+    """Executa a operação N vezes e retorna as latências em milissegundos"""
+    latencias = []
+    for _ in range(repeticoes):
+        obra_id = random.choice(obra_ids)
+        inicio = time.perf_counter()
+        funcao(obra_id)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return latencias
+
+
+def resumo(latencias):
+    ordenadas = sorted(latencias)
+    p95 = ordenadas[int(len(ordenadas) * 0.95) - 1]
+    return f"média {statistics.mean(latencias):7.3f} ms | p50 {statistics.median(latencias):7.3f} ms | p95 {p95:7.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de conexões do AgendaObras')
+    parser.add_argument('--obras', type=int, default=3000, help='Quantidade de obras sintéticas')
+    parser.add_argument('--repeticoes', type=int, default=300, help='Chamadas medidas por cenário')
+    parser.add_argument('--caminho', help='Arquivo de banco a criar (padrão: arquivo temporário)')
+    args = parser.parse_args()
+
+    if args.caminho:
+        db_name = args.caminho
+    else:
+        db_name = os.path.join(tempfile.mkdtemp(prefix='agendaobras_bench_'), 'bench.db')
+
+    print(f"📂 Banco de benchmark: {db_name}")
+    db = Database(db_name)
+    print(f"🏗️ Populando {args.obras} obra(s)...")
+    obra_ids = popular_banco(db, args.obras)
+
+    # Aquecimento (cache do sistema de arquivos e do pool)
+    medir(lambda o: operacao_antiga(db_name, o), obra_ids, 20)
+    medir(lambda o: operacao_pool(db, o), obra_ids, 20)
+
+    antes = medir(lambda o: operacao_antiga(db_name, o), obra_ids, args.repeticoes)
+    depois = medir(lambda o: operacao_pool(db, o), obra_ids, args.repeticoes)
+
+    print()
+    print("=" * 70)
+    print(f"Antes  (connect por chamada): {resumo(antes)}")
+    print(f"Depois (pool de conexões):    {resumo(depois)}")
+    print(f"Ganho médio: {statistics.mean(antes) / statistics.mean(depois):.1f}x")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
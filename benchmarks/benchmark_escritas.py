@@ -0,0 +1,107 @@
+"""
+Benchmark de latência ao marcar itens do checklist enquanto o notificador grava alertas:
+escritas concorrentes em conexões próprias (comportamento anterior, disputando o lock do
+SQLite) versus escritas serializadas pela thread de escrita (escritor_banco).
+
+USO:
+    python benchmarks/benchmark_escritas.py
+    python benchmarks/benchmark_escritas.py --obras 2000 --repeticoes 300 --escritores 3
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from benchmark_conexoes import popular_banco, resumo
+
+
+def gravar_alerta(conn, obra_id: int, tarefa_id: int):
+    """Mesma escrita do notificador por tarefa alertada (controle + histórico)"""
+    agora = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    conn.execute('''
+        UPDATE obra_checklist SET ultima_notificacao = ?, status_notificacao = 'alerta' WHERE id = ?
+    ''', (agora, tarefa_id))
+    conn.execute('''
+        INSERT INTO historico_notificacoes (obra_id, tarefa_id, tipo_notificacao, data_envio, destinatarios)
+        VALUES (?, ?, 'tipo_b', ?, 'bench@exemplo.com')
+    ''', (obra_id, tarefa_id, agora))
+
+
+def alternar_item(conn, item_id: int):
+    conn.execute('UPDATE obra_checklist SET concluido = 1 - concluido WHERE id = ?', (item_id,))
+
+
+def carga_notificador(db: Database, itens, parar: threading.Event, serializado: bool):
+    while not parar.is_set():
+        obra_id, item_id = random.choice(itens)
+        if serializado:
+            db.enviar_escrita(gravar_alerta, obra_id, item_id).result()
+        else:
+            with db.conexao() as conn:
+                gravar_alerta(conn, obra_id, item_id)
+
+
+def medir(db: Database, itens, repeticoes: int, escritores: int, serializado: bool):
+    """Latência (ms) de cada marcação com `escritores` threads gravando alertas em paralelo"""
+    parar = threading.Event()
+    threads = [threading.Thread(target=carga_notificador, args=(db, itens, parar, serializado), daemon=True)
+               for _ in range(escritores)]
+    for thread in threads:
+        thread.start()
+
+    latencias = []
+    for _ in range(repeticoes):
+        _, item_id = random.choice(itens)
+        inicio = time.perf_counter()
+        if serializado:
+            db.enviar_escrita(alternar_item, item_id).result()
+        else:
+            with db.conexao() as conn:
+                alternar_item(conn, item_id)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        time.sleep(0.002)  # intervalo entre cliques
+
+    parar.set()
+    for thread in threads:
+        thread.join()
+    return latencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de escritas concorrentes do AgendaObras')
+    parser.add_argument('--obras', type=int, default=1000, help='Quantidade de obras sintéticas')
+    parser.add_argument('--repeticoes', type=int, default=200, help='Marcações medidas por cenário')
+    parser.add_argument('--escritores', type=int, default=2, help='Threads simulando o notificador')
+    parser.add_argument('--caminho', help='Arquivo de banco a criar (padrão: arquivo temporário)')
+    args = parser.parse_args()
+
+    db_name = args.caminho or os.path.join(tempfile.mkdtemp(prefix='agendaobras_bench_'), 'bench.db')
+    print(f"📂 Banco de benchmark: {db_name}")
+    db = Database(db_name)
+    print(f"🏗️ Populando {args.obras} obra(s)...")
+    popular_banco(db, args.obras)
+    with db.conexao() as conn:
+        itens = [(row['obra_id'], row['id']) for row in conn.execute('SELECT obra_id, id FROM obra_checklist')]
+
+    antes = medir(db, itens, args.repeticoes, args.escritores, serializado=False)
+    depois = medir(db, itens, args.repeticoes, args.escritores, serializado=True)
+
+    print()
+    print("=" * 70)
+    print(f"Antes  (conexões concorrentes): {resumo(antes)}")
+    print(f"Depois (thread de escrita):     {resumo(depois)}")
+    print(f"Transações da thread de escrita: {db.escritor.transacoes}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
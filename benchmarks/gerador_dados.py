@@ -0,0 +1,253 @@
+"""
+Gerador de bancos sintéticos do AgendaObras para testes de carga e benchmarks.
+Cria obras em todas as fases do ciclo de vida, com checklist coerente com as regras do
+sistema (criado por Database.criar_obras_em_lote e recalculado por recalcular_checklists),
+instâncias mensais de MEDIÇÃO/CONFIRMAÇÃO DE MEDIÇÃO e histórico de notificações.
+
+Fases (proporção padrão em FASES):
+    acionada      só data de acionamento; nenhuma tarefa concluída
+    em_analise    retorno do projeto concluído, análise pendente
+    assinada      contrato assinado, aguardando AIO/início
+    em_execucao   obra iniciada: tarefas mensais desde o início, algumas atrasadas
+    concluida     status 'Concluída', todas as tarefas concluídas
+
+USO:
+    python benchmarks/gerador_dados.py --obras 5000 --caminho bench_5k.db
+    python benchmarks/gerador_dados.py --obras 50000 --caminho bench_50k.db --semente 7
+"""
+
+import argparse
+import calendar
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, Iterator, List, Tuple
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+# Fase -> (peso, intervalo de idade da obra em dias desde o acionamento)
+FASES: Dict[str, Tuple[float, Tuple[int, int]]] = {
+    'acionada': (0.10, (0, 10)),
+    'em_analise': (0.15, (5, 30)),
+    'assinada': (0.20, (20, 60)),
+    'em_execucao': (0.35, (60, 540)),
+    'concluida': (0.20, (240, 1080)),
+}
+
+# Dias após o acionamento em que cada tarefa (ordem do template) costuma ser concluída
+DIAS_CONCLUSAO = {1: 2, 2: 5, 3: 7, 4: 9, 5: 12, 6: 14, 7: 22, 8: 18, 9: 18, 10: 21, 11: 24, 12: 26,
+                  13: 28, 14: 32, 15: 30, 16: 34}
+
+# Tarefas concluídas em cada fase (ordens dos templates)
+CONCLUIDAS_POR_FASE = {
+    'acionada': [],
+    'em_analise': [1],
+    'assinada': [1, 2, 3, 5],
+    'em_execucao': list(range(1, 17)),
+    'concluida': list(range(1, 17)),
+}
+
+TIPOS_NOTIFICACAO = ['reiteracao_1', 'reiteracao_2', 'reiteracao_3', 'critico_atrasado', 'tipo_b']
+SERVICOS = ['Reforma', 'Manutenção predial', 'Climatização', 'Acessibilidade', 'Cobertura', 'Elétrica']
+STATUS_POR_FASE = {
+    'acionada': 'Não Iniciada',
+    'em_analise': 'Não Iniciada',
+    'assinada': 'Não Iniciada',
+    'em_execucao': 'Em Andamento',
+    'concluida': 'Concluída',
+}
+
+
+def _iso(data: datetime.date) -> str:
+    return data.strftime('%Y-%m-%d')
+
+
+def _meses(inicio: datetime.date, fim: datetime.date) -> Iterator[Tuple[int, int]]:
+    """(ano, mês) de inicio até fim, inclusive"""
+    ano, mes = inicio.year, inicio.month
+    while (ano, mes) <= (fim.year, fim.month):
+        yield ano, mes
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+
+
+def _dia_do_mes(ano: int, mes: int, dia: int) -> datetime.date:
+    return datetime.date(ano, mes, min(dia, calendar.monthrange(ano, mes)[1]))
+
+
+class GeradorDados:
+    """Gera obras sintéticas reproduzíveis (mesma semente e mesma data -> mesmo banco)"""
+
+    def __init__(self, db: Database, semente: int = 42, hoje: datetime.date = None,
+                 historico_por_obra: int = 6):
+        self.db = db
+        self.rng = random.Random(semente)
+        self.hoje = hoje or datetime.date.today()
+        self.historico_por_obra = historico_por_obra
+
+    def _sortear_fase(self) -> str:
+        return self.rng.choices(list(FASES), weights=[peso for peso, _ in FASES.values()])[0]
+
+    def _planejar_obra(self, indice: int) -> Dict:
+        """Dados da obra e linha do tempo (datas de conclusão por ordem de template)"""
+        fase = self._sortear_fase()
+        idade_min, idade_max = FASES[fase][1]
+        acionamento = self.hoje - datetime.timedelta(days=self.rng.randint(idade_min, idade_max))
+
+        conclusoes = {}
+        for ordem in CONCLUIDAS_POR_FASE[fase]:
+            data = acionamento + datetime.timedelta(days=DIAS_CONCLUSAO[ordem] + self.rng.randint(0, 3))
+            # Em execução, ~10% das tarefas não essenciais ficam pendentes (geram alertas)
+            if fase == 'em_execucao' and ordem not in (1, 2, 3, 5, 6) and self.rng.random() < 0.1:
+                continue
+            conclusoes[ordem] = min(data, self.hoje)
+
+        obra = {
+            'nome_contrato': f'Obra Sintética {indice:06d}',
+            'cliente': f'Cliente {self.rng.randint(1, 200):03d}',
+            'valor_contrato': round(self.rng.uniform(20000, 900000), 2),
+            'status': STATUS_POR_FASE[fase],
+            'servico': self.rng.choice(SERVICOS),
+            'prefixo_agencia': f'{self.rng.randint(1, 9999):04d}',
+            'pedido_sap': f'45{self.rng.randint(0, 99999999):08d}',
+            'data_acionamento': _iso(acionamento),
+            'data_inicio': None,
+        }
+        if 5 in conclusoes:
+            obra['data_assinatura'] = _iso(conclusoes[5])
+        if 6 in conclusoes:
+            obra['data_aio'] = _iso(min(conclusoes[6] + datetime.timedelta(days=7), self.hoje))
+
+        inicio = fim = None
+        if fase == 'assinada':
+            inicio = self.hoje + datetime.timedelta(days=self.rng.randint(10, 60))
+        elif fase in ('em_execucao', 'concluida'):
+            inicio = min(acionamento + datetime.timedelta(days=45), self.hoje)
+            if fase == 'concluida':
+                fim = min(inicio + datetime.timedelta(days=self.rng.randint(60, 300)),
+                          self.hoje - datetime.timedelta(days=1))
+                obra['data_conclusao'] = _iso(fim)
+        if inicio:
+            obra['data_inicio'] = _iso(inicio)
+
+        return {'fase': fase, 'obra': obra, 'conclusoes': conclusoes, 'inicio': inicio, 'fim': fim}
+
+    def gerar(self, total_obras: int) -> Dict:
+        """Cria as obras e seus dados derivados. Retorna contagens e duração"""
+        inicio_geracao = time.perf_counter()
+        planos = [self._planejar_obra(indice) for indice in range(total_obras)]
+
+        resultado = self.db.criar_obras_em_lote(plano['obra'] for plano in planos)
+        if resultado['erros']:
+            raise ValueError(f"Obras sintéticas inválidas: {resultado['erros'][:3]}")
+        for plano, obra_id in zip(planos, resultado['criadas']):
+            plano['obra_id'] = obra_id
+
+        estatisticas = self.db._escrever(self._gravar_estado, planos)
+        self.db.recalcular_checklists()
+
+        fases = {fase: 0 for fase in FASES}
+        for plano in planos:
+            fases[plano['fase']] += 1
+        estatisticas.update({
+            'obras': total_obras,
+            'fases': fases,
+            'segundos': round(time.perf_counter() - inicio_geracao, 2),
+        })
+        return estatisticas
+
+    def _gravar_estado(self, conn, planos: List[Dict]) -> Dict:
+        """Conclui tarefas, cria instâncias mensais e histórico (executado na thread de escrita)"""
+        templates = {row['ordem']: dict(row) for row in conn.execute('SELECT * FROM checklist_templates')}
+        ordem_por_template = {template['id']: ordem for ordem, template in templates.items()}
+        itens_por_obra: Dict[int, List[Tuple[int, int]]] = {}
+        for row in conn.execute('SELECT id, obra_id, template_id FROM obra_checklist'):
+            itens_por_obra.setdefault(row['obra_id'], []).append((row['id'], row['template_id']))
+
+        conclusoes, mensais, historico = [], [], []
+        mensais_templates = [template for template in templates.values() if template['recorrencia'] == 'mensal']
+        for plano in planos:
+            itens = itens_por_obra.get(plano['obra_id'], [])
+            for item_id, template_id in itens:
+                data = plano['conclusoes'].get(ordem_por_template.get(template_id))
+                if data:
+                    conclusoes.append((_iso(data), item_id))
+
+            if plano['inicio'] and plano['inicio'] <= self.hoje:
+                mensais.extend(self._instancias_mensais(plano, mensais_templates))
+
+            if plano['fase'] != 'acionada' and itens:
+                historico.extend(self._historico(plano, itens))
+
+        conn.executemany('''
+            UPDATE obra_checklist SET concluido = 1, data_conclusao = ?, bloqueado = 0 WHERE id = ?
+        ''', conclusoes)
+        conn.executemany('''
+            INSERT INTO obra_checklist
+            (obra_id, template_id, descricao, prazo_dias, data_limite, tipo, base_calculo, data_base_calculo,
+             bloqueado, recorrencia, mes_referencia, status_notificacao, concluido, data_conclusao)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, 'mensal', ?, 'pendente', ?, ?)
+        ''', mensais)
+        conn.executemany('''
+            INSERT INTO historico_notificacoes (obra_id, tarefa_id, tipo_notificacao, data_envio, destinatarios, sucesso)
+            VALUES (?, ?, ?, ?, 'equipe@exemplo.com', ?)
+        ''', historico)
+
+        return {'itens_concluidos': len(conclusoes), 'instancias_mensais': len(mensais), 'historico': len(historico)}
+
+    def _instancias_mensais(self, plano: Dict, templates: List[Dict]) -> Iterator[tuple]:
+        """MEDIÇÃO/CONFIRMAÇÃO de cada mês desde o início (até a conclusão ou o mês atual)"""
+        fim = plano['fim'] or self.hoje
+        for ano, mes in _meses(plano['inicio'], fim):
+            for template in templates:
+                data_limite = _dia_do_mes(ano, mes, template['dia_referencia_mensal'] or 1)
+                concluida = plano['fase'] == 'concluida' or (data_limite < self.hoje and self.rng.random() < 0.9)
+                data_conclusao = _iso(min(data_limite, self.hoje)) if concluida else None
+                yield (plano['obra_id'], template['id'], f"{template['nome']} - {mes:02d}/{ano}",
+                       template['prazo_dias'], _iso(data_limite), template['tipo'], template['base_calculo'],
+                       plano['obra']['data_inicio'], f'{ano}-{mes:02d}', 1 if concluida else 0, data_conclusao)
+
+    def _historico(self, plano: Dict, itens: List[Tuple[int, int]]) -> Iterator[tuple]:
+        acionamento = datetime.datetime.strptime(plano['obra']['data_acionamento'], '%Y-%m-%d').date()
+        dias_vida = max((min(plano['fim'] or self.hoje, self.hoje) - acionamento).days, 1)
+        for _ in range(self.rng.randint(0, 2 * self.historico_por_obra)):
+            data = acionamento + datetime.timedelta(days=self.rng.randint(0, dias_vida))
+            item_id, _ = self.rng.choice(itens)
+            yield (plano['obra_id'], item_id, self.rng.choice(TIPOS_NOTIFICACAO),
+                   f'{_iso(data)} {self.rng.randint(7, 18):02d}:00:00', 0 if self.rng.random() < 0.02 else 1)
+
+
+def gerar_banco(db_name: str, total_obras: int, semente: int = 42, hoje: datetime.date = None,
+                historico_por_obra: int = 6) -> Dict:
+    """Cria (ou completa) o banco db_name com total_obras obras sintéticas"""
+    db = Database(db_name)
+    return GeradorDados(db, semente, hoje, historico_por_obra).gerar(total_obras)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera um banco sintético do AgendaObras')
+    parser.add_argument('--obras', type=int, default=5000, help='Quantidade de obras sintéticas')
+    parser.add_argument('--caminho', help='Arquivo de banco a criar (padrão: arquivo temporário)')
+    parser.add_argument('--semente', type=int, default=42, help='Semente aleatória (mesma semente = mesmo banco)')
+    parser.add_argument('--historico', type=int, default=6, help='Média de notificações por obra')
+    args = parser.parse_args()
+
+    db_name = args.caminho or os.path.join(tempfile.mkdtemp(prefix='agendaobras_dados_'), 'sintetico.db')
+    print(f"📂 Banco sintético: {db_name}")
+    estatisticas = gerar_banco(db_name, args.obras, args.semente, historico_por_obra=args.historico)
+
+    print(f"✅ {estatisticas['obras']} obra(s) em {estatisticas['segundos']}s")
+    for fase, total in estatisticas['fases'].items():
+        print(f"   {fase:<12} {total}")
+    print(f"   {estatisticas['itens_concluidos']} tarefa(s) concluída(s), "
+          f"{estatisticas['instancias_mensais']} instância(s) mensal(is), "
+          f"{estatisticas['historico']} notificação(ões) no histórico")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+Suíte de benchmarks do banco de dados do AgendaObras.
+Mede, sobre um banco sintético (benchmarks/gerador_dados.py), as operações que definem a
+experiência do usuário e a carga do notificador:
+
+    listar_obras            dashboard completo
+    obter_checklist         abrir os detalhes de uma obra
+    marcar_item_checklist   clique no checkbox (marca e desmarca)
+    recalcular_checklist    alteração de data crítica (data de início)
+    gerar_tarefas_mensais   verificação diária das tarefas recorrentes
+    verificar_prazos        varredura do notificador (envio de e-mail simulado)
+
+O resultado é um relatório JSON (versão, ambiente, tamanho do banco e estatísticas por
+operação, em ms) para comparar versões: --comparar mostra a variação de cada operação
+em relação a um relatório anterior.
+
+USO:
+    python benchmarks/suite_banco.py --obras 5000 --saida bench_1.2.0.json
+    python benchmarks/suite_banco.py --caminho bench_50k.db --comparar bench_1.2.0.json
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import VERSION, EmailConfig
+from database import Database
+from email_service import EmailService
+from gerador_tarefas_recorrentes import GeradorTarefasRecorrentes
+from notificador_prazos import NotificadorPrazos
+from gerador_dados import gerar_banco
+
+
+class EmailServiceSimulado(EmailService):
+    """Monta os e-mails normalmente, mas não conecta ao servidor SMTP"""
+
+    def __init__(self, database: Database):
+        self.database = database
+        self.config = EmailConfig()
+        self.config.email_destinatarios = ['bench@exemplo.com']
+        self.config.email_critico = ''
+
+    def enviar_email(self, destinatario, assunto: str, corpo_html: str) -> Tuple[bool, str]:
+        return True, "Simulado"
+
+
+def estatisticas(latencias: List[float]) -> Dict[str, float]:
+    """Média, percentis e extremos (ms) de uma lista de latências"""
+    ordenadas = sorted(latencias)
+    return {
+        'repeticoes': len(ordenadas),
+        'media_ms': round(statistics.mean(ordenadas), 3),
+        'p50_ms': round(statistics.median(ordenadas), 3),
+        'p95_ms': round(ordenadas[math.ceil(len(ordenadas) * 0.95) - 1], 3),
+        'min_ms': round(ordenadas[0], 3),
+        'max_ms': round(ordenadas[-1], 3),
+    }
+
+
+class SuiteBanco:
+    """Executa cada operação várias vezes e coleta as latências"""
+
+    def __init__(self, db: Database, semente: int = 42):
+        self.db = db
+        self.rng = random.Random(semente)
+        self.notificador = NotificadorPrazos(db, EmailServiceSimulado(db), GeradorTarefasRecorrentes(db))
+
+        with db.conexao() as conn:
+            self.obras = [row['id'] for row in conn.execute('SELECT id FROM obras')]
+            self.obras_em_execucao = [row['id'] for row in conn.execute('''
+                SELECT id FROM obras WHERE status = 'Em Andamento' AND data_inicio IS NOT NULL
+            ''')] or self.obras
+            self.itens = [row['id'] for row in conn.execute('''
+                SELECT id FROM obra_checklist WHERE bloqueado = 0 AND concluido = 0
+            ''')]
+
+    def _medir(self, operacao: Callable, repeticoes: int, preparar: Callable = None) -> List[float]:
+        latencias = []
+        for _ in range(repeticoes):
+            argumentos = preparar() if preparar else ()
+            inicio = time.perf_counter()
+            operacao(*argumentos)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        return latencias
+
+    def listar_obras(self, repeticoes: int) -> List[float]:
+        return self._medir(self.db.listar_obras, repeticoes)
+
+    def obter_checklist(self, repeticoes: int) -> List[float]:
+        return self._medir(self.db.obter_checklist, repeticoes, lambda: (self.rng.choice(self.obras),))
+
+    def marcar_item_checklist(self, repeticoes: int) -> List[float]:
+        def marcar_e_desmarcar(item_id):
+            self.db.marcar_item_checklist(item_id, True)
+            self.db.marcar_item_checklist(item_id, False)
+
+        # Cada repetição são dois cliques: a latência registrada é a média dos dois
+        return [latencia / 2 for latencia in
+                self._medir(marcar_e_desmarcar, repeticoes, lambda: (self.rng.choice(self.itens),))]
+
+    def recalcular_checklist(self, repeticoes: int) -> List[float]:
+        def preparar():
+            obra_id = self.rng.choice(self.obras_em_execucao)
+            nova_data = (datetime.date.today() - datetime.timedelta(days=self.rng.randint(30, 400))).strftime('%Y-%m-%d')
+            return obra_id, 'data_inicio', nova_data
+
+        return self._medir(self.db.recalcular_checklist, repeticoes, preparar)
+
+    def gerar_tarefas_mensais(self, repeticoes: int) -> List[float]:
+        return self._medir(self.notificador.gerador_recorrentes.gerar_tarefas_mensais, repeticoes)
+
+    def verificar_prazos(self, repeticoes: int) -> List[float]:
+        def reiniciar_notificacoes():
+            # Fora da medição: cada repetição encontra as tarefas como no primeiro envio do dia
+            self.db._escrever(lambda conn: conn.execute('''
+                UPDATE obra_checklist SET ultima_notificacao = NULL, tentativas_reiteracao = 0
+                WHERE concluido = 0 AND ultima_notificacao IS NOT NULL
+            '''))
+            return ()
+
+        def verificar():
+            self.notificador._verificar_prazos()
+            self.db._escrever(lambda conn: None)  # Inclui as gravações assíncronas do envio
+
+        return self._medir(verificar, repeticoes, reiniciar_notificacoes)
+
+    def executar(self, repeticoes: int, repeticoes_pesadas: int) -> Dict[str, Dict]:
+        operacoes = [
+            ('listar_obras', self.listar_obras, repeticoes_pesadas),
+            ('obter_checklist', self.obter_checklist, repeticoes),
+            ('marcar_item_checklist', self.marcar_item_checklist, repeticoes),
+            ('recalcular_checklist', self.recalcular_checklist, repeticoes),
+            ('gerar_tarefas_mensais', self.gerar_tarefas_mensais, repeticoes_pesadas),
+            ('verificar_prazos', self.verificar_prazos, repeticoes_pesadas),
+        ]
+        resultado = {}
+        for nome, operacao, total in operacoes:
+            print(f"⏱️ {nome} ({total}x)...")
+            resultado[nome] = estatisticas(operacao(total))
+        return resultado
+
+
+def tamanho_banco(db: Database) -> Dict:
+    with db.conexao() as conn:
+        contagens = {tabela: conn.execute(f'SELECT COUNT(*) FROM {tabela}').fetchone()[0]
+                     for tabela in ('obras', 'obra_checklist', 'historico_notificacoes')}
+    tamanho = sum(os.path.getsize(caminho) for caminho in (db.db_name, f'{db.db_name}-wal')
+                  if os.path.exists(caminho))
+    contagens['arquivo_mb'] = round(tamanho / (1024 * 1024), 1)
+    return contagens
+
+
+def comparar(atual: Dict, anterior: Dict):
+    """Imprime a variação de cada operação em relação ao relatório anterior"""
+    print()
+    print(f"Comparação com {anterior.get('versao')} ({anterior.get('data')}):")
+    print(f"{'operação':<24}{'p50 antes':>12}{'p50 agora':>12}{'variação':>11}")
+    for nome, dados in atual['operacoes'].items():
+        antes = anterior.get('operacoes', {}).get(nome)
+        if not antes:
+            print(f"{nome:<24}{'-':>12}{dados['p50_ms']:>12.2f}{'nova':>11}")
+            continue
+        variacao = (dados['p50_ms'] / antes['p50_ms'] - 1) * 100 if antes['p50_ms'] else 0.0
+        print(f"{nome:<24}{antes['p50_ms']:>12.2f}{dados['p50_ms']:>12.2f}{variacao:>+10.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Suíte de benchmarks do banco do AgendaObras')
+    parser.add_argument('--obras', type=int, default=5000, help='Obras sintéticas (se o banco não existir)')
+    parser.add_argument('--caminho', help='Banco a medir; é gerado se não existir (padrão: temporário)')
+    parser.add_argument('--semente', type=int, default=42, help='Semente do gerador e das escolhas aleatórias')
+    parser.add_argument('--repeticoes', type=int, default=50, help='Repetições das operações rápidas')
+    parser.add_argument('--repeticoes-pesadas', type=int, default=5,
+                        help='Repetições de listar_obras, gerar_tarefas_mensais e verificar_prazos')
+    parser.add_argument('--saida', help='Arquivo do relatório JSON (padrão: imprime na tela)')
+    parser.add_argument('--comparar', help='Relatório JSON anterior para comparação')
+    args = parser.parse_args()
+
+    # O notificador registra cada e-mail (simulado) enviado
+    logging.getLogger('agendaobras').setLevel(logging.WARNING)
+
+    db_name = args.caminho or os.path.join(tempfile.mkdtemp(prefix='agendaobras_suite_'), 'suite.db')
+    print(f"📂 Banco de benchmark: {db_name}")
+    if not os.path.exists(db_name) or os.path.getsize(db_name) == 0:
+        print(f"🏗️ Gerando {args.obras} obra(s) sintética(s)...")
+        gerar_banco(db_name, args.obras, args.semente)
+    db = Database(db_name)
+
+    relatorio = {
+        'versao': VERSION,
+        'data': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'ambiente': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'plataforma': platform.platform(),
+        },
+        'banco': tamanho_banco(db),
+        'semente': args.semente,
+        'operacoes': SuiteBanco(db, args.semente).executar(args.repeticoes, args.repeticoes_pesadas),
+    }
+
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto + '\n')
+        print(f"💾 Relatório salvo em {args.saida}")
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            comparar(relatorio, json.load(arquivo))
+
+
+if __name__ == '__main__':
+    main()
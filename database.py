@@ -3,666 +3,1179 @@ Módulo de gerenciamento do banco de dados SQLite para o sistema AgendaObras.
 Contém a classe Database com todas as operações CRUD para obras e checklists.
 """
 
-import sqlite3
+import os
+import threading
 import datetime
-from typing import List, Dict, Optional
-from migrations import run_migrations
+import re
+import json
+import base64
+from concurrent.futures import Future
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+from migrations import run_migrations, COLUNAS_FTS, VERSAO_SCHEMA
 from error_logger import log_error
+from grafo_checklist import GrafoChecklist, BASE_POR_CAMPO
+from pool_conexoes import obter_pool
+from escritor_banco import obter_escritor
+from replica_local import ReplicaLocal
+from arquivamento import ALIAS_ARQUIVO, caminho_arquivo
+from app_logger import obter_logger
+from datas import converter_data, somar_dias, hoje_dia, dia_epoca
+
+logger = obter_logger("database")
 
 CAMINHO_DB = r'G:\Meu Drive\17 - MODELOS\PROGRAMAS\AgendaObras\app\db\agendaobras.db'
 
+# Máximo de parâmetros por consulta em cláusulas IN (limite antigo do SQLite é 999)
+LIMITE_PARAMETROS_SQL = 900
+
+# Pesos do bm25 na busca, na ordem de COLUNAS_FTS + descrições do checklist
+PESOS_BUSCA = '10.0, 6.0, 1.0, 4.0, 4.0, 4.0, 2.0, 1.0'
+
+# Campos gravados na criação de obras (data_criacao é preenchida automaticamente)
+CAMPOS_OBRA = [
+    'nome_contrato', 'cliente', 'valor_contrato', 'data_inicio', 'status',
+    'contrato_ic', 'pedido_sap', 'prefixo_agencia', 'servico', 'valor_parceiro', 'valor_percentual',
+    'total_obra', 'mes_execucao', 'ano_execucao', 'data_conclusao', 'data_assinatura', 'data_aio',
+    'data_acionamento',
+]
+
+# Filtros aceitos por obter_tarefas_por_periodo: nome -> condição SQL
+FILTROS_TAREFAS = {
+    'obra_id': 'oc.obra_id = :obra_id',
+    'cliente': 'o.cliente = :cliente',
+    'status': 'o.status = :status',
+    'tipo': 'oc.tipo = :tipo',
+}
+
+# Linhas lidas por vez do cursor em consultas iteradas
+TAMANHO_LOTE_LEITURA = 500
+
+# Erro das escritas em obras que não estão no banco principal (obras arquivadas são somente leitura)
+MENSAGEM_OBRA_AUSENTE = "Obra {obra_id} não encontrada (obras arquivadas não podem ser alteradas)"
+
+# Datas-base que, ao serem apagadas na edição da obra, não recalculam o checklist
+DATAS_LIMPAS_SEM_RECALCULO = ('data_acionamento', 'data_assinatura', 'data_aio')
+
+# Campos de data de obras (formato ISO AAAA-MM-DD)
+CAMPOS_DATA_OBRA = ['data_inicio', 'data_conclusao', 'data_assinatura', 'data_aio', 'data_acionamento']
+
+# Colunas das linhas montadas por Database._montar_checklist
+COLUNAS_ITEM_CHECKLIST = [
+    'id', 'obra_id', 'template_id', 'descricao', 'prazo_dias', 'data_limite', 'tipo',
+    'base_calculo', 'data_base_calculo', 'bloqueado', 'status_notificacao', 'recorrencia', 'depende_item_id',
+]
+
+# Bancos cujo schema já foi verificado/migrado neste processo
+_schemas_prontos = set()
+_schemas_lock = threading.Lock()
+
+# Cache de templates de checklist por banco: db_name -> (versao_templates, templates)
+_cache_templates: Dict[str, Tuple[str, List[Dict]]] = {}
+
+# Ordenações da listagem paginada: chave -> (expressão SQL indexada, direção)
+# NULLs viram '' para que a comparação por chave (row values) funcione
+ORDENACOES_OBRAS = {
+    'data_inicio': ("IFNULL(o.data_inicio, '')", 'DESC'),
+    'data_criacao': ("IFNULL(o.data_criacao, '')", 'DESC'),
+    'nome_contrato': ('o.nome_contrato', 'ASC'),
+    'relevancia': ('busca.relevancia', 'ASC'),
+}
+
+# Obras com o resumo de obra_resumo (migração 11) e a descrição/prazo da próxima tarefa.
+# {colunas_extras} permite acrescentar colunas calculadas (ex: ', expr AS nome')
+SELECT_OBRAS_RESUMO = '''
+    SELECT o.*,
+           COALESCE(r.total_tarefas, 0) AS total_tarefas,
+           COALESCE(r.tarefas_concluidas, 0) AS tarefas_concluidas,
+           COALESCE(r.tarefas_bloqueadas, 0) AS tarefas_bloqueadas,
+           COALESCE(r.tarefas_pendentes, 0) AS tarefas_pendentes,
+           COALESCE(r.tarefas_atrasadas, 0) AS tarefas_atrasadas,
+           r.proximo_prazo,
+           pt.descricao AS proxima_tarefa_descricao,
+           pt.data_limite AS proxima_tarefa_data_limite{colunas_extras}
+    FROM obras o
+    LEFT JOIN obra_resumo r ON r.obra_id = o.id
+    LEFT JOIN obra_checklist pt ON pt.id = r.proxima_tarefa_id
+'''
+
+
+# Recalcula em lote o prazo de itens não concluídos a partir de {data_base} (expressão SQL
+# avaliada por linha de obra_checklist). date() aceita prazos negativos ('-15 days').
+# Reiterações só são reiniciadas quando o prazo de fato muda.
+SQL_RECALCULAR_PRAZOS = '''
+    UPDATE obra_checklist
+    SET tentativas_reiteracao = CASE WHEN data_limite IS {nova_data_limite}
+                                     THEN tentativas_reiteracao ELSE 0 END,
+        status_notificacao = CASE WHEN data_limite IS {nova_data_limite}
+                                  THEN status_notificacao ELSE 'pendente' END,
+        data_limite = {nova_data_limite},
+        data_base_calculo = {data_base},
+        bloqueado = 0
+    WHERE concluido = 0 AND recorrencia != 'mensal' AND {filtro}
+    AND {data_base} IS NOT NULL
+    AND (data_limite IS NOT {nova_data_limite} OR data_base_calculo IS NOT {data_base} OR bloqueado != 0)
+'''
+
+# Data base de itens calculados a partir de uma data da obra (base_calculo -> coluna de obras)
+DATA_BASE_OBRA = '''(SELECT NULLIF(CASE obra_checklist.base_calculo
+        WHEN 'inicio' THEN o.data_inicio WHEN 'criacao' THEN o.data_acionamento
+        WHEN 'assinatura' THEN o.data_assinatura WHEN 'aio' THEN o.data_aio END, '')
+    FROM obras o WHERE o.id = obra_checklist.obra_id)'''
+
+# Data base de itens 'fim_tarefa': conclusão da tarefa da qual dependem
+DATA_BASE_DEPENDENCIA = '''(SELECT pai.data_conclusao FROM obra_checklist pai
+    WHERE pai.id = obra_checklist.depende_item_id AND pai.concluido = 1)'''
+
+# Trava/destrava tarefas mensais conforme a obra já ter começado ({bloqueado}: 0 ou 1 por linha)
+SQL_TRAVA_MENSAL = '''
+    UPDATE obra_checklist
+    SET bloqueado = {bloqueado}
+    WHERE recorrencia = 'mensal' AND {filtro}
+    AND bloqueado != {bloqueado} AND ({bloqueado} = 0 OR concluido = 0)
+'''
+
+BLOQUEIO_MENSAL_OBRA = '''(SELECT CASE WHEN NULLIF(o.data_inicio, '') <= date('now', 'localtime') THEN 0 ELSE 1 END
+    FROM obras o WHERE o.id = obra_checklist.obra_id)'''
+
+
+def montar_consulta_fts(texto: str) -> Optional[str]:
+    """Converte o texto digitado em uma consulta FTS5 segura.
+    Cada palavra vira um termo por prefixo ("medi"* encontra MEDIÇÃO); todos devem ocorrer.
+    """
+    termos = re.findall(r'\w+', texto or '')
+    if not termos:
+        return None
+    return ' '.join(f'"{termo}"*' for termo in termos)
+
+
 class Database:
-    def __init__(self, db_name: str = CAMINHO_DB):
+    def __init__(self, db_name: str = CAMINHO_DB, replica_local: bool = None):
+        """
+        Args:
+            db_name: Arquivo do banco (compartilhado no Google Drive)
+            replica_local: Lê de uma cópia local atualizada sob demanda (ver replica_local.py).
+                Padrão: variável de ambiente AGENDAOBRAS_REPLICA_LOCAL=1
+        """
         self.db_name = db_name
-        self.init_database()
-        # Executa migrações pendentes
-        run_migrations(db_name)
+        # Pool compartilhado por todas as instâncias/serviços que usam o mesmo arquivo
+        self.pool = obter_pool(db_name)
+        # Thread única de escrita compartilhada (serializa escritas da interface e do notificador)
+        self.escritor = obter_escritor(db_name)
+        # Data da última verificação de virada de dia em obra_resumo
+        self._data_resumo = None
+        # Indica se a tabela FTS5 obras_fts existe (verificado na primeira busca)
+        self._fts_disponivel = None
+        # Cria tabelas e executa migrações pendentes (uma vez por processo)
+        self._preparar_schema()
+        
+        if replica_local is None:
+            replica_local = os.environ.get('AGENDAOBRAS_REPLICA_LOCAL') == '1'
+        # Cópia local para leituras; escritas continuam no arquivo compartilhado
+        self.replica = ReplicaLocal(db_name) if replica_local else None
+        
+        # Arquivo morto (obras concluídas antigas): anexado se já existir
+        self.caminho_arquivo = caminho_arquivo(db_name)
+        self.arquivo_anexado = False
+        if os.path.exists(self.caminho_arquivo) and os.path.getsize(self.caminho_arquivo) > 0:
+            self.anexar_arquivo()
     
     def get_connection(self):
-        """Cria e retorna uma conexão com o banco de dados com timeout e WAL mode"""
-        conn = sqlite3.connect(self.db_name, timeout=30.0, check_same_thread=False)
-        conn.row_factory = sqlite3.Row  # Permite acesso por nome de coluna
-        # Habilita WAL mode para melhor concorrência
-        conn.execute('PRAGMA journal_mode=WAL')
-        conn.execute('PRAGMA busy_timeout=30000')  # 30 segundos
-        return conn
+        """Empresta uma conexão do pool (timeout e WAL mode já configurados).
+        Chamar close() devolve a conexão ao pool em vez de fechar o arquivo.
+        """
+        return self.pool.obter()
     
-    def init_database(self):
-        """Inicializa o banco de dados com as tabelas necessárias"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Tabela de obras
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS obras (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome_contrato TEXT NOT NULL,
-                cliente TEXT NOT NULL,
-                valor_contrato REAL NOT NULL,
-                data_inicio TEXT,
-                status TEXT DEFAULT 'Não Iniciada',
-                data_criacao TEXT DEFAULT CURRENT_TIMESTAMP,
-                contrato_ic TEXT,
-                pedido_sap TEXT,
-                prefixo_agencia TEXT,
-                servico TEXT,
-                valor_parceiro REAL,
-                valor_percentual REAL,
-                total_obra REAL,
-                mes_execucao TEXT,
-                ano_execucao INTEGER,
-                data_conclusao TEXT,
-                data_assinatura TEXT,
-                data_aio TEXT,
-                data_acionamento TEXT
-            )
-        ''')
-        
-        # Tabela de templates de checklist (padrão)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS checklist_templates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                ordem INTEGER NOT NULL,
-                prazo_dias INTEGER NOT NULL,
-                tipo TEXT DEFAULT 'A',
-                base_calculo TEXT DEFAULT 'inicio',
-                depende_template_id INTEGER,
-                dias_offset INTEGER DEFAULT 0,
-                recorrencia TEXT DEFAULT 'unica',
-                dia_referencia_mensal INTEGER,
-                trigger_ui TEXT,
-                possui_reiteracao INTEGER DEFAULT 1,
-                FOREIGN KEY (depende_template_id) REFERENCES checklist_templates (id)
-            )
-        ''')
-        
-        # Tabela de checklist por obra
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS obra_checklist (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                obra_id INTEGER NOT NULL,
-                template_id INTEGER NOT NULL,
-                descricao TEXT NOT NULL,
-                prazo_dias INTEGER NOT NULL,
-                data_limite TEXT,
-                concluido INTEGER DEFAULT 0,
-                data_conclusao TEXT,
-                tipo TEXT DEFAULT 'A',
-                base_calculo TEXT DEFAULT 'inicio',
-                data_base_calculo TEXT,
-                depende_item_id INTEGER,
-                bloqueado INTEGER DEFAULT 0,
-                tentativas_reiteracao INTEGER DEFAULT 0,
-                ultima_notificacao TEXT,
-                status_notificacao TEXT DEFAULT 'pendente',
-                recorrencia TEXT DEFAULT 'unica',
-                mes_referencia TEXT,
-                FOREIGN KEY (obra_id) REFERENCES obras (id),
-                FOREIGN KEY (template_id) REFERENCES checklist_templates (id),
-                FOREIGN KEY (depende_item_id) REFERENCES obra_checklist (id)
-            )
-        ''')
-        
-        # Tabela de histórico de notificações
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS historico_notificacoes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                obra_id INTEGER NOT NULL,
-                tarefa_id INTEGER NOT NULL,
-                tipo_notificacao TEXT NOT NULL,
-                data_envio TEXT NOT NULL,
-                destinatarios TEXT,
-                sucesso INTEGER DEFAULT 1,
-                mensagem_erro TEXT,
-                FOREIGN KEY (obra_id) REFERENCES obras (id),
-                FOREIGN KEY (tarefa_id) REFERENCES obra_checklist (id)
-            )
-        ''')
-        
-        # Insere templates padrão se não existirem
-        cursor.execute('SELECT COUNT(*) as count FROM checklist_templates')
-        if cursor.fetchone()['count'] == 0:
-            # NOVOS TEMPLATES - 18 tarefas com dependências e lógica avançada
-            templates = [
-                # Grupo 1: Fluxo Inicial
-                # (nome, ordem, prazo_dias, tipo, base_calculo, depende_template_id, dias_offset, recorrencia, dia_ref_mensal, trigger_ui, possui_reiteracao)
-                ('RETORNO PROJETO E ORÇAMENTO', 1, 2, 'A', 'criacao', None, 0, 'unica', None, None, 1),
-                ('ANÁLISE', 2, 3, 'B', 'fim_tarefa', 1, 0, 'unica', None, None, 0),
-                ('ANÁLISE - GESTOR', 3, 2, 'B', 'fim_tarefa', 2, 0, 'unica', None, None, 0),
-                
-                # Grupo 2: Pós-Análise Gestor
-                ('RETORNO DO QUESTIONAMENTO', 4, 2, 'A', 'fim_tarefa', 3, 0, 'unica', None, None, 1),
-                ('CONTRATO ASSINADO', 5, 5, 'B', 'fim_tarefa', 3, 0, 'unica', None, 'data_assinatura', 0),
-                
-                # Grupo 3: Gatilho da Data de Assinatura
-                ('SOLICITAR A DATA DA AIO', 6, 1, 'A', 'assinatura', None, 0, 'unica', None, 'data_aio', 1),
-                ('PEDIDO MATERIAL ABC', 7, 8, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
-                ('ART', 8, 5, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
-                ('SOLICITAÇÃO SEGUROS', 9, 5, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
-                ('ACEITE SEGURO', 10, 5, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
-                ('PAGAMENTO SEGURO', 11, 5, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
-                ('ENVIO DO SEGURO + ART', 12, 5, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
-                
-                # Grupo 4: Gatilho da Data AIO
-                ('CRONOGRAMA DE OBRA', 13, 0, 'B', 'aio', None, 0, 'unica', None, None, 0),
-                ('RELATÓRIO', 14, 5, 'B', 'aio', None, 0, 'unica', None, None, 0),
-                
-                # Grupo 5: Prazos Regressivos (baseados no início da obra)
-                ('CONTRATAÇÃO DA EQUIPE', 15, -15, 'B', 'inicio', None, 0, 'unica', None, None, 0),
-                ('SOLICITAÇÃO DE ACESSO', 16, -10, 'B', 'inicio', None, 0, 'unica', None, None, 0),
-                
-                # Grupo 6: Tarefas Recorrentes (Mensais)
-                ('MEDIÇÃO', 17, 0, 'B', 'inicio', None, 0, 'mensal', 20, None, 0),
-                ('CONFIRMAÇÃO DE MEDIÇÃO', 18, 0, 'A', 'inicio', None, 0, 'mensal', 10, None, 1),
-            ]
-            cursor.executemany('''
-                INSERT INTO checklist_templates 
-                (nome, ordem, prazo_dias, tipo, base_calculo, depende_template_id, dias_offset, 
-                 recorrencia, dia_referencia_mensal, trigger_ui, possui_reiteracao)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', templates)
-        
-        conn.commit()
-        conn.close()
+    def conexao(self):
+        """Context manager transacional do pool: commit ao final, rollback em caso de erro"""
+        return self.pool.conexao()
     
-    # ========== CRUD OBRAS ========== #
-    def criar_obra(self, nome_contrato: str, cliente: str, valor_contrato: float, 
-                   data_inicio: str, status: str = 'Não Iniciada', **kwargs) -> int:
-        """Cria uma nova obra e retorna o ID"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+    def conexao_leitura(self):
+        """Context manager para consultas: usa a réplica local quando habilitada"""
+        if self.replica:
+            return self.replica.conexao()
+        return self.conexao()
+    
+    def anexar_arquivo(self):
+        """Anexa o arquivo morto às conexões do pool como ALIAS_ARQUIVO"""
+        if not self.arquivo_anexado:
+            self.pool.anexar(ALIAS_ARQUIVO, self.caminho_arquivo)
+            self.arquivo_anexado = True
+    
+    def enviar_escrita(self, funcao, *args, **kwargs) -> Future:
+        """Agenda funcao(conn, *args, **kwargs) na thread de escrita; retorna um Future
+        resolvido após o COMMIT"""
+        futuro = self.escritor.enviar(funcao, *args, **kwargs)
+        replica = self.replica
+        if not replica:
+            return futuro
         
-            # Extrai campos adicionais e converte strings vazias para None
-            contrato_ic = kwargs.get('contrato_ic', None) or None
-            pedido_sap = kwargs.get('pedido_sap', None) or None
-            prefixo_agencia = kwargs.get('prefixo_agencia', None) or None
-            servico = kwargs.get('servico', None) or None
-            valor_parceiro = kwargs.get('valor_parceiro', None) or None
-            valor_percentual = kwargs.get('valor_percentual', None) or None
-            total_obra = kwargs.get('total_obra', None) or None
-            mes_execucao = kwargs.get('mes_execucao', None) or None
-            ano_execucao = kwargs.get('ano_execucao', None)
-            data_conclusao = kwargs.get('data_conclusao', None) or None
-            data_assinatura = kwargs.get('data_assinatura', None) or None
-            data_aio = kwargs.get('data_aio', None) or None
-            data_acionamento = kwargs.get('data_acionamento', None) or None
-            
-            # Converte string vazia de data_inicio para None
-            data_inicio = data_inicio or None
+        # A réplica é invalidada na thread de escrita antes de entregar o resultado: quem
+        # aguarda o Future já encontra a réplica marcada para verificação na leitura seguinte
+        resultado = Future()
+        
+        def concluir(operacao: Future):
+            replica.invalidar()
+            erro = operacao.exception()
+            if erro is not None:
+                resultado.set_exception(erro)
+            else:
+                resultado.set_result(operacao.result())
+        
+        futuro.add_done_callback(concluir)
+        return resultado
+    
+    def _escrever(self, funcao, *args, **kwargs):
+        """Executa funcao(conn, *args, **kwargs) na thread de escrita e aguarda o resultado"""
+        return self.enviar_escrita(funcao, *args, **kwargs).result()
+    
+    def _preparar_schema(self):
+        """Executa init_database e as migrações apenas na primeira instância do processo,
+        e só se PRAGMA user_version indicar um schema anterior a VERSAO_SCHEMA.
+        Com o banco atualizado, abrir uma nova página não executa nenhuma DDL.
+        """
+        with _schemas_lock:
+            if self.db_name in _schemas_prontos:
+                return
             
-            # Data de criação com horário local
-            data_criacao = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            with self.conexao() as conn:
+                versao = conn.execute('PRAGMA user_version').fetchone()[0]
+            if versao < VERSAO_SCHEMA:
+                self.init_database()
+                run_migrations(self.db_name)
+            else:
+                logger.debug("Schema na versão %s, migrações ignoradas: %s", versao, self.db_name)
+            _schemas_prontos.add(self.db_name)
+    
+    def init_database(self):
+        """Inicializa o banco de dados com as tabelas necessárias"""
+        with self.conexao() as conn:
+            cursor = conn.cursor()
             
+            # Tabela de obras
             cursor.execute('''
-                INSERT INTO obras (nome_contrato, cliente, valor_contrato, data_inicio, status,
-                                 contrato_ic, pedido_sap, prefixo_agencia, servico, valor_parceiro, valor_percentual,
-                                 total_obra, mes_execucao, ano_execucao, data_conclusao, data_assinatura, data_aio,
-                                 data_acionamento, data_criacao)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (nome_contrato, cliente, valor_contrato, data_inicio, status,
-                  contrato_ic, pedido_sap, prefixo_agencia, servico, valor_parceiro, valor_percentual,
-                  total_obra, mes_execucao, ano_execucao, data_conclusao, data_assinatura, data_aio,
-                  data_acionamento, data_criacao))
+                CREATE TABLE IF NOT EXISTS obras (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nome_contrato TEXT NOT NULL,
+                    cliente TEXT NOT NULL,
+                    valor_contrato REAL NOT NULL,
+                    data_inicio TEXT,
+                    status TEXT DEFAULT 'Não Iniciada',
+                    data_criacao TEXT DEFAULT CURRENT_TIMESTAMP,
+                    contrato_ic TEXT,
+                    pedido_sap TEXT,
+                    prefixo_agencia TEXT,
+                    servico TEXT,
+                    valor_parceiro REAL,
+                    valor_percentual REAL,
+                    total_obra REAL,
+                    mes_execucao TEXT,
+                    ano_execucao INTEGER,
+                    data_conclusao TEXT,
+                    data_assinatura TEXT,
+                    data_aio TEXT,
+                    data_acionamento TEXT
+                )
+            ''')
             
-            obra_id = cursor.lastrowid
+            # Tabela de templates de checklist (padrão)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS checklist_templates (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nome TEXT NOT NULL,
+                    ordem INTEGER NOT NULL,
+                    prazo_dias INTEGER NOT NULL,
+                    tipo TEXT DEFAULT 'A',
+                    base_calculo TEXT DEFAULT 'inicio',
+                    depende_template_id INTEGER,
+                    dias_offset INTEGER DEFAULT 0,
+                    recorrencia TEXT DEFAULT 'unica',
+                    dia_referencia_mensal INTEGER,
+                    trigger_ui TEXT,
+                    possui_reiteracao INTEGER DEFAULT 1,
+                    FOREIGN KEY (depende_template_id) REFERENCES checklist_templates (id)
+                )
+            ''')
             
-            # Prepara dados completos da obra para criar checklist
-            obra_dados = {
-                'data_inicio': data_inicio,
-                'data_assinatura': data_assinatura,
-                'data_aio': data_aio,
-                'data_acionamento': data_acionamento
-            }
+            # Tabela de checklist por obra
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS obra_checklist (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    obra_id INTEGER NOT NULL,
+                    template_id INTEGER NOT NULL,
+                    descricao TEXT NOT NULL,
+                    prazo_dias INTEGER NOT NULL,
+                    data_limite TEXT,
+                    concluido INTEGER DEFAULT 0,
+                    data_conclusao TEXT,
+                    tipo TEXT DEFAULT 'A',
+                    base_calculo TEXT DEFAULT 'inicio',
+                    data_base_calculo TEXT,
+                    depende_item_id INTEGER,
+                    bloqueado INTEGER DEFAULT 0,
+                    tentativas_reiteracao INTEGER DEFAULT 0,
+                    ultima_notificacao TEXT,
+                    status_notificacao TEXT DEFAULT 'pendente',
+                    recorrencia TEXT DEFAULT 'unica',
+                    mes_referencia TEXT,
+                    FOREIGN KEY (obra_id) REFERENCES obras (id),
+                    FOREIGN KEY (template_id) REFERENCES checklist_templates (id),
+                    FOREIGN KEY (depende_item_id) REFERENCES obra_checklist (id)
+                )
+            ''')
             
-            # Cria checklist automático para a obra
-            self._criar_checklist_obra(cursor, obra_id, obra_dados)
+            # Tabela de histórico de notificações
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS historico_notificacoes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    obra_id INTEGER NOT NULL,
+                    tarefa_id INTEGER NOT NULL,
+                    tipo_notificacao TEXT NOT NULL,
+                    data_envio TEXT NOT NULL,
+                    destinatarios TEXT,
+                    sucesso INTEGER DEFAULT 1,
+                    mensagem_erro TEXT,
+                    FOREIGN KEY (obra_id) REFERENCES obras (id),
+                    FOREIGN KEY (tarefa_id) REFERENCES obra_checklist (id)
+                )
+            ''')
             
-            conn.commit()
-            conn.close()
+            # Insere templates padrão se não existirem
+            cursor.execute('SELECT COUNT(*) as count FROM checklist_templates')
+            if cursor.fetchone()['count'] == 0:
+                # NOVOS TEMPLATES - 18 tarefas com dependências e lógica avançada
+                templates = [
+                    # Grupo 1: Fluxo Inicial
+                    # (nome, ordem, prazo_dias, tipo, base_calculo, depende_template_id, dias_offset, recorrencia, dia_ref_mensal, trigger_ui, possui_reiteracao)
+                    ('RETORNO PROJETO E ORÇAMENTO', 1, 2, 'A', 'criacao', None, 0, 'unica', None, None, 1),
+                    ('ANÁLISE', 2, 3, 'B', 'fim_tarefa', 1, 0, 'unica', None, None, 0),
+                    ('ANÁLISE - GESTOR', 3, 2, 'B', 'fim_tarefa', 2, 0, 'unica', None, None, 0),
+                    
+                    # Grupo 2: Pós-Análise Gestor
+                    ('RETORNO DO QUESTIONAMENTO', 4, 2, 'A', 'fim_tarefa', 3, 0, 'unica', None, None, 1),
+                    ('CONTRATO ASSINADO', 5, 5, 'B', 'fim_tarefa', 3, 0, 'unica', None, 'data_assinatura', 0),
+                    
+                    # Grupo 3: Gatilho da Data de Assinatura
+                    ('SOLICITAR A DATA DA AIO', 6, 1, 'A', 'assinatura', None, 0, 'unica', None, 'data_aio', 1),
+                    ('PEDIDO MATERIAL ABC', 7, 8, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
+                    ('ART', 8, 5, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
+                    ('SOLICITAÇÃO SEGUROS', 9, 5, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
+                    ('ACEITE SEGURO', 10, 5, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
+                    ('PAGAMENTO SEGURO', 11, 5, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
+                    ('ENVIO DO SEGURO + ART', 12, 5, 'B', 'assinatura', None, 0, 'unica', None, None, 0),
+                    
+                    # Grupo 4: Gatilho da Data AIO
+                    ('CRONOGRAMA DE OBRA', 13, 0, 'B', 'aio', None, 0, 'unica', None, None, 0),
+                    ('RELATÓRIO', 14, 5, 'B', 'aio', None, 0, 'unica', None, None, 0),
+                    
+                    # Grupo 5: Prazos Regressivos (baseados no início da obra)
+                    ('CONTRATAÇÃO DA EQUIPE', 15, -15, 'B', 'inicio', None, 0, 'unica', None, None, 0),
+                    ('SOLICITAÇÃO DE ACESSO', 16, -10, 'B', 'inicio', None, 0, 'unica', None, None, 0),
+                    
+                    # Grupo 6: Tarefas Recorrentes (Mensais)
+                    ('MEDIÇÃO', 17, 0, 'B', 'inicio', None, 0, 'mensal', 20, None, 0),
+                    ('CONFIRMAÇÃO DE MEDIÇÃO', 18, 0, 'A', 'inicio', None, 0, 'mensal', 10, None, 1),
+                ]
+                cursor.executemany('''
+                    INSERT INTO checklist_templates 
+                    (nome, ordem, prazo_dias, tipo, base_calculo, depende_template_id, dias_offset, 
+                     recorrencia, dia_referencia_mensal, trigger_ui, possui_reiteracao)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', templates)
+    
+    # ========== CRUD OBRAS ========== #
+    def criar_obra(self, nome_contrato: str, cliente: str, valor_contrato: float, 
+                   data_inicio: str, status: str = 'Não Iniciada', **kwargs) -> int:
+        """Cria uma nova obra e retorna o ID"""
+        # Converte string vazia de data_inicio para None
+        data_inicio = data_inicio or None
+        
+        try:
+            def gravar(conn):
+                cursor = conn.cursor()
+                
+                # Extrai campos adicionais e converte strings vazias para None
+                contrato_ic = kwargs.get('contrato_ic', None) or None
+                pedido_sap = kwargs.get('pedido_sap', None) or None
+                prefixo_agencia = kwargs.get('prefixo_agencia', None) or None
+                servico = kwargs.get('servico', None) or None
+                valor_parceiro = kwargs.get('valor_parceiro', None) or None
+                valor_percentual = kwargs.get('valor_percentual', None) or None
+                total_obra = kwargs.get('total_obra', None) or None
+                mes_execucao = kwargs.get('mes_execucao', None) or None
+                ano_execucao = kwargs.get('ano_execucao', None)
+                data_conclusao = kwargs.get('data_conclusao', None) or None
+                data_assinatura = kwargs.get('data_assinatura', None) or None
+                data_aio = kwargs.get('data_aio', None) or None
+                data_acionamento = kwargs.get('data_acionamento', None) or None
+                
+                # Data de criação com horário local
+                data_criacao = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                
+                cursor.execute('''
+                    INSERT INTO obras (nome_contrato, cliente, valor_contrato, data_inicio, status,
+                                     contrato_ic, pedido_sap, prefixo_agencia, servico, valor_parceiro, valor_percentual,
+                                     total_obra, mes_execucao, ano_execucao, data_conclusao, data_assinatura, data_aio,
+                                     data_acionamento, data_criacao)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (nome_contrato, cliente, valor_contrato, data_inicio, status,
+                      contrato_ic, pedido_sap, prefixo_agencia, servico, valor_parceiro, valor_percentual,
+                      total_obra, mes_execucao, ano_execucao, data_conclusao, data_assinatura, data_aio,
+                      data_acionamento, data_criacao))
+                
+                obra_id = cursor.lastrowid
+                
+                # Prepara dados completos da obra para criar checklist
+                obra_dados = {
+                    'data_inicio': data_inicio,
+                    'data_assinatura': data_assinatura,
+                    'data_aio': data_aio,
+                    'data_acionamento': data_acionamento
+                }
+                
+                # Cria checklist automático para a obra
+                self._criar_checklist_obra(cursor, obra_id, obra_dados)
+                
+                return obra_id
             
-            return obra_id
+            return self._escrever(gravar)
             
         except Exception as e:
             log_error(e, "database", f"Criar obra: {nome_contrato}")
-            if 'conn' in locals():
-                try:
-                    conn.close()
-                except:
-                    pass
             raise
     
+    def criar_obras_em_lote(self, obras: Iterable[Dict], tamanho_bloco: int = 500) -> Dict:
+        """Cria várias obras (com checklist) em uma única transação.
+        
+        Args:
+            obras: Iterável de dicionários com os campos de criar_obra (datas em ISO).
+                   É lido e validado por inteiro na thread de quem chama, antes de enviar a
+                   escrita: a thread de escrita só grava linhas já prontas.
+            tamanho_bloco: Quantidade de obras acumuladas em memória antes de cada executemany
+        
+        Returns:
+            {'criadas': [ids], 'erros': [{'indice': posição no iterável, 'erro': mensagem}]}
+            Linhas inválidas são ignoradas e reportadas; as demais são gravadas.
+        """
+        resultado = {'criadas': [], 'erros': []}
+        data_criacao = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        validas = []
+        for indice, dados in enumerate(obras):
+            try:
+                validas.append(self._validar_obra_lote(dados))
+            except ValueError as e:
+                resultado['erros'].append({'indice': indice, 'erro': str(e)})
+        
+        try:
+            def gravar(conn):
+                # A thread de escrita já abriu a transação (BEGIN IMMEDIATE): os ids estão reservados
+                templates = self._obter_templates(conn)
+                proxima_obra = self._proximo_id(conn, 'obras')
+                proximo_item = self._proximo_id(conn, 'obra_checklist')
+                
+                linhas_obras, linhas_itens = [], []
+                for valores in validas:
+                    obra_id = proxima_obra
+                    proxima_obra += 1
+                    linhas_obras.append((obra_id, *[valores[campo] for campo in CAMPOS_OBRA], data_criacao))
+                    
+                    itens = self._montar_checklist(templates, obra_id, valores, proximo_item)
+                    proximo_item += len(itens)
+                    linhas_itens.extend(itens)
+                    resultado['criadas'].append(obra_id)
+                    
+                    if len(linhas_obras) >= tamanho_bloco:
+                        self._gravar_lote_obras(conn, linhas_obras, linhas_itens)
+                        linhas_obras, linhas_itens = [], []
+                
+                self._gravar_lote_obras(conn, linhas_obras, linhas_itens)
+            
+            self._escrever(gravar)
+        
+        except Exception as e:
+            log_error(e, "database", f"Criar obras em lote ({len(resultado['criadas'])} válida(s) antes da falha)")
+            raise
+        
+        logger.info("📦 Lote gravado: %s obra(s) criada(s), %s erro(s)", len(resultado['criadas']), len(resultado['erros']))
+        return resultado
+    
+    def _gravar_lote_obras(self, conn, linhas_obras: List[tuple], linhas_itens: List[tuple]):
+        """Grava um bloco de obras e itens de checklist com executemany"""
+        if not linhas_obras:
+            return
+        
+        # Os itens são gravados antes das obras: os triggers de obra_checklist ignoram
+        # obras ainda inexistentes e os de obras calculam resumo/busca uma vez por obra,
+        # já com o checklist completo.
+        conn.executemany(f'''
+            INSERT INTO obra_checklist ({', '.join(COLUNAS_ITEM_CHECKLIST)})
+            VALUES ({', '.join('?' * len(COLUNAS_ITEM_CHECKLIST))})
+        ''', linhas_itens)
+        
+        colunas = ['id', *CAMPOS_OBRA, 'data_criacao']
+        conn.executemany(f'''
+            INSERT INTO obras ({', '.join(colunas)})
+            VALUES ({', '.join('?' * len(colunas))})
+        ''', linhas_obras)
+    
+    @staticmethod
+    def _proximo_id(conn, tabela: str) -> int:
+        """Próximo id AUTOINCREMENT da tabela (exige a transação de escrita já aberta)"""
+        linha = conn.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (tabela,)).fetchone()
+        sequencia = linha[0] if linha else 0
+        maior_id = conn.execute(f'SELECT MAX(id) FROM {tabela}').fetchone()[0] or 0
+        return max(sequencia, maior_id) + 1
+    
+    @staticmethod
+    def _validar_obra_lote(dados: Dict) -> Dict:
+        """Valida e normaliza uma obra do lote (mesmas regras de criar_obra). Lança ValueError"""
+        valores = {campo: dados.get(campo) for campo in CAMPOS_OBRA}
+        for campo, valor in valores.items():
+            if isinstance(valor, str):
+                valores[campo] = valor.strip() or None
+        
+        if not valores['nome_contrato']:
+            raise ValueError("Nome do contrato é obrigatório")
+        if not valores['cliente']:
+            raise ValueError("Cliente é obrigatório")
+        
+        for campo in ('valor_contrato', 'valor_parceiro', 'valor_percentual', 'total_obra'):
+            if valores[campo] is not None:
+                try:
+                    valores[campo] = float(valores[campo])
+                except (TypeError, ValueError):
+                    raise ValueError(f"Valor numérico inválido em {campo}: {valores[campo]}")
+        if not valores['valor_contrato'] or valores['valor_contrato'] <= 0:
+            raise ValueError("Valor do contrato deve ser maior que zero")
+        
+        if valores['ano_execucao'] is not None:
+            try:
+                valores['ano_execucao'] = int(valores['ano_execucao'])
+            except (TypeError, ValueError):
+                raise ValueError(f"Ano de execução inválido: {valores['ano_execucao']}")
+        
+        for campo in CAMPOS_DATA_OBRA:
+            if valores[campo] is not None:
+                try:
+                    datetime.datetime.strptime(valores[campo], '%Y-%m-%d')
+                except (TypeError, ValueError):
+                    raise ValueError(f"Data inválida em {campo} (esperado AAAA-MM-DD): {valores[campo]}")
+        
+        valores['status'] = valores['status'] or 'Não Iniciada'
+        return valores
+    
+    def _montar_checklist(self, templates, obra_id: int, obra_dados: Dict, primeiro_id: int) -> List[tuple]:
+        """Monta em memória as linhas de obra_checklist de uma obra nova (ordem de COLUNAS_ITEM_CHECKLIST).
+        Os ids são atribuídos a partir de primeiro_id, o que permite ligar as dependências sem consultas.
+        """
+        data_inicio = obra_dados.get('data_inicio') or None
+        obra_ja_comecou = self._obra_ja_comecou(data_inicio)
+        
+        # Mapeia template_id -> id do item para resolver dependências
+        template_map = {template['id']: primeiro_id + i for i, template in enumerate(templates)}
+        
+        linhas = []
+        for template in templates:
+            if template['recorrencia'] == 'mensal':
+                # Tarefa mensal "template": data_limite definida pelo gerador mensal
+                data_limite, data_base = None, data_inicio
+                bloqueado = 0 if obra_ja_comecou else 1
+            else:
+                data_limite, data_base, bloqueado = self._calcular_item_checklist(template, obra_dados)
+            
+            linhas.append((
+                template_map[template['id']], obra_id, template['id'], template['nome'], template['prazo_dias'],
+                data_limite, template['tipo'], template['base_calculo'], data_base, bloqueado,
+                'pendente', template['recorrencia'], template_map.get(template['depende_template_id'])
+            ))
+        
+        return linhas
+    
     def _criar_checklist_obra(self, cursor, obra_id: int, obra_dados: Dict):
-        """Cria checklist automático baseado nos templates com dependências e lógica avançada"""
-        cursor.execute('SELECT * FROM checklist_templates ORDER BY ordem')
-        templates = cursor.fetchall()
+        """Cria checklist automático baseado nos templates com dependências e lógica avançada.
+        Deve ser chamado após o INSERT da obra, com a transação de escrita já aberta.
+        """
+        templates = self._obter_templates(cursor)
+        primeiro_id = self._proximo_id(cursor, 'obra_checklist')
+        
+        cursor.executemany(f'''
+            INSERT INTO obra_checklist ({', '.join(COLUNAS_ITEM_CHECKLIST)})
+            VALUES ({', '.join('?' * len(COLUNAS_ITEM_CHECKLIST))})
+        ''', self._montar_checklist(templates, obra_id, obra_dados, primeiro_id))
+    
+    def _obter_templates(self, conn) -> List[Dict]:
+        """Retorna os templates de checklist (ordenados), usando cache por versão.
+        A versão em metadados é incrementada por triggers sempre que os templates mudam.
+        """
+        linha = conn.execute("SELECT valor FROM metadados WHERE chave = 'versao_templates'").fetchone()
+        versao = linha[0] if linha else None
         
-        # Dicionário para mapear template_id -> obra_checklist_id (para resolver dependências)
-        template_map = {}
+        cache = _cache_templates.get(self.db_name)
+        if cache and versao is not None and cache[0] == versao:
+            return cache[1]
         
-        # Normaliza dados da obra: converte strings vazias para None
+        templates = [dict(row) for row in conn.execute('SELECT * FROM checklist_templates ORDER BY ordem')]
+        if versao is not None:
+            _cache_templates[self.db_name] = (versao, templates)
+        return templates
+    
+    @staticmethod
+    def _obra_ja_comecou(data_inicio: Optional[str]) -> bool:
+        """Indica se a data de início (ISO) já chegou; datas vazias ou inválidas contam como não iniciada"""
+        data_inicio_obj = converter_data(data_inicio)
+        return data_inicio_obj is not None and data_inicio_obj <= datetime.date.today()
+    
+    def _calcular_item_checklist(self, template, obra_dados: Dict) -> Tuple[Optional[str], Optional[str], int]:
+        """Calcula (data_limite, data_base_calculo, bloqueado) de um item não recorrente
+        a partir da base de cálculo do template e das datas da obra"""
         data_inicio = obra_dados.get('data_inicio') or None
         data_assinatura = obra_dados.get('data_assinatura') or None
         data_aio = obra_dados.get('data_aio') or None
         data_acionamento = obra_dados.get('data_acionamento') or None
         
-        # Verifica se a obra já começou
-        hoje = datetime.date.today()
-        obra_ja_comecou = False
-        if data_inicio and data_inicio.strip():  # Verifica se data_inicio não é vazio
-            try:
-                data_inicio_obj = datetime.datetime.strptime(data_inicio, '%Y-%m-%d').date()
-                obra_ja_comecou = data_inicio_obj <= hoje
-            except ValueError:
-                # Se data_inicio for inválida, considera que a obra não começou
-                obra_ja_comecou = False
+        # Determina se a tarefa deve iniciar bloqueada
+        bloqueado = 0
+        data_limite = None
+        data_base = None
         
-        # Primeira passagem: criar todos os itens
-        for template in templates:
-            # Para tarefas recorrentes mensais: cria template inicial bloqueado
-            # Serão desbloqueadas e geradas mensalmente pelo GeradorTarefasRecorrentes
-            if template['recorrencia'] == 'mensal':
-                # Determina se deve bloquear: bloqueia se a obra ainda não começou ou se data_inicio não foi preenchida
-                bloqueado_mensal = 0 if obra_ja_comecou else 1
+        # Calcula data_limite baseado em base_calculo
+        if template['base_calculo'] == 'criacao':
+            # Base na data de acionamento (se informada) ou data de hoje como fallback
+            if data_acionamento and data_acionamento.strip():
+                data_base = data_acionamento
+            else:
+                data_base = datetime.date.today().strftime('%Y-%m-%d')
+            data_limite = somar_dias(data_base, template['prazo_dias'])
                 
-                # Cria tarefa mensal "template" (será gerenciada pelo gerador)
-                cursor.execute('''
-                    INSERT INTO obra_checklist 
-                    (obra_id, template_id, descricao, prazo_dias, data_limite, tipo, 
-                     base_calculo, data_base_calculo, bloqueado, status_notificacao, recorrencia)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (obra_id, template['id'], template['nome'], template['prazo_dias'],
-                      None,  # data_limite será definida pelo gerador mensal
-                      template['tipo'], template['base_calculo'], data_inicio, bloqueado_mensal, 
-                      'pendente', template['recorrencia']))
+        elif template['base_calculo'] == 'inicio':
+            data_base = data_inicio
+            if data_base and data_base.strip():  # Verifica se data_inicio não é vazio
+                try:
+                    # Suporta prazos negativos (regressivos)
+                    data_limite = somar_dias(data_base, template['prazo_dias'])
+                except ValueError:
+                    # Se data for inválida, bloqueia a tarefa
+                    bloqueado = 1
+                    data_limite = None
+            else:
+                bloqueado = 1  # Bloqueia até data_inicio ser preenchida
                 
-                template_map[template['id']] = cursor.lastrowid
-                continue
-            
-            # Determina se a tarefa deve iniciar bloqueada
-            bloqueado = 0
-            data_limite = None
+        elif template['base_calculo'] == 'assinatura':
+            data_base = data_assinatura
+            if data_base:
+                data_limite = somar_dias(data_base, template['prazo_dias'])
+            else:
+                bloqueado = 1  # Bloqueia até data_assinatura ser preenchida
+                
+        elif template['base_calculo'] == 'aio':
+            data_base = data_aio
+            if data_base:
+                data_limite = somar_dias(data_base, template['prazo_dias'])
+            else:
+                bloqueado = 1  # Bloqueia até data_aio ser preenchida
+                
+        elif template['base_calculo'] == 'fim_tarefa':
+            # Depende do fim de outra tarefa - será calculado na segunda passagem
+            bloqueado = 1
             data_base = None
+        
+        return data_limite, data_base, bloqueado
+    
+    def listar_obras(self, filtro: str = None, incluir_arquivadas: bool = False) -> List[Dict]:
+        """Lista todas as obras, com filtro opcional (busca textual ordenada por relevância).
+        Com incluir_arquivadas, as obras do arquivo morto vêm ao final (com 'arquivada': True).
+        """
+        with self.conexao_leitura() as conn:
+            juncao, condicao, params, relevancia = self._clausulas_busca(conn, filtro)
+            cursor = conn.execute(f'''
+                SELECT o.* FROM obras o
+                {juncao}
+                {'WHERE ' + condicao if condicao else ''}
+                ORDER BY {'busca.relevancia, ' if relevancia else ''}o.data_inicio DESC
+            ''', params)
             
-            # Calcula data_limite baseado em base_calculo
-            if template['base_calculo'] == 'criacao':
-                # Base na data de acionamento (se informada) ou data de hoje como fallback
-                if data_acionamento and data_acionamento.strip():
-                    data_base = data_acionamento
-                else:
-                    data_base = datetime.date.today().strftime('%Y-%m-%d')
-                data_obj = datetime.datetime.strptime(data_base, '%Y-%m-%d')
-                data_limite = data_obj + datetime.timedelta(days=template['prazo_dias'])
-                    
-            elif template['base_calculo'] == 'inicio':
-                data_base = data_inicio
-                if data_base and data_base.strip():  # Verifica se data_inicio não é vazio
-                    try:
-                        data_obj = datetime.datetime.strptime(data_base, '%Y-%m-%d')
-                        # Suporta prazos negativos (regressivos)
-                        data_limite = data_obj + datetime.timedelta(days=template['prazo_dias'])
-                    except ValueError:
-                        # Se data for inválida, bloqueia a tarefa
-                        bloqueado = 1
-                        data_limite = None
-                else:
-                    bloqueado = 1  # Bloqueia até data_inicio ser preenchida
-                    
-            elif template['base_calculo'] == 'assinatura':
-                data_base = data_assinatura
-                if data_base:
-                    data_obj = datetime.datetime.strptime(data_base, '%Y-%m-%d')
-                    data_limite = data_obj + datetime.timedelta(days=template['prazo_dias'])
-                else:
-                    bloqueado = 1  # Bloqueia até data_assinatura ser preenchida
-                    
-            elif template['base_calculo'] == 'aio':
-                data_base = data_aio
-                if data_base:
-                    data_obj = datetime.datetime.strptime(data_base, '%Y-%m-%d')
-                    data_limite = data_obj + datetime.timedelta(days=template['prazo_dias'])
-                else:
-                    bloqueado = 1  # Bloqueia até data_aio ser preenchida
-                    
-            elif template['base_calculo'] == 'fim_tarefa':
-                # Depende do fim de outra tarefa - será calculado na segunda passagem
-                bloqueado = 1
-                data_base = None
+            obras = [dict(row) for row in cursor.fetchall()]
+        
+        if incluir_arquivadas:
+            obras.extend(self.listar_obras_arquivadas(filtro))
+        return obras
+    
+    def listar_obras_arquivadas(self, filtro: str = None) -> List[Dict]:
+        """Lista as obras do arquivo morto (busca por LIKE; o arquivo não tem índice FTS)"""
+        if not self.arquivo_anexado:
+            return []
+        
+        condicao, params = self._condicao_busca_arquivo(filtro)
+        with self.conexao() as conn:
+            cursor = conn.execute(f'''
+                SELECT o.* FROM {ALIAS_ARQUIVO}.obras o
+                {'WHERE ' + condicao if condicao else ''}
+                ORDER BY o.data_inicio DESC
+            ''', params)
+            return [dict(row, arquivada=True) for row in cursor.fetchall()]
+    
+    @staticmethod
+    def _condicao_busca_arquivo(filtro: Optional[str]) -> Tuple[str, Dict]:
+        """Mesma busca por LIKE de _clausulas_busca, sobre as tabelas do arquivo morto"""
+        if not filtro or not filtro.strip():
+            return '', {}
+        colunas = ' OR '.join(f'o.{coluna} LIKE :filtro' for coluna in COLUNAS_FTS)
+        condicao = f'''(
+            {colunas}
+            OR EXISTS (SELECT 1 FROM {ALIAS_ARQUIVO}.obra_checklist oc
+                       WHERE oc.obra_id = o.id AND oc.descricao LIKE :filtro)
+        )'''
+        return condicao, {'filtro': f'%{filtro.strip()}%'}
+    
+    def listar_obras_com_resumo(self, filtro: str = None) -> List[Dict]:
+        """Lista as obras (filtro opcional) já com o resumo do checklist.
+        
+        O resumo vem da tabela obra_resumo, mantida por triggers (migração 11).
+        Além das colunas de obras, cada dicionário contém:
+            total_tarefas, tarefas_concluidas, tarefas_bloqueadas, tarefas_pendentes,
+            tarefas_atrasadas, proximo_prazo, proxima_tarefa_descricao, proxima_tarefa_data_limite
+        A próxima tarefa é a primeira (menor id) pendente e não bloqueada.
+        """
+        self._atualizar_resumo_virada_dia()
+        with self.conexao_leitura() as conn:
+            juncao, condicao, params, relevancia = self._clausulas_busca(conn, filtro)
             
-            # Insere item do checklist
-            cursor.execute('''
-                INSERT INTO obra_checklist 
-                (obra_id, template_id, descricao, prazo_dias, data_limite, tipo, 
-                 base_calculo, data_base_calculo, bloqueado, status_notificacao, recorrencia)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (obra_id, template['id'], template['nome'], template['prazo_dias'],
-                  data_limite.strftime('%Y-%m-%d') if data_limite else None,
-                  template['tipo'], template['base_calculo'], data_base, bloqueado, 
-                  'pendente', template['recorrencia']))
+            cursor = conn.execute(f'''
+                {SELECT_OBRAS_RESUMO.format(colunas_extras='')}
+                {juncao}
+                {'WHERE ' + condicao if condicao else ''}
+                ORDER BY {'busca.relevancia, ' if relevancia else ''}o.data_inicio DESC
+            ''', params)
             
-            # Armazena mapeamento
-            template_map[template['id']] = cursor.lastrowid
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def listar_obras_pagina(self, cursor: str = None, limite: int = 24,
+                            ordenacao: str = None, filtro: str = None) -> Dict:
+        """Lista uma página de obras com resumo, usando paginação por chave (keyset).
         
-        # Segunda passagem: resolver dependências fim_tarefa
-        cursor.execute('SELECT * FROM checklist_templates WHERE base_calculo = "fim_tarefa" OR depende_template_id IS NOT NULL')
-        templates_dependentes = cursor.fetchall()
+        Args:
+            cursor: Valor opaco retornado em 'proximo_cursor' da página anterior (None = primeira)
+            limite: Quantidade máxima de obras na página
+            ordenacao: Chave de ORDENACOES_OBRAS (padrão: relevância quando há busca, senão data_inicio)
+            filtro: Texto de busca (mesma busca de listar_obras)
         
-        for template in templates_dependentes:
-            item_id = template_map.get(template['id'])
-            if not item_id:
-                continue
+        Returns:
+            {'obras': [...], 'proximo_cursor': str ou None quando não há mais páginas}
+        """
+        self._atualizar_resumo_virada_dia()
+        with self.conexao_leitura() as conn:
+            juncao, condicao, params, relevancia = self._clausulas_busca(conn, filtro)
             
-            depende_template_id = template['depende_template_id']
-            if depende_template_id and depende_template_id in template_map:
-                depende_item_id = template_map[depende_template_id]
-                
-                # Atualiza dependência
-                cursor.execute('''
-                    UPDATE obra_checklist 
-                    SET depende_item_id = ?
-                    WHERE id = ?
-                ''', (depende_item_id, item_id))
-                
-                # Se a tarefa dependente estiver concluída, desbloqueia e calcula prazo
-                cursor.execute('SELECT concluido, data_conclusao FROM obra_checklist WHERE id = ?', (depende_item_id,))
-                tarefa_dep = cursor.fetchone()
-                
-                if tarefa_dep and tarefa_dep['concluido']:
-                    data_base = tarefa_dep['data_conclusao']
-                    data_obj = datetime.datetime.strptime(data_base, '%Y-%m-%d')
-                    data_limite = data_obj + datetime.timedelta(days=template['prazo_dias'])
-                    
-                    cursor.execute('''
-                        UPDATE obra_checklist 
-                        SET bloqueado = 0, data_limite = ?, data_base_calculo = ?
-                        WHERE id = ?
-                    ''', (data_limite.strftime('%Y-%m-%d'), data_base, item_id))
-
-    
-    def listar_obras(self, filtro: str = None) -> List[Dict]:
-        """Lista todas as obras, com filtro opcional"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        if filtro:
-            query = '''
-                SELECT * FROM obras 
-                WHERE nome_contrato LIKE ? OR cliente LIKE ? OR status LIKE ?
-                ORDER BY data_inicio DESC
+            if ordenacao is None or (ordenacao == 'relevancia' and not relevancia):
+                ordenacao = 'relevancia' if relevancia else 'data_inicio'
+            if ordenacao not in ORDENACOES_OBRAS:
+                raise ValueError(f"Ordenação inválida: {ordenacao}")
+            expressao, direcao = ORDENACOES_OBRAS[ordenacao]
+            
+            condicoes = [condicao] if condicao else []
+            if cursor:
+                chave, ultimo_id = self._decodificar_cursor(cursor, ordenacao)
+                comparador = '<' if direcao == 'DESC' else '>'
+                # O primeiro termo permite ao SQLite posicionar o índice; o segundo desempata pelo id
+                condicoes.append(f'{expressao} {comparador}= :cursor_chave '
+                                 f'AND ({expressao}, o.id) {comparador} (:cursor_chave, :cursor_id)')
+                params.update({'cursor_chave': chave, 'cursor_id': ultimo_id})
+            params['limite'] = limite + 1
+            
+            linhas = conn.execute(f'''
+                {SELECT_OBRAS_RESUMO.format(colunas_extras=f', {expressao} AS chave_ordenacao')}
+                {juncao}
+                {'WHERE ' + ' AND '.join(condicoes) if condicoes else ''}
+                ORDER BY {expressao} {direcao}, o.id {direcao}
+                LIMIT :limite
+            ''', params).fetchall()
+        
+        obras = [dict(row) for row in linhas[:limite]]
+        proximo_cursor = None
+        if len(linhas) > limite:
+            ultima = obras[-1]
+            proximo_cursor = self._codificar_cursor(ordenacao, ultima['chave_ordenacao'], ultima['id'])
+        for obra in obras:
+            del obra['chave_ordenacao']
+        
+        return {'obras': obras, 'proximo_cursor': proximo_cursor}
+    
+    def contar_obras(self, filtro: str = None, incluir_arquivadas: bool = False) -> int:
+        """Conta as obras que correspondem ao filtro (mesma busca de listar_obras)"""
+        with self.conexao_leitura() as conn:
+            juncao, condicao, params, _ = self._clausulas_busca(conn, filtro)
+            total = conn.execute(f'''
+                SELECT COUNT(*) FROM obras o
+                {juncao}
+                {'WHERE ' + condicao if condicao else ''}
+            ''', params).fetchone()[0]
+        
+        if incluir_arquivadas and self.arquivo_anexado:
+            condicao, params = self._condicao_busca_arquivo(filtro)
+            with self.conexao() as conn:
+                total += conn.execute(f'''
+                    SELECT COUNT(*) FROM {ALIAS_ARQUIVO}.obras o
+                    {'WHERE ' + condicao if condicao else ''}
+                ''', params).fetchone()[0]
+        return total
+    
+    @staticmethod
+    def _codificar_cursor(ordenacao: str, chave, obra_id: int) -> str:
+        """Codifica a posição da última obra da página em um cursor opaco"""
+        dados = json.dumps([ordenacao, chave, obra_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(dados).decode('ascii')
+    
+    @staticmethod
+    def _decodificar_cursor(cursor: str, ordenacao: str) -> tuple:
+        """Decodifica um cursor de listar_obras_pagina, validando a ordenação"""
+        try:
+            ordenacao_cursor, chave, obra_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Cursor de paginação inválido: {cursor}") from e
+        if ordenacao_cursor != ordenacao:
+            raise ValueError(f"Cursor gerado para ordenação '{ordenacao_cursor}', não '{ordenacao}'")
+        return chave, obra_id
+    
+    def _clausulas_busca(self, conn, filtro: Optional[str]) -> Tuple[str, str, Dict, bool]:
+        """Monta junção, condição (sem WHERE) e parâmetros da busca de obras (alias o).
+        
+        Usa o índice FTS5 obras_fts (sem acentos, por prefixo) e recorre a LIKE quando
+        o FTS5 não está disponível. O último valor indica se a junção expõe a coluna
+        busca.relevancia (bm25, menor é mais relevante).
+        """
+        if not filtro or not filtro.strip():
+            return '', '', {}, False
+        
+        if self._fts_disponivel is None:
+            self._fts_disponivel = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'obras_fts'"
+            ).fetchone() is not None
+        
+        consulta = montar_consulta_fts(filtro)
+        if self._fts_disponivel and consulta:
+            juncao = f'''
+                JOIN (
+                    SELECT rowid AS obra_id, bm25(obras_fts, {PESOS_BUSCA}) AS relevancia
+                    FROM obras_fts WHERE obras_fts MATCH :consulta
+                ) busca ON busca.obra_id = o.id
             '''
-            cursor.execute(query, (f'%{filtro}%', f'%{filtro}%', f'%{filtro}%'))
-        else:
-            cursor.execute('SELECT * FROM obras ORDER BY data_inicio DESC')
+            return juncao, '', {'consulta': consulta}, True
         
-        obras = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        colunas = ' OR '.join(f'o.{coluna} LIKE :filtro' for coluna in COLUNAS_FTS)
+        condicao = f'''(
+            {colunas}
+            OR EXISTS (SELECT 1 FROM obra_checklist oc WHERE oc.obra_id = o.id AND oc.descricao LIKE :filtro)
+        )'''
+        return '', condicao, {'filtro': f'%{filtro.strip()}%'}, False
+    
+    def _atualizar_resumo_virada_dia(self):
+        """Recalcula tarefas_atrasadas de obra_resumo calculadas em dias anteriores.
+        Os triggers só atualizam o resumo quando o checklist muda, mas o status
+        "atrasada" também muda com a passagem do dia.
+        """
+        hoje = datetime.date.today().strftime('%Y-%m-%d')
+        if self._data_resumo == hoje:
+            return
         
-        return obras
+        # Só envia escrita se houver linhas desatualizadas (consulta no arquivo compartilhado)
+        with self.conexao() as conn:
+            desatualizado = conn.execute(
+                'SELECT 1 FROM obra_resumo WHERE data_referencia < ? LIMIT 1', (hoje,)
+            ).fetchone()
+        
+        def gravar(conn):
+            # Só pode haver atraso se o prazo pendente mais antigo já passou
+            conn.execute('''
+                UPDATE obra_resumo
+                SET tarefas_atrasadas = CASE
+                        WHEN proximo_prazo < :hoje THEN (
+                            SELECT COUNT(*) FROM obra_checklist oc
+                            WHERE oc.obra_id = obra_resumo.obra_id AND oc.concluido = 0
+                            AND oc.data_limite != \'\' AND oc.data_limite < :hoje
+                        )
+                        ELSE 0
+                    END,
+                    data_referencia = :hoje
+                WHERE data_referencia < :hoje
+            ''', {'hoje': hoje})
+        
+        if desatualizado:
+            self._escrever(gravar)
+        
+        self._data_resumo = hoje
     
     def obter_obra(self, obra_id: int) -> Optional[Dict]:
         """Obtém uma obra específica por ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.conexao_leitura() as conn:
+            obra = conn.execute('SELECT * FROM obras WHERE id = ?', (obra_id,)).fetchone()
         
-        cursor.execute('SELECT * FROM obras WHERE id = ?', (obra_id,))
-        obra = cursor.fetchone()
-        
-        conn.close()
+        if obra is None and self.arquivo_anexado:
+            # Obra arquivada: leitura direta do arquivo morto
+            with self.conexao() as conn:
+                obra = conn.execute(f'SELECT * FROM {ALIAS_ARQUIVO}.obras WHERE id = ?', (obra_id,)).fetchone()
+            return dict(obra, arquivada=True) if obra else None
         
         return dict(obra) if obra else None
     
     def atualizar_obra(self, obra_id: int, nome_contrato: str, cliente: str, 
                        valor_contrato: float, data_inicio: str, status: str, **kwargs) -> bool:
-        """Atualiza uma obra existente. Retorna True se requer confirmação de recálculo"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+        """Atualiza uma obra existente. Campos omitidos em kwargs ficam como estão.
+        Retorna True se alguma data-base mudou e os prazos do checklist foram recalculados"""
+        alteracoes = {'nome_contrato': nome_contrato, 'cliente': cliente, 'valor_contrato': valor_contrato,
+                      'data_inicio': data_inicio, 'status': status, **kwargs}
+        return bool(self.atualizar_campos_obra(obra_id, alteracoes)['recalculados'])
+    
+    def atualizar_campos_obra(self, obra_id: int, alteracoes: Dict) -> Dict:
+        """Grava apenas os campos que mudaram e, na mesma transação, recalcula os prazos das
+        tarefas cujas datas-base (data_inicio, data_acionamento, data_assinatura, data_aio) mudaram.
         
-            # Busca dados antigos para comparação
-            cursor.execute('SELECT data_inicio, data_assinatura, data_aio, data_acionamento FROM obras WHERE id = ?', (obra_id,))
-            obra_antiga = cursor.fetchone()
-            
-            # Extrai campos adicionais e converte strings vazias para None
-            contrato_ic = kwargs.get('contrato_ic', None) or None
-            pedido_sap = kwargs.get('pedido_sap', None) or None
-            prefixo_agencia = kwargs.get('prefixo_agencia', None) or None
-            servico = kwargs.get('servico', None) or None
-            valor_parceiro = kwargs.get('valor_parceiro', None) or None
-            valor_percentual = kwargs.get('valor_percentual', None) or None
-            total_obra = kwargs.get('total_obra', None) or None
-            mes_execucao = kwargs.get('mes_execucao', None) or None
-            ano_execucao = kwargs.get('ano_execucao', None)
-            data_conclusao = kwargs.get('data_conclusao', None) or None
-            data_assinatura = kwargs.get('data_assinatura', None) or None
-            data_aio = kwargs.get('data_aio', None) or None
-            data_acionamento = kwargs.get('data_acionamento', None) or None
-            
-            # Converte string vazia de data_inicio para None
-            data_inicio = data_inicio or None
-            
-            cursor.execute('''
-                UPDATE obras 
-                SET nome_contrato = ?, cliente = ?, valor_contrato = ?, 
-                    data_inicio = ?, status = ?, contrato_ic = ?, pedido_sap = ?, prefixo_agencia = ?,
-                    servico = ?, valor_parceiro = ?, valor_percentual = ?, total_obra = ?,
-                    mes_execucao = ?, ano_execucao = ?, data_conclusao = ?, 
-                    data_assinatura = ?, data_aio = ?, data_acionamento = ?
-                WHERE id = ?
-            ''', (nome_contrato, cliente, valor_contrato, data_inicio, status,
-                  contrato_ic, pedido_sap, prefixo_agencia, servico, valor_parceiro, valor_percentual, total_obra,
-                  mes_execucao, ano_execucao, data_conclusao, data_assinatura, data_aio, data_acionamento, obra_id))
-            
-            # Verifica se houve mudança em datas críticas
-            requer_confirmacao = False
-            if obra_antiga:
-                # Verifica mudança em data_inicio
-                if obra_antiga['data_inicio'] != data_inicio:
-                    # Verifica se existem tarefas com base_calculo='inicio'
-                    cursor.execute('''
-                        SELECT COUNT(*) as count FROM obra_checklist 
-                        WHERE obra_id = ? AND base_calculo = 'inicio'
-                    ''', (obra_id,))
-                    if cursor.fetchone()['count'] > 0:
-                        requer_confirmacao = True
-                
-                # Verifica mudança em data_acionamento
-                if obra_antiga['data_acionamento'] != data_acionamento:
-                    cursor.execute('''
-                        SELECT COUNT(*) as count FROM obra_checklist 
-                        WHERE obra_id = ? AND base_calculo = 'criacao'
-                    ''', (obra_id,))
-                    if cursor.fetchone()['count'] > 0:
-                        requer_confirmacao = True
-                
-                # Verifica mudança em data_assinatura ou data_aio
-                if obra_antiga['data_assinatura'] != data_assinatura or obra_antiga['data_aio'] != data_aio:
-                    # Verifica se existem tarefas concluídas que dependem dessas datas
-                    cursor.execute('''
-                        SELECT COUNT(*) as count FROM obra_checklist 
-                        WHERE obra_id = ? AND concluido = 1 
-                        AND (base_calculo = 'assinatura' OR base_calculo = 'aio')
-                    ''', (obra_id,))
-                    if cursor.fetchone()['count'] > 0:
-                        requer_confirmacao = True
-            
-            conn.commit()
-            conn.close()
+        Limpar data_acionamento, data_assinatura ou data_aio só grava NULL na obra: o checklist
+        não é recalculado (tarefas com gatilho são reabertas apenas pelo checkbox, via
+        marcar_item_checklist). Limpar data_inicio bloqueia as tarefas baseadas nela.
+        
+        Args:
+            obra_id: ID da obra
+            alteracoes: {campo: novo valor} com campos de CAMPOS_OBRA ('' é gravado como NULL)
+        
+        Returns:
+            {'alterados': [campos gravados], 'recalculados': [datas-base recalculadas],
+             'tarefas_atualizadas': n}
+        
+        Raises:
+            ValueError: campo inválido ou obra inexistente no banco principal (ex: arquivada)
+        """
+        invalidos = set(alteracoes) - set(CAMPOS_OBRA)
+        if invalidos:
+            raise ValueError(f"Campo(s) de obra inválido(s): {', '.join(sorted(invalidos))}")
+        valores = {campo: None if valor == '' else valor for campo, valor in alteracoes.items()}
+        
+        def gravar(conn):
+            resultado = {'alterados': [], 'recalculados': [], 'tarefas_atualizadas': 0}
+            if not valores:
+                return resultado
+            atual = conn.execute(f'SELECT {", ".join(valores)} FROM obras WHERE id = ?', (obra_id,)).fetchone()
+            if atual is None:
+                return None
             
-            return requer_confirmacao
+            diferencas = {campo: valor for campo, valor in valores.items() if atual[campo] != valor}
+            if not diferencas:
+                return resultado
+            atribuicoes = ', '.join(f'{campo} = ?' for campo in diferencas)
+            conn.execute(f'UPDATE obras SET {atribuicoes} WHERE id = ?', (*diferencas.values(), obra_id))
+            resultado['alterados'] = list(diferencas)
             
+            for campo in BASE_POR_CAMPO:
+                if campo not in diferencas:
+                    continue
+                if not diferencas[campo] and campo in DATAS_LIMPAS_SEM_RECALCULO:
+                    continue
+                resultado['tarefas_atualizadas'] += self._recalcular_por_data(
+                    conn, obra_id, campo, diferencas[campo])
+                resultado['recalculados'].append(campo)
+            return resultado
+        
+        try:
+            resultado = self._escrever(gravar)
         except Exception as e:
-            log_error(e, "database", f"Atualizar obra - ID: {obra_id}, Nome: {nome_contrato}")
-            if 'conn' in locals():
-                try:
-                    conn.close()
-                except:
-                    pass
+            log_error(e, "database", f"Atualizar obra - ID: {obra_id}, campos: {', '.join(valores)}")
             raise
+        
+        # Obra ausente é erro de quem chamou (ex: obra arquivada), não falha do banco: não vai ao log
+        if resultado is None:
+            raise ValueError(MENSAGEM_OBRA_AUSENTE.format(obra_id=obra_id))
+        if resultado['alterados']:
+            logger.debug("✏️ Obra %s: %s alterado(s), %s tarefa(s) recalculada(s)", obra_id,
+                         ', '.join(resultado['alterados']), resultado['tarefas_atualizadas'])
+        return resultado
     
     def deletar_obra(self, obra_id: int):
-        """Deleta uma obra e seu checklist"""
+        """Deleta uma obra e seu checklist. Lança ValueError se a obra não estiver no banco principal"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM obra_checklist WHERE obra_id = ?', (obra_id,))
-            cursor.execute('DELETE FROM obras WHERE id = ?', (obra_id,))
+            def gravar(conn):
+                cursor = conn.cursor()
+                
+                cursor.execute('DELETE FROM obra_checklist WHERE obra_id = ?', (obra_id,))
+                cursor.execute('DELETE FROM obras WHERE id = ?', (obra_id,))
+                return cursor.rowcount
             
-            conn.commit()
-            conn.close()
+            removidas = self._escrever(gravar)
             
         except Exception as e:
             log_error(e, "database", f"Deletar obra - ID: {obra_id}")
-            if 'conn' in locals():
-                try:
-                    conn.close()
-                except:
-                    pass
             raise
+        
+        if removidas == 0:
+            raise ValueError(MENSAGEM_OBRA_AUSENTE.format(obra_id=obra_id))
     
     def recalcular_checklist(self, obra_id: int, campo_atualizado: str, nova_data: str):
         """Recalcula prazos do checklist quando data crítica é alterada"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        base_calculo_map = {
-            'data_assinatura': 'assinatura',
-            'data_aio': 'aio',
-            'data_inicio': 'inicio',
-            'data_acionamento': 'criacao'
-        }
-        
-        base_calculo = base_calculo_map.get(campo_atualizado)
-        if not base_calculo:
-            conn.close()
+        if campo_atualizado not in BASE_POR_CAMPO:
             return
         
-        # Se nova_data está vazia, bloqueia as tarefas relacionadas
+        tarefas_atualizadas = self._escrever(self._recalcular_por_data, obra_id, campo_atualizado, nova_data)
         if not nova_data or not nova_data.strip():
-            print(f"\n🔒 Data {campo_atualizado} removida. Bloqueando tarefas relacionadas...")
-            cursor.execute('''
-                UPDATE obra_checklist 
-                SET bloqueado = 1, data_limite = NULL, data_base_calculo = NULL
-                WHERE obra_id = ? AND base_calculo = ? AND concluido = 0
-            ''', (obra_id, base_calculo))
-            
-            # Se for data_inicio, bloqueia também tarefas mensais
-            if campo_atualizado == 'data_inicio':
-                cursor.execute('''
-                    UPDATE obra_checklist 
-                    SET bloqueado = 1
-                    WHERE obra_id = ? AND recorrencia = 'mensal' AND concluido = 0
-                ''', (obra_id,))
-            
-            conn.commit()
-            conn.close()
-            print(f"✅ Tarefas bloqueadas com sucesso\n")
-            return
-        
-        print(f"\n🔄 Recalculando tarefas com base_calculo='{base_calculo}' para obra {obra_id}...")
-        print(f"   Nova data base: {nova_data}")
+            logger.info("🔒 %s removida (obra %s): %s tarefa(s) bloqueada(s)", campo_atualizado, obra_id, tarefas_atualizadas)
+        else:
+            logger.info("🔄 Recálculo de %s=%s (obra %s): %s tarefa(s) atualizada(s)", campo_atualizado, nova_data, obra_id, tarefas_atualizadas)
+        return tarefas_atualizadas
+    
+    def _recalcular_por_data(self, conn, obra_id: int, campo_atualizado: str, nova_data: Optional[str]) -> int:
+        """Recalcula as tarefas da obra baseadas em campo_atualizado (executado na thread de escrita)"""
+        if not nova_data or not nova_data.strip():
+            # Remoção de data pode reabrir tarefas com gatilho e limpar outras datas: usa o grafo
+            logger.debug("🔒 Data %s removida. Bloqueando tarefas relacionadas...", campo_atualizado)
+            grafo = self._carregar_grafo(conn, obra_id)
+            if grafo is None:
+                return 0
+            grafo.alterar_data(campo_atualizado, None)
+            return self._gravar_grafo(conn, obra_id, grafo)
         
-        # Debug: Mostra TODAS as tarefas da obra
-        cursor.execute('SELECT descricao, base_calculo, concluido, bloqueado, data_limite, recorrencia FROM obra_checklist WHERE obra_id = ?', (obra_id,))
-        todas = cursor.fetchall()
-        print(f"   === DEBUG: TODAS as tarefas da obra ===")
-        for t in todas:
-            print(f"   - {t['descricao']}: base={t['base_calculo']}, concluido={t['concluido']}, bloqueado={t['bloqueado']}, limite={t['data_limite']}, recorrencia={t['recorrencia']}")
-        print(f"   =====================================")
+        params = {'obra_id': obra_id, 'base_calculo': BASE_POR_CAMPO[campo_atualizado], 'nova_data': nova_data}
+        total = conn.execute(self._sql_recalcular_prazos(
+            ':nova_data', 'obra_id = :obra_id AND base_calculo = :base_calculo AND depende_item_id IS NULL'),
+            params).rowcount
         
-        # Se campo atualizado é data_inicio, verifica se deve desbloquear tarefas mensais
         if campo_atualizado == 'data_inicio':
-            hoje = datetime.date.today()
-            data_inicio_obj = datetime.datetime.strptime(nova_data, '%Y-%m-%d').date()
-            
-            if data_inicio_obj <= hoje:
-                # Obra já começou: desbloqueia tarefas mensais
-                cursor.execute('''
-                    UPDATE obra_checklist 
-                    SET bloqueado = 0
-                    WHERE obra_id = ? AND recorrencia = 'mensal' AND bloqueado = 1
-                ''', (obra_id,))
-                rows_updated = cursor.rowcount
-                if rows_updated > 0:
-                    print(f"   ✅ Desbloqueadas {rows_updated} tarefa(s) mensal(is)")
-            else:
-                # Obra ainda não começou: bloqueia tarefas mensais
-                cursor.execute('''
-                    UPDATE obra_checklist 
-                    SET bloqueado = 1
-                    WHERE obra_id = ? AND recorrencia = 'mensal' AND concluido = 0
-                ''', (obra_id,))
-                rows_updated = cursor.rowcount
-                if rows_updated > 0:
-                    print(f"   🔒 Bloqueadas {rows_updated} tarefa(s) mensal(is)")
-        
-        # Busca tarefas que dependem dessa data (não concluídas)
-        cursor.execute('''
-            SELECT * FROM obra_checklist 
-            WHERE obra_id = ? AND base_calculo = ? AND concluido = 0
-        ''', (obra_id, base_calculo))
-        
-        tarefas = cursor.fetchall()
-        print(f"   Tarefas encontradas para recálculo: {len(tarefas)}")
-        
-        tarefas_atualizadas = 0
-        for tarefa in tarefas:
-            # Recalcula data_limite usando o prazo_dias da própria tarefa
-            data_obj = datetime.datetime.strptime(nova_data, '%Y-%m-%d')
-            prazo_dias = tarefa['prazo_dias']
-            
-            # Suporta prazos negativos (regressivos)
-            nova_data_limite = data_obj + datetime.timedelta(days=prazo_dias)
-            
-            print(f"   📝 {tarefa['descricao']}: prazo={prazo_dias} dias, antiga={tarefa['data_limite']}, nova={nova_data_limite.strftime('%d/%m/%Y')}")
+            params['bloqueado'] = 0 if nova_data <= datetime.date.today().strftime('%Y-%m-%d') else 1
+            total += conn.execute(SQL_TRAVA_MENSAL.format(bloqueado=':bloqueado', filtro='obra_id = :obra_id'),
+                                  params).rowcount
+        return total
+    
+    def recalcular_checklists(self, obra_ids: Optional[List[int]] = None) -> int:
+        """Recalcula prazos e travas mensais de várias obras (todas, se obra_ids for None).
+        Usa as datas gravadas em obras e a conclusão das tarefas das quais cada item depende.
+        """
+        def gravar(conn):
+            if obra_ids is None:
+                return self._recalcular_prazos(conn, '1', [])
             
-            # Atualiza tarefa
-            cursor.execute('''
-                UPDATE obra_checklist 
-                SET data_limite = ?, data_base_calculo = ?, bloqueado = 0, 
-                    tentativas_reiteracao = 0, status_notificacao = 'pendente'
-                WHERE id = ?
-            ''', (nova_data_limite.strftime('%Y-%m-%d'), nova_data, tarefa['id']))
+            ids = list(obra_ids)
+            total = 0
+            for inicio in range(0, len(ids), LIMITE_PARAMETROS_SQL):
+                bloco = ids[inicio:inicio + LIMITE_PARAMETROS_SQL]
+                total += self._recalcular_prazos(conn, f"obra_id IN ({', '.join('?' * len(bloco))})", bloco)
+            return total
+        
+        return self._escrever(gravar)
+    
+    def atualizar_prazo_template(self, template_id: int, prazo_dias: int) -> int:
+        """Altera o prazo de um template e recalcula os itens pendentes criados a partir dele.
+        Retorna a quantidade de itens com prazo recalculado.
+        """
+        try:
+            def gravar(conn):
+                conn.execute('UPDATE checklist_templates SET prazo_dias = ? WHERE id = ?', (prazo_dias, template_id))
+                conn.execute('''
+                    UPDATE obra_checklist SET prazo_dias = ?
+                    WHERE template_id = ? AND concluido = 0 AND prazo_dias != ?
+                ''', (prazo_dias, template_id, prazo_dias))
+                return self._recalcular_prazos(conn, 'template_id = ?', [template_id])
             
-            print(f"   ✅ Recalculado: {tarefa['descricao']} -> {nova_data_limite.strftime('%d/%m/%Y')}")
-            tarefas_atualizadas += 1
+            return self._escrever(gravar)
+        except Exception as e:
+            log_error(e, "database", f"Atualizar prazo do template - ID: {template_id}")
+            raise
+    
+    def _recalcular_prazos(self, conn, filtro: str, params: list) -> int:
+        """Aplica os recálculos em lote às linhas de obra_checklist que satisfazem o filtro"""
+        total = conn.execute(self._sql_recalcular_prazos(
+            DATA_BASE_OBRA, f"{filtro} AND depende_item_id IS NULL AND base_calculo IN ('inicio', 'criacao', 'assinatura', 'aio')"),
+            params).rowcount
+        total += conn.execute(self._sql_recalcular_prazos(
+            DATA_BASE_DEPENDENCIA, f"{filtro} AND depende_item_id IS NOT NULL"), params).rowcount
+        total += conn.execute(SQL_TRAVA_MENSAL.format(bloqueado=BLOQUEIO_MENSAL_OBRA, filtro=filtro), params).rowcount
+        return total
+    
+    @staticmethod
+    def _sql_recalcular_prazos(data_base: str, filtro: str) -> str:
+        return SQL_RECALCULAR_PRAZOS.format(
+            data_base=data_base, filtro=filtro,
+            nova_data_limite=f"date({data_base}, prazo_dias || ' days')")
+    
+    def _carregar_grafo(self, conn, obra_id: int) -> Optional[GrafoChecklist]:
+        """Monta o grafo de dependências do checklist da obra (uma consulta por tabela)"""
+        obra = conn.execute('SELECT * FROM obras WHERE id = ?', (obra_id,)).fetchone()
+        if not obra:
+            return None
         
-        conn.commit()
-        conn.close()
+        itens = conn.execute('SELECT * FROM obra_checklist WHERE obra_id = ?', (obra_id,)).fetchall()
+        triggers = {template['id']: template['trigger_ui']
+                    for template in self._obter_templates(conn) if template['trigger_ui']}
+        return GrafoChecklist(dict(obra), (dict(item) for item in itens), triggers)
+    
+    def _gravar_grafo(self, conn, obra_id: int, grafo: GrafoChecklist) -> int:
+        """Grava apenas as datas e itens que o grafo alterou. Retorna a quantidade de itens alterados"""
+        datas_obra = grafo.alteracoes_obra()
+        if datas_obra:
+            atribuicoes = ', '.join(f'{campo} = ?' for campo in datas_obra)
+            conn.execute(f'UPDATE obras SET {atribuicoes} WHERE id = ?', (*datas_obra.values(), obra_id))
         
-        print(f"🔄 Recálculo concluído: {tarefas_atualizadas} tarefa(s) atualizada(s)\n")
-        return tarefas_atualizadas
+        # Agrupa por conjunto de colunas para gravar cada grupo com um único executemany
+        grupos: Dict[tuple, List[tuple]] = {}
+        alteracoes = grafo.alteracoes_itens()
+        for item_id, colunas in alteracoes:
+            grupos.setdefault(tuple(colunas), []).append((*colunas.values(), item_id))
+        for colunas, linhas in grupos.items():
+            atribuicoes = ', '.join(f'{coluna} = ?' for coluna in colunas)
+            conn.executemany(f'UPDATE obra_checklist SET {atribuicoes} WHERE id = ?', linhas)
+        
+        return len(alteracoes)
     
     # ========== CRUD CHECKLIST ========== #
     def obter_checklist(self, obra_id: int) -> List[Dict]:
-        """Obtém o checklist de uma obra"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM obra_checklist 
-            WHERE obra_id = ? 
-            ORDER BY id
-        ''', (obra_id,))
+        """Obtém o checklist de uma obra (do arquivo morto, se a obra estiver arquivada)"""
+        with self.conexao_leitura() as conn:
+            cursor = conn.execute('''
+                SELECT * FROM obra_checklist 
+                WHERE obra_id = ? 
+                ORDER BY id
+            ''', (obra_id,))
+            
+            checklist = [dict(row) for row in cursor.fetchall()]
         
-        checklist = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        if not checklist and self.arquivo_anexado:
+            with self.conexao() as conn:
+                cursor = conn.execute(f'''
+                    SELECT * FROM {ALIAS_ARQUIVO}.obra_checklist
+                    WHERE obra_id = ?
+                    ORDER BY id
+                ''', (obra_id,))
+                checklist = [dict(row) for row in cursor.fetchall()]
         
         return checklist
     
-    def obter_item_checklist(self, item_id: int) -> Optional[Dict]:
-        """Obtém um item específico do checklist"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def obter_checklists_em_lote(self, obra_ids: List[int]) -> Dict[int, List[Dict]]:
+        """Obtém os checklists de várias obras de uma vez, agrupados por obra_id.
+        Evita uma consulta por card ao renderizar o dashboard.
+        """
+        checklists = {obra_id: [] for obra_id in obra_ids}
+        if not checklists:
+            return checklists
         
-        cursor.execute('''
-            SELECT * FROM obra_checklist 
-            WHERE id = ?
-        ''', (item_id,))
+        ids = list(checklists)
+        with self.conexao_leitura() as conn:
+            # Divide em blocos para respeitar o limite de parâmetros do SQLite
+            for inicio in range(0, len(ids), LIMITE_PARAMETROS_SQL):
+                bloco = ids[inicio:inicio + LIMITE_PARAMETROS_SQL]
+                marcadores = ', '.join('?' * len(bloco))
+                cursor = conn.execute(f'''
+                    SELECT * FROM obra_checklist 
+                    WHERE obra_id IN ({marcadores}) 
+                    ORDER BY obra_id, id
+                ''', bloco)
+                
+                for row in cursor:
+                    checklists[row['obra_id']].append(dict(row))
         
-        row = cursor.fetchone()
-        conn.close()
+        return checklists
+    
+    def obter_item_checklist(self, item_id: int) -> Optional[Dict]:
+        """Obtém um item específico do checklist"""
+        with self.conexao_leitura() as conn:
+            row = conn.execute('''
+                SELECT * FROM obra_checklist 
+                WHERE id = ?
+            ''', (item_id,)).fetchone()
         
         return dict(row) if row else None
 
@@ -671,142 +1184,169 @@ class Database:
         if campo not in ('data_assinatura', 'data_aio'):
             raise ValueError(f"Campo de data crítica inválido: {campo}")
         
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(f'UPDATE obras SET {campo} = ? WHERE id = ?', (data or None, obra_id))
-        conn.commit()
-        conn.close()
+        def gravar(conn):
+            conn.execute(f'UPDATE obras SET {campo} = ? WHERE id = ?', (data or None, obra_id))
+        
+        self._escrever(gravar)
     
     def marcar_item_checklist(self, item_id: int, concluido: bool) -> Optional[str]:
-        """Marca/desmarca um item do checklist. Retorna trigger_ui se houver"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        trigger_ui = None
-        
-        # Busca trigger_ui e obra_id (necessário tanto ao marcar quanto desmarcar)
-        cursor.execute('''
-            SELECT ct.trigger_ui, oc.obra_id 
-            FROM obra_checklist oc
-            JOIN checklist_templates ct ON oc.template_id = ct.id
-            WHERE oc.id = ?
-        ''', (item_id,))
-        row_info = cursor.fetchone()
-        obra_id = row_info['obra_id'] if row_info else None
-        if row_info and row_info['trigger_ui']:
-            trigger_ui = row_info['trigger_ui']
-        
-        if concluido:
-            data_conclusao = datetime.datetime.now().strftime('%Y-%m-%d')
-            cursor.execute('''
-                UPDATE obra_checklist 
-                SET concluido = 1, data_conclusao = ?
-                WHERE id = ?
-            ''', (data_conclusao, item_id))
-            
-            # Desbloqueia tarefas dependentes
-            cursor.execute('''
-                SELECT id, prazo_dias FROM obra_checklist 
-                WHERE depende_item_id = ? AND concluido = 0
-            ''', (item_id,))
-            
-            dependentes = cursor.fetchall()
-            for dep in dependentes:
-                # Calcula nova data_limite baseada na data de conclusão
-                data_obj = datetime.datetime.strptime(data_conclusao, '%Y-%m-%d')
-                nova_data_limite = data_obj + datetime.timedelta(days=dep['prazo_dias'])
-                
-                cursor.execute('''
-                    UPDATE obra_checklist 
-                    SET bloqueado = 0, data_limite = ?, data_base_calculo = ?
-                    WHERE id = ?
-                ''', (nova_data_limite.strftime('%Y-%m-%d'), data_conclusao, dep['id']))
-        else:
-            cursor.execute('''
-                UPDATE obra_checklist 
-                SET concluido = 0, data_conclusao = NULL
-                WHERE id = ?
-            ''', (item_id,))
+        """Marca/desmarca um item do checklist. Retorna trigger_ui se houver.
+        Dependentes, datas com gatilho e itens baseados nelas são atualizados em cascata.
+        Lança ValueError se o item não estiver no banco principal (ex: obra arquivada).
+        """
+        def gravar(conn):
+            item = conn.execute('SELECT obra_id, template_id FROM obra_checklist WHERE id = ?', (item_id,)).fetchone()
+            if not item:
+                raise ValueError(f"Item {item_id} do checklist não encontrado (obras arquivadas não podem ser alteradas)")
             
-            # Rebloqueia tarefas dependentes diretas (por depende_item_id)
-            cursor.execute('''
-                UPDATE obra_checklist 
-                SET bloqueado = 1, data_limite = NULL
-                WHERE depende_item_id = ? AND concluido = 0
-            ''', (item_id,))
+            grafo = self._carregar_grafo(conn, item['obra_id'])
+            grafo.marcar(item_id, concluido)
+            self._gravar_grafo(conn, item['obra_id'], grafo)
             
-            # Se tem trigger_ui, limpa a data correspondente e rebloqueia tarefas baseadas nela
-            if trigger_ui and obra_id:
-                # Mapa trigger_ui -> campo na tabela obras e base_calculo no checklist
-                trigger_map = {
-                    'data_assinatura': ('data_assinatura', 'assinatura'),
-                    'data_aio': ('data_aio', 'aio'),
-                }
-                if trigger_ui in trigger_map:
-                    campo_obra, base_calculo = trigger_map[trigger_ui]
-                    
-                    # Limpa a data na tabela obras
-                    cursor.execute(f'UPDATE obras SET {campo_obra} = NULL WHERE id = ?', (obra_id,))
-                    
-                    # Rebloqueia e limpa prazos de tarefas que dependem dessa data
-                    cursor.execute('''
-                        UPDATE obra_checklist 
-                        SET bloqueado = 1, data_limite = NULL, data_base_calculo = NULL
-                        WHERE obra_id = ? AND base_calculo = ? AND concluido = 0
-                    ''', (obra_id, base_calculo))
-                    
-                    # Tarefas com base_calculo dessa data que foram concluídas e têm trigger_ui
-                    # também devem ter seus efeitos cascateados (ex: desmarcar CONTRATO ASSINADO
-                    # limpa data_assinatura, que afeta SOLICITAR A DATA DA AIO que tem trigger_ui=data_aio)
-                    cursor.execute('''
-                        SELECT oc.id, ct.trigger_ui
-                        FROM obra_checklist oc
-                        JOIN checklist_templates ct ON oc.template_id = ct.id
-                        WHERE oc.obra_id = ? AND oc.base_calculo = ? AND oc.concluido = 1
-                        AND ct.trigger_ui IS NOT NULL
-                    ''', (obra_id, base_calculo))
-                    
-                    tarefas_cascata = cursor.fetchall()
-                    for tarefa_cascata in tarefas_cascata:
-                        # Desmarca a tarefa em cascata
-                        cursor.execute('''
-                            UPDATE obra_checklist 
-                            SET concluido = 0, data_conclusao = NULL
-                            WHERE id = ?
-                        ''', (tarefa_cascata['id'],))
-                        
-                        # Se essa tarefa cascateada também tem trigger_ui, limpa a data correspondente
-                        cascata_trigger = tarefa_cascata['trigger_ui']
-                        if cascata_trigger in trigger_map:
-                            campo_cascata, base_cascata = trigger_map[cascata_trigger]
-                            cursor.execute(f'UPDATE obras SET {campo_cascata} = NULL WHERE id = ?', (obra_id,))
-                            cursor.execute('''
-                                UPDATE obra_checklist 
-                                SET bloqueado = 1, data_limite = NULL, data_base_calculo = NULL
-                                WHERE obra_id = ? AND base_calculo = ? AND concluido = 0
-                            ''', (obra_id, base_cascata))
-        
-        conn.commit()
-        conn.close()
-        
-        return trigger_ui
+            template = next((t for t in self._obter_templates(conn) if t['id'] == item['template_id']), None)
+            return template['trigger_ui'] if template else None
+        
+        return self._escrever(gravar)
     
     def obter_tarefas_atrasadas(self) -> List[Dict]:
         """Retorna tarefas não concluídas que passaram do prazo"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.conexao_leitura() as conn:
+            # dia_limite: número do dia (coluna gerada), comparação inteira e sem datas vazias
+            cursor = conn.execute('''
+                SELECT oc.*, o.nome_contrato, o.cliente
+                FROM obra_checklist oc
+                JOIN obras o ON oc.obra_id = o.id
+                WHERE oc.concluido = 0 AND oc.dia_limite < ?
+                ORDER BY oc.dia_limite
+            ''', (hoje_dia(),))
+            
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def obter_tarefas_por_periodo(self, inicio: str, fim: str, filtros: Dict = None) -> Iterator[Dict]:
+        """Tarefas pendentes e desbloqueadas de todas as obras com prazo entre inicio e fim
+        (AAAA-MM-DD, inclusivas), em ordem de prazo.
         
-        hoje = datetime.date.today().strftime('%Y-%m-%d')
+        A consulta percorre só o trecho do índice idx_obra_checklist_pendentes_dia dentro do
+        período. As linhas são lidas em lotes conforme o iterador avança; a conexão fica
+        emprestada até o iterador terminar (ou ser fechado).
+        
+        Args:
+            filtros: Condições opcionais de FILTROS_TAREFAS (ex: {'cliente': 'Banco X'})
+        """
+        dia_inicio, dia_fim = dia_epoca(inicio), dia_epoca(fim)
+        if dia_inicio is None or dia_fim is None:
+            raise ValueError(f"Período inválido: {inicio!r} a {fim!r}")
+        
+        filtros = {campo: valor for campo, valor in (filtros or {}).items() if valor not in (None, '')}
+        invalidos = set(filtros) - set(FILTROS_TAREFAS)
+        if invalidos:
+            raise ValueError(f"Filtros desconhecidos: {', '.join(sorted(invalidos))}")
+        condicoes = ''.join(f' AND {FILTROS_TAREFAS[campo]}' for campo in filtros)
         
-        cursor.execute('''
-            SELECT oc.*, o.nome_contrato, o.cliente
+        return self._iterar_consulta(f'''
+            SELECT oc.id, oc.obra_id, oc.descricao, oc.tipo, oc.data_limite, oc.dia_limite,
+                   oc.recorrencia, oc.tentativas_reiteracao, oc.ultima_notificacao,
+                   o.nome_contrato, o.cliente, o.status AS status_obra
             FROM obra_checklist oc
             JOIN obras o ON oc.obra_id = o.id
-            WHERE oc.concluido = 0 AND oc.data_limite < ?
-            ORDER BY oc.data_limite
-        ''', (hoje,))
+            WHERE oc.concluido = 0 AND oc.bloqueado = 0
+              AND oc.dia_limite BETWEEN :inicio AND :fim{condicoes}
+            ORDER BY oc.dia_limite, oc.id
+        ''', {'inicio': dia_inicio, 'fim': dia_fim, **filtros})
+    
+    def _iterar_consulta(self, sql: str, params) -> Iterator[Dict]:
+        """Executa a consulta na conexão de leitura e gera as linhas em lotes de TAMANHO_LOTE_LEITURA"""
+        with self.conexao_leitura() as conn:
+            cursor = conn.execute(sql, params)
+            while True:
+                linhas = cursor.fetchmany(TAMANHO_LOTE_LEITURA)
+                if not linhas:
+                    break
+                for row in linhas:
+                    yield dict(row)
+
+    
+    # ========== HISTÓRICO DE NOTIFICAÇÕES ========== #
+    def listar_historico(self, obra_id: int = None, periodo: Tuple[Optional[str], Optional[str]] = None,
+                         tipo: str = None, cursor: str = None, limite: int = 50) -> Dict:
+        """Lista o histórico de notificações, do envio mais recente ao mais antigo, paginado por chave.
+        Inclui os registros já movidos para o arquivo morto.
+        
+        Args:
+            obra_id: Apenas notificações da obra
+            periodo: (data inicial, data final) AAAA-MM-DD, inclusivas; qualquer uma pode ser None
+            tipo: tipo_notificacao (ex: 'reiteracao_1', 'tipo_b')
+            cursor: Valor de 'proximo_cursor' da página anterior (None = primeira)
+            limite: Quantidade máxima de registros na página
         
-        tarefas = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        Returns:
+            {'registros': [...], 'proximo_cursor': str ou None quando não há mais páginas}
+        """
+        condicoes, params = [], {'limite': limite + 1}
+        if obra_id is not None:
+            condicoes.append('h.obra_id = :obra_id')
+            params['obra_id'] = obra_id
+        inicio, fim = periodo or (None, None)
+        if inicio:
+            condicoes.append('h.data_envio >= :inicio')
+            params['inicio'] = inicio
+        if fim:
+            condicoes.append("h.data_envio < date(:fim, '+1 day')")
+            params['fim'] = fim
+        if tipo:
+            condicoes.append('h.tipo_notificacao = :tipo')
+            params['tipo'] = tipo
+        if cursor:
+            data_envio, ultimo_id = self._decodificar_cursor(cursor, 'historico')
+            # O primeiro termo permite ao SQLite posicionar o índice; o segundo desempata pelo id
+            condicoes.append('h.data_envio <= :cursor_data AND (h.data_envio, h.id) < (:cursor_data, :cursor_id)')
+            params.update({'cursor_data': data_envio, 'cursor_id': ultimo_id})
+        where = 'WHERE ' + ' AND '.join(condicoes) if condicoes else ''
         
-        return tarefas
+        colunas = '''h.id, h.obra_id, h.tarefa_id, h.tipo_notificacao, h.data_envio,
+                     h.destinatarios, h.sucesso, h.mensagem_erro'''
+        consulta = f'''
+            SELECT {colunas},
+                   (SELECT oc.descricao FROM main.obra_checklist oc WHERE oc.id = h.tarefa_id) AS tarefa_descricao
+            FROM main.historico_notificacoes h {where}
+        '''
+        if self.arquivo_anexado:
+            # Histórico arquivado por idade pode apontar para tarefas que continuam no banco principal
+            consulta += f'''
+            UNION ALL
+            SELECT {colunas},
+                   COALESCE((SELECT oc.descricao FROM main.obra_checklist oc WHERE oc.id = h.tarefa_id),
+                            (SELECT oc.descricao FROM {ALIAS_ARQUIVO}.obra_checklist oc WHERE oc.id = h.tarefa_id))
+            FROM {ALIAS_ARQUIVO}.historico_notificacoes h {where}
+            '''
+        
+        # A réplica local não tem o arquivo morto anexado
+        with (self.conexao() if self.arquivo_anexado else self.conexao_leitura()) as conn:
+            linhas = conn.execute(f'''
+                {consulta}
+                ORDER BY data_envio DESC, id DESC
+                LIMIT :limite
+            ''', params).fetchall()
+        
+        registros = [dict(row) for row in linhas[:limite]]
+        proximo_cursor = None
+        if len(linhas) > limite:
+            ultimo = registros[-1]
+            proximo_cursor = self._codificar_cursor('historico', ultimo['data_envio'], ultimo['id'])
+        
+        return {'registros': registros, 'proximo_cursor': proximo_cursor}
+
+
+# Instâncias compartilhadas por todo o processo, indexadas pelo caminho do banco
+_databases: Dict[str, Database] = {}
+_databases_lock = threading.Lock()
+
+
+def obter_database(db_name: str = CAMINHO_DB) -> Database:
+    """Retorna o Database compartilhado do banco informado (cria se necessário)"""
+    with _databases_lock:
+        database = _databases.get(db_name)
+        if database is None:
+            database = Database(db_name)
+            _databases[db_name] = database
+        return database
@@ -0,0 +1,100 @@
+"""
+Utilitários de datas do sistema AgendaObras.
+As datas são gravadas como texto ISO (AAAA-MM-DD). Para comparar datas e calcular diferenças
+em dias, obras e obra_checklist têm colunas geradas com o número do dia (dias desde
+1970-01-01: dia_limite, dia_conclusao, dia_inicio), e este módulo faz a mesma conversão em
+Python. As conversões são memorizadas: milhares de tarefas compartilham poucas datas distintas.
+
+EXEMPLO DE USO:
+    dias_atraso = hoje_dia() - tarefa['dia_limite']
+    formatar_data('2025-03-15')   # '15/03/2025'
+"""
+
+import datetime
+from functools import lru_cache
+from typing import Optional
+
+# Ordinal de 1970-01-01 (dia 0)
+ORDINAL_EPOCA = datetime.date(1970, 1, 1).toordinal()
+
+# Expressão SQL equivalente a dia_epoca() (NULL para NULL, '' ou texto inválido)
+SQL_DIA_EPOCA = "CAST(julianday(date({coluna})) - 2440587.5 AS INTEGER)"
+
+# Quantidade de textos distintos mantidos em cada cache
+TAMANHO_CACHE = 4096
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def converter_data(texto: Optional[str]) -> Optional[datetime.date]:
+    """Converte 'AAAA-MM-DD' (ou 'AAAA-MM-DD HH:MM:SS') em date. None se vazio ou inválido"""
+    if not texto:
+        return None
+    try:
+        return datetime.date.fromisoformat(texto.strip()[:10])
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def dia_epoca(texto: Optional[str]) -> Optional[int]:
+    """Número do dia (dias desde 1970-01-01) de uma data ISO. None se vazio ou inválido"""
+    data = converter_data(texto)
+    return data.toordinal() - ORDINAL_EPOCA if data else None
+
+
+def dia_da_data(data: datetime.date) -> int:
+    """Número do dia de um date"""
+    return data.toordinal() - ORDINAL_EPOCA
+
+
+def data_do_dia(dia: int) -> datetime.date:
+    """date correspondente a um número do dia"""
+    return datetime.date.fromordinal(dia + ORDINAL_EPOCA)
+
+
+def hoje_dia() -> int:
+    """Número do dia de hoje"""
+    return dia_da_data(datetime.date.today())
+
+
+def dias_ate(texto: Optional[str]) -> Optional[int]:
+    """Dias de hoje até a data (negativo se já passou). None se vazio ou inválido"""
+    dia = dia_epoca(texto)
+    return dia - hoje_dia() if dia is not None else None
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def somar_dias(texto: str, dias: int) -> str:
+    """Soma dias (inclusive negativos) a uma data AAAA-MM-DD. ValueError se a data for inválida"""
+    data = converter_data(texto)
+    if data is None:
+        raise ValueError(f"Data inválida: {texto!r}")
+    return (data + datetime.timedelta(days=dias)).isoformat()
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def formatar_data(texto: Optional[str]) -> str:
+    """Data do banco para exibição (dd/mm/aaaa). Aceita ISO ou dd/mm/aaaa; outros textos voltam inalterados"""
+    if not texto or not texto.strip():
+        return ''
+    texto = texto.strip()
+    data = converter_data(texto) if '-' in texto else None
+    if data:
+        return data.strftime('%d/%m/%Y')
+    if '/' in texto:
+        try:
+            return datetime.datetime.strptime(texto, '%d/%m/%Y').strftime('%d/%m/%Y')
+        except ValueError:
+            pass
+    return texto
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def formatar_data_hora(texto: Optional[str], separador: str = ' às ') -> str:
+    """'AAAA-MM-DD HH:MM:SS' para 'dd/mm/aaaa às HH:MM' (só a data se não houver hora)"""
+    if not texto or ' ' not in texto.strip():
+        return formatar_data(texto)
+    try:
+        return datetime.datetime.fromisoformat(texto.strip()).strftime(f'%d/%m/%Y{separador}%H:%M')
+    except ValueError:
+        return texto
@@ -9,6 +9,8 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Tuple, Dict, List
 from error_logger import log_error
+from app_logger import obter_logger
+from datas import dia_epoca, hoje_dia, formatar_data
 from config import (
     EmailConfig, 
     TEMPLATE_EMAIL_ALERTA_A, 
@@ -20,6 +22,14 @@ from config import (
     SECAO_TIPO_B
 )
 
+logger = obter_logger("email_service")
+
+
+def _dia_limite(tarefa: Dict) -> int:
+    """Número do dia do prazo (coluna dia_limite quando a tarefa veio do banco)"""
+    dia = tarefa.get('dia_limite')
+    return dia if dia is not None else dia_epoca(tarefa['data_limite'])
+
 
 class EmailService:
     """Serviço para envio de emails via SMTP"""
@@ -57,23 +67,23 @@ class EmailService:
             server.send_message(msg)
             server.quit()
             
-            print(f"✅ Email enviado com sucesso para {destinatario}")
+            logger.info("✅ Email enviado com sucesso para %s", destinatario)
             return (True, "Email enviado com sucesso")
             
         except smtplib.SMTPAuthenticationError as e:
             erro = "Falha na autenticação SMTP. Verifique usuário e senha."
             log_error(e, "email_service", f"Autenticação SMTP para {destinatario}")
-            print(f"❌ {erro}")
+            logger.error("❌ %s", erro)
             return (False, erro)
         except smtplib.SMTPException as e:
             erro = f"Erro SMTP: {str(e)}"
             log_error(e, "email_service", f"Envio de email SMTP para {destinatario}")
-            print(f"❌ {erro}")
+            logger.error("❌ %s", erro)
             return (False, erro)
         except Exception as e:
             erro = f"Erro ao enviar email: {str(e)}"
             log_error(e, "email_service", f"Enviar email para {destinatario} - assunto: {assunto}")
-            print(f"❌ {erro}")
+            logger.error("❌ %s", erro)
             return (False, erro)
     
     def testar_conexao(self) -> Tuple[bool, str]:
@@ -97,10 +107,8 @@ class EmailService:
     
     def criar_email_alerta_tipo_a(self, tarefa: Dict, reiteracao: int) -> str:
         """Cria HTML de email para tarefa Tipo A (com reiteração)"""
-        data_limite = datetime.datetime.strptime(tarefa['data_limite'], '%Y-%m-%d')
-        prazo_formatado = data_limite.strftime('%d/%m/%Y')
-        
-        dias_atraso = (datetime.date.today() - data_limite.date()).days
+        prazo_formatado = formatar_data(tarefa['data_limite'])
+        dias_atraso = hoje_dia() - _dia_limite(tarefa)
         
         if reiteracao == 3:
             mensagem_adicional = "<p style='color: #d32f2f; font-weight: bold;'>⚠️ ATENÇÃO: Esta é a última reiteração automática. Após esta, os alertas se tornarão CRÍTICOS e DIÁRIOS.</p>"
@@ -120,14 +128,13 @@ class EmailService:
     
     def criar_email_alerta_tipo_b(self, tarefa: Dict) -> str:
         """Cria HTML de email para tarefa Tipo B (prazo fixo)"""
-        data_limite = datetime.datetime.strptime(tarefa['data_limite'], '%Y-%m-%d')
-        prazo_formatado = data_limite.strftime('%d/%m/%Y')
+        prazo_formatado = formatar_data(tarefa['data_limite'])
         
-        hoje = datetime.date.today()
-        if data_limite.date() == hoje:
+        dias_atraso = hoje_dia() - _dia_limite(tarefa)
+        if dias_atraso == 0:
             status = "ÚLTIMO DIA DO PRAZO - HOJE"
-        elif data_limite.date() < hoje:
-            status = f"ATRASADA - {(hoje - data_limite.date()).days} dias"
+        elif dias_atraso > 0:
+            status = f"ATRASADA - {dias_atraso} dias"
         else:
             status = "Dentro do prazo"
         
@@ -142,8 +149,7 @@ class EmailService:
     
     def criar_email_critico_atrasado(self, tarefa: Dict, dias_atraso: int) -> str:
         """Cria HTML de email crítico para tarefa atrasada"""
-        data_limite = datetime.datetime.strptime(tarefa['data_limite'], '%Y-%m-%d')
-        prazo_formatado = data_limite.strftime('%d/%m/%Y')
+        prazo_formatado = formatar_data(tarefa['data_limite'])
         
         return TEMPLATE_EMAIL_CRITICO_ATRASADO.format(
             nome_contrato=tarefa['nome_contrato'],
@@ -157,19 +163,17 @@ class EmailService:
     def registrar_envio(self, obra_id: int, tarefa_id: int, tipo_notificacao: str, 
                        destinatarios: str, sucesso: bool, mensagem_erro: str = None):
         """Registra envio de notificação no histórico"""
-        conn = self.database.get_connection()
-        cursor = conn.cursor()
+        data_envio = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        cursor.execute('''
-            INSERT INTO historico_notificacoes 
-            (obra_id, tarefa_id, tipo_notificacao, data_envio, destinatarios, sucesso, mensagem_erro)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (obra_id, tarefa_id, tipo_notificacao, 
-              datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-              destinatarios, 1 if sucesso else 0, mensagem_erro))
+        def gravar(conn):
+            conn.execute('''
+                INSERT INTO historico_notificacoes 
+                (obra_id, tarefa_id, tipo_notificacao, data_envio, destinatarios, sucesso, mensagem_erro)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (obra_id, tarefa_id, tipo_notificacao, data_envio,
+                  destinatarios, 1 if sucesso else 0, mensagem_erro))
         
-        conn.commit()
-        conn.close()
+        self.database._escrever(gravar)
     
     def criar_email_agrupado_por_obra(self, obra_info: Dict, tarefas_agrupadas: Dict[str, List[Dict]]) -> Tuple[str, str, bool]:
         """Cria HTML de email agrupado por obra com múltiplas tarefas
@@ -195,6 +199,7 @@ class EmailService:
         
         # Gera seções de conteúdo - ORDEM POR CRITICIDADE (mais crítico primeiro)
         secoes_html = []
+        hoje = hoje_dia()
         
         # 1. MAIS CRÍTICO: Tarefas Críticas Atrasadas
         tarefas_critico = tarefas_agrupadas.get('critico_atrasado', [])
@@ -202,15 +207,13 @@ class EmailService:
             # Ordena por dias de atraso (mais atrasadas primeiro)
             tarefas_critico_ordenadas = sorted(
                 tarefas_critico, 
-                key=lambda t: (datetime.date.today() - datetime.datetime.strptime(t['data_limite'], '%Y-%m-%d').date()).days,
-                reverse=True
+                key=_dia_limite
             )
             
             linhas = []
             for tarefa in tarefas_critico_ordenadas:
-                data_limite = datetime.datetime.strptime(tarefa['data_limite'], '%Y-%m-%d')
-                prazo_formatado = data_limite.strftime('%d/%m/%Y')
-                dias_atraso = (datetime.date.today() - data_limite.date()).days
+                prazo_formatado = formatar_data(tarefa['data_limite'])
+                dias_atraso = hoje - _dia_limite(tarefa)
                 
                 linha = f"""
                 <tr>
@@ -234,21 +237,18 @@ class EmailService:
             # Ordena por dias de atraso (mais atrasadas primeiro)
             tarefas_tipo_b_ordenadas = sorted(
                 tarefas_tipo_b,
-                key=lambda t: (datetime.date.today() - datetime.datetime.strptime(t['data_limite'], '%Y-%m-%d').date()).days,
-                reverse=True
+                key=_dia_limite
             )
             linhas = []
             for tarefa in tarefas_tipo_b_ordenadas:
-                data_limite = datetime.datetime.strptime(tarefa['data_limite'], '%Y-%m-%d')
-                prazo_formatado = data_limite.strftime('%d/%m/%Y')
+                prazo_formatado = formatar_data(tarefa['data_limite'])
                 
-                hoje = datetime.date.today()
-                if data_limite.date() == hoje:
+                dias_atraso = hoje - _dia_limite(tarefa)
+                if dias_atraso == 0:
                     status = "ÚLTIMO DIA"
                     dias = "HOJE"
                     classe_dias = "dias-atraso"
-                elif data_limite.date() < hoje:
-                    dias_atraso = (hoje - data_limite.date()).days
+                elif dias_atraso > 0:
                     status = "ATRASADA"
                     dias = f"{dias_atraso} dias"
                     classe_dias = "dias-atraso"
@@ -282,15 +282,13 @@ class EmailService:
                 # Ordena por dias de atraso (mais atrasadas primeiro)
                 tarefas_ordenadas = sorted(
                     tarefas,
-                    key=lambda t: (datetime.date.today() - datetime.datetime.strptime(t['data_limite'], '%Y-%m-%d').date()).days,
-                    reverse=True
+                    key=_dia_limite
                 )
                 
                 linhas = []
                 for tarefa in tarefas_ordenadas:
-                    data_limite = datetime.datetime.strptime(tarefa['data_limite'], '%Y-%m-%d')
-                    prazo_formatado = data_limite.strftime('%d/%m/%Y')
-                    dias_atraso = (datetime.date.today() - data_limite.date()).days
+                    prazo_formatado = formatar_data(tarefa['data_limite'])
+                    dias_atraso = hoje - _dia_limite(tarefa)
                     
                     # Classe CSS baseada nos dias de atraso
                     if dias_atraso > 7:
@@ -0,0 +1,193 @@
+"""
+Escritor único do banco de dados SQLite para o sistema AgendaObras.
+Uma thread dedicada por arquivo de banco executa todas as operações de escrita, em ordem
+de chegada, usando uma única conexão. Com isso a interface, o notificador e o gerador de
+tarefas recorrentes nunca disputam o lock de escrita entre si (sem "database is locked"
+dentro do processo e sem laços de nova tentativa).
+
+Operações que chegam enquanto outra está sendo gravada são agrupadas em uma mesma
+transação curta; cada uma roda em seu próprio SAVEPOINT, então a falha de uma não
+desfaz as demais. O resultado de cada operação só é entregue após o COMMIT.
+
+EXEMPLOS DE USO:
+
+1. Escrita síncrona (aguarda o COMMIT):
+    escritor = obter_escritor(CAMINHO_DB)
+    obra_id = escritor.executar(lambda conn: conn.execute('INSERT ...').lastrowid)
+
+2. Escrita assíncrona (retorna um Future):
+    futuro = escritor.enviar(gravar_historico, obra_id, tarefa_id)
+    ...
+    futuro.result()
+"""
+
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+from error_logger import log_error
+from app_logger import obter_logger
+from pool_conexoes import obter_pool
+
+logger = obter_logger("escritor_banco")
+
+# Máximo de operações agrupadas na mesma transação
+MAX_OPERACOES_POR_TRANSACAO = 64
+
+# Segundos sem escritas até a thread encerrar e devolver a conexão ao pool
+TEMPO_OCIOSO = 60.0
+
+Operacao = Tuple[Future, Callable, tuple, dict]
+
+
+class EscritorBanco:
+    """Thread única que serializa as escritas de um arquivo de banco"""
+
+    def __init__(self, db_name: str, max_operacoes: int = MAX_OPERACOES_POR_TRANSACAO):
+        self.db_name = db_name
+        self.max_operacoes = max_operacoes
+        self._fila: 'queue.SimpleQueue[Optional[Operacao]]' = queue.SimpleQueue()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.transacoes = 0
+
+    def enviar(self, funcao: Callable, *args, **kwargs) -> Future:
+        """Agenda funcao(conn, *args, **kwargs) na thread de escrita e retorna um Future"""
+        futuro = Future()
+        if self._na_thread_escritora():
+            # Escrita disparada de dentro de outra escrita: executa na mesma transação
+            try:
+                futuro.set_result(funcao(self._conn, *args, **kwargs))
+            except BaseException as e:
+                futuro.set_exception(e)
+            return futuro
+
+        self._iniciar()
+        self._fila.put((futuro, funcao, args, kwargs))
+        return futuro
+
+    def executar(self, funcao: Callable, *args, **kwargs):
+        """Executa funcao(conn, *args, **kwargs) na thread de escrita e aguarda o resultado"""
+        return self.enviar(funcao, *args, **kwargs).result()
+
+    def parar(self, timeout: float = None):
+        """Grava o que já está na fila e encerra a thread (ex: antes de substituir o arquivo)"""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._fila.put(None)
+        thread.join(timeout)
+
+    def _na_thread_escritora(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _iniciar(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._executar_loop, daemon=True,
+                                                name='escritor-banco')
+                self._thread.start()
+
+    def _executar_loop(self):
+        conexao = obter_pool(self.db_name).obter()
+        self._conn = conexao._conexao_ativa()
+        try:
+            while True:
+                try:
+                    operacao = self._fila.get(timeout=TEMPO_OCIOSO)
+                except queue.Empty:
+                    break
+                if operacao is None:
+                    break
+                lote = [operacao]
+                encerrar = self._completar_lote(lote)
+                self._gravar_lote(lote)
+                if encerrar:
+                    break
+        finally:
+            self._conn = None
+            conexao.close()
+            with self._lock:
+                self._thread = None
+            if not self._fila.empty():
+                # Operações que chegaram durante o encerramento
+                self._iniciar()
+
+    def _completar_lote(self, lote: List[Operacao]) -> bool:
+        """Junta ao lote as operações que já estão aguardando. Retorna True se pediram parada"""
+        while len(lote) < self.max_operacoes:
+            try:
+                operacao = self._fila.get_nowait()
+            except queue.Empty:
+                return False
+            if operacao is None:
+                return True
+            lote.append(operacao)
+        return False
+
+    def _gravar_lote(self, lote: List[Operacao]):
+        """Executa o lote em uma transação, com um SAVEPOINT por operação"""
+        conn = self._conn
+        resultados: List[Tuple[Future, bool, object]] = []
+        try:
+            # Bancos anexados ao pool depois que esta conexão foi aberta (ex: arquivo morto)
+            obter_pool(self.db_name).preparar_conexao(conn)
+            conn.execute('BEGIN IMMEDIATE')
+            for futuro, funcao, args, kwargs in lote:
+                if not futuro.set_running_or_notify_cancel():
+                    continue
+                conn.execute('SAVEPOINT operacao')
+                try:
+                    resultado = funcao(conn, *args, **kwargs)
+                    conn.execute('RELEASE operacao')
+                    resultados.append((futuro, True, resultado))
+                except BaseException as e:
+                    conn.execute('ROLLBACK TO operacao')
+                    conn.execute('RELEASE operacao')
+                    resultados.append((futuro, False, e))
+            conn.commit()
+            self.transacoes += 1
+        except BaseException as e:
+            # Falha da transação inteira (ex: banco bloqueado por outro computador além do timeout)
+            log_error(e, "escritor_banco", f"Gravar lote de {len(lote)} operação(ões)")
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            for futuro, _, _, _ in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+
+        logger.debug("Lote gravado: %s operação(ões)", len(lote))
+        for futuro, sucesso, valor in resultados:
+            if sucesso:
+                futuro.set_result(valor)
+            else:
+                futuro.set_exception(valor)
+
+
+# Escritores compartilhados por todo o processo, indexados pelo caminho do banco
+_escritores: Dict[str, EscritorBanco] = {}
+_escritores_lock = threading.Lock()
+
+
+def obter_escritor(db_name: str) -> EscritorBanco:
+    """Retorna o escritor compartilhado do banco informado (cria se necessário)"""
+    with _escritores_lock:
+        escritor = _escritores.get(db_name)
+        if escritor is None:
+            escritor = EscritorBanco(db_name)
+            _escritores[db_name] = escritor
+        return escritor
+
+
+def parar_escritores(timeout: float = None):
+    """Encerra as threads de escrita de todos os bancos do processo"""
+    with _escritores_lock:
+        escritores = list(_escritores.values())
+    for escritor in escritores:
+        escritor.parar(timeout)
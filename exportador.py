@@ -0,0 +1,246 @@
+"""
+Módulo de exportação de obras e checklists para CSV, JSON Lines ou Parquet.
+Percorre obras com obra_checklist (uma linha por tarefa) e, opcionalmente, o histórico de
+notificações com um cursor SQLite lido em lotes de TAMANHO_LOTE linhas. Cada lote é escrito
+no arquivo antes de buscar o próximo, então a memória usada não depende do tamanho da carteira.
+
+USO (linha de comando):
+    python exportador.py carteira.csv
+    python exportador.py carteira.jsonl --historico --arquivadas
+    python exportador.py carteira.parquet --db "caminho/agendaobras.db"
+
+O formato é escolhido pela extensão (.csv, .jsonl ou .parquet). Com --historico, o histórico
+vai para um segundo arquivo ao lado (carteira_historico.csv). O CSV usa ';' e UTF-8 com BOM
+(abre direto no Excel), e as colunas da obra têm os mesmos nomes aceitos pelo importador_obras.
+
+Arquivos .parquet exigem o pacote opcional pyarrow (pip install pyarrow).
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+from app_logger import obter_logger
+from arquivamento import ALIAS_ARQUIVO
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+logger = obter_logger("exportador")
+
+# Linhas buscadas no cursor e gravadas por vez (um row group no Parquet)
+TAMANHO_LOTE = 10000
+
+# Colunas exportadas: (nome, expressão SQL, tipo). {esquema} é main ou o arquivo morto
+COLUNAS_CHECKLIST: List[Tuple[str, str, str]] = [
+    ('obra_id', 'o.id', 'int'),
+    ('nome_contrato', 'o.nome_contrato', 'str'),
+    ('cliente', 'o.cliente', 'str'),
+    ('status', 'o.status', 'str'),
+    ('valor_contrato', 'o.valor_contrato', 'float'),
+    ('contrato_ic', 'o.contrato_ic', 'str'),
+    ('pedido_sap', 'o.pedido_sap', 'str'),
+    ('prefixo_agencia', 'o.prefixo_agencia', 'str'),
+    ('servico', 'o.servico', 'str'),
+    ('data_acionamento', 'o.data_acionamento', 'str'),
+    ('data_assinatura', 'o.data_assinatura', 'str'),
+    ('data_aio', 'o.data_aio', 'str'),
+    ('data_inicio', 'o.data_inicio', 'str'),
+    ('data_conclusao', 'o.data_conclusao', 'str'),
+    ('arquivada', '{arquivada}', 'int'),
+    ('tarefa_id', 'oc.id', 'int'),
+    ('tarefa', 'oc.descricao', 'str'),
+    ('tipo', 'oc.tipo', 'str'),
+    ('recorrencia', 'oc.recorrencia', 'str'),
+    ('mes_referencia', 'oc.mes_referencia', 'str'),
+    ('data_limite', 'oc.data_limite', 'str'),
+    ('bloqueado', 'oc.bloqueado', 'int'),
+    ('concluido', 'oc.concluido', 'int'),
+    ('tarefa_data_conclusao', 'oc.data_conclusao', 'str'),
+]
+
+COLUNAS_HISTORICO: List[Tuple[str, str, str]] = [
+    ('id', 'h.id', 'int'),
+    ('obra_id', 'h.obra_id', 'int'),
+    ('tarefa_id', 'h.tarefa_id', 'int'),
+    ('tipo_notificacao', 'h.tipo_notificacao', 'str'),
+    ('data_envio', 'h.data_envio', 'str'),
+    ('destinatarios', 'h.destinatarios', 'str'),
+    ('sucesso', 'h.sucesso', 'int'),
+    ('mensagem_erro', 'h.mensagem_erro', 'str'),
+    ('arquivado', '{arquivada}', 'int'),
+]
+
+# Tipo da coluna -> tipo SQL do CAST (tipos estáveis para o Parquet)
+TIPOS_SQL = {'int': 'INTEGER', 'float': 'REAL', 'str': 'TEXT'}
+
+SQL_CHECKLIST = '''
+    SELECT {colunas}
+    FROM {esquema}.obras o
+    LEFT JOIN {esquema}.obra_checklist oc ON oc.obra_id = o.id
+    ORDER BY o.id, oc.id
+'''
+
+SQL_HISTORICO = '''
+    SELECT {colunas}
+    FROM {esquema}.historico_notificacoes h
+    ORDER BY h.id
+'''
+
+FORMATOS = ('csv', 'jsonl', 'parquet')
+
+
+def formatos_disponiveis() -> List[str]:
+    """Formatos suportados nesta instalação (Parquet só com pyarrow)"""
+    return [formato for formato in FORMATOS if formato != 'parquet' or pyarrow is not None]
+
+
+def _montar_consulta(sql: str, colunas: List[Tuple[str, str, str]], esquema: str) -> str:
+    arquivada = '1' if esquema == ALIAS_ARQUIVO else '0'
+    selecao = ', '.join(f'CAST({expressao.format(arquivada=arquivada)} AS {TIPOS_SQL[tipo]}) AS {nome}'
+                        for nome, expressao, tipo in colunas)
+    return sql.format(colunas=selecao, esquema=esquema)
+
+
+def _ler_lotes(database: 'Database', sql: str, colunas: List[Tuple[str, str, str]],
+               incluir_arquivadas: bool, tamanho_lote: int) -> Iterator[List[tuple]]:
+    """Gera lotes de até tamanho_lote linhas (tuplas na ordem de colunas)"""
+    esquemas = ['main']
+    if incluir_arquivadas and database.arquivo_anexado:
+        esquemas.append(ALIAS_ARQUIVO)
+    # O arquivo morto só é anexado às conexões do banco compartilhado (não à réplica)
+    conexao = database.conexao() if len(esquemas) > 1 else database.conexao_leitura()
+
+    with conexao as conn:
+        for esquema in esquemas:
+            cursor = conn.execute(_montar_consulta(sql, colunas, esquema))
+            while True:
+                lote = cursor.fetchmany(tamanho_lote)
+                if not lote:
+                    break
+                yield [tuple(linha) for linha in lote]
+
+
+def linhas_checklist(database: 'Database', incluir_arquivadas: bool = False,
+                     tamanho_lote: int = TAMANHO_LOTE) -> Iterator[List[tuple]]:
+    """Lotes de linhas obra + tarefa (obras sem checklist aparecem uma vez, sem tarefa)"""
+    return _ler_lotes(database, SQL_CHECKLIST, COLUNAS_CHECKLIST, incluir_arquivadas, tamanho_lote)
+
+
+def linhas_historico(database: 'Database', incluir_arquivadas: bool = False,
+                     tamanho_lote: int = TAMANHO_LOTE) -> Iterator[List[tuple]]:
+    """Lotes de linhas do histórico de notificações"""
+    return _ler_lotes(database, SQL_HISTORICO, COLUNAS_HISTORICO, incluir_arquivadas, tamanho_lote)
+
+
+def _escrever_csv(caminho: str, colunas: List[Tuple[str, str, str]], lotes: Iterator[List[tuple]]) -> int:
+    total = 0
+    with open(caminho, 'w', newline='', encoding='utf-8-sig') as arquivo:
+        escritor = csv.writer(arquivo, delimiter=';')
+        escritor.writerow([nome for nome, _, _ in colunas])
+        for lote in lotes:
+            escritor.writerows(lote)
+            total += len(lote)
+    return total
+
+
+def _escrever_jsonl(caminho: str, colunas: List[Tuple[str, str, str]], lotes: Iterator[List[tuple]]) -> int:
+    total = 0
+    nomes = [nome for nome, _, _ in colunas]
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        for lote in lotes:
+            arquivo.writelines(json.dumps(dict(zip(nomes, linha)), ensure_ascii=False) + '\n' for linha in lote)
+            total += len(lote)
+    return total
+
+
+def _escrever_parquet(caminho: str, colunas: List[Tuple[str, str, str]], lotes: Iterator[List[tuple]]) -> int:
+    if pyarrow is None:
+        raise ImportError("Exportação para .parquet requer o pacote pyarrow (pip install pyarrow)")
+
+    tipos = {'int': pyarrow.int64(), 'float': pyarrow.float64(), 'str': pyarrow.string()}
+    esquema = pyarrow.schema([(nome, tipos[tipo]) for nome, _, tipo in colunas])
+    total = 0
+    with pyarrow.parquet.ParquetWriter(caminho, esquema) as escritor:
+        for lote in lotes:
+            # Lote em colunas: cada lote vira um row group
+            valores = list(zip(*lote))
+            tabela = pyarrow.Table.from_arrays(
+                [pyarrow.array(coluna, type=campo.type) for coluna, campo in zip(valores, esquema)],
+                schema=esquema)
+            escritor.write_table(tabela)
+            total += len(lote)
+    return total
+
+
+ESCRITORES = {'csv': _escrever_csv, 'jsonl': _escrever_jsonl, 'parquet': _escrever_parquet}
+
+
+def formato_do_arquivo(caminho: str) -> str:
+    extensao = os.path.splitext(caminho)[1].lower().lstrip('.')
+    formato = {'json': 'jsonl', 'ndjson': 'jsonl', 'txt': 'csv'}.get(extensao, extensao)
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação não suportado: .{extensao} (use .csv, .jsonl ou .parquet)")
+    return formato
+
+
+def caminho_historico(caminho: str) -> str:
+    """Arquivo do histórico ao lado da exportação (carteira.csv -> carteira_historico.csv)"""
+    base, extensao = os.path.splitext(caminho)
+    return f'{base}_historico{extensao}'
+
+
+def exportar(database: 'Database', caminho: str, incluir_historico: bool = False,
+             incluir_arquivadas: bool = False, tamanho_lote: int = TAMANHO_LOTE) -> Dict:
+    """Exporta a carteira para caminho (formato pela extensão).
+
+    Returns:
+        {'arquivo': caminho, 'linhas': n, 'arquivo_historico': caminho ou None, 'linhas_historico': n}
+    """
+    formato = formato_do_arquivo(caminho)
+    escrever = ESCRITORES[formato]
+    resultado: Dict[str, Optional[object]] = {
+        'arquivo': caminho, 'linhas': 0, 'arquivo_historico': None, 'linhas_historico': 0,
+    }
+    resultado['linhas'] = escrever(
+        caminho, COLUNAS_CHECKLIST, linhas_checklist(database, incluir_arquivadas, tamanho_lote))
+    if incluir_historico:
+        resultado['arquivo_historico'] = caminho_historico(caminho)
+        resultado['linhas_historico'] = escrever(
+            resultado['arquivo_historico'], COLUNAS_HISTORICO,
+            linhas_historico(database, incluir_arquivadas, tamanho_lote))
+
+    logger.info("📤 Exportação %s: %s linha(s) de checklist, %s de histórico",
+                caminho, resultado['linhas'], resultado['linhas_historico'])
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exporta obras e checklists do AgendaObras')
+    parser.add_argument('arquivo', help='Arquivo de saída (.csv, .jsonl ou .parquet)')
+    parser.add_argument('--historico', action='store_true',
+                        help='Exporta também o histórico de notificações (arquivo _historico ao lado)')
+    parser.add_argument('--arquivadas', action='store_true', help='Inclui obras e histórico do arquivo morto')
+    parser.add_argument('--db', help='Arquivo do banco de dados (padrão: banco configurado em database.py)')
+    args = parser.parse_args()
+
+    from database import Database, CAMINHO_DB
+    database = Database(args.db or CAMINHO_DB)
+
+    print(f"📤 Exportando para {args.arquivo}...")
+    inicio = datetime.datetime.now()
+    resultado = exportar(database, args.arquivo, args.historico, args.arquivadas)
+    duracao = (datetime.datetime.now() - inicio).total_seconds()
+
+    print(f"✅ {resultado['linhas']} linha(s) exportada(s) em {duracao:.1f}s")
+    if resultado['arquivo_historico']:
+        print(f"   {resultado['linhas_historico']} registro(s) de histórico em {resultado['arquivo_historico']}")
+
+
+if __name__ == '__main__':
+    main()
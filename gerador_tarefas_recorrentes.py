@@ -1,13 +1,108 @@
 """
 Módulo responsável por gerar tarefas mensais recorrentes automaticamente.
 Gerencia a criação de tarefas que se repetem mensalmente, como medições.
+
+A geração é feita por conjunto: um único INSERT ... SELECT cria as instâncias de cada
+obra × template mensal × mês, e o índice único (obra_id, template_id, mes_referencia)
+(migração 17) descarta as que já existem (ON CONFLICT DO NOTHING). O número de comandos não
+depende da quantidade de obras nem de meses.
+
+A verificação diária cria apenas o mês atual. A recuperação (recuperar_meses_faltantes) cria
+também os meses anteriores que ficaram sem instância (ex: meses sem ninguém abrir o sistema),
+desde o início de cada obra até hoje ou até a data de conclusão. Executada na inicialização
+(últimos MESES_RECUPERACAO_INICIALIZACAO meses) ou pela linha de comando:
+    python gerador_tarefas_recorrentes.py --simular
+    python gerador_tarefas_recorrentes.py --meses 6 --db "caminho/agendaobras.db"
 """
 
+import argparse
 import sqlite3
 import datetime
-import calendar
-from typing import Dict
+from typing import Dict, Optional
 from error_logger import log_error
+from app_logger import obter_logger
+
+logger = obter_logger("gerador_tarefas_recorrentes")
+
+# Meses anteriores ao atual verificados na inicialização do sistema
+MESES_RECUPERACAO_INICIALIZACAO = 12
+
+# Obras que já começaram (data_inicio válida até hoje) e ainda não terminaram
+SQL_OBRAS_ATIVAS = '''
+    SELECT id FROM obras
+    WHERE data_inicio IS NOT NULL AND data_inicio != ''
+    AND data_inicio <= :hoje AND (data_conclusao IS NULL OR data_conclusao >= :hoje)
+    AND status != 'Concluída'
+'''
+
+# Desbloqueia os itens-modelo mensais (mes_referencia NULL) das obras ativas
+SQL_DESBLOQUEAR_MENSAIS = f'''
+    UPDATE obra_checklist
+    SET bloqueado = 0
+    WHERE recorrencia = 'mensal' AND bloqueado = 1 AND mes_referencia IS NULL
+    AND obra_id IN ({SQL_OBRAS_ATIVAS})
+'''
+
+COLUNAS_INSTANCIA = '''obra_id, template_id, descricao, prazo_dias, data_limite, tipo,
+     base_calculo, data_base_calculo, bloqueado, recorrencia, mes_referencia,
+     status_notificacao'''
+
+# Instâncias mensais que faltam (na ordem de COLUNAS_INSTANCIA, mais {colunas_extras}).
+# A CTE recursiva gera, para cada obra iniciada e não concluída, um mês por linha, do mês de
+# início (ou :desde, se posterior) até o mês de hoje ou da data de conclusão. O prazo é o dia de
+# referência do template no mês (ou o último dia, se o mês for mais curto). Descrição "NOME - mm/aaaa".
+# {filtro_obras} restringe as obras consideradas (ex: só as ativas hoje, na verificação diária)
+SQL_INSTANCIAS_FALTANTES = '''
+    WITH RECURSIVE periodos AS (
+        SELECT id AS obra_id, data_inicio,
+               MAX(date(data_inicio, 'start of month'), :desde) AS mes,
+               date(MIN(:hoje, IFNULL(NULLIF(data_conclusao, ''), :hoje)), 'start of month') AS ultimo_mes
+        FROM obras
+        WHERE data_inicio IS NOT NULL AND data_inicio != '' AND data_inicio <= :hoje
+        AND status != 'Concluída'{filtro_obras}
+    ),
+    meses AS (
+        SELECT obra_id, data_inicio, mes, ultimo_mes FROM periodos WHERE mes <= ultimo_mes
+        UNION ALL
+        SELECT obra_id, data_inicio, date(mes, '+1 month'), ultimo_mes FROM meses WHERE mes < ultimo_mes
+    )
+    SELECT m.obra_id, t.id, t.nome || ' - ' || strftime('%m/%Y', m.mes), t.prazo_dias,
+           MIN(date(m.mes, '+' || (t.dia_referencia_mensal - 1) || ' days'),
+               date(m.mes, '+1 month', '-1 day')),
+           t.tipo, t.base_calculo, m.data_inicio, 0, 'mensal', substr(m.mes, 1, 7),
+           'pendente'{colunas_extras}
+    FROM meses m
+    JOIN checklist_templates t ON t.recorrencia = 'mensal' AND t.dia_referencia_mensal IS NOT NULL
+    WHERE NOT EXISTS (
+        SELECT 1 FROM obra_checklist oc
+        WHERE oc.obra_id = m.obra_id AND oc.template_id = t.id AND oc.mes_referencia = substr(m.mes, 1, 7)
+    )
+    ORDER BY m.obra_id, m.mes, t.ordem
+'''
+
+SQL_CRIAR_INSTANCIAS = f'''
+    INSERT INTO obra_checklist
+    ({COLUNAS_INSTANCIA})
+    {SQL_INSTANCIAS_FALTANTES.format(colunas_extras='', filtro_obras='')}
+    ON CONFLICT DO NOTHING
+'''
+
+# Verificação diária: só obras ativas hoje (como SQL_DESBLOQUEAR_MENSAIS). Uma obra concluída
+# no começo do mês não recebe as instâncias do mês atual
+SQL_CRIAR_INSTANCIAS_MES_ATUAL = f'''
+    INSERT INTO obra_checklist
+    ({COLUNAS_INSTANCIA})
+    {SQL_INSTANCIAS_FALTANTES.format(colunas_extras='', filtro_obras=f"""
+        AND id IN ({SQL_OBRAS_ATIVAS})""")}
+    ON CONFLICT DO NOTHING
+'''
+
+# Relatório da recuperação (simulação ou execução): o que será/foi criado
+SQL_RELATORIO_FALTANTES = SQL_INSTANCIAS_FALTANTES.format(colunas_extras=''',
+           (SELECT nome_contrato FROM obras WHERE id = m.obra_id)''', filtro_obras='')
+
+# Mês inicial quando a recuperação não tem limite (anterior a qualquer data)
+INICIO_SEM_LIMITE = '0001-01-01'
 
 
 class GeradorTarefasRecorrentes:
@@ -16,98 +111,109 @@ class GeradorTarefasRecorrentes:
     def __init__(self, database: 'Database'):
         self.database = database
     
-    def gerar_tarefas_mensais(self):
-        """Verifica e gera tarefas mensais para obras ativas"""
-        conn = None
+    def gerar_tarefas_mensais(self, hoje: datetime.date = None) -> Dict[str, int]:
+        """Verifica e gera as tarefas mensais do mês atual para obras ativas.
+        
+        Returns:
+            {'criadas': instâncias do mês criadas, 'desbloqueadas': itens-modelo desbloqueados}
+        """
+        hoje = hoje or datetime.date.today()
+        parametros = {'hoje': hoje.strftime('%Y-%m-%d'), 'desde': hoje.strftime('%Y-%m-01')}
+        resultado = {'criadas': 0, 'desbloqueadas': 0}
         try:
-            conn = self.database.get_connection()
-            cursor = conn.cursor()
-            
-            # Busca obras que já começaram (com data_inicio preenchida e válida)
-            hoje = datetime.date.today()
-            cursor.execute('''
-                SELECT * FROM obras 
-                WHERE data_inicio IS NOT NULL AND data_inicio != '' 
-                AND data_inicio <= ? AND (data_conclusao IS NULL OR data_conclusao >= ?)
-                AND status != 'Concluída'
-            ''', (hoje.strftime('%Y-%m-%d'), hoje.strftime('%Y-%m-%d')))
-            
-            obras_ativas = [dict(row) for row in cursor.fetchall()]
-            
-            # Busca templates de tarefas recorrentes
-            cursor.execute('''
-                SELECT * FROM checklist_templates 
-                WHERE recorrencia = 'mensal'
-            ''')
-            templates_mensais = [dict(row) for row in cursor.fetchall()]
+            def gravar(conn):
+                desbloqueadas = conn.execute(SQL_DESBLOQUEAR_MENSAIS, parametros).rowcount
+                criadas = conn.execute(SQL_CRIAR_INSTANCIAS_MES_ATUAL, parametros).rowcount
+                return {'criadas': criadas, 'desbloqueadas': desbloqueadas}
             
-            for obra in obras_ativas:
-                # Desbloqueia tarefas mensais template (se ainda estiverem bloqueadas)
-                cursor.execute('''
-                    UPDATE obra_checklist 
-                    SET bloqueado = 0
-                    WHERE obra_id = ? AND recorrencia = 'mensal' AND bloqueado = 1 AND mes_referencia IS NULL
-                ''', (obra['id'],))
-                
-                # Cria instâncias mensais específicas
-                for template in templates_mensais:
-                    self._verificar_e_criar_mes_atual(cursor, obra, template, hoje)
+            resultado = self.database.enviar_escrita(gravar).result()
             
-            conn.commit()
-            
-            print(f"🔄 Gerador de tarefas recorrentes executado: {len(obras_ativas)} obra(s) verificada(s)")
+            logger.info("🔄 Gerador de tarefas recorrentes executado: %s tarefa(s) mensal(is) criada(s), "
+                        "%s item(ns) desbloqueado(s)", resultado['criadas'], resultado['desbloqueadas'])
         
         except sqlite3.OperationalError as e:
             if "locked" in str(e).lower():
-                print(f"⚠️ Banco de dados temporariamente bloqueado ao gerar tarefas recorrentes...")
+                logger.warning("⚠️ Banco de dados temporariamente bloqueado ao gerar tarefas recorrentes...")
             else:
                 log_error(e, "gerador_tarefas_recorrentes", "Gerar tarefas mensais - OperationalError")
                 raise
         except Exception as e:
             log_error(e, "gerador_tarefas_recorrentes", "Gerar tarefas mensais")
-            print(f"❌ Erro ao gerar tarefas recorrentes: {e}")
-        finally:
-            if conn:
-                conn.close()
-    
-    def _verificar_e_criar_mes_atual(self, cursor, obra: Dict, template: Dict, hoje: datetime.date):
-        """Verifica se existe tarefa mensal para o mês atual e cria se necessário"""
-        mes_ref = hoje.strftime('%Y-%m')
+            logger.error("❌ Erro ao gerar tarefas recorrentes: %s", e)
         
-        # Verifica se já existe essa tarefa para este mês
-        cursor.execute('''
-            SELECT id FROM obra_checklist 
-            WHERE obra_id = ? AND template_id = ? AND mes_referencia = ?
-        ''', (obra['id'], template['id'], mes_ref))
-        
-        if cursor.fetchone():
-            return  # Já existe
+        return resultado
+    
+    def recuperar_meses_faltantes(self, hoje: datetime.date = None, meses: Optional[int] = None,
+                                  simular: bool = False) -> Dict:
+        """Cria, em uma única passada, as instâncias mensais que faltam em meses anteriores.
         
-        # Calcula data limite baseada no dia de referência mensal
-        dia_ref = template['dia_referencia_mensal']
-        try:
-            data_limite = datetime.date(hoje.year, hoje.month, dia_ref)
-        except ValueError:
-            # Se o dia não existe no mês (ex: 31 em fevereiro), usa último dia do mês
-            ultimo_dia = calendar.monthrange(hoje.year, hoje.month)[1]
-            data_limite = datetime.date(hoje.year, hoje.month, ultimo_dia)
+        Args:
+            meses: Quantos meses anteriores ao atual verificar (None = desde o início de cada obra)
+            simular: Apenas informa o que seria criado, sem gravar
         
-        # Se a data já passou e ainda não criamos, cria mesmo assim (vai estar atrasada)
-        # Se ainda não chegou no dia, cria já para aparecer no sistema
+        Returns:
+            {'criadas': n (0 na simulação), 'faltantes': [{'obra_id', 'nome_contrato',
+             'mes_referencia', 'descricao', 'data_limite'}, ...]}
+        """
+        hoje = hoje or datetime.date.today()
+        desde = INICIO_SEM_LIMITE
+        if meses is not None:
+            indice_mes = hoje.year * 12 + hoje.month - 1 - meses
+            desde = datetime.date(indice_mes // 12, indice_mes % 12 + 1, 1).isoformat()
+        parametros = {'hoje': hoje.strftime('%Y-%m-%d'), 'desde': desde}
         
-        # Cria a tarefa mensal - formata mês no padrão brasileiro mm/aaaa
-        mes_ref_formatado = hoje.strftime('%m/%Y')
-        descricao = f"{template['nome']} - {mes_ref_formatado}"
+        def listar(conn):
+            return [{'obra_id': row[0], 'nome_contrato': row[-1], 'descricao': row[2],
+                     'data_limite': row[4], 'mes_referencia': row[10]}
+                    for row in conn.execute(SQL_RELATORIO_FALTANTES, parametros)]
         
-        cursor.execute('''
-            INSERT INTO obra_checklist 
-            (obra_id, template_id, descricao, prazo_dias, data_limite, tipo, 
-             base_calculo, data_base_calculo, bloqueado, recorrencia, mes_referencia,
-             status_notificacao)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (obra['id'], template['id'], descricao, template['prazo_dias'],
-              data_limite.strftime('%Y-%m-%d'), template['tipo'],
-              template['base_calculo'], obra['data_inicio'], 0, 
-              'mensal', mes_ref, 'pendente'))
+        try:
+            if simular:
+                with self.database.conexao() as conn:
+                    return {'criadas': 0, 'faltantes': listar(conn)}
+            
+            def gravar(conn):
+                faltantes = listar(conn)
+                criadas = conn.execute(SQL_CRIAR_INSTANCIAS, parametros).rowcount if faltantes else 0
+                return {'criadas': criadas, 'faltantes': faltantes}
+            
+            resultado = self.database.enviar_escrita(gravar).result()
+        except Exception as e:
+            log_error(e, "gerador_tarefas_recorrentes", f"Recuperar meses faltantes desde {desde}")
+            raise
         
-        print(f"  ✅ Criada tarefa mensal: {descricao} para obra {obra['nome_contrato']}")
+        if resultado['criadas']:
+            logger.info("🔄 %s tarefa(s) mensal(is) de meses anteriores recuperada(s) em %s obra(s)",
+                        resultado['criadas'], len({item['obra_id'] for item in resultado['faltantes']}))
+        return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Cria as tarefas mensais (MEDIÇÃO, CONFIRMAÇÃO DE MEDIÇÃO) que faltam em meses anteriores')
+    parser.add_argument('--simular', action='store_true', help='Apenas lista o que seria criado')
+    parser.add_argument('--meses', type=int,
+                        help='Meses anteriores ao atual a verificar (padrão: desde o início de cada obra)')
+    parser.add_argument('--db', help='Arquivo do banco de dados (padrão: banco configurado em database.py)')
+    args = parser.parse_args()
+
+    from database import Database, CAMINHO_DB
+    gerador = GeradorTarefasRecorrentes(Database(args.db or CAMINHO_DB))
+    resultado = gerador.recuperar_meses_faltantes(meses=args.meses, simular=args.simular)
+
+    obra_atual = None
+    for item in resultado['faltantes']:
+        if item['obra_id'] != obra_atual:
+            obra_atual = item['obra_id']
+            print(f"🏗️ {item['nome_contrato']} (obra {obra_atual})")
+        print(f"   {item['descricao']} - prazo {item['data_limite']}")
+
+    total = len(resultado['faltantes'])
+    if args.simular:
+        print(f"🔎 Simulação: {total} tarefa(s) mensal(is) seriam criada(s)")
+    else:
+        print(f"✅ {resultado['criadas']} tarefa(s) mensal(is) criada(s)")
+
+
+if __name__ == '__main__':
+    main()
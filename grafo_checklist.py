@@ -0,0 +1,231 @@
+"""
+Motor de dependências do checklist de uma obra.
+Monta em memória um grafo acíclico (DAG) com os itens do checklist e as datas críticas
+da obra, e propaga qualquer alteração (marcar/desmarcar item, mudança de data, mudança
+de prazo do template) em uma única passagem em ordem topológica.
+
+Arestas do grafo:
+    item -> item     depende_item_id (base_calculo 'fim_tarefa'): prazo conta da conclusão do pai
+    data -> item     base_calculo 'inicio', 'criacao', 'assinatura' ou 'aio': prazo conta da data da obra
+    item -> data     trigger_ui do template: desmarcar o item limpa a data da obra
+
+O grafo só altera o estado em memória; quem persiste é o Database, gravando apenas as
+linhas que mudaram (ver alteracoes_itens/alteracoes_obra).
+"""
+
+import datetime
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from datas import somar_dias
+
+# base_calculo do item -> campo de data da obra
+CAMPO_POR_BASE = {
+    'inicio': 'data_inicio',
+    'criacao': 'data_acionamento',
+    'assinatura': 'data_assinatura',
+    'aio': 'data_aio',
+}
+BASE_POR_CAMPO = {campo: base for base, campo in CAMPO_POR_BASE.items()}
+
+# Valores de trigger_ui que correspondem a uma data da obra
+CAMPOS_TRIGGER = ('data_assinatura', 'data_aio')
+
+# Colunas de obra_checklist que o motor pode alterar
+COLUNAS_ESTADO = ('concluido', 'data_conclusao', 'bloqueado', 'data_limite', 'data_base_calculo',
+                  'tentativas_reiteracao', 'status_notificacao')
+
+
+class GrafoChecklist:
+    """Grafo de dependências do checklist de uma obra"""
+
+    def __init__(self, obra: Dict, itens: Iterable[Dict], triggers: Dict[int, str] = None):
+        """
+        Args:
+            obra: linha da obra (precisa das datas críticas)
+            itens: linhas de obra_checklist da obra
+            triggers: template_id -> trigger_ui (apenas templates com gatilho)
+        """
+        self.obra = dict(obra)
+        self.itens = {item['id']: dict(item) for item in itens}
+        self._obra_original = dict(self.obra)
+        self._itens_originais = {item_id: dict(item) for item_id, item in self.itens.items()}
+
+        self.triggers = {}
+        for item in self.itens.values():
+            trigger = (triggers or {}).get(item['template_id'])
+            if trigger in CAMPOS_TRIGGER:
+                self.triggers[item['id']] = trigger
+
+        # Nós: ('item', id) ou ('data', campo)
+        self.sucessores: Dict[tuple, List[tuple]] = defaultdict(list)
+        self.predecessores: Dict[tuple, List[tuple]] = defaultdict(list)
+        for item in self.itens.values():
+            origem = self._origem(item)
+            if origem:
+                self._ligar(origem, ('item', item['id']))
+        for item_id, campo in self.triggers.items():
+            self._ligar(('item', item_id), ('data', campo))
+
+        self.ordem = self._ordenar()
+
+    def _ligar(self, origem: tuple, destino: tuple):
+        self.sucessores[origem].append(destino)
+        self.predecessores[destino].append(origem)
+
+    def _origem(self, item: Dict) -> Optional[tuple]:
+        """Nó do qual o prazo do item depende"""
+        if item.get('recorrencia') == 'mensal':
+            return ('data', 'data_inicio')
+        if item.get('depende_item_id') in self.itens:
+            return ('item', item['depende_item_id'])
+        campo = CAMPO_POR_BASE.get(item.get('base_calculo'))
+        return ('data', campo) if campo else None
+
+    def _ordenar(self) -> List[tuple]:
+        """Ordenação topológica (Kahn). Levanta ValueError se houver ciclo"""
+        nos = [('data', campo) for campo in CAMPO_POR_BASE.values()]
+        nos += [('item', item_id) for item_id in sorted(self.itens)]
+        grau = {no: len(self.predecessores[no]) for no in nos}
+
+        fila = [no for no in nos if grau[no] == 0]
+        ordem = []
+        while fila:
+            no = fila.pop(0)
+            ordem.append(no)
+            for sucessor in self.sucessores[no]:
+                grau[sucessor] -= 1
+                if grau[sucessor] == 0:
+                    fila.append(sucessor)
+
+        if len(ordem) != len(nos):
+            ciclo = sorted(no[1] for no in nos if grau[no] > 0 and no[0] == 'item')
+            raise ValueError(f"Ciclo de dependências no checklist (itens {ciclo})")
+        return ordem
+
+    # ========== OPERAÇÕES ========== #
+
+    def marcar(self, item_id: int, concluido: bool, data: str = None):
+        """Marca/desmarca um item e propaga para dependentes e datas com gatilho"""
+        item = self.itens[item_id]
+        if concluido:
+            item['concluido'] = 1
+            item['data_conclusao'] = data or datetime.date.today().strftime('%Y-%m-%d')
+        else:
+            item['concluido'] = 0
+            item['data_conclusao'] = None
+        self.propagar([('item', item_id)])
+
+    def alterar_data(self, campo: str, valor: Optional[str]):
+        """Altera uma data crítica da obra e recalcula os itens que dependem dela"""
+        if campo not in CAMPO_POR_BASE.values():
+            raise ValueError(f"Campo de data crítica inválido: {campo}")
+        self.obra[campo] = valor or None
+        self.propagar([('data', campo)])
+
+    def recalcular_itens(self, item_ids: Iterable[int]):
+        """Recalcula itens cujo prazo mudou (ex: alteração de template) e seus dependentes"""
+        sementes = [('item', item_id) for item_id in item_ids if item_id in self.itens]
+        for no in sementes:
+            self._recalcular_item(self.itens[no[1]])
+        self.propagar(sementes)
+
+    def propagar(self, sementes: Iterable[tuple]):
+        """Recalcula, em ordem topológica, todos os nós alcançáveis a partir das sementes.
+        Cada nó é avaliado uma única vez; só segue adiante quem de fato mudou.
+        """
+        alterados = set(sementes)
+        for no in self.ordem:
+            if no in alterados or not any(pred in alterados for pred in self.predecessores[no]):
+                continue
+            if no[0] == 'item':
+                mudou = self._recalcular_item(self.itens[no[1]])
+            else:
+                mudou = self._recalcular_data(no[1])
+            if mudou:
+                alterados.add(no)
+
+    # ========== REGRAS POR NÓ ========== #
+
+    def _recalcular_data(self, campo: str) -> bool:
+        """Data com gatilho é limpa quando o item que a definiu é desmarcado"""
+        for pred in self.predecessores[('data', campo)]:
+            item_id = pred[1]
+            reaberto = self._itens_originais[item_id]['concluido'] and not self.itens[item_id]['concluido']
+            if reaberto and self.obra.get(campo):
+                self.obra[campo] = None
+                return True
+        return False
+
+    def _recalcular_item(self, item: Dict) -> bool:
+        """Recalcula prazo e bloqueio do item a partir da sua origem. Retorna True se mudou"""
+        antes = tuple(item.get(coluna) for coluna in COLUNAS_ESTADO)
+
+        if item.get('recorrencia') == 'mensal':
+            # data_limite das tarefas mensais é definida pelo gerador de recorrentes
+            if self._obra_ja_comecou():
+                item['bloqueado'] = 0
+            elif not item['concluido']:
+                item['bloqueado'] = 1
+
+        elif item.get('depende_item_id') in self.itens:
+            pai = self.itens[item['depende_item_id']]
+            if not item['concluido']:
+                if pai['concluido'] and pai['data_conclusao']:
+                    self._definir_prazo(item, pai['data_conclusao'])
+                else:
+                    item['bloqueado'] = 1
+                    item['data_limite'] = None
+
+        elif item.get('base_calculo') in CAMPO_POR_BASE:
+            data_base = self.obra.get(CAMPO_POR_BASE[item['base_calculo']])
+            if item['concluido'] and not data_base and item['id'] in self.triggers:
+                # Item com gatilho concluído perde a data da qual dependia: volta a ficar pendente
+                # (ex: limpar data_assinatura reabre SOLICITAR A DATA DA AIO, que limpa data_aio)
+                item['concluido'] = 0
+                item['data_conclusao'] = None
+            if not item['concluido']:
+                if data_base:
+                    self._definir_prazo(item, data_base)
+                else:
+                    item['bloqueado'] = 1
+                    item['data_limite'] = None
+                    item['data_base_calculo'] = None
+
+        return tuple(item.get(coluna) for coluna in COLUNAS_ESTADO) != antes
+
+    def _definir_prazo(self, item: Dict, data_base: str):
+        data_limite = somar_dias(data_base, item['prazo_dias'])
+        if data_limite != item.get('data_limite'):
+            # Prazo novo: reinicia o controle de reiterações
+            item['tentativas_reiteracao'] = 0
+            item['status_notificacao'] = 'pendente'
+        item['data_limite'] = data_limite
+        item['data_base_calculo'] = data_base
+        item['bloqueado'] = 0
+
+    def _obra_ja_comecou(self) -> bool:
+        data_inicio = self.obra.get('data_inicio')
+        if not data_inicio:
+            return False
+        try:
+            return somar_dias(data_inicio, 0) <= datetime.date.today().strftime('%Y-%m-%d')
+        except ValueError:
+            return False
+
+    # ========== RESULTADO ========== #
+
+    def alteracoes_itens(self) -> List[Tuple[int, Dict]]:
+        """Itens alterados desde a montagem do grafo: [(item_id, {coluna: novo valor})]"""
+        alteracoes = []
+        for item_id in sorted(self.itens):
+            item, original = self.itens[item_id], self._itens_originais[item_id]
+            colunas = {coluna: item.get(coluna) for coluna in COLUNAS_ESTADO
+                       if item.get(coluna) != original.get(coluna)}
+            if colunas:
+                alteracoes.append((item_id, colunas))
+        return alteracoes
+
+    def alteracoes_obra(self) -> Dict:
+        """Datas da obra alteradas desde a montagem do grafo: {campo: novo valor}"""
+        return {campo: self.obra.get(campo) for campo in CAMPO_POR_BASE.values()
+                if self.obra.get(campo) != self._obra_original.get(campo)}
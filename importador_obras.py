@@ -0,0 +1,263 @@
+"""
+Módulo de importação de obras em lote a partir de planilhas CSV ou XLSX.
+Lê a planilha linha a linha, converte valores no formato brasileiro e grava todas as
+obras (com checklist) em uma única transação via Database.criar_obras_em_lote.
+
+USO (linha de comando):
+    python importador_obras.py obras.csv
+    python importador_obras.py obras.xlsx --db "caminho/agendaobras.db"
+
+A primeira linha da planilha deve conter os nomes das colunas. Colunas obrigatórias:
+nome_contrato, cliente e valor_contrato (aceita variações como "Nome do Contrato" ou "Valor").
+Datas podem estar em dd/mm/aaaa ou aaaa-mm-dd; valores em 1.234,56 ou 1234.56.
+
+Arquivos .xlsx exigem o pacote opcional openpyxl (pip install openpyxl).
+"""
+
+import argparse
+import csv
+import datetime
+import os
+import re
+import tempfile
+import unicodedata
+from typing import Dict, Iterator, List, Tuple
+from error_logger import log_error
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+# Nome normalizado da coluna na planilha -> campo de obras
+ALIASES_COLUNAS = {
+    'nome': 'nome_contrato',
+    'contrato': 'nome_contrato',
+    'nome_do_contrato': 'nome_contrato',
+    'valor': 'valor_contrato',
+    'valor_do_contrato': 'valor_contrato',
+    'ic': 'contrato_ic',
+    'pedido': 'pedido_sap',
+    'prefixo': 'prefixo_agencia',
+    'agencia': 'prefixo_agencia',
+    'prefixo_da_agencia': 'prefixo_agencia',
+    'inicio': 'data_inicio',
+    'data_de_inicio': 'data_inicio',
+    'conclusao': 'data_conclusao',
+    'data_de_conclusao': 'data_conclusao',
+    'assinatura': 'data_assinatura',
+    'data_de_assinatura': 'data_assinatura',
+    'aio': 'data_aio',
+    'data_da_aio': 'data_aio',
+    'acionamento': 'data_acionamento',
+    'data_de_acionamento': 'data_acionamento',
+    'mes_de_execucao': 'mes_execucao',
+    'ano_de_execucao': 'ano_execucao',
+}
+
+CAMPOS_NUMERICOS = ['valor_contrato', 'valor_parceiro', 'valor_percentual', 'total_obra']
+CAMPOS_DATA = ['data_inicio', 'data_conclusao', 'data_assinatura', 'data_aio', 'data_acionamento']
+
+
+def normalizar_coluna(nome) -> str:
+    """Converte o cabeçalho em snake_case sem acentos e aplica os apelidos conhecidos"""
+    texto = unicodedata.normalize('NFKD', str(nome or '')).encode('ascii', 'ignore').decode('ascii')
+    texto = re.sub(r'[^a-z0-9]+', '_', texto.strip().lower()).strip('_')
+    return ALIASES_COLUNAS.get(texto, texto)
+
+
+def converter_numero(valor):
+    """Converte número em formato brasileiro ("R$ 1.234,56") ou decimal ("1234.56")"""
+    if valor is None or isinstance(valor, (int, float)):
+        return valor
+    texto = str(valor).replace('R$', '').replace('%', '').replace(' ', '').strip()
+    if not texto:
+        return None
+    if ',' in texto:
+        texto = texto.replace('.', '').replace(',', '.')
+    try:
+        return float(texto)
+    except ValueError:
+        raise ValueError(f"Número inválido: {valor}")
+
+
+def converter_data(valor):
+    """Converte data (dd/mm/aaaa, aaaa-mm-dd ou célula de data do Excel) para ISO"""
+    if valor is None:
+        return None
+    if isinstance(valor, datetime.datetime):
+        return valor.date().strftime('%Y-%m-%d')
+    if isinstance(valor, datetime.date):
+        return valor.strftime('%Y-%m-%d')
+    texto = str(valor).strip()
+    if not texto:
+        return None
+    for formato in ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.datetime.strptime(texto, formato).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida: {valor}")
+
+
+def converter_linha(dados: Dict) -> Dict:
+    """Converte os valores de uma linha da planilha para o formato de criar_obras_em_lote"""
+    obra = {}
+    for campo, valor in dados.items():
+        if not campo:
+            continue
+        if isinstance(valor, str):
+            valor = valor.strip()
+        if campo in CAMPOS_NUMERICOS:
+            try:
+                obra[campo] = converter_numero(valor)
+            except ValueError as e:
+                raise ValueError(f"{campo}: {e}")
+        elif campo in CAMPOS_DATA:
+            try:
+                obra[campo] = converter_data(valor)
+            except ValueError as e:
+                raise ValueError(f"{campo}: {e}")
+        elif campo == 'ano_execucao' or valor is None or isinstance(valor, str):
+            obra[campo] = valor
+        else:
+            # Células numéricas do Excel em colunas de texto (ex: pedido SAP 4500123456.0)
+            if isinstance(valor, float) and valor.is_integer():
+                valor = int(valor)
+            obra[campo] = str(valor)
+    return obra
+
+
+class _DialetoPadrao(csv.excel):
+    """CSV do Excel em português: separado por ponto e vírgula"""
+    delimiter = ';'
+
+
+def _detectar_codificacao(caminho: str) -> str:
+    """CSV salvo pelo Excel costuma vir em cp1252; o padrão é UTF-8 (com ou sem BOM)"""
+    with open(caminho, 'rb') as arquivo:
+        amostra = arquivo.read(64 * 1024)
+    try:
+        amostra.decode('utf-8')
+        return 'utf-8-sig'
+    except UnicodeDecodeError as e:
+        # Amostra cortada no meio de um caractere multibyte ainda é UTF-8
+        if e.start >= len(amostra) - 3:
+            return 'utf-8-sig'
+        return 'cp1252'
+
+
+def _ler_csv(caminho: str) -> Iterator[Tuple[int, Dict]]:
+    with open(caminho, newline='', encoding=_detectar_codificacao(caminho)) as arquivo:
+        amostra = arquivo.read(4096)
+        arquivo.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=';,\t')
+        except csv.Error:
+            dialeto = _DialetoPadrao
+
+        leitor = csv.reader(arquivo, dialeto)
+        cabecalho = [normalizar_coluna(coluna) for coluna in next(leitor, [])]
+        for numero_linha, valores in enumerate(leitor, start=2):
+            if not any(valor.strip() for valor in valores):
+                continue
+            yield numero_linha, dict(zip(cabecalho, valores))
+
+
+def _ler_xlsx(caminho: str) -> Iterator[Tuple[int, Dict]]:
+    if openpyxl is None:
+        raise ImportError("Importação de .xlsx requer o pacote openpyxl (pip install openpyxl)")
+
+    pasta = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        linhas = pasta.active.iter_rows(values_only=True)
+        cabecalho = [normalizar_coluna(coluna) for coluna in next(linhas, ())]
+        for numero_linha, valores in enumerate(linhas, start=2):
+            if not any(valor not in (None, '') for valor in valores):
+                continue
+            yield numero_linha, dict(zip(cabecalho, valores))
+    finally:
+        pasta.close()
+
+
+def ler_planilha(caminho: str) -> Iterator[Tuple[int, Dict]]:
+    """Lê a planilha sob demanda, retornando (número da linha, {campo: valor bruto})"""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.xlsx':
+        return _ler_xlsx(caminho)
+    if extensao in ('.csv', '.txt'):
+        return _ler_csv(caminho)
+    raise ValueError(f"Formato de planilha não suportado: {extensao} (use .csv ou .xlsx)")
+
+
+def importar_obras(caminho: str, database: 'Database') -> Dict:
+    """Importa as obras da planilha em uma única transação.
+
+    Returns:
+        {'criadas': [ids], 'erros': [{'linha': nº da linha na planilha, 'erro': mensagem}]}
+    """
+    erros: List[Dict] = []
+    linhas_enviadas: List[int] = []
+
+    def obras_validas():
+        for numero_linha, dados in ler_planilha(caminho):
+            try:
+                obra = converter_linha(dados)
+            except ValueError as e:
+                erros.append({'linha': numero_linha, 'erro': str(e)})
+                continue
+            linhas_enviadas.append(numero_linha)
+            yield obra
+
+    # A planilha é lida e convertida aqui, antes de enviar a escrita: a thread de escrita
+    # (e a transação) não esperam pela leitura do arquivo
+    obras = list(obras_validas())
+
+    try:
+        resultado = database.criar_obras_em_lote(obras)
+    except Exception as e:
+        log_error(e, "importador_obras", f"Importar planilha: {caminho}")
+        raise
+
+    for erro in resultado['erros']:
+        erros.append({'linha': linhas_enviadas[erro['indice']], 'erro': erro['erro']})
+    erros.sort(key=lambda erro: erro['linha'])
+
+    return {'criadas': resultado['criadas'], 'erros': erros}
+
+
+def importar_conteudo(nome_arquivo: str, conteudo: bytes, database: 'Database') -> Dict:
+    """Importa uma planilha recebida em memória (ex: upload da interface)"""
+    extensao = os.path.splitext(nome_arquivo)[1].lower()
+    descritor, caminho = tempfile.mkstemp(suffix=extensao, prefix='agendaobras_importacao_')
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(conteudo)
+        return importar_obras(caminho, database)
+    finally:
+        os.remove(caminho)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Importa obras de uma planilha CSV/XLSX para o AgendaObras')
+    parser.add_argument('planilha', help='Arquivo .csv ou .xlsx')
+    parser.add_argument('--db', help='Arquivo do banco de dados (padrão: banco configurado em database.py)')
+    args = parser.parse_args()
+
+    from database import Database, CAMINHO_DB
+    database = Database(args.db or CAMINHO_DB)
+
+    print(f"📥 Importando {args.planilha}...")
+    inicio = datetime.datetime.now()
+    resultado = importar_obras(args.planilha, database)
+    duracao = (datetime.datetime.now() - inicio).total_seconds()
+
+    print(f"✅ {len(resultado['criadas'])} obra(s) importada(s) em {duracao:.1f}s")
+    if resultado['erros']:
+        print(f"⚠️ {len(resultado['erros'])} linha(s) ignorada(s):")
+        for erro in resultado['erros']:
+            print(f"   Linha {erro['linha']}: {erro['erro']}")
+
+
+if __name__ == '__main__':
+    main()
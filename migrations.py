@@ -6,6 +6,171 @@ Gerencia alterações incrementais na estrutura do banco de dados
 import sqlite3
 from typing import Callable, List, Tuple
 from error_logger import log_error
+from datas import SQL_DIA_EPOCA
+
+# Índices criados pela migração 10 (nome, tabela(colunas) [WHERE ...])
+INDICES: List[Tuple[str, str]] = [
+    # obter_checklist, recalcular_checklist (prefixo obra_id) e recálculo por base
+    ('idx_obra_checklist_obra_base', 'obra_checklist(obra_id, base_calculo, concluido)'),
+    # Cascatas de dependência em marcar_item_checklist (só itens dependentes)
+    ('idx_obra_checklist_depende', 'obra_checklist(depende_item_id) WHERE depende_item_id IS NOT NULL'),
+    # Verificação de tarefa mensal existente no gerador de recorrentes
+    ('idx_obra_checklist_mes_ref', 'obra_checklist(obra_id, template_id, mes_referencia)'),
+    # Varredura de prazos do notificador (já ordenada por data_limite)
+    ('idx_obra_checklist_pendentes', 'obra_checklist(concluido, bloqueado, data_limite)'),
+    # Ordenação de listar_obras
+    ('idx_obras_data_inicio', 'obras(data_inicio)'),
+]
+
+# Índices criados pela migração 13 (mesmas expressões de database.ORDENACOES_OBRAS)
+INDICES_PAGINACAO: List[Tuple[str, str]] = [
+    ('idx_obras_ordem_inicio', "obras(IFNULL(data_inicio, ''))"),
+    ('idx_obras_ordem_criacao', "obras(IFNULL(data_criacao, ''))"),
+    ('idx_obras_ordem_nome', 'obras(nome_contrato)'),
+]
+
+# Índices do histórico de notificações criados pela migração 15
+INDICES_HISTORICO: List[Tuple[str, str]] = [
+    # listar_historico por obra e período (já ordenado por data_envio)
+    ('idx_historico_obra_data', 'historico_notificacoes(obra_id, data_envio)'),
+    # Histórico de uma tarefa (reiterações) e exclusão de itens do checklist
+    ('idx_historico_tarefa', 'historico_notificacoes(tarefa_id)'),
+]
+
+# Colunas geradas (VIRTUAL) com o número do dia das datas ISO, criadas pela migração 16
+# (tabela, coluna gerada, coluna de data)
+COLUNAS_DIA: List[Tuple[str, str, str]] = [
+    ('obra_checklist', 'dia_limite', 'data_limite'),
+    ('obra_checklist', 'dia_conclusao', 'data_conclusao'),
+    ('obras', 'dia_inicio', 'data_inicio'),
+    ('obras', 'dia_conclusao', 'data_conclusao'),
+]
+
+# Índices sobre as colunas de dia criados pela migração 16
+INDICES_DIA: List[Tuple[str, str]] = [
+    # Varredura de prazos do notificador e tarefas atrasadas (substitui idx_obra_checklist_pendentes)
+    ('idx_obra_checklist_pendentes_dia', 'obra_checklist(concluido, bloqueado, dia_limite)'),
+    # Tarefas concluídas por período
+    ('idx_obra_checklist_conclusao_dia', 'obra_checklist(dia_conclusao) WHERE dia_conclusao IS NOT NULL'),
+]
+
+# Índice único das instâncias mensais criado pela migração 17 (substitui idx_obra_checklist_mes_ref).
+# Itens que não são instâncias mensais têm mes_referencia NULL e não conflitam entre si
+INDICE_MENSAL_UNICO: Tuple[str, str] = (
+    'idx_obra_checklist_mensal_unico', 'obra_checklist(obra_id, template_id, mes_referencia)'
+)
+
+
+# Recalcula a linha de obra_resumo de uma obra a partir de obra_checklist.
+# {obra_id} é a expressão do id da obra e {origem} a cláusula FROM que fornece os itens (alias oc).
+SQL_RECALCULAR_RESUMO = '''
+    INSERT OR REPLACE INTO obra_resumo (
+        obra_id, total_tarefas, tarefas_concluidas, tarefas_bloqueadas, tarefas_pendentes,
+        tarefas_atrasadas, proximo_prazo, proxima_tarefa_id, data_referencia
+    )
+    SELECT {obra_id},
+           COUNT(oc.id),
+           COALESCE(SUM(oc.concluido = 1), 0),
+           COALESCE(SUM(oc.concluido = 0 AND oc.bloqueado = 1), 0),
+           COALESCE(SUM(oc.concluido = 0 AND oc.bloqueado = 0), 0),
+           COALESCE(SUM(oc.concluido = 0 AND oc.data_limite IS NOT NULL AND oc.data_limite != \'\'
+                        AND oc.data_limite < date(\'now\', \'localtime\')), 0),
+           MIN(CASE WHEN oc.concluido = 0 AND oc.data_limite != \'\' THEN oc.data_limite END),
+           MIN(CASE WHEN oc.concluido = 0 AND oc.bloqueado = 0 THEN oc.id END),
+           date(\'now\', \'localtime\')
+    FROM {origem};
+'''
+
+# Triggers que mantêm obra_resumo atualizada (criados pela migração 11)
+TRIGGERS_OBRA_RESUMO = f'''
+    CREATE TRIGGER IF NOT EXISTS trg_obras_resumo_insert
+    AFTER INSERT ON obras
+    BEGIN
+        {SQL_RECALCULAR_RESUMO.format(obra_id='NEW.id', origem='obra_checklist oc WHERE oc.obra_id = NEW.id')}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_obras_resumo_delete
+    AFTER DELETE ON obras
+    BEGIN
+        DELETE FROM obra_resumo WHERE obra_id = OLD.id;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_checklist_resumo_insert
+    AFTER INSERT ON obra_checklist
+    WHEN EXISTS (SELECT 1 FROM obras WHERE id = NEW.obra_id)
+    BEGIN
+        {SQL_RECALCULAR_RESUMO.format(obra_id='NEW.obra_id', origem='obra_checklist oc WHERE oc.obra_id = NEW.obra_id')}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_checklist_resumo_update
+    AFTER UPDATE OF concluido, bloqueado, data_limite ON obra_checklist
+    WHEN EXISTS (SELECT 1 FROM obras WHERE id = NEW.obra_id)
+    BEGIN
+        {SQL_RECALCULAR_RESUMO.format(obra_id='NEW.obra_id', origem='obra_checklist oc WHERE oc.obra_id = NEW.obra_id')}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_checklist_resumo_delete
+    AFTER DELETE ON obra_checklist
+    WHEN EXISTS (SELECT 1 FROM obras WHERE id = OLD.obra_id)
+    BEGIN
+        {SQL_RECALCULAR_RESUMO.format(obra_id='OLD.obra_id', origem='obra_checklist oc WHERE oc.obra_id = OLD.obra_id')}
+    END;
+'''
+
+
+# Colunas de obras indexadas na busca textual (além das descrições do checklist)
+COLUNAS_FTS = ['nome_contrato', 'cliente', 'status', 'contrato_ic', 'pedido_sap', 'prefixo_agencia', 'servico']
+
+# (Re)indexa obras em obras_fts; rowid = id da obra. {filtro} restringe as obras (ex: WHERE o.id = NEW.id)
+SQL_INDEXAR_OBRA_FTS = f'''
+    INSERT INTO obras_fts (rowid, {', '.join(COLUNAS_FTS)}, tarefas)
+    SELECT o.id, {', '.join('o.' + coluna for coluna in COLUNAS_FTS)},
+           (SELECT group_concat(oc.descricao, \' \') FROM obra_checklist oc WHERE oc.obra_id = o.id)
+    FROM obras o {{filtro}};
+'''
+
+# Triggers que mantêm obras_fts sincronizada (criados pela migração 12)
+TRIGGERS_OBRAS_FTS = f'''
+    CREATE TRIGGER IF NOT EXISTS trg_obras_fts_insert
+    AFTER INSERT ON obras
+    BEGIN
+        {SQL_INDEXAR_OBRA_FTS.format(filtro='WHERE o.id = NEW.id')}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_obras_fts_update
+    AFTER UPDATE OF {', '.join(COLUNAS_FTS)} ON obras
+    BEGIN
+        DELETE FROM obras_fts WHERE rowid = OLD.id;
+        {SQL_INDEXAR_OBRA_FTS.format(filtro='WHERE o.id = NEW.id')}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_obras_fts_delete
+    AFTER DELETE ON obras
+    BEGIN
+        DELETE FROM obras_fts WHERE rowid = OLD.id;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_checklist_fts_insert
+    AFTER INSERT ON obra_checklist
+    BEGIN
+        DELETE FROM obras_fts WHERE rowid = NEW.obra_id;
+        {SQL_INDEXAR_OBRA_FTS.format(filtro='WHERE o.id = NEW.obra_id')}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_checklist_fts_update
+    AFTER UPDATE OF descricao ON obra_checklist
+    BEGIN
+        DELETE FROM obras_fts WHERE rowid = NEW.obra_id;
+        {SQL_INDEXAR_OBRA_FTS.format(filtro='WHERE o.id = NEW.obra_id')}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_checklist_fts_delete
+    AFTER DELETE ON obra_checklist
+    BEGIN
+        DELETE FROM obras_fts WHERE rowid = OLD.obra_id;
+        {SQL_INDEXAR_OBRA_FTS.format(filtro='WHERE o.id = OLD.obra_id')}
+    END;
+'''
 
 
 class Migration:
@@ -132,6 +297,70 @@ class MigrationManager:
             upgrade=self._migration_009_add_data_acionamento,
             downgrade=None
         ))
+        
+        # Migração 10: Índices para as consultas mais frequentes
+        self.migrations.append(Migration(
+            version=10,
+            description="Criar índices de obra_checklist e obras para consultas frequentes",
+            upgrade=self._migration_010_create_indexes,
+            downgrade=None
+        ))
+        
+        # Migração 11: Tabela de resumo por obra mantida por triggers
+        self.migrations.append(Migration(
+            version=11,
+            description="Criar tabela obra_resumo mantida por triggers de obra_checklist",
+            upgrade=self._migration_011_create_obra_resumo,
+            downgrade=None
+        ))
+        
+        # Migração 12: Busca textual (FTS5) sobre obras e descrições do checklist
+        self.migrations.append(Migration(
+            version=12,
+            description="Criar índice de busca textual obras_fts (FTS5, sem acentos)",
+            upgrade=self._migration_012_create_obras_fts,
+            downgrade=None
+        ))
+        
+        # Migração 13: Índices para a listagem paginada de obras
+        self.migrations.append(Migration(
+            version=13,
+            description="Criar índices de ordenação para a listagem paginada de obras",
+            upgrade=self._migration_013_create_pagination_indexes,
+            downgrade=None
+        ))
+        
+        # Migração 14: Versão dos templates de checklist (invalidação de cache)
+        self.migrations.append(Migration(
+            version=14,
+            description="Criar tabela metadados com versão dos templates mantida por triggers",
+            upgrade=self._migration_014_create_metadados,
+            downgrade=None
+        ))
+        
+        # Migração 15: Índices do histórico de notificações
+        self.migrations.append(Migration(
+            version=15,
+            description="Criar índices do histórico de notificações por obra/data e por tarefa",
+            upgrade=self._migration_015_create_history_indexes,
+            downgrade=None
+        ))
+        
+        # Migração 16: Número do dia das datas (comparações e diferenças inteiras)
+        self.migrations.append(Migration(
+            version=16,
+            description="Criar colunas geradas com o número do dia das datas e seus índices",
+            upgrade=self._migration_016_add_day_number_columns,
+            downgrade=None
+        ))
+        
+        # Migração 17: Instâncias mensais únicas por obra/template/mês
+        self.migrations.append(Migration(
+            version=17,
+            description="Remover instâncias mensais duplicadas e criar índice único por obra/template/mês",
+            upgrade=self._migration_017_unique_monthly_instances,
+            downgrade=None
+        ))
     
     def _migration_001_add_tipo_recorrencia(self, conn: sqlite3.Connection):
         """Adiciona coluna tipo_recorrencia à tabela checklist_templates"""
@@ -573,6 +802,196 @@ class MigrationManager:
         
         conn.commit()
     
+    def _migration_010_create_indexes(self, conn: sqlite3.Connection):
+        """Cria índices compostos/parciais usados pelo checklist, notificador e listagem"""
+        cursor = conn.cursor()
+        
+        for nome, definicao in INDICES:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {nome} ON {definicao}')
+            print(f"    ✅ Índice {nome} criado")
+        
+        # Atualiza estatísticas para o planejador escolher os novos índices.
+        # Em banco vazio as estatísticas levariam o planejador a preferir varreduras,
+        # então nesse caso mantém as estimativas padrão do SQLite.
+        cursor.execute('SELECT COUNT(*) FROM obra_checklist')
+        if cursor.fetchone()[0] > 0:
+            cursor.execute('ANALYZE')
+            print("    ✅ Estatísticas atualizadas (ANALYZE)")
+        else:
+            print("    ⏭️  Banco vazio, ANALYZE adiado")
+        
+        conn.commit()
+    
+    def _migration_011_create_obra_resumo(self, conn: sqlite3.Connection):
+        """Cria a tabela obra_resumo, seus triggers e popula com as obras existentes"""
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS obra_resumo (
+                obra_id INTEGER PRIMARY KEY,
+                total_tarefas INTEGER NOT NULL DEFAULT 0,
+                tarefas_concluidas INTEGER NOT NULL DEFAULT 0,
+                tarefas_bloqueadas INTEGER NOT NULL DEFAULT 0,
+                tarefas_pendentes INTEGER NOT NULL DEFAULT 0,
+                tarefas_atrasadas INTEGER NOT NULL DEFAULT 0,
+                proximo_prazo TEXT,
+                proxima_tarefa_id INTEGER,
+                data_referencia TEXT NOT NULL,
+                FOREIGN KEY (obra_id) REFERENCES obras (id)
+            )
+        ''')
+        print("    ✅ Tabela obra_resumo criada")
+        
+        cursor.executescript(TRIGGERS_OBRA_RESUMO)
+        print("    ✅ Triggers de obra_resumo criados")
+        
+        cursor.execute('DELETE FROM obra_resumo')
+        cursor.execute(SQL_RECALCULAR_RESUMO.format(
+            obra_id='o.id', origem='obras o LEFT JOIN obra_checklist oc ON oc.obra_id = o.id GROUP BY o.id'))
+        print(f"    ✅ Resumo calculado para {cursor.rowcount} obra(s)")
+        
+        conn.commit()
+    
+    def _migration_012_create_obras_fts(self, conn: sqlite3.Connection):
+        """Cria a tabela FTS5 obras_fts, seus triggers e indexa as obras existentes"""
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS obras_fts USING fts5(
+                    {', '.join(COLUNAS_FTS)}, tarefas,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            # SQLite compilado sem FTS5: a busca continua usando LIKE
+            log_error(e, "migrations", "Criar tabela obras_fts")
+            print(f"    ⏭️  FTS5 indisponível ({e}), busca textual usará LIKE")
+            return
+        print("    ✅ Tabela obras_fts criada")
+        
+        cursor.executescript(TRIGGERS_OBRAS_FTS)
+        print("    ✅ Triggers de obras_fts criados")
+        
+        cursor.execute('DELETE FROM obras_fts')
+        cursor.execute(SQL_INDEXAR_OBRA_FTS.format(filtro=''))
+        print(f"    ✅ {cursor.rowcount} obra(s) indexada(s) para busca")
+        
+        conn.commit()
+    
+    def _migration_013_create_pagination_indexes(self, conn: sqlite3.Connection):
+        """Cria índices por expressão usados na paginação por chave de listar_obras_pagina"""
+        cursor = conn.cursor()
+        
+        for nome, definicao in INDICES_PAGINACAO:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {nome} ON {definicao}')
+            print(f"    ✅ Índice {nome} criado")
+        
+        conn.commit()
+    
+    def _migration_014_create_metadados(self, conn: sqlite3.Connection):
+        """Cria a tabela metadados e os triggers que incrementam versao_templates"""
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS metadados (
+                chave TEXT PRIMARY KEY,
+                valor TEXT
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO metadados (chave, valor) VALUES ('versao_templates', 1)")
+        print("    ✅ Tabela metadados criada")
+        
+        for evento in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_templates_versao_{evento.lower()}
+                AFTER {evento} ON checklist_templates
+                BEGIN
+                    UPDATE metadados SET valor = valor + 1 WHERE chave = 'versao_templates';
+                END
+            ''')
+        print("    ✅ Triggers de versão dos templates criados")
+        
+        conn.commit()
+    
+    def _migration_015_create_history_indexes(self, conn: sqlite3.Connection):
+        """Cria os índices usados por listar_historico"""
+        cursor = conn.cursor()
+        
+        for nome, definicao in INDICES_HISTORICO:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {nome} ON {definicao}')
+            print(f"    ✅ Índice {nome} criado")
+        
+        conn.commit()
+    
+    def _migration_016_add_day_number_columns(self, conn: sqlite3.Connection):
+        """Adiciona colunas geradas dia_* (dias desde 1970-01-01) e troca o índice de pendentes"""
+        cursor = conn.cursor()
+        
+        for tabela, coluna, origem in COLUNAS_DIA:
+            # table_xinfo lista também as colunas geradas
+            cursor.execute(f"PRAGMA table_xinfo({tabela})")
+            if coluna in [row[1] for row in cursor.fetchall()]:
+                print(f"    ⏭️  Coluna {tabela}.{coluna} já existe, pulando...")
+                continue
+            cursor.execute(f'''
+                ALTER TABLE {tabela}
+                ADD COLUMN {coluna} INTEGER GENERATED ALWAYS AS ({SQL_DIA_EPOCA.format(coluna=origem)}) VIRTUAL
+            ''')
+            print(f"    ✅ Coluna gerada {tabela}.{coluna} adicionada")
+        
+        for nome, definicao in INDICES_DIA:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {nome} ON {definicao}')
+            print(f"    ✅ Índice {nome} criado")
+        
+        cursor.execute('DROP INDEX IF EXISTS idx_obra_checklist_pendentes')
+        print("    ✅ Índice idx_obra_checklist_pendentes removido (substituído por dia_limite)")
+        
+        conn.commit()
+    
+    def _migration_017_unique_monthly_instances(self, conn: sqlite3.Connection):
+        """Remove instâncias mensais repetidas (mesma obra, template e mês) e cria o índice único.
+        Mantém a instância concluída (ou a mais antiga); histórico e dependências das removidas
+        passam a apontar para ela.
+        """
+        cursor = conn.cursor()
+        
+        cursor.execute('DROP TABLE IF EXISTS temp.mensais_duplicadas')
+        cursor.execute('''
+            CREATE TEMP TABLE mensais_duplicadas AS
+            SELECT id, manter FROM (
+                SELECT id, FIRST_VALUE(id) OVER (
+                    PARTITION BY obra_id, template_id, mes_referencia ORDER BY concluido DESC, id
+                ) AS manter
+                FROM obra_checklist
+                WHERE mes_referencia IS NOT NULL
+            )
+            WHERE id != manter
+        ''')
+        cursor.execute('SELECT COUNT(*) FROM temp.mensais_duplicadas')
+        duplicadas = cursor.fetchone()[0]
+        
+        if duplicadas:
+            for tabela, coluna in (('historico_notificacoes', 'tarefa_id'), ('obra_checklist', 'depende_item_id')):
+                cursor.execute(f'''
+                    UPDATE {tabela}
+                    SET {coluna} = (SELECT manter FROM temp.mensais_duplicadas d WHERE d.id = {tabela}.{coluna})
+                    WHERE {coluna} IN (SELECT id FROM temp.mensais_duplicadas)
+                ''')
+            cursor.execute('DELETE FROM obra_checklist WHERE id IN (SELECT id FROM temp.mensais_duplicadas)')
+            print(f"    ✅ {duplicadas} instância(s) mensal(is) duplicada(s) removida(s)")
+        else:
+            print("    ⏭️  Nenhuma instância mensal duplicada")
+        cursor.execute('DROP TABLE temp.mensais_duplicadas')
+        
+        nome, definicao = INDICE_MENSAL_UNICO
+        cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {nome} ON {definicao}')
+        print(f"    ✅ Índice único {nome} criado")
+        cursor.execute('DROP INDEX IF EXISTS idx_obra_checklist_mes_ref')
+        print("    ✅ Índice idx_obra_checklist_mes_ref removido (substituído pelo índice único)")
+        
+        conn.commit()
+    
     def _get_applied_versions(self) -> List[int]:
         """Retorna lista de migrações já aplicadas"""
         conn = sqlite3.connect(self.db_name)
@@ -590,6 +1009,7 @@ class MigrationManager:
         pending = [m for m in self.migrations if m.version not in applied]
         
         if not pending:
+            self._gravar_versao_schema()
             print("✅ Todas as migrações estão atualizadas!")
             return
         
@@ -601,6 +1021,7 @@ class MigrationManager:
             for migration in pending:
                 migration.apply(conn)
             
+            self._gravar_versao_schema(conn)
             print(f"\n✅ {len(pending)} migração(ões) aplicada(s) com sucesso!\n")
         except Exception as e:
             log_error(e, "migrations", "Aplicar migrações pendentes")
@@ -610,6 +1031,18 @@ class MigrationManager:
         finally:
             conn.close()
     
+    def _gravar_versao_schema(self, conn: sqlite3.Connection = None):
+        """Grava a versão da última migração em PRAGMA user_version (verificação rápida na inicialização)"""
+        versao = VERSAO_SCHEMA
+        conexao = conn or sqlite3.connect(self.db_name)
+        try:
+            if conexao.execute('PRAGMA user_version').fetchone()[0] != versao:
+                conexao.execute(f'PRAGMA user_version = {versao}')
+                conexao.commit()
+        finally:
+            if conn is None:
+                conexao.close()
+    
     def show_status(self):
         """Exibe status das migrações"""
         applied = self._get_applied_versions()
@@ -625,6 +1058,20 @@ class MigrationManager:
         print(f"Total: {len(applied)}/{len(self.migrations)} aplicadas\n")
 
 
+def _ultima_versao_registrada() -> int:
+    """Maior versão entre as migrações de MigrationManager (sem abrir o banco)"""
+    registro = object.__new__(MigrationManager)
+    registro.migrations = []
+    registro._register_migrations()
+    return max(migration.version for migration in registro.migrations)
+
+
+# Versão da última migração registrada. Gravada em PRAGMA user_version após as migrações,
+# permite ao Database pular toda a verificação de schema quando o banco já está atualizado.
+# Calculada a partir das migrações: registrar uma nova já faz os bancos existentes a aplicarem.
+VERSAO_SCHEMA = _ultima_versao_registrada()
+
+
 def run_migrations(db_name: str = "agendaobras.db"):
     """Função auxiliar para executar migrações"""
     manager = MigrationManager(db_name)
@@ -6,9 +6,14 @@ Responsável por verificar prazos e enviar alertas por email conforme regras de
 import threading
 import time
 import datetime
-import sqlite3
 from typing import Dict
 from error_logger import log_error
+from app_logger import obter_logger
+from arquivamento import ArquivadorObras
+from gerador_tarefas_recorrentes import MESES_RECUPERACAO_INICIALIZACAO
+from datas import hoje_dia
+
+logger = obter_logger("notificador_prazos")
 
 # Flag global para controlar se o notificador já está executando
 _notificador_ativo = False
@@ -34,7 +39,7 @@ class NotificadorPrazos:
             self.executando = True
             thread = threading.Thread(target=self._verificar_loop, daemon=True)
             thread.start()
-            print("🔔 Sistema de notificação de prazos iniciado!")
+            logger.info("🔔 Sistema de notificação de prazos iniciado!")
     
     def verificar_agora(self, forcar: bool = False):
         """Executa verificação manual de prazos
@@ -43,40 +48,46 @@ class NotificadorPrazos:
             forcar: Se True, ignora verificação de última execução e força o envio
         """
         if forcar:
-            print("🔄 Verificação manual FORÇADA de prazos...")
+            logger.info("🔄 Verificação manual FORÇADA de prazos...")
             try:
                 self.gerador_recorrentes.gerar_tarefas_mensais()
                 alertas = self._verificar_prazos()
                 self._registrar_execucao(alertas, 'concluida')
-                print("✅ Verificação manual concluída!")
+                logger.info("✅ Verificação manual concluída!")
                 return True
             except Exception as e:
-                print(f"❌ Erro na verificação manual: {e}")
+                logger.error("❌ Erro na verificação manual: %s", e)
                 self._registrar_execucao(0, 'erro', str(e))
                 return False
         else:
             if self._ja_executou_hoje():
-                print("ℹ️ Verificação já foi executada hoje. Use forcar=True para executar de qualquer forma.")
+                logger.info("ℹ️ Verificação já foi executada hoje. Use forcar=True para executar de qualquer forma.")
                 return False
             else:
-                print("🔄 Executando verificação manual de prazos...")
+                logger.info("🔄 Executando verificação manual de prazos...")
                 try:
                     self.gerador_recorrentes.gerar_tarefas_mensais()
                     alertas = self._verificar_prazos()
                     self._registrar_execucao(alertas, 'concluida')
-                    print("✅ Verificação manual concluída!")
+                    logger.info("✅ Verificação manual concluída!")
                     return True
                 except Exception as e:
-                    print(f"❌ Erro na verificação manual: {e}")
+                    logger.error("❌ Erro na verificação manual: %s", e)
                     self._registrar_execucao(0, 'erro', str(e))
                     return False
     
     def _verificar_loop(self):
         """Loop de verificação (executa a cada 24 horas)"""
+        # Na inicialização: tarefas mensais de meses em que o sistema não foi aberto
+        try:
+            self.gerador_recorrentes.recuperar_meses_faltantes(meses=MESES_RECUPERACAO_INICIALIZACAO)
+        except Exception as e:
+            logger.error("❌ Erro ao recuperar tarefas mensais de meses anteriores: %s", e)
+        
         while self.executando:
             # Verifica se já executou hoje
             if self._ja_executou_hoje():
-                print("ℹ️  Verificação de prazos já executada hoje. Aguardando próximo ciclo...")
+                logger.debug("ℹ️  Verificação de prazos já executada hoje. Aguardando próximo ciclo...")
                 time.sleep(3600)  # Verifica a cada 1 hora se mudou o dia
                 continue
             
@@ -84,7 +95,7 @@ class NotificadorPrazos:
             try:
                 self.gerador_recorrentes.gerar_tarefas_mensais()
             except Exception as e:
-                print(f"❌ Erro ao gerar tarefas recorrentes: {e}")
+                logger.error("❌ Erro ao gerar tarefas recorrentes: %s", e)
             
             # Verifica prazos e envia alertas
             try:
@@ -92,118 +103,104 @@ class NotificadorPrazos:
                 # Registra que executou hoje
                 self._registrar_execucao(alertas, 'concluida')
             except Exception as e:
-                print(f"❌ Erro ao verificar prazos: {e}")
+                logger.error("❌ Erro ao verificar prazos: %s", e)
                 self._registrar_execucao(0, 'erro', str(e))
             
+            # Move obras concluídas e histórico antigo para o arquivo morto e aplica a retenção
+            try:
+                arquivador = ArquivadorObras(self.database)
+                arquivador.arquivar()
+                arquivador.expurgar_historico()
+            except Exception as e:
+                logger.error("❌ Erro ao arquivar obras concluídas: %s", e)
+            
             time.sleep(3600)  # Verifica a cada 1 hora se mudou o dia
     
     def _verificar_prazos(self) -> int:
         """Verifica tarefas atrasadas e envia alertas agrupados por obra. Retorna total de alertas enviados."""
-        # Retry mechanism para lidar com database locked
-        max_tentativas = 3
-        for tentativa in range(max_tentativas):
-            conn = None
-            try:
-                conn = self.database.get_connection()
-                cursor = conn.cursor()
-                
-                hoje = datetime.date.today().strftime('%Y-%m-%d')
-                
-                # Busca tarefas não concluídas e não bloqueadas
-                cursor.execute('''
-                    SELECT oc.*, o.nome_contrato, o.cliente, ct.possui_reiteracao, ct.tipo_recorrencia
-                    FROM obra_checklist oc
-                    JOIN obras o ON oc.obra_id = o.id 
-                    LEFT JOIN checklist_templates ct ON oc.template_id = ct.id
-                    WHERE oc.concluido = 0 AND oc.bloqueado = 0 
-                    AND oc.data_limite IS NOT NULL
-                    ORDER BY oc.data_limite
-                ''')
-                
-                tarefas = [dict(row) for row in cursor.fetchall()]
-                
-                # Dicionário para agrupar alertas por obra
-                # Estrutura: {obra_id: {'info': {...}, 'tarefas': {tipo_alerta: [tarefa_data, ...]}}}
-                alertas_por_obra = {}
+        hoje = hoje_dia()
+        
+        # Apenas leitura: em WAL não espera pelas escritas (que passam pela thread de escrita)
+        with self.database.conexao() as conn:
+            cursor = conn.cursor()
+            
+            # Busca tarefas não concluídas e não bloqueadas
+            cursor.execute('''
+                SELECT oc.*, o.nome_contrato, o.cliente, ct.possui_reiteracao, ct.tipo_recorrencia
+                FROM obra_checklist oc
+                JOIN obras o ON oc.obra_id = o.id 
+                LEFT JOIN checklist_templates ct ON oc.template_id = ct.id
+                WHERE oc.concluido = 0 AND oc.bloqueado = 0 
+                AND oc.dia_limite IS NOT NULL
+                ORDER BY oc.dia_limite
+            ''')
+            
+            tarefas = [dict(row) for row in cursor.fetchall()]
+            
+            # Dicionário para agrupar alertas por obra
+            # Estrutura: {obra_id: {'info': {...}, 'tarefas': {tipo_alerta: [tarefa_data, ...]}}}
+            alertas_por_obra = {}
+            
+            for tarefa in tarefas:
+                # Diferença em dias pela coluna gerada dia_limite (sem converter texto)
+                dias_diff = hoje - tarefa['dia_limite']
                 
-                for tarefa in tarefas:
-                    data_limite = datetime.datetime.strptime(tarefa['data_limite'], '%Y-%m-%d').date()
-                    dias_diff = (hoje - data_limite).days if isinstance(hoje, datetime.date) else (datetime.datetime.strptime(hoje, '%Y-%m-%d').date() - data_limite).days
+                try:
+                    # Processa tarefa e obtém dados de alerta (se aplicável)
+                    if tarefa['tipo'] == 'A':
+                        # Tipo A: Com reiterações (dias 2, 4, 6, depois diário)
+                        alerta_data = self._processar_tipo_a(cursor, tarefa, dias_diff)
+                    else:
+                        # Tipo B: Prazo fixo (último dia crítico, depois diário)
+                        alerta_data = self._processar_tipo_b(cursor, tarefa, dias_diff)
                     
-                    try:
-                        # Processa tarefa e obtém dados de alerta (se aplicável)
-                        if tarefa['tipo'] == 'A':
-                            # Tipo A: Com reiterações (dias 2, 4, 6, depois diário)
-                            alerta_data = self._processar_tipo_a(cursor, tarefa, dias_diff)
-                        else:
-                            # Tipo B: Prazo fixo (último dia crítico, depois diário)
-                            alerta_data = self._processar_tipo_b(cursor, tarefa, dias_diff)
+                    # Se deve enviar alerta, adiciona ao agrupamento por obra
+                    if alerta_data:
+                        obra_id = tarefa['obra_id']
                         
-                        # Se deve enviar alerta, adiciona ao agrupamento por obra
-                        if alerta_data:
-                            obra_id = tarefa['obra_id']
-                            
-                            # Inicializa estrutura da obra se não existir
-                            if obra_id not in alertas_por_obra:
-                                alertas_por_obra[obra_id] = {
-                                    'info': {
-                                        'nome_contrato': tarefa['nome_contrato'],
-                                        'cliente': tarefa['cliente']
-                                    },
-                                    'tarefas': {
-                                        'reiteracao_1': [],
-                                        'reiteracao_2': [],
-                                        'reiteracao_3': [],
-                                        'critico_atrasado': [],
-                                        'tipo_b': []
-                                    }
+                        # Inicializa estrutura da obra se não existir
+                        if obra_id not in alertas_por_obra:
+                            alertas_por_obra[obra_id] = {
+                                'info': {
+                                    'nome_contrato': tarefa['nome_contrato'],
+                                    'cliente': tarefa['cliente']
+                                },
+                                'tarefas': {
+                                    'reiteracao_1': [],
+                                    'reiteracao_2': [],
+                                    'reiteracao_3': [],
+                                    'critico_atrasado': [],
+                                    'tipo_b': []
                                 }
-                            
-                            # Adiciona tarefa no tipo de alerta correspondente
-                            tipo_alerta = alerta_data['tipo_alerta']
-                            alertas_por_obra[obra_id]['tarefas'][tipo_alerta].append(alerta_data)
-                            
-                    except Exception as e:
-                        print(f"⚠️ Erro ao processar tarefa {tarefa['id']}: {e}")
-                        continue
-                
-                # Envia emails agrupados por obra
-                total_emails_enviados = 0
-                for obra_id, dados_obra in alertas_por_obra.items():
-                    if self._enviar_email_agrupado_por_obra(obra_id, dados_obra):
-                        total_emails_enviados += 1
-                
-                if total_emails_enviados > 0:
-                    total_tarefas = sum(
-                        len(tarefas) 
-                        for obra in alertas_por_obra.values() 
-                        for tarefas in obra['tarefas'].values()
-                    )
-                    print(f"\n📧 {total_emails_enviados} email(s) enviado(s) para {total_tarefas} tarefa(s)\n")
-                    obras_com_emails = [dados['info']['nome_contrato'] for obra_id, dados in alertas_por_obra.items() if any(dados['tarefas'].values())]
-                    
-                    print(f"Obra(s) com e-mails enviados:")
-                    for nome in obras_com_emails:
-                        print(f"   - {nome}\n")
-
-                return total_tarefas if alertas_por_obra else 0
-
-            except sqlite3.OperationalError as e:
-                if "locked" in str(e).lower():
-                    if tentativa < max_tentativas - 1:
-                        print(f"⚠️ Banco de dados temporariamente bloqueado, tentando novamente em 5 segundos... (tentativa {tentativa + 1}/{max_tentativas})")
-                        time.sleep(5)
-                        continue
-                    else:
-                        print(f"❌ Banco de dados permanece bloqueado após {max_tentativas} tentativas")
-                        return 0
-                else:
-                    raise
-            finally:
-                if conn:
-                    conn.close()
+                            }
+                        
+                        # Adiciona tarefa no tipo de alerta correspondente
+                        tipo_alerta = alerta_data['tipo_alerta']
+                        alertas_por_obra[obra_id]['tarefas'][tipo_alerta].append(alerta_data)
+                        
+                except Exception as e:
+                    logger.warning("⚠️ Erro ao processar tarefa %s: %s", tarefa['id'], e)
+                    continue
+            
+        # Envia emails agrupados por obra (fora da transação de leitura)
+        total_emails_enviados = 0
+        total_tarefas = 0
+        for obra_id, dados_obra in alertas_por_obra.items():
+            if self._enviar_email_agrupado_por_obra(obra_id, dados_obra):
+                total_emails_enviados += 1
         
-        return 0
+        if total_emails_enviados > 0:
+            total_tarefas = sum(
+                len(tarefas) 
+                for obra in alertas_por_obra.values() 
+                for tarefas in obra['tarefas'].values()
+            )
+            logger.info("📧 %s email(s) enviado(s) para %s tarefa(s)", total_emails_enviados, total_tarefas)
+            obras_com_emails = [dados['info']['nome_contrato'] for obra_id, dados in alertas_por_obra.items() if any(dados['tarefas'].values())]
+            
+            logger.debug("Obra(s) com e-mails enviados: %s", ', '.join(obras_com_emails))
+
+        return total_tarefas if alertas_por_obra else 0
     
     def _processar_tipo_a(self, cursor, tarefa: Dict, dias_diff: int):
         """Processa notificação para tarefa Tipo A (com reiterações)
@@ -280,6 +277,7 @@ class NotificadorPrazos:
                 'obra_id': tarefa['obra_id'],
                 'descricao': tarefa['descricao'],
                 'data_limite': tarefa['data_limite'],
+                'dia_limite': tarefa['dia_limite'],
                 'tipo_alerta': tipo_alerta,
                 'nova_tentativa': nova_tentativa,
                 'dias_diff': dias_diff,
@@ -325,6 +323,7 @@ class NotificadorPrazos:
                 'obra_id': tarefa['obra_id'],
                 'descricao': tarefa['descricao'],
                 'data_limite': tarefa['data_limite'],
+                'dia_limite': tarefa['dia_limite'],
                 'tipo_alerta': tipo_alerta,
                 'dias_diff': dias_diff,
                 'hoje_str': hoje_str,
@@ -369,247 +368,113 @@ class NotificadorPrazos:
                 email_critico = getattr(self.email_service.config, 'email_critico', '')
                 if email_critico and email_critico not in destinatario:
                     destinatario.append(email_critico)
-                    print(f"📧 Email crítico: adicionando {email_critico} como destinatário")
+                    logger.debug("📧 Email crítico: adicionando %s como destinatário", email_critico)
             sucesso, msg = self.email_service.enviar_email(destinatario, assunto, corpo_html)
             
             if not sucesso:
-                print(f"❌ Falha ao enviar email para obra {obra_info['nome_contrato']}: {msg}")
+                logger.error("❌ Falha ao enviar email para obra %s: %s", obra_info['nome_contrato'], msg)
                 return False
             
-            # Atualiza banco para todas as tarefas
-            for tipo_alerta, lista_tarefas in tarefas_com_conteudo.items():
-                for tarefa_data in lista_tarefas:
-                    tarefa_id = tarefa_data['tarefa_id']
-                    
-                    # Atualiza campos de controle da tarefa
-                    if 'nova_tentativa' in tarefa_data:
-                        # Tipo A (com reiterações)
-                        self._atualizar_tarefa_com_retry(
-                            tarefa_id,
-                            tarefa_data['nova_tentativa'],
-                            tarefa_data['hoje_str'],
-                            tarefa_data['status']
-                        )
-                    else:
-                        # Tipo B (sem reiterações)
-                        self._atualizar_tarefa_tipo_b_com_retry(
-                            tarefa_id,
-                            tarefa_data['hoje_str'],
-                            tarefa_data['status']
-                        )
-                    
-                    # Registra histórico individual para cada tarefa
-                    self._registrar_historico_com_retry(
-                        obra_id,
-                        tarefa_id,
-                        tipo_alerta,
-                        destinatario,
-                        sucesso,
-                        None if sucesso else msg
-                    )
+            # Atualiza controle das tarefas e histórico em uma única operação da thread de escrita
+            futuro = self.database.enviar_escrita(self._gravar_envio, obra_id, tarefas_com_conteudo, destinatario)
+            futuro.add_done_callback(lambda f: self._verificar_gravacao(f, obra_id))
             
             # Log de sucesso
             total_tarefas = sum(len(tarefas) for tarefas in tarefas_com_conteudo.values())
-            print(f"📧 Email agrupado enviado: {obra_info['nome_contrato']} ({total_tarefas} tarefa(s))")
+            logger.info("📧 Email agrupado enviado: %s (%s tarefa(s))", obra_info['nome_contrato'], total_tarefas)
             return True
             
         except Exception as e:
-            print(f"❌ Erro ao enviar email agrupado para obra {obra_info['nome_contrato']}: {e}")
+            logger.error("❌ Erro ao enviar email agrupado para obra %s: %s", obra_info['nome_contrato'], e)
             return False
     
     def _ja_executou_hoje(self) -> bool:
         """Verifica se a verificação de prazos já foi executada hoje"""
         try:
-            conn = self.database.get_connection()
-            cursor = conn.cursor()
-            
             hoje = datetime.date.today().strftime('%Y-%m-%d')
-            cursor.execute('''
-                SELECT COUNT(*) FROM verificacoes_prazos 
-                WHERE data_verificacao = ? AND status = 'concluida'
-            ''', (hoje,))
-            
-            count = cursor.fetchone()[0]
-            conn.close()
+            with self.database.conexao() as conn:
+                count = conn.execute('''
+                    SELECT COUNT(*) FROM verificacoes_prazos 
+                    WHERE data_verificacao = ? AND status = 'concluida'
+                ''', (hoje,)).fetchone()[0]
             
             return count > 0
         except Exception as e:
-            print(f"⚠️ Erro ao verificar última execução: {e}")
+            logger.warning("⚠️ Erro ao verificar última execução: %s", e)
             return False
     
     def _registrar_execucao(self, alertas_enviados: int = 0, status: str = 'concluida', mensagem_erro: str = None):
         """Registra que a verificação foi executada hoje"""
         try:
-            conn = self.database.get_connection()
-            cursor = conn.cursor()
-            
             hoje = datetime.date.today().strftime('%Y-%m-%d')
             agora = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            # Conta tarefas verificadas
-            cursor.execute('''
-                SELECT COUNT(*) FROM obra_checklist 
-                WHERE concluido = 0 AND bloqueado = 0 AND data_limite IS NOT NULL
-            ''')
-            tarefas_verificadas = cursor.fetchone()[0]
-            
-            # Insere ou atualiza registro
-            cursor.execute('''
-                INSERT OR REPLACE INTO verificacoes_prazos 
-                (data_verificacao, data_hora_inicio, data_hora_fim, tarefas_verificadas, alertas_enviados, status, mensagem_erro)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (hoje, agora, agora, tarefas_verificadas, alertas_enviados, status, mensagem_erro))
-            
-            conn.commit()
-            conn.close()
-            
-            if status == 'concluida':
-                print(f"✅ Verificação de prazos concluída e registrada para {hoje} ({tarefas_verificadas} tarefas verificadas, {alertas_enviados} alertas enviados)")
-            else:
-                print(f"⚠️ Verificação de prazos registrada com status '{status}' para {hoje}")
-        except Exception as e:
-            print(f"⚠️ Erro ao registrar execução: {e}")
-    
-    def _atualizar_tarefa_com_retry(self, tarefa_id: int, tentativas: int, ultima_notif: str, status: str, max_tentativas: int = 5):
-        """Atualiza tarefa com retry em caso de database locked"""
-        for tentativa in range(max_tentativas):
-            conn = None
-            try:
-                conn = self.database.get_connection()
+            def gravar(conn):
                 cursor = conn.cursor()
                 
+                # Conta tarefas verificadas
                 cursor.execute('''
-                    UPDATE obra_checklist 
-                    SET tentativas_reiteracao = ?, ultima_notificacao = ?, status_notificacao = ?
-                    WHERE id = ?
-                ''', (tentativas, ultima_notif, status, tarefa_id))
-                
-                conn.commit()
-                conn.close()
-                return True
-                
-            except sqlite3.OperationalError as e:
-                if "locked" in str(e).lower():
-                    if conn:
-                        try:
-                            conn.close()
-                        except Exception as e_close:
-                            log_error(e_close, "notificador_prazos", "Fechar conexão após database locked em _atualizar_tarefa_com_retry")
-                            pass
-                    if tentativa < max_tentativas - 1:
-                        time.sleep(0.5)  # Aguarda 500ms antes de tentar novamente
-                        continue
-                    else:
-                        print(f"❌ Falha ao atualizar tarefa {tarefa_id} após {max_tentativas} tentativas")
-                        return False
-                else:
-                    raise
-            except Exception as e:
-                log_error(e, "notificador_prazos", f"Atualizar tarefa {tarefa_id} com retry")
-                print(f"❌ Erro ao atualizar tarefa {tarefa_id}: {e}")
-                if conn:
-                    try:
-                        conn.close()
-                    except Exception as e_close:
-                        log_error(e_close, "notificador_prazos", "Fechar conexão após erro em _atualizar_tarefa_com_retry")
-                        pass
-                return False
-        return False
-    
-    def _registrar_historico_com_retry(self, obra_id: int, tarefa_id: int, tipo: str, destinatarios: str, sucesso: bool, erro: str = None, max_tentativas: int = 5):
-        """Registra histórico com retry em caso de database locked"""
-        for tentativa in range(max_tentativas):
-            conn = None
-            try:
-                conn = self.database.get_connection()
-                cursor = conn.cursor()
-                
-                data_envio = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    SELECT COUNT(*) FROM obra_checklist 
+                    WHERE concluido = 0 AND bloqueado = 0 AND data_limite IS NOT NULL
+                ''')
+                tarefas_verificadas = cursor.fetchone()[0]
                 
-                # Converte a lista de destinatários em string para armazenamento (se for lista)
-                if isinstance(destinatarios, list):
-                    destinatarios_str = ", ".join(destinatarios)
-
+                # Insere ou atualiza registro
                 cursor.execute('''
-                    INSERT INTO historico_notificacoes 
-                    (obra_id, tarefa_id, tipo_notificacao, data_envio, destinatarios, sucesso, mensagem_erro)
+                    INSERT OR REPLACE INTO verificacoes_prazos 
+                    (data_verificacao, data_hora_inicio, data_hora_fim, tarefas_verificadas, alertas_enviados, status, mensagem_erro)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (obra_id, tarefa_id, tipo, data_envio, destinatarios_str, 1 if sucesso else 0, erro))
-                
-                conn.commit()
-                conn.close()
-                return True
-                
-            except sqlite3.OperationalError as e:
-                if "locked" in str(e).lower():
-                    if conn:
-                        try:
-                            conn.close()
-                        except Exception as e_close:
-                            log_error(e_close, "notificador_prazos", "Fechar conexão após database locked em _registrar_historico_com_retry")
-                            pass
-                    if tentativa < max_tentativas - 1:
-                        time.sleep(0.5)  # Aguarda 500ms antes de tentar novamente
-                        continue
-                    else:
-                        print(f"❌ Falha ao registrar histórico após {max_tentativas} tentativas")
-                        return False
-                else:
-                    raise
-            except Exception as e:
-                log_error(e, "notificador_prazos", "Registrar histórico com retry")
-                print(f"❌ Erro ao registrar histórico: {e}")
-                if conn:
-                    try:
-                        conn.close()
-                    except Exception as e_close:
-                        log_error(e_close, "notificador_prazos", "Fechar conexão após erro em _registrar_historico_com_retry")
-                        pass
-                return False
-        return False
+                ''', (hoje, agora, agora, tarefas_verificadas, alertas_enviados, status, mensagem_erro))
+                return tarefas_verificadas
+            
+            # Enfileirada após as gravações dos envios: só confirma depois delas
+            tarefas_verificadas = self.database.enviar_escrita(gravar).result()
+            
+            if status == 'concluida':
+                logger.info("✅ Verificação de prazos concluída e registrada para %s (%s tarefas verificadas, %s alertas enviados)", hoje, tarefas_verificadas, alertas_enviados)
+            else:
+                logger.warning("⚠️ Verificação de prazos registrada com status '%s' para %s", status, hoje)
+        except Exception as e:
+            logger.warning("⚠️ Erro ao registrar execução: %s", e)
     
-    def _atualizar_tarefa_tipo_b_com_retry(self, tarefa_id: int, ultima_notif: str, status: str, max_tentativas: int = 5):
-        """Atualiza tarefa tipo B com retry em caso de database locked"""
-        for tentativa in range(max_tentativas):
-            conn = None
-            try:
-                conn = self.database.get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    UPDATE obra_checklist 
-                    SET ultima_notificacao = ?, status_notificacao = ?
-                    WHERE id = ?
-                ''', (ultima_notif, status, tarefa_id))
-                
-                conn.commit()
-                conn.close()
-                return True
-                
-            except sqlite3.OperationalError as e:
-                if "locked" in str(e).lower():
-                    if conn:
-                        try:
-                            conn.close()
-                        except Exception as e_close:
-                            log_error(e_close, "notificador_prazos", "Fechar conexão após database locked em _atualizar_tarefa_tipo_b_com_retry")
-                            pass
-                    if tentativa < max_tentativas - 1:
-                        time.sleep(0.5)  # Aguarda 500ms antes de tentar novamente
-                        continue
-                    else:
-                        print(f"❌ Falha ao atualizar tarefa tipo B {tarefa_id} após {max_tentativas} tentativas")
-                        return False
+    def _gravar_envio(self, conn, obra_id: int, tarefas_com_conteudo: Dict, destinatarios) -> int:
+        """Grava o resultado de um email agrupado: controle de reiteração das tarefas e
+        histórico de notificações. Executada na thread de escrita do banco."""
+        data_envio = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if isinstance(destinatarios, list):
+            destinatarios = ", ".join(destinatarios)
+        
+        tipo_a, tipo_b, historico = [], [], []
+        for tipo_alerta, lista_tarefas in tarefas_com_conteudo.items():
+            for tarefa_data in lista_tarefas:
+                tarefa_id = tarefa_data['tarefa_id']
+                if 'nova_tentativa' in tarefa_data:
+                    # Tipo A (com reiterações)
+                    tipo_a.append((tarefa_data['nova_tentativa'], tarefa_data['hoje_str'], tarefa_data['status'], tarefa_id))
                 else:
-                    raise
-            except Exception as e:
-                log_error(e, "notificador_prazos", f"Atualizar tarefa tipo B {tarefa_id} com retry")
-                print(f"❌ Erro ao atualizar tarefa tipo B {tarefa_id}: {e}")
-                if conn:
-                    try:
-                        conn.close()
-                    except Exception as e_close:
-                        log_error(e_close, "notificador_prazos", "Fechar conexão após erro em _atualizar_tarefa_tipo_b_com_retry")
-                        pass
-                return False
-        return False
+                    # Tipo B (sem reiterações)
+                    tipo_b.append((tarefa_data['hoje_str'], tarefa_data['status'], tarefa_id))
+                historico.append((obra_id, tarefa_id, tipo_alerta, data_envio, destinatarios, 1, None))
+        
+        conn.executemany('''
+            UPDATE obra_checklist 
+            SET tentativas_reiteracao = ?, ultima_notificacao = ?, status_notificacao = ?
+            WHERE id = ?
+        ''', tipo_a)
+        conn.executemany('''
+            UPDATE obra_checklist 
+            SET ultima_notificacao = ?, status_notificacao = ?
+            WHERE id = ?
+        ''', tipo_b)
+        conn.executemany('''
+            INSERT INTO historico_notificacoes 
+            (obra_id, tarefa_id, tipo_notificacao, data_envio, destinatarios, sucesso, mensagem_erro)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', historico)
+        return len(historico)
+    
+    def _verificar_gravacao(self, futuro, obra_id: int):
+        """Registra falhas na gravação do envio (o email já foi enviado)"""
+        erro = futuro.exception()
+        if erro:
+            log_error(erro, "notificador_prazos", f"Gravar envio de alertas da obra {obra_id}")
@@ -6,6 +6,7 @@ Contém métodos utilitários para formatação e cálculos.
 import datetime
 from typing import List, Dict
 from error_logger import log_error
+from datas import dias_ate
 
 
 class ObrasHelper:
@@ -30,10 +31,10 @@ class ObrasHelper:
     def calcular_dias_restantes(data_limite: str) -> int:
         """Calcula dias restantes até o prazo"""
         try:
-            data_limite_obj = datetime.datetime.strptime(data_limite, '%Y-%m-%d').date()
-            hoje = datetime.date.today()
-            delta = (data_limite_obj - hoje).days
-            return delta
+            dias = dias_ate(data_limite)
+            if dias is None:
+                raise ValueError(f"Data inválida: {data_limite!r}")
+            return dias
         except Exception as e:
             log_error(e, "obras_helper", f"Calcular dias restantes - data_limite: {data_limite}")
             return 0
@@ -44,20 +45,41 @@ class ObrasHelper:
         try:
             progresso = ObrasHelper.calcular_progresso(checklist)
             
-            if progresso == 100:
-                return ('green', 'check_circle', 'Concluída')
-            
             # Verifica se há tarefas atrasadas
             hoje = datetime.date.today().strftime('%Y-%m-%d')
             atrasadas = [item for item in checklist 
                          if not item['concluido'] and item['data_limite'] and item['data_limite'] < hoje]
             
-            if atrasadas:
-                return ('red', 'warning', 'Atrasada')
-            elif progresso > 0:
-                return ('orange', 'schedule', 'Em Andamento')
-            else:
-                return ('gray', 'hourglass_empty', 'Não Iniciada')
+            return ObrasHelper._status_visual(progresso, len(atrasadas))
         except Exception as e:
             log_error(e, "obras_helper", f"Obter status visual - obra_id: {obra.get('id', 'N/A')}")
             return ('gray', 'error', 'Erro')
+    
+    @staticmethod
+    def calcular_progresso_resumo(obra: Dict) -> int:
+        """Calcula percentual de progresso a partir do resumo de listar_obras_com_resumo"""
+        if not obra.get('total_tarefas'):
+            return 0
+        return int((obra['tarefas_concluidas'] / obra['total_tarefas']) * 100)
+    
+    @staticmethod
+    def obter_status_visual_resumo(obra: Dict) -> tuple:
+        """Retorna cor e ícone a partir do resumo de listar_obras_com_resumo"""
+        try:
+            progresso = ObrasHelper.calcular_progresso_resumo(obra)
+            return ObrasHelper._status_visual(progresso, obra.get('tarefas_atrasadas') or 0)
+        except Exception as e:
+            log_error(e, "obras_helper", f"Obter status visual (resumo) - obra_id: {obra.get('id', 'N/A')}")
+            return ('gray', 'error', 'Erro')
+    
+    @staticmethod
+    def _status_visual(progresso: int, total_atrasadas: int) -> tuple:
+        """Regra comum de status: concluída, atrasada, em andamento ou não iniciada"""
+        if progresso == 100:
+            return ('green', 'check_circle', 'Concluída')
+        if total_atrasadas:
+            return ('red', 'warning', 'Atrasada')
+        elif progresso > 0:
+            return ('orange', 'schedule', 'Em Andamento')
+        else:
+            return ('gray', 'hourglass_empty', 'Não Iniciada')
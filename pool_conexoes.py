@@ -0,0 +1,190 @@
+"""
+Módulo de pool de conexões SQLite para o sistema AgendaObras.
+Mantém conexões abertas e reutilizáveis por arquivo de banco de dados, evitando
+abrir/fechar o arquivo (e reconfigurar os PRAGMAs) a cada operação.
+
+EXEMPLOS DE USO:
+
+1. Bloco transacional (commit automático, rollback em caso de erro):
+    pool = obter_pool(CAMINHO_DB)
+    with pool.conexao() as conn:
+        conn.execute('UPDATE obras SET status = ? WHERE id = ?', ('Concluída', 1))
+
+2. Compatível com o padrão antigo get_connection()/close():
+    conn = pool.obter()
+    ...
+    conn.close()  # Devolve a conexão ao pool em vez de fechar o arquivo
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List
+from error_logger import log_error
+
+# Quantidade máxima de conexões ociosas mantidas abertas por banco
+MAX_CONEXOES_OCIOSAS = 8
+
+# Timeout (em segundos) para aguardar locks do SQLite
+TIMEOUT_CONEXAO = 30.0
+
+
+class ConexaoPool:
+    """Conexão emprestada do pool.
+
+    Delega todas as operações à sqlite3.Connection original. O método close()
+    devolve a conexão ao pool (descartando alterações não confirmadas, como faria
+    o fechamento real) em vez de fechar o arquivo.
+    """
+
+    def __init__(self, pool: 'PoolConexoes', conn: sqlite3.Connection):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_conn', conn)
+
+    def _conexao_ativa(self) -> sqlite3.Connection:
+        conn = object.__getattribute__(self, '_conn')
+        if conn is None:
+            raise sqlite3.ProgrammingError('Cannot operate on a closed database.')
+        return conn
+
+    def __getattr__(self, nome):
+        return getattr(self._conexao_ativa(), nome)
+
+    def __setattr__(self, nome, valor):
+        setattr(self._conexao_ativa(), nome, valor)
+
+    def __enter__(self):
+        self._conexao_ativa().__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return self._conexao_ativa().__exit__(exc_type, exc_value, tb)
+
+    def close(self):
+        """Devolve a conexão ao pool (chamadas repetidas são ignoradas)"""
+        conn = object.__getattribute__(self, '_conn')
+        if conn is None:
+            return
+        object.__setattr__(self, '_conn', None)
+        self._pool._devolver(conn)
+
+
+class PoolConexoes:
+    """Pool limitado de conexões SQLite para um único arquivo de banco"""
+
+    def __init__(self, db_name: str, max_ociosas: int = MAX_CONEXOES_OCIOSAS,
+                 timeout: float = TIMEOUT_CONEXAO):
+        self.db_name = db_name
+        self.max_ociosas = max_ociosas
+        self.timeout = timeout
+        self._ociosas: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.conexoes_abertas = 0
+        # Bancos anexados (ATTACH) a todas as conexões: alias -> caminho
+        self.anexos: Dict[str, str] = {}
+
+    def _abrir(self) -> sqlite3.Connection:
+        """Abre uma nova conexão configurada com timeout e WAL mode"""
+        conn = sqlite3.connect(self.db_name, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Permite acesso por nome de coluna
+        # Habilita WAL mode para melhor concorrência
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        with self._lock:
+            self.conexoes_abertas += 1
+        return conn
+
+    def obter(self) -> ConexaoPool:
+        """Empresta uma conexão do pool (reutiliza uma ociosa ou abre uma nova)"""
+        with self._lock:
+            conn = self._ociosas.pop() if self._ociosas else None
+        if conn is None:
+            conn = self._abrir()
+        self.preparar_conexao(conn)
+        return ConexaoPool(self, conn)
+    
+    def anexar(self, alias: str, caminho: str):
+        """Anexa (ATTACH ... AS alias) outro arquivo às conexões emprestadas a partir de agora"""
+        with self._lock:
+            self.anexos[alias] = caminho
+    
+    def preparar_conexao(self, conn: sqlite3.Connection):
+        """Anexa à conexão os bancos que ainda faltam (fora de transação, como exige o ATTACH)"""
+        if not self.anexos:
+            return
+        anexados = {row[1] for row in conn.execute('PRAGMA database_list')}
+        for alias, caminho in list(self.anexos.items()):
+            if alias not in anexados:
+                conn.execute(f'ATTACH DATABASE ? AS {alias}', (caminho,))
+
+    def _devolver(self, conn: sqlite3.Connection):
+        """Recebe uma conexão de volta, descartando transações pendentes"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error as e:
+            # Conexão em estado inválido: descarta em vez de devolver ao pool
+            log_error(e, "pool_conexoes", f"Devolver conexão ao pool: {self.db_name}")
+            self._fechar(conn)
+            return
+
+        with self._lock:
+            if len(self._ociosas) < self.max_ociosas:
+                self._ociosas.append(conn)
+                return
+        self._fechar(conn)
+
+    def _fechar(self, conn: sqlite3.Connection):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self.conexoes_abertas -= 1
+
+    @contextmanager
+    def conexao(self):
+        """Context manager transacional: commit ao final, rollback em caso de erro"""
+        conn = self.obter()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            raise
+        finally:
+            conn.close()
+
+    def fechar_todas(self):
+        """Fecha todas as conexões ociosas (ex: antes de substituir o arquivo do banco)"""
+        with self._lock:
+            ociosas, self._ociosas = self._ociosas, []
+        for conn in ociosas:
+            self._fechar(conn)
+
+
+# Pools compartilhados por todo o processo, indexados pelo caminho do banco
+_pools: Dict[str, PoolConexoes] = {}
+_pools_lock = threading.Lock()
+
+
+def obter_pool(db_name: str) -> PoolConexoes:
+    """Retorna o pool compartilhado do banco informado (cria se necessário)"""
+    with _pools_lock:
+        pool = _pools.get(db_name)
+        if pool is None:
+            pool = PoolConexoes(db_name)
+            _pools[db_name] = pool
+        return pool
+
+
+def fechar_pools():
+    """Fecha as conexões ociosas de todos os pools do processo"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.fechar_todas()
@@ -0,0 +1,160 @@
+"""
+Réplica local (somente leitura) do banco de dados compartilhado no Google Drive.
+Cada leitura no arquivo do Drive atravessa o sistema de arquivos virtual; com a réplica,
+as consultas do dashboard são feitas em uma cópia no disco local, atualizada apenas
+quando o arquivo compartilhado muda. As escritas continuam indo para o arquivo
+compartilhado (thread de escrita do Database), então os demais usuários veem tudo.
+
+Detecção de mudanças (barata, sem ler o banco):
+    - mtime/tamanho do arquivo e do -wal (alterações sincronizadas pelo Drive)
+    - PRAGMA data_version em uma conexão de monitoramento (commits de outras conexões)
+
+A cópia é feita pela API de backup do SQLite, em passos de PAGINAS_POR_PASSO páginas,
+sem bloquear as escritas no arquivo compartilhado. Quem lê a réplica durante a cópia
+continua vendo a versão anterior até o fim (WAL).
+
+EXEMPLO DE USO:
+    replica = ReplicaLocal(CAMINHO_DB)
+    with replica.conexao() as conn:
+        conn.execute('SELECT * FROM obras')
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+from error_logger import log_error
+from app_logger import obter_logger
+from pool_conexoes import obter_pool, TIMEOUT_CONEXAO
+
+logger = obter_logger("replica_local")
+
+# Diretório padrão das réplicas (disco local do usuário)
+DIRETORIO_REPLICA = os.path.join(os.environ.get('LOCALAPPDATA') or tempfile.gettempdir(),
+                                 'AgendaObras', 'replica')
+
+# Intervalo mínimo (em segundos) entre verificações de mudança no arquivo compartilhado
+INTERVALO_VERIFICACAO = 1.0
+
+# Páginas copiadas por passo da API de backup (libera o arquivo compartilhado entre passos)
+PAGINAS_POR_PASSO = 256
+
+
+def caminho_replica(db_name: str, diretorio: str = None) -> str:
+    """Arquivo local da réplica do banco informado (um por caminho de origem)"""
+    diretorio = diretorio or os.environ.get('AGENDAOBRAS_REPLICA_DIR') or DIRETORIO_REPLICA
+    nome = os.path.splitext(os.path.basename(db_name))[0]
+    sufixo = hashlib.sha1(os.path.abspath(db_name).encode('utf-8')).hexdigest()[:8]
+    return os.path.join(diretorio, f'{nome}_{sufixo}.db')
+
+
+class ReplicaLocal:
+    """Cópia local de leitura de um banco compartilhado"""
+
+    def __init__(self, db_name: str, diretorio: str = None,
+                 intervalo: float = INTERVALO_VERIFICACAO):
+        self.db_name = db_name
+        self.caminho = caminho_replica(db_name, diretorio)
+        self.intervalo = intervalo
+        self.atualizacoes = 0
+        self._monitor: Optional[sqlite3.Connection] = None
+        self._assinatura = None
+        self._data_version = None
+        self._ultima_verificacao = 0.0
+        self._invalidada = True
+        self._disponivel = False
+        self._lock = threading.Lock()
+
+    def invalidar(self):
+        """Força a verificação na próxima leitura (ex: após uma escrita deste processo)"""
+        self._invalidada = True
+
+    @contextmanager
+    def conexao(self):
+        """Conexão de leitura: réplica atualizada ou, se indisponível, o arquivo compartilhado"""
+        self.atualizar()
+        pool = obter_pool(self.caminho if self._disponivel else self.db_name)
+        with pool.conexao() as conn:
+            yield conn
+
+    def atualizar(self, forcar: bool = False) -> bool:
+        """Copia o banco compartilhado se ele mudou desde a última cópia. Retorna True se copiou"""
+        agora = time.monotonic()
+        if not (forcar or self._invalidada or agora - self._ultima_verificacao >= self.intervalo):
+            return False
+
+        with self._lock:
+            if not (forcar or self._invalidada or time.monotonic() - self._ultima_verificacao >= self.intervalo):
+                return False  # Outra thread acabou de verificar
+            self._invalidada = False
+            try:
+                assinatura = self._assinatura_arquivo()
+                if assinatura != self._assinatura:
+                    # Arquivo substituído/sincronizado pelo Drive: reabre o monitoramento
+                    self._fechar_monitor()
+                data_version = self._obter_data_version()
+                self._ultima_verificacao = time.monotonic()
+
+                if (not forcar and self._disponivel and assinatura == self._assinatura
+                        and data_version == self._data_version):
+                    return False
+
+                inicio = time.perf_counter()
+                self._copiar()
+                self._assinatura, self._data_version = assinatura, data_version
+                self._disponivel = True
+                self.atualizacoes += 1
+                logger.debug("Réplica local atualizada em %.0f ms: %s",
+                             (time.perf_counter() - inicio) * 1000, self.caminho)
+                return True
+            except (sqlite3.Error, OSError) as e:
+                # Sem réplica as leituras seguem no arquivo compartilhado
+                log_error(e, "replica_local", f"Atualizar réplica: {self.caminho}")
+                self._disponivel = False
+                self._fechar_monitor()
+                return False
+
+    def _assinatura_arquivo(self) -> Tuple:
+        """(mtime, tamanho) do banco e do -wal; mudam quando outro computador sincroniza"""
+        assinatura = []
+        for caminho in (self.db_name, f'{self.db_name}-wal'):
+            try:
+                estado = os.stat(caminho)
+                assinatura.append((estado.st_mtime_ns, estado.st_size))
+            except FileNotFoundError:
+                assinatura.append(None)
+        return tuple(assinatura)
+
+    def _obter_data_version(self) -> int:
+        if self._monitor is None:
+            self._monitor = sqlite3.connect(self.db_name, timeout=TIMEOUT_CONEXAO, check_same_thread=False)
+        return self._monitor.execute('PRAGMA data_version').fetchone()[0]
+
+    def _copiar(self):
+        """Copia o banco compartilhado para a réplica (API de backup, em passos)"""
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        destino = obter_pool(self.caminho).obter()
+        try:
+            self._monitor.backup(destino._conexao_ativa(), pages=PAGINAS_POR_PASSO)
+        finally:
+            destino.close()
+
+    def _fechar_monitor(self):
+        if self._monitor is not None:
+            try:
+                self._monitor.close()
+            except sqlite3.Error:
+                pass
+            self._monitor = None
+
+    def fechar(self):
+        """Fecha a conexão de monitoramento e as conexões ociosas da réplica"""
+        with self._lock:
+            self._fechar_monitor()
+            self._disponivel = False
+            self._invalidada = True
+        obter_pool(self.caminho).fechar_todas()
@@ -0,0 +1,89 @@
+"""
+Base dos testes que usam um banco SQLite temporário.
+Cria o diretório e o Database no setUp (ou setUpClass) e, ao final, encerra a thread de
+escrita e as conexões do pool do arquivo antes de apagar o diretório.
+Os logs de erro (error_logger) também vão para o diretório temporário.
+
+EXEMPLO DE USO:
+    class TestAlgo(TesteComBanco):
+        prefixo = 'algo'
+
+        def setUp(self):
+            super().setUp()
+            self.obra_id = self.db.criar_obra('Obra', 'Cliente', 10.0, '2025-01-10')
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Tuple
+from unittest import mock
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import error_logger
+from database import Database
+from escritor_banco import obter_escritor
+from pool_conexoes import obter_pool
+
+
+def criar_banco_temporario(prefixo: str, nome_banco: str = None) -> Tuple[str, str]:
+    """Cria um diretório temporário e retorna (diretório, caminho do banco dentro dele)"""
+    diretorio = tempfile.mkdtemp(prefix=f'agendaobras_{prefixo}_')
+    db_name = os.path.join(diretorio, nome_banco or f'{prefixo}.db')
+    os.makedirs(os.path.dirname(db_name), exist_ok=True)
+    return diretorio, db_name
+
+
+def redirecionar_logs_erro(diretorio: str):
+    """Patcher que grava os logs de erro em <diretorio>/erros em vez de ERRO_DIR"""
+    return mock.patch.object(error_logger, 'ERRO_DIR', os.path.join(diretorio, 'erros'))
+
+
+def liberar_banco(db_name: str, diretorio: str):
+    """Encerra o escritor e as conexões do banco e apaga o diretório temporário"""
+    obter_escritor(db_name).parar()
+    obter_pool(db_name).fechar_todas()
+    shutil.rmtree(diretorio, ignore_errors=True)
+
+
+class TesteComBanco(unittest.TestCase):
+    """Um banco novo por teste: self.diretorio, self.db_name e self.db"""
+
+    prefixo = 'teste'
+    # Caminho do banco relativo ao diretório temporário (padrão: <prefixo>.db)
+    nome_banco = None
+
+    def setUp(self):
+        self.diretorio, self.db_name = criar_banco_temporario(self.prefixo, self.nome_banco)
+        logs_erro = redirecionar_logs_erro(self.diretorio)
+        logs_erro.start()
+        self.addCleanup(logs_erro.stop)
+        self.db = self.criar_database()
+
+    def criar_database(self) -> Database:
+        return Database(self.db_name)
+
+    def tearDown(self):
+        liberar_banco(self.db_name, self.diretorio)
+
+
+class TesteComBancoCompartilhado(unittest.TestCase):
+    """Um banco por classe (setUpClass), para testes de leitura sobre a mesma massa de dados"""
+
+    prefixo = 'teste'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.diretorio, cls.db_name = criar_banco_temporario(cls.prefixo)
+        cls._logs_erro = redirecionar_logs_erro(cls.diretorio)
+        cls._logs_erro.start()
+        cls.db = Database(cls.db_name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._logs_erro.stop()
+        liberar_banco(cls.db_name, cls.diretorio)
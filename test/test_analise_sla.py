@@ -0,0 +1,99 @@
+"""
+Testes para o módulo analise_sla.py
+Valida as taxas de cumprimento de prazo, os percentis do tempo de execução e o cache
+associado à versão dos dados
+"""
+
+import sys
+import os
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+from analise_sla import AnaliseSLA
+from datas import dia_epoca
+
+
+class TestAnaliseSLA(TesteComBanco):
+
+    prefixo = 'analise'
+
+    def setUp(self):
+        super().setUp()
+        self.analise = AnaliseSLA(self.db)
+
+        self.obra_a = self.db.criar_obra('Obra A', 'Cliente A', 1000.0, '2025-01-01')
+        self.obra_b = self.db.criar_obra('Obra B', 'Cliente B', 1000.0, '2025-01-01')
+        # Isola um template: prazos de 10 dias a partir de 2025-01-01 em todas as tarefas da análise
+        with self.db.conexao() as conn:
+            self.template_id = conn.execute('''
+                SELECT template_id FROM obra_checklist WHERE obra_id = ? AND data_limite IS NOT NULL
+                ORDER BY id LIMIT 1
+            ''', (self.obra_a,)).fetchone()[0]
+        self.db._escrever(lambda conn: conn.execute('''
+            UPDATE obra_checklist SET data_limite = NULL WHERE template_id != ?
+        ''', (self.template_id,)))
+        self.db._escrever(lambda conn: conn.execute('''
+            UPDATE obra_checklist
+            SET data_base_calculo = '2025-01-01', data_limite = '2025-01-11', concluido = 0,
+                data_conclusao = NULL, tentativas_reiteracao = 0
+            WHERE template_id = ?
+        ''', (self.template_id,)))
+
+    def tearDown(self):
+        self.analise.fechar()
+        super().tearDown()
+
+    def _concluir(self, obra_id, data_conclusao, reiteracoes=0):
+        self.db._escrever(lambda conn: conn.execute('''
+            UPDATE obra_checklist SET concluido = 1, data_conclusao = ?, tentativas_reiteracao = ?
+            WHERE obra_id = ? AND template_id = ?
+        ''', (data_conclusao, reiteracoes, obra_id, self.template_id)))
+
+    def test_por_template(self):
+        self._concluir(self.obra_a, '2025-01-06')
+        self._concluir(self.obra_b, '2025-01-21', reiteracoes=2)
+
+        linhas = self.analise.calcular('template')
+        self.assertEqual(len(linhas), 1)
+        linha = linhas[0]
+        self.assertEqual(linha['grupo'], self.template_id)
+        self.assertTrue(linha['rotulo'])
+        self.assertEqual((linha['tarefas'], linha['concluidas'], linha['no_prazo'], linha['fora_do_prazo']),
+                         (2, 2, 1, 1))
+        self.assertEqual(linha['taxa_no_prazo'], 50.0)
+        self.assertEqual(linha['atraso_medio_dias'], 10.0)
+        self.assertEqual((linha['p50_dias'], linha['p90_dias'], linha['duracao_media_dias']), (5, 20, 12.5))
+        self.assertEqual((linha['reiteracoes'], linha['reiteracoes_max']), (2, 2))
+
+    def test_por_cliente_e_mes(self):
+        self._concluir(self.obra_b, '2025-01-21')
+
+        por_cliente = {linha['rotulo']: linha for linha in self.analise.calcular('cliente', dia_epoca('2025-02-01'))}
+        self.assertEqual(por_cliente['Cliente A']['vencidas'], 1)
+        self.assertIsNone(por_cliente['Cliente A']['taxa_no_prazo'])
+        self.assertEqual(por_cliente['Cliente B']['taxa_no_prazo'], 0.0)
+        # Mais atrasado primeiro (empate no total de atrasos)
+        self.assertEqual([linha['posicao_atraso'] for linha in por_cliente.values()], [1, 1])
+
+        por_mes = self.analise.calcular('mes')
+        self.assertEqual([(linha['rotulo'], linha['tarefas']) for linha in por_mes], [('2025-01', 2)])
+
+    def test_cache_por_versao_dos_dados(self):
+        self.analise.obter('template')
+        self.analise.obter('template')
+        self.assertEqual(self.analise.calculos, 1)
+
+        self._concluir(self.obra_a, '2025-01-06')
+        linha = self.analise.obter('template')[0]
+        self.assertEqual(self.analise.calculos, 2)
+        self.assertEqual(linha['concluidas'], 1)
+
+        with self.assertRaises(ValueError):
+            self.analise.obter('inexistente')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Testes para o módulo app_logger.py
+Valida interpretação de níveis, filtro por módulo e gravação assíncrona em arquivo
+"""
+
+import sys
+import os
+import logging
+import shutil
+import tempfile
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app_logger import configurar_logging, encerrar_logging, interpretar_niveis, obter_logger
+
+
+class TestAppLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp(prefix='agendaobras_logs_')
+
+    def tearDown(self):
+        encerrar_logging()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _conteudo_log(self):
+        encerrar_logging()  # esvazia a fila antes de ler
+        with open(os.path.join(self.diretorio, 'agendaobras.log'), encoding='utf-8') as arquivo:
+            return arquivo.read()
+
+    def test_interpretar_niveis(self):
+        self.assertEqual(interpretar_niveis('WARNING,database=DEBUG'),
+                         (logging.WARNING, {'database': logging.DEBUG}))
+        self.assertEqual(interpretar_niveis(''), (logging.INFO, {}))
+        with self.assertRaises(ValueError):
+            interpretar_niveis('database=VERBOSO')
+
+    def test_niveis_por_modulo(self):
+        configurar_logging('WARNING,database=DEBUG', self.diretorio, console=False)
+        obter_logger('database').debug('recalculo %s', 42)
+        obter_logger('notificador_prazos').info('não deve aparecer')
+        obter_logger('notificador_prazos').warning('aviso %s', 'registrado')
+
+        conteudo = self._conteudo_log()
+        self.assertIn('agendaobras.database: recalculo 42', conteudo)
+        self.assertIn('aviso registrado', conteudo)
+        self.assertNotIn('não deve aparecer', conteudo)
+
+    def test_formatacao_preguicosa(self):
+        """Argumentos de mensagens abaixo do nível não são formatados"""
+        class Caro:
+            formatado = False
+
+            def __str__(self):
+                Caro.formatado = True
+                return 'caro'
+
+        configurar_logging('INFO', self.diretorio, console=False)
+        obter_logger('database').debug('valor %s', Caro())
+        encerrar_logging()
+        self.assertFalse(Caro.formatado)
+
+    def test_reconfigurar_restaura_niveis(self):
+        configurar_logging('INFO,database=ERROR', self.diretorio, console=False)
+        configurar_logging('INFO', self.diretorio, console=False)
+        obter_logger('database').info('voltou')
+        self.assertIn('voltou', self._conteudo_log())
+
+
+if __name__ == '__main__':
+    unittest.main()
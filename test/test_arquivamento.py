@@ -0,0 +1,114 @@
+"""
+Testes para o módulo arquivamento.py
+Valida a movimentação de obras concluídas e histórico antigo para o arquivo morto
+e a leitura transparente de obras arquivadas
+"""
+
+import sys
+import os
+import datetime
+import unittest
+from unittest import mock
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+from arquivamento import ArquivadorObras, caminho_arquivo
+from database import Database
+
+
+class TestArquivamento(TesteComBanco):
+
+    prefixo = 'arquivo'
+
+    def setUp(self):
+        super().setUp()
+        self.hoje = datetime.date(2025, 6, 30)
+
+        self.antiga = self.db.criar_obra('Reforma Antiga', 'Cliente A', 1000.0, '2024-01-10',
+                                         status='Concluída', data_conclusao='2025-01-15')
+        self.recente = self.db.criar_obra('Reforma Recente', 'Cliente B', 2000.0, '2025-03-01',
+                                          status='Concluída', data_conclusao='2025-06-20')
+        self.ativa = self.db.criar_obra('Obra Ativa', 'Cliente C', 3000.0, '2025-05-01')
+
+        with self.db.conexao() as conn:
+            tarefa_antiga = conn.execute('SELECT id FROM obra_checklist WHERE obra_id = ?', (self.antiga,)).fetchone()[0]
+            tarefa_ativa = conn.execute('SELECT id FROM obra_checklist WHERE obra_id = ?', (self.ativa,)).fetchone()[0]
+            conn.executemany('''
+                INSERT INTO historico_notificacoes (obra_id, tarefa_id, tipo_notificacao, data_envio)
+                VALUES (?, ?, 'tipo_a', ?)
+            ''', [(self.antiga, tarefa_antiga, '2025-01-10 08:00:00'),
+                  (self.ativa, tarefa_ativa, '2023-05-02 08:00:00'),
+                  (self.ativa, tarefa_ativa, '2025-06-01 08:00:00')])
+
+        self.total_itens = len(self.db.obter_checklist(self.antiga))
+
+    def _contar(self, sql, params=()):
+        with self.db.conexao() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    def test_move_obras_concluidas_apos_carencia(self):
+        resultado = ArquivadorObras(self.db, dias_carencia=90, dias_historico=365).arquivar(self.hoje)
+
+        self.assertEqual(resultado, {'obras': 1, 'itens': self.total_itens, 'historico': 2})
+        self.assertTrue(os.path.exists(caminho_arquivo(self.db_name)))
+        ids = {obra['id'] for obra in self.db.listar_obras()}
+        self.assertEqual(ids, {self.recente, self.ativa})
+        self.assertEqual(self._contar('SELECT COUNT(*) FROM obra_checklist WHERE obra_id = ?', (self.antiga,)), 0)
+        self.assertEqual(self._contar('SELECT COUNT(*) FROM obra_resumo WHERE obra_id = ?', (self.antiga,)), 0)
+        self.assertEqual(self._contar('SELECT COUNT(*) FROM historico_notificacoes'), 1)
+        self.assertEqual(self._contar('SELECT COUNT(*) FROM arquivo.historico_notificacoes'), 2)
+
+    def test_leitura_transparente_da_obra_arquivada(self):
+        ArquivadorObras(self.db).arquivar(self.hoje)
+
+        obra = self.db.obter_obra(self.antiga)
+        self.assertEqual(obra['nome_contrato'], 'Reforma Antiga')
+        self.assertTrue(obra['arquivada'])
+        self.assertEqual(len(self.db.obter_checklist(self.antiga)), self.total_itens)
+        self.assertNotIn('arquivada', self.db.obter_obra(self.ativa))
+
+    def test_escritas_em_obra_arquivada_falham(self):
+        ArquivadorObras(self.db).arquivar(self.hoje)
+        item = self.db.obter_checklist(self.antiga)[0]
+
+        with mock.patch('database.log_error') as log_error:
+            with self.assertRaises(ValueError):
+                self.db.atualizar_campos_obra(self.antiga, {'nome_contrato': 'Alterada'})
+            with self.assertRaises(ValueError):
+                self.db.marcar_item_checklist(item['id'], not item['concluido'])
+            with self.assertRaises(ValueError):
+                self.db.deletar_obra(self.antiga)
+        # Obra ausente é erro de quem chamou: não gera log de erro
+        log_error.assert_not_called()
+
+        # Obra e checklist seguem intactos no arquivo morto
+        self.assertEqual(self.db.obter_obra(self.antiga)['nome_contrato'], 'Reforma Antiga')
+        self.assertEqual(self.db.obter_checklist(self.antiga)[0]['concluido'], item['concluido'])
+
+    def test_busca_com_arquivadas(self):
+        ArquivadorObras(self.db).arquivar(self.hoje)
+
+        self.assertEqual(self.db.listar_obras('Reforma'), [self.db.obter_obra(self.recente)])
+        obras = self.db.listar_obras('Reforma', incluir_arquivadas=True)
+        self.assertEqual([obra['id'] for obra in obras], [self.recente, self.antiga])
+        self.assertEqual(self.db.contar_obras('Reforma', incluir_arquivadas=True), 2)
+
+    def test_arquivar_novamente_nao_duplica(self):
+        arquivador = ArquivadorObras(self.db)
+        arquivador.arquivar(self.hoje)
+        resultado = arquivador.arquivar(self.hoje)
+
+        self.assertEqual(resultado, {'obras': 0, 'itens': 0, 'historico': 0})
+        self.assertEqual(self._contar('SELECT COUNT(*) FROM arquivo.obras'), 1)
+
+    def test_nova_instancia_anexa_arquivo_existente(self):
+        ArquivadorObras(self.db).arquivar(self.hoje)
+        outra = Database(self.db_name)
+        self.assertTrue(outra.arquivo_anexado)
+        self.assertTrue(outra.obter_obra(self.antiga)['arquivada'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Testes da atualização de obras por diferença (atualizar_campos_obra / atualizar_obra)
+Valida que só os campos alterados são gravados e que o recálculo de prazos é derivado
+das datas-base alteradas, na mesma transação
+"""
+
+import sys
+import os
+import datetime
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+
+
+class TestAtualizarObra(TesteComBanco):
+
+    prefixo = 'atualizar'
+
+    def setUp(self):
+        super().setUp()
+        self.obra_id = self.db.criar_obra('Obra', 'Cliente', 10.0, '2099-01-10',
+                                          data_conclusao='2099-12-01', pedido_sap='SAP-1')
+
+    def _itens(self, base_calculo):
+        return [item for item in self.db.obter_checklist(self.obra_id)
+                if item['base_calculo'] == base_calculo and not item['depende_item_id']
+                and item['recorrencia'] != 'mensal']
+
+    def test_grava_apenas_campos_alterados(self):
+        resultado = self.db.atualizar_campos_obra(self.obra_id, {
+            'nome_contrato': 'Obra', 'cliente': 'Cliente Novo', 'valor_contrato': 10.0})
+
+        self.assertEqual(resultado, {'alterados': ['cliente'], 'recalculados': [], 'tarefas_atualizadas': 0})
+        obra = self.db.obter_obra(self.obra_id)
+        self.assertEqual(obra['cliente'], 'Cliente Novo')
+        self.assertEqual(obra['pedido_sap'], 'SAP-1')
+
+    def test_sem_diferencas_nao_grava(self):
+        transacoes = self.db.escritor.transacoes
+        resultado = self.db.atualizar_campos_obra(self.obra_id, {'cliente': 'Cliente', 'data_inicio': '2099-01-10'})
+        self.assertEqual(resultado['alterados'], [])
+        # Apenas a leitura de comparação passou pela thread de escrita
+        self.assertEqual(self.db.escritor.transacoes - transacoes, 1)
+        with self.assertRaises(ValueError):
+            self.db.atualizar_campos_obra(self.obra_id, {'coluna_inexistente': 1})
+
+    def test_atualizar_obra_preserva_campos_omitidos(self):
+        self.db.atualizar_obra(self.obra_id, 'Obra', 'Cliente', 10.0, '2099-01-10', 'Em Andamento')
+
+        obra = self.db.obter_obra(self.obra_id)
+        self.assertEqual(obra['status'], 'Em Andamento')
+        self.assertEqual(obra['data_conclusao'], '2099-12-01')
+        self.assertEqual(obra['pedido_sap'], 'SAP-1')
+
+    def test_data_base_alterada_recalcula_na_mesma_transacao(self):
+        self.assertTrue(self.db.atualizar_obra(self.obra_id, 'Obra', 'Cliente', 10.0, '2099-03-01', 'Não Iniciada'))
+        for item in self._itens('inicio'):
+            esperado = datetime.date(2099, 3, 1) + datetime.timedelta(days=item['prazo_dias'])
+            self.assertEqual(item['data_limite'], esperado.isoformat())
+
+        resultado = self.db.atualizar_campos_obra(self.obra_id, {'data_assinatura': '2099-02-01'})
+        self.assertEqual(resultado['recalculados'], ['data_assinatura'])
+        itens_assinatura = self._itens('assinatura')
+        self.assertTrue(itens_assinatura)
+        for item in itens_assinatura:
+            esperado = datetime.date(2099, 2, 1) + datetime.timedelta(days=item['prazo_dias'])
+            self.assertEqual(item['data_limite'], esperado.isoformat())
+            self.assertEqual(item['bloqueado'], 0)
+
+    def test_data_base_removida_nao_recalcula_checklist(self):
+        self.db.atualizar_campos_obra(self.obra_id, {'data_assinatura': '2099-02-01'})
+        solicitar_aio = next(item for item in self.db.obter_checklist(self.obra_id)
+                             if item['descricao'] == 'SOLICITAR A DATA DA AIO')
+        self.db.marcar_item_checklist(solicitar_aio['id'], True)
+        self.db.atualizar_campos_obra(self.obra_id, {'data_aio': '2099-02-10'})
+        antes = self._itens('assinatura')
+
+        resultado = self.db.atualizar_campos_obra(self.obra_id, {'data_assinatura': ''})
+
+        self.assertEqual(resultado, {'alterados': ['data_assinatura'], 'recalculados': [], 'tarefas_atualizadas': 0})
+        obra = self.db.obter_obra(self.obra_id)
+        self.assertIsNone(obra['data_assinatura'])
+        # Sem cascata: a AIO e a tarefa que a definiu continuam como estavam
+        self.assertEqual(obra['data_aio'], '2099-02-10')
+        self.assertEqual(self.db.obter_item_checklist(solicitar_aio['id'])['concluido'], 1)
+        self.assertEqual(self._itens('assinatura'), antes)
+
+    def test_data_inicio_removida_bloqueia_tarefas(self):
+        resultado = self.db.atualizar_campos_obra(self.obra_id, {'data_inicio': ''})
+
+        self.assertEqual(resultado['recalculados'], ['data_inicio'])
+        for item in self._itens('inicio'):
+            self.assertEqual(item['bloqueado'], 1)
+            self.assertIsNone(item['data_limite'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Testes para a busca textual de obras (FTS5)
+Valida busca sem acentos, por prefixo, em campos adicionais e nas descrições do checklist
+"""
+
+import sys
+import os
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBancoCompartilhado
+from database import Database, montar_consulta_fts
+
+
+class TestBuscaObras(TesteComBancoCompartilhado):
+
+    prefixo = 'busca'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reforma = cls.db.criar_obra('Reforma Agência Centro', 'Banco Alfa', 1000.0, '2025-01-10',
+                                        pedido_sap='4500123456', prefixo_agencia='1234')
+        cls.pintura = cls.db.criar_obra('Pintura Fachada', 'Construtora São João', 2000.0, '2025-02-01',
+                                        servico='Pintura externa')
+
+    def _ids(self, filtro):
+        return [obra['id'] for obra in self.db.listar_obras(filtro)]
+
+    def test_montar_consulta_fts(self):
+        self.assertEqual(montar_consulta_fts('medi fachada'), '"medi"* "fachada"*')
+        self.assertEqual(montar_consulta_fts('a"b'), '"a"* "b"*')
+        self.assertIsNone(montar_consulta_fts('  -- '))
+
+    def test_busca_sem_acentos_e_por_prefixo(self):
+        self.assertEqual(self._ids('agencia'), [self.reforma])
+        self.assertEqual(self._ids('sao jo'), [self.pintura])
+
+    def test_busca_campos_adicionais(self):
+        self.assertEqual(self._ids('4500123'), [self.reforma])
+        self.assertEqual(self._ids('externa'), [self.pintura])
+
+    def test_busca_descricoes_do_checklist(self):
+        # Todas as obras têm as tarefas de MEDIÇÃO do template
+        self.assertEqual(set(self._ids('medicao')), {self.reforma, self.pintura})
+
+    def test_busca_acompanha_edicao_e_exclusao(self):
+        obra_id = self.db.criar_obra('Obra Temporária', 'Cliente Xyz', 10.0, '')
+        self.assertEqual(self._ids('xyz'), [obra_id])
+        self.db.atualizar_obra(obra_id, 'Obra Temporária', 'Cliente Wk', 10.0, '', 'Não Iniciada')
+        self.assertEqual(self._ids('xyz'), [])
+        self.assertEqual(self._ids('wk'), [obra_id])
+        self.db.deletar_obra(obra_id)
+        self.assertEqual(self._ids('wk'), [])
+        self.assertEqual(self._ids('xyz'), [])
+
+    def test_resumo_usa_mesma_busca(self):
+        obras = self.db.listar_obras_com_resumo('fachada')
+        self.assertEqual([obra['id'] for obra in obras], [self.pintura])
+        self.assertGreater(obras[0]['total_tarefas'], 0)
+
+    def test_fallback_like(self):
+        db = Database(self.db.db_name)
+        db._fts_disponivel = False
+        self.assertEqual([obra['id'] for obra in db.listar_obras('Fachada')], [self.pintura])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Testes para o cache versionado de templates de checklist
+Valida reutilização do cache e invalidação quando os templates mudam
+"""
+
+import sys
+import os
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+
+
+class TestCacheTemplates(TesteComBanco):
+
+    prefixo = 'templates'
+
+    def test_cache_reutilizado_entre_obras(self):
+        with self.db.conexao() as conn:
+            primeira = self.db._obter_templates(conn)
+            segunda = self.db._obter_templates(conn)
+        self.assertIs(primeira, segunda)
+
+    def test_alteracao_de_template_invalida_cache(self):
+        with self.db.conexao() as conn:
+            template = self.db._obter_templates(conn)[0]
+            conn.execute('UPDATE checklist_templates SET prazo_dias = prazo_dias + 5 WHERE id = ?',
+                         (template['id'],))
+
+        obra_id = self.db.criar_obra('Obra', 'Cliente', 10.0, '2025-01-10')
+        item = next(i for i in self.db.obter_checklist(obra_id) if i['template_id'] == template['id'])
+        self.assertEqual(item['prazo_dias'], template['prazo_dias'] + 5)
+
+    def test_dependencias_ligadas_em_memoria(self):
+        obra_id = self.db.criar_obra('Obra', 'Cliente', 10.0, '2025-01-10')
+        checklist = self.db.obter_checklist(obra_id)
+        por_template = {item['template_id']: item for item in checklist}
+        with self.db.conexao() as conn:
+            templates = self.db._obter_templates(conn)
+        for template in templates:
+            item = por_template[template['id']]
+            if template['depende_template_id']:
+                self.assertEqual(item['depende_item_id'], por_template[template['depende_template_id']]['id'])
+            else:
+                self.assertIsNone(item['depende_item_id'])
+
+    def test_obra_nova_nao_consulta_templates_com_cache_valido(self):
+        self.db.criar_obra('Obra', 'Cliente', 10.0, '2025-01-10')
+        comandos = []
+        conexao = self.db.pool.obter()
+        conexao.set_trace_callback(comandos.append)
+        conexao.close()
+        self.db.criar_obra('Obra 2', 'Cliente', 10.0, '2025-01-10')
+        conexao = self.db.pool.obter()
+        conexao.set_trace_callback(None)
+        conexao.close()
+        self.assertFalse(any('FROM checklist_templates' in comando for comando in comandos))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Testes para as consultas usadas na renderização do dashboard
+Valida que as versões em lote retornam o mesmo resultado das consultas por obra
+"""
+
+import sys
+import os
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBancoCompartilhado
+import database
+from obras_helper import ObrasHelper
+
+
+class TestConsultasDashboard(TesteComBancoCompartilhado):
+
+    prefixo = 'dashboard'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.obra_ids = [
+            cls.db.criar_obra('Obra Alfa', 'Cliente A', 1000.0, '2025-01-10'),
+            cls.db.criar_obra('Obra Beta', 'Cliente B', 2000.0, ''),
+            cls.db.criar_obra('Obra Gama', 'Cliente C', 3000.0, '2025-03-01'),
+        ]
+
+    def test_checklists_em_lote_igual_por_obra(self):
+        lote = self.db.obter_checklists_em_lote(self.obra_ids)
+        self.assertEqual(set(lote), set(self.obra_ids))
+        for obra_id in self.obra_ids:
+            self.assertEqual(lote[obra_id], self.db.obter_checklist(obra_id))
+
+    def test_checklists_em_lote_divide_blocos(self):
+        limite_original = database.LIMITE_PARAMETROS_SQL
+        database.LIMITE_PARAMETROS_SQL = 2
+        try:
+            lote = self.db.obter_checklists_em_lote(self.obra_ids)
+        finally:
+            database.LIMITE_PARAMETROS_SQL = limite_original
+        for obra_id in self.obra_ids:
+            self.assertEqual(lote[obra_id], self.db.obter_checklist(obra_id))
+
+    def test_checklists_em_lote_vazio_e_inexistente(self):
+        self.assertEqual(self.db.obter_checklists_em_lote([]), {})
+        self.assertEqual(self.db.obter_checklists_em_lote([999999]), {999999: []})
+
+    def test_resumo_igual_ao_calculo_em_python(self):
+        # Conclui a primeira tarefa disponível da primeira obra para variar o resumo
+        checklist = self.db.obter_checklist(self.obra_ids[0])
+        item = next(i for i in checklist if not i['concluido'] and not i['bloqueado'])
+        self.db.marcar_item_checklist(item['id'], True)
+
+        resumos = {obra['id']: obra for obra in self.db.listar_obras_com_resumo()}
+        self.assertEqual(set(resumos), set(self.obra_ids))
+
+        for obra_id in self.obra_ids:
+            obra = resumos[obra_id]
+            checklist = self.db.obter_checklist(obra_id)
+            proxima = next((i for i in checklist if not i['concluido'] and not i['bloqueado']), None)
+
+            self.assertEqual(obra['total_tarefas'], len(checklist))
+            self.assertEqual(ObrasHelper.calcular_progresso_resumo(obra),
+                             ObrasHelper.calcular_progresso(checklist))
+            self.assertEqual(ObrasHelper.obter_status_visual_resumo(obra),
+                             ObrasHelper.obter_status_visual(obra, checklist))
+            self.assertEqual(obra['proxima_tarefa_descricao'], proxima['descricao'] if proxima else None)
+            self.assertEqual(obra['proxima_tarefa_data_limite'], proxima['data_limite'] if proxima else None)
+
+    def test_resumo_com_filtro(self):
+        obras = self.db.listar_obras_com_resumo('Beta')
+        self.assertEqual([obra['id'] for obra in obras], [self.obra_ids[1]])
+        self.assertGreater(obras[0]['total_tarefas'], 0)
+
+    def test_resumo_acompanha_alteracoes_do_checklist(self):
+        obra_id = self.db.criar_obra('Obra Delta', 'Cliente D', 500.0, '2025-02-01')
+        checklist = self.db.obter_checklist(obra_id)
+        for item in checklist:
+            if not item['concluido'] and not item['bloqueado']:
+                self.db.marcar_item_checklist(item['id'], True)
+
+        resumo = next(o for o in self.db.listar_obras_com_resumo() if o['id'] == obra_id)
+        checklist = self.db.obter_checklist(obra_id)
+        self.assertEqual(resumo['tarefas_concluidas'], sum(1 for i in checklist if i['concluido']))
+        self.assertEqual(resumo['tarefas_bloqueadas'],
+                         sum(1 for i in checklist if not i['concluido'] and i['bloqueado']))
+
+        self.db.deletar_obra(obra_id)
+        with self.db.conexao() as conn:
+            self.assertIsNone(conn.execute('SELECT 1 FROM obra_resumo WHERE obra_id = ?', (obra_id,)).fetchone())
+
+    def test_resumo_recalcula_atrasadas_na_virada_do_dia(self):
+        obra_id = self.obra_ids[2]
+        esperado = next(o for o in self.db.listar_obras_com_resumo() if o['id'] == obra_id)['tarefas_atrasadas']
+        self.assertGreater(esperado, 0)
+
+        # Simula um resumo calculado ontem, antes de as tarefas vencerem
+        with self.db.conexao() as conn:
+            conn.execute('''
+                UPDATE obra_resumo SET tarefas_atrasadas = 0, data_referencia = date('now', 'localtime', '-1 day')
+                WHERE obra_id = ?
+            ''', (obra_id,))
+        self.db._data_resumo = None
+
+        resumo = next(o for o in self.db.listar_obras_com_resumo() if o['id'] == obra_id)
+        self.assertEqual(resumo['tarefas_atrasadas'], esperado)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Testes do módulo datas e das colunas geradas dia_* (migração 16)
+Valida que a conversão em Python e a coluna gerada no SQLite produzem o mesmo número do dia
+"""
+
+import sys
+import os
+import datetime
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+from datas import (converter_data, dia_epoca, data_do_dia, hoje_dia, dias_ate, somar_dias,
+                   formatar_data, formatar_data_hora)
+
+
+class TestDatas(unittest.TestCase):
+
+    def test_dia_epoca(self):
+        self.assertEqual(dia_epoca('1970-01-01'), 0)
+        self.assertEqual(dia_epoca('2024-01-01'), 19723)
+        self.assertEqual(dia_epoca('2024-01-01 18:30:00'), 19723)
+        self.assertEqual(dia_epoca('1969-12-31'), -1)
+        for invalida in (None, '', '   ', '31/12/2024', 'lixo'):
+            self.assertIsNone(dia_epoca(invalida))
+        self.assertEqual(data_do_dia(19723), datetime.date(2024, 1, 1))
+
+    def test_hoje_e_dias_ate(self):
+        hoje = datetime.date.today()
+        self.assertEqual(data_do_dia(hoje_dia()), hoje)
+        self.assertEqual(dias_ate((hoje + datetime.timedelta(days=5)).isoformat()), 5)
+        self.assertEqual(dias_ate((hoje - datetime.timedelta(days=3)).isoformat()), -3)
+        self.assertIsNone(dias_ate(''))
+
+    def test_somar_dias(self):
+        self.assertEqual(somar_dias('2024-02-27', 3), '2024-03-01')
+        self.assertEqual(somar_dias('2024-03-01', -1), '2024-02-29')
+        with self.assertRaises(ValueError):
+            somar_dias('', 1)
+
+    def test_formatar(self):
+        self.assertEqual(formatar_data('2025-03-15'), '15/03/2025')
+        self.assertEqual(formatar_data('15/03/2025'), '15/03/2025')
+        self.assertEqual(formatar_data(''), '')
+        self.assertEqual(formatar_data(None), '')
+        self.assertEqual(formatar_data('sem data'), 'sem data')
+        self.assertEqual(formatar_data_hora('2025-03-15 09:05:00'), '15/03/2025 às 09:05')
+        self.assertEqual(formatar_data_hora('2025-03-15 09:05:00', ' '), '15/03/2025 09:05')
+        self.assertEqual(formatar_data_hora('2025-03-15'), '15/03/2025')
+
+    def test_memorizacao(self):
+        converter_data.cache_clear()
+        for _ in range(3):
+            converter_data('2025-06-01')
+        self.assertEqual(converter_data.cache_info().hits, 2)
+
+
+class TestColunasDia(TesteComBanco):
+
+    prefixo = 'datas'
+
+    def test_colunas_geradas_iguais_ao_python(self):
+        obra_id = self.db.criar_obra('Obra Datas', 'Cliente', 1000.0, '2025-01-10')
+        with self.db.conexao() as conn:
+            obra = conn.execute('SELECT data_inicio, dia_inicio FROM obras WHERE id = ?', (obra_id,)).fetchone()
+            itens = conn.execute('SELECT data_limite, dia_limite FROM obra_checklist WHERE obra_id = ?',
+                                 (obra_id,)).fetchall()
+        self.assertEqual(obra['dia_inicio'], dia_epoca(obra['data_inicio']))
+        self.assertTrue(itens)
+        for item in itens:
+            self.assertEqual(item['dia_limite'], dia_epoca(item['data_limite']))
+
+    def test_tarefas_atrasadas_ignoram_prazo_vazio(self):
+        obra_id = self.db.criar_obra('Obra Atrasos', 'Cliente', 1000.0, '2020-01-10')
+        with self.db.conexao() as conn:
+            item_id = conn.execute('SELECT id FROM obra_checklist WHERE obra_id = ? LIMIT 1',
+                                   (obra_id,)).fetchone()[0]
+        self.db._escrever(lambda conn: conn.execute(
+            "UPDATE obra_checklist SET data_limite = '' WHERE id = ?", (item_id,)))
+
+        atrasadas = self.db.obter_tarefas_atrasadas()
+        self.assertTrue(atrasadas)
+        self.assertNotIn(item_id, [tarefa['id'] for tarefa in atrasadas])
+        self.assertTrue(all(tarefa['dia_limite'] < hoje_dia() for tarefa in atrasadas))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Testes para o módulo escritor_banco.py
+Valida serialização das escritas, isolamento por SAVEPOINT, agrupamento e escrita aninhada
+"""
+
+import sys
+import os
+import shutil
+import threading
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import criar_banco_temporario, TesteComBanco
+from escritor_banco import EscritorBanco
+from pool_conexoes import obter_pool
+
+
+class TestEscritorBanco(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio, self.db_name = criar_banco_temporario('escritor')
+        self.pool = obter_pool(self.db_name)
+        with self.pool.conexao() as conn:
+            conn.execute('CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT UNIQUE)')
+        self.escritor = EscritorBanco(self.db_name)
+
+    def tearDown(self):
+        self.escritor.parar()
+        self.pool.fechar_todas()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _contar(self):
+        with self.pool.conexao() as conn:
+            return conn.execute('SELECT COUNT(*) FROM itens').fetchone()[0]
+
+    @staticmethod
+    def _inserir(conn, nome):
+        return conn.execute('INSERT INTO itens (nome) VALUES (?)', (nome,)).lastrowid
+
+    def test_escritas_concorrentes_sem_lock(self):
+        erros = []
+
+        def trabalhador(indice):
+            try:
+                for i in range(50):
+                    self.escritor.executar(self._inserir, f'{indice}-{i}')
+            except Exception as e:
+                erros.append(e)
+
+        threads = [threading.Thread(target=trabalhador, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(erros, [])
+        self.assertEqual(self._contar(), 400)
+
+    def test_falha_isolada_por_savepoint(self):
+        """Operação com erro não desfaz as demais do mesmo lote"""
+        evento = threading.Event()
+        bloqueio = self.escritor.enviar(lambda conn: evento.wait(5))
+        futuros = [self.escritor.enviar(self._inserir, nome) for nome in ('a', 'a', 'b')]
+        evento.set()
+        bloqueio.result()
+
+        self.assertIsNotNone(futuros[0].result())
+        with self.assertRaises(Exception):
+            futuros[1].result()
+        self.assertIsNotNone(futuros[2].result())
+        self.assertEqual(self._contar(), 2)
+
+    def test_operacoes_em_espera_sao_agrupadas(self):
+        evento = threading.Event()
+        self.escritor.enviar(lambda conn: evento.wait(5))
+        futuros = [self.escritor.enviar(self._inserir, str(i)) for i in range(20)]
+        evento.set()
+        for futuro in futuros:
+            futuro.result()
+        self.assertLessEqual(self.escritor.transacoes, 2)
+
+    def test_escrita_aninhada_na_mesma_transacao(self):
+        def externa(conn):
+            self._inserir(conn, 'externa')
+            return self.escritor.executar(self._inserir, 'interna')
+
+        self.assertIsNotNone(self.escritor.executar(externa))
+        self.assertEqual(self._contar(), 2)
+
+
+class TestDatabaseEscritor(TesteComBanco):
+
+    prefixo = 'escritor_db'
+
+    def test_marcar_itens_em_paralelo(self):
+        obra_id = self.db.criar_obra('Obra', 'Cliente', 10.0, '2025-01-10')
+        itens = [item['id'] for item in self.db.obter_checklist(obra_id) if not item['bloqueado']]
+        threads = [threading.Thread(target=self.db.marcar_item_checklist, args=(item_id, True)) for item_id in itens]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        concluidos = [item['id'] for item in self.db.obter_checklist(obra_id) if item['concluido']]
+        self.assertEqual(sorted(concluidos), sorted(itens))
+
+
+if __name__ == '__main__':
+    unittest.main()
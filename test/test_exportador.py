@@ -0,0 +1,122 @@
+"""
+Testes para o módulo exportador.py
+Valida a exportação em lotes para CSV e JSON Lines (e Parquet quando o pyarrow estiver
+instalado), o histórico em arquivo separado e a inclusão das obras arquivadas
+"""
+
+import sys
+import os
+import csv
+import datetime
+import json
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+import exportador
+from arquivamento import ArquivadorObras
+
+
+class TestExportador(TesteComBanco):
+
+    prefixo = 'exportador'
+
+    def setUp(self):
+        super().setUp()
+
+        self.antiga = self.db.criar_obra('Reforma Antiga', 'Cliente A', 1000.0, '2024-01-10',
+                                         status='Concluída', data_conclusao='2025-01-15')
+        self.ativa = self.db.criar_obra('Obra Ação', 'Cliente B', 2500.5, '2025-05-01', pedido_sap='SAP-9')
+        with self.db.conexao() as conn:
+            tarefa = conn.execute('SELECT id FROM obra_checklist WHERE obra_id = ?', (self.ativa,)).fetchone()[0]
+            conn.executemany('''
+                INSERT INTO historico_notificacoes (obra_id, tarefa_id, tipo_notificacao, data_envio)
+                VALUES (?, ?, 'tipo_a', ?)
+            ''', [(self.ativa, tarefa, '2025-06-01 08:00:00'), (self.ativa, tarefa, '2025-06-02 08:00:00')])
+            self.total_tarefas = conn.execute('SELECT COUNT(*) FROM obra_checklist').fetchone()[0]
+            self.tarefas_antiga = conn.execute('SELECT COUNT(*) FROM obra_checklist WHERE obra_id = ?',
+                                               (self.antiga,)).fetchone()[0]
+
+    def _caminho(self, nome):
+        return os.path.join(self.diretorio, nome)
+
+    def test_csv(self):
+        resultado = exportador.exportar(self.db, self._caminho('carteira.csv'))
+
+        self.assertEqual(resultado['linhas'], self.total_tarefas)
+        self.assertIsNone(resultado['arquivo_historico'])
+        with open(resultado['arquivo'], encoding='utf-8-sig', newline='') as arquivo:
+            linhas = list(csv.DictReader(arquivo, delimiter=';'))
+        self.assertEqual(len(linhas), self.total_tarefas)
+        self.assertEqual(list(linhas[0]), [nome for nome, _, _ in exportador.COLUNAS_CHECKLIST])
+        ativa = [linha for linha in linhas if linha['obra_id'] == str(self.ativa)]
+        self.assertEqual(ativa[0]['nome_contrato'], 'Obra Ação')
+        self.assertEqual(ativa[0]['pedido_sap'], 'SAP-9')
+
+    def test_jsonl_em_varios_lotes(self):
+        lotes = list(exportador.linhas_checklist(self.db, tamanho_lote=7))
+        self.assertGreater(len(lotes), 1)
+        self.assertTrue(all(len(lote) <= 7 for lote in lotes))
+
+        resultado = exportador.exportar(self.db, self._caminho('carteira.jsonl'), tamanho_lote=7)
+        with open(resultado['arquivo'], encoding='utf-8') as arquivo:
+            registros = [json.loads(linha) for linha in arquivo]
+        self.assertEqual(len(registros), self.total_tarefas)
+        ids = [(registro['obra_id'], registro['tarefa_id']) for registro in registros]
+        self.assertEqual(ids, sorted(ids))
+        self.assertIsInstance(registros[0]['valor_contrato'], float)
+        self.assertEqual(registros[0]['arquivada'], 0)
+
+    def test_obra_sem_checklist(self):
+        self.db._escrever(lambda conn: conn.execute('DELETE FROM obra_checklist WHERE obra_id = ?', (self.antiga,)))
+        registros = [linha for lote in exportador.linhas_checklist(self.db) for linha in lote]
+        sem_tarefa = [linha for linha in registros if linha[0] == self.antiga]
+        self.assertEqual(len(sem_tarefa), 1)
+        self.assertIsNone(sem_tarefa[0][[nome for nome, _, _ in exportador.COLUNAS_CHECKLIST].index('tarefa_id')])
+
+    def test_historico_em_arquivo_separado(self):
+        resultado = exportador.exportar(self.db, self._caminho('carteira.csv'), incluir_historico=True)
+
+        self.assertEqual(resultado['arquivo_historico'], self._caminho('carteira_historico.csv'))
+        self.assertEqual(resultado['linhas_historico'], 2)
+        with open(resultado['arquivo_historico'], encoding='utf-8-sig', newline='') as arquivo:
+            linhas = list(csv.DictReader(arquivo, delimiter=';'))
+        self.assertEqual({linha['obra_id'] for linha in linhas}, {str(self.ativa)})
+
+    def test_inclui_arquivadas(self):
+        ArquivadorObras(self.db, dias_carencia=90).arquivar(datetime.date(2025, 6, 30))
+
+        sem_arquivo = exportador.exportar(self.db, self._caminho('ativas.csv'))
+        self.assertEqual(sem_arquivo['linhas'], self.total_tarefas - self.tarefas_antiga)
+
+        com_arquivo = exportador.exportar(self.db, self._caminho('todas.jsonl'), incluir_arquivadas=True)
+        self.assertEqual(com_arquivo['linhas'], self.total_tarefas)
+        with open(com_arquivo['arquivo'], encoding='utf-8') as arquivo:
+            arquivadas = {registro['obra_id'] for registro in map(json.loads, arquivo) if registro['arquivada']}
+        self.assertEqual(arquivadas, {self.antiga})
+
+    def test_formato_invalido(self):
+        with self.assertRaises(ValueError):
+            exportador.exportar(self.db, self._caminho('carteira.xlsx'))
+        self.assertEqual(exportador.formato_do_arquivo('carteira.ndjson'), 'jsonl')
+
+    @unittest.skipUnless(exportador.pyarrow, 'pyarrow não instalado')
+    def test_parquet(self):
+        import pyarrow.parquet
+        resultado = exportador.exportar(self.db, self._caminho('carteira.parquet'), tamanho_lote=7)
+
+        arquivo = pyarrow.parquet.ParquetFile(resultado['arquivo'])
+        self.assertEqual(arquivo.metadata.num_rows, self.total_tarefas)
+        self.assertGreater(arquivo.num_row_groups, 1)
+
+    @unittest.skipIf(exportador.pyarrow, 'pyarrow instalado')
+    def test_parquet_sem_pyarrow(self):
+        self.assertNotIn('parquet', exportador.formatos_disponiveis())
+        with self.assertRaises(ImportError):
+            exportador.exportar(self.db, self._caminho('carteira.parquet'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Testes para o módulo grafo_checklist.py
+Valida a propagação em cascata (dependências, datas com gatilho) e a gravação só do que mudou
+"""
+
+import sys
+import os
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+from grafo_checklist import GrafoChecklist
+
+
+def item(item_id, depende=None, base='fim_tarefa', prazo=2, concluido=0, template_id=None):
+    return {'id': item_id, 'template_id': template_id or item_id, 'prazo_dias': prazo,
+            'base_calculo': base, 'depende_item_id': depende, 'recorrencia': 'unica',
+            'concluido': concluido, 'data_conclusao': None, 'bloqueado': 1, 'data_limite': None,
+            'data_base_calculo': None, 'tentativas_reiteracao': 0, 'status_notificacao': 'pendente'}
+
+
+class TestGrafoChecklist(unittest.TestCase):
+
+    def test_cadeia_profunda_em_uma_passagem(self):
+        """Desmarcar a raiz rebloqueia só o filho pendente; marcar libera só o filho direto"""
+        itens = [item(1, base='inicio')] + [item(i, depende=i - 1) for i in range(2, 50)]
+        grafo = GrafoChecklist({'data_inicio': '2025-01-10'}, itens)
+        grafo.alterar_data('data_inicio', '2025-01-10')
+        self.assertEqual(grafo.itens[1]['data_limite'], '2025-01-12')
+
+        for item_id in range(1, 49):
+            grafo.marcar(item_id, True, data='2025-02-01')
+        self.assertEqual(grafo.itens[49]['data_limite'], '2025-02-03')
+        self.assertEqual(grafo.itens[49]['bloqueado'], 0)
+
+        grafo.marcar(48, False)
+        self.assertEqual(grafo.itens[49]['bloqueado'], 1)
+        self.assertIsNone(grafo.itens[49]['data_limite'])
+
+    def test_ciclo_e_rejeitado(self):
+        with self.assertRaises(ValueError):
+            GrafoChecklist({}, [item(1, depende=2), item(2, depende=1)])
+
+    def test_gatilhos_em_cascata(self):
+        """Desmarcar o item que define data_assinatura reabre o item que define data_aio"""
+        itens = [
+            item(1, base='inicio', concluido=1),
+            item(2, base='assinatura', concluido=1),
+            item(3, base='aio'),
+            item(4, depende=3),
+        ]
+        obra = {'data_inicio': '2025-01-10', 'data_assinatura': '2025-01-20', 'data_aio': '2025-01-25'}
+        grafo = GrafoChecklist(obra, itens, {1: 'data_assinatura', 2: 'data_aio'})
+
+        grafo.marcar(1, False)
+
+        self.assertEqual(grafo.alteracoes_obra(), {'data_assinatura': None, 'data_aio': None})
+        self.assertEqual(grafo.itens[2]['concluido'], 0)
+        self.assertEqual(grafo.itens[3]['bloqueado'], 1)
+        self.assertEqual(grafo.itens[4]['bloqueado'], 1)
+        # Item 3 e 4 já estavam bloqueados: só o que mudou é gravado
+        self.assertEqual([item_id for item_id, _ in grafo.alteracoes_itens()], [1, 2])
+
+
+class TestCascataNoBanco(TesteComBanco):
+
+    prefixo = 'grafo'
+
+    def setUp(self):
+        super().setUp()
+        self.obra_id = self.db.criar_obra('Obra', 'Cliente', 10.0, '2025-01-10')
+        self.itens = {item['descricao']: item for item in self.db.obter_checklist(self.obra_id)}
+
+    def _item(self, descricao):
+        return self.db.obter_item_checklist(self.itens[descricao]['id'])
+
+    def test_marcar_libera_dependente(self):
+        self.db.marcar_item_checklist(self.itens['RETORNO PROJETO E ORÇAMENTO']['id'], True)
+        analise = self._item('ANÁLISE')
+        self.assertEqual(analise['bloqueado'], 0)
+        self.assertIsNotNone(analise['data_limite'])
+
+    def test_desmarcar_contrato_limpa_datas_em_cascata(self):
+        self.db.atualizar_data_critica(self.obra_id, 'data_assinatura', '2025-02-01')
+        self.db.recalcular_checklist(self.obra_id, 'data_assinatura', '2025-02-01')
+        self.assertEqual(self._item('ART')['data_limite'], '2025-02-06')
+
+        self.db.marcar_item_checklist(self.itens['SOLICITAR A DATA DA AIO']['id'], True)
+        self.db.atualizar_data_critica(self.obra_id, 'data_aio', '2025-02-10')
+        self.db.recalcular_checklist(self.obra_id, 'data_aio', '2025-02-10')
+        self.assertEqual(self._item('RELATÓRIO')['bloqueado'], 0)
+
+        self.db.marcar_item_checklist(self.itens['CONTRATO ASSINADO']['id'], True)
+        trigger = self.db.marcar_item_checklist(self.itens['CONTRATO ASSINADO']['id'], False)
+
+        self.assertEqual(trigger, 'data_assinatura')
+        obra = self.db.obter_obra(self.obra_id)
+        self.assertIsNone(obra['data_assinatura'])
+        self.assertIsNone(obra['data_aio'])
+        self.assertEqual(self._item('SOLICITAR A DATA DA AIO')['concluido'], 0)
+        self.assertEqual(self._item('ART')['bloqueado'], 1)
+        self.assertEqual(self._item('RELATÓRIO')['bloqueado'], 1)
+
+    def test_recalcular_data_inicio(self):
+        alterados = self.db.recalcular_checklist(self.obra_id, 'data_inicio', '2025-03-01')
+        self.assertEqual(self._item('CONTRATAÇÃO DA EQUIPE')['data_limite'], '2025-02-14')
+        self.assertEqual(alterados, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Testes para Database.listar_historico e a retenção do histórico de notificações
+Valida filtros, paginação por chave, uso dos índices e leitura do arquivo morto
+"""
+
+import sys
+import os
+import datetime
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+from arquivamento import ArquivadorObras
+from database import Database
+
+
+class TestHistoricoNotificacoes(TesteComBanco):
+
+    prefixo = 'historico'
+
+    def setUp(self):
+        super().setUp()
+        self.obra_a = self.db.criar_obra('Obra A', 'Cliente', 1000.0, '2025-01-10')
+        self.obra_b = self.db.criar_obra('Obra B', 'Cliente', 1000.0, '2025-01-10')
+
+        with self.db.conexao() as conn:
+            self.tarefa_a = conn.execute('SELECT id FROM obra_checklist WHERE obra_id = ? ORDER BY id',
+                                         (self.obra_a,)).fetchone()[0]
+            tarefa_b = conn.execute('SELECT id FROM obra_checklist WHERE obra_id = ?', (self.obra_b,)).fetchone()[0]
+            registros = []
+            for dia in range(1, 31):
+                data_envio = f'2025-04-{dia:02d} 08:00:00'
+                tipo = 'tipo_b' if dia % 3 == 0 else 'reiteracao_1'
+                registros.append((self.obra_a, self.tarefa_a, tipo, data_envio, 'a@exemplo.com'))
+                registros.append((self.obra_b, tarefa_b, 'tipo_b', data_envio, 'b@exemplo.com'))
+            registros.append((self.obra_a, self.tarefa_a, 'reiteracao_1', '2022-03-01 08:00:00', 'a@exemplo.com'))
+            conn.executemany('''
+                INSERT INTO historico_notificacoes (obra_id, tarefa_id, tipo_notificacao, data_envio, destinatarios)
+                VALUES (?, ?, ?, ?, ?)
+            ''', registros)
+
+    def _todas_paginas(self, **filtros):
+        registros, cursor = [], None
+        while True:
+            pagina = self.db.listar_historico(cursor=cursor, limite=7, **filtros)
+            registros.extend(pagina['registros'])
+            cursor = pagina['proximo_cursor']
+            if cursor is None:
+                return registros
+
+    def test_filtros_por_obra_periodo_e_tipo(self):
+        registros = self.db.listar_historico(obra_id=self.obra_a, periodo=('2025-04-10', '2025-04-20'),
+                                             tipo='tipo_b')['registros']
+        self.assertEqual([r['data_envio'][:10] for r in registros], ['2025-04-18', '2025-04-15', '2025-04-12'])
+        self.assertTrue(all(r['tarefa_descricao'] for r in registros))
+
+    def test_paginacao_percorre_tudo_sem_repetir(self):
+        registros = self._todas_paginas(obra_id=self.obra_a)
+        self.assertEqual(len(registros), 31)
+        self.assertEqual(len({r['id'] for r in registros}), 31)
+        chaves = [(r['data_envio'], r['id']) for r in registros]
+        self.assertEqual(chaves, sorted(chaves, reverse=True))
+
+    def test_cursor_de_outra_ordenacao_rejeitado(self):
+        cursor_obras = self.db.listar_obras_pagina(limite=1)['proximo_cursor']
+        with self.assertRaises(ValueError):
+            self.db.listar_historico(cursor=cursor_obras)
+
+    def test_consulta_por_obra_usa_indice(self):
+        with self.db.conexao() as conn:
+            plano = ' '.join(row[3] for row in conn.execute('''
+                EXPLAIN QUERY PLAN SELECT * FROM historico_notificacoes
+                WHERE obra_id = ? AND data_envio >= ? ORDER BY data_envio DESC
+            ''', (self.obra_a, '2025-04-01')))
+        self.assertIn('idx_historico_obra_data', plano)
+        self.assertNotIn('TEMP B-TREE', plano)
+
+    def test_historico_arquivado_continua_listado(self):
+        arquivador = ArquivadorObras(self.db, dias_historico=365)
+        resultado = arquivador.arquivar(datetime.date(2025, 6, 30))
+        self.assertEqual(resultado['historico'], 1)
+
+        registros = self._todas_paginas(obra_id=self.obra_a)
+        self.assertEqual(len(registros), 31)
+        self.assertEqual(registros[-1]['data_envio'], '2022-03-01 08:00:00')
+        self.assertIsNotNone(registros[-1]['tarefa_descricao'])
+
+    def test_expurgo_remove_historico_antigo_do_arquivo(self):
+        arquivador = ArquivadorObras(self.db, dias_historico=365, dias_expurgo=3 * 365)
+        arquivador.arquivar(datetime.date(2025, 6, 30))
+
+        self.assertEqual(arquivador.expurgar_historico(datetime.date(2025, 6, 30)), 1)
+        self.assertEqual(len(self._todas_paginas(obra_id=self.obra_a)), 30)
+        self.assertEqual(arquivador.expurgar_historico(datetime.date(2025, 6, 30)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
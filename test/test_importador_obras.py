@@ -0,0 +1,124 @@
+"""
+Testes para a criação de obras em lote e o importador de planilhas CSV
+Valida que o lote gera o mesmo checklist de criar_obra e reporta erros por linha
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+from importador_obras import importar_obras, converter_numero, converter_data, normalizar_coluna
+
+
+def checklist_comparavel(database, obra_id):
+    """Checklist sem ids absolutos (dependências viram a posição do item)"""
+    checklist = database.obter_checklist(obra_id)
+    posicoes = {item['id']: i for i, item in enumerate(checklist)}
+    return [
+        {campo: (posicoes.get(valor) if campo == 'depende_item_id' else valor)
+         for campo, valor in item.items() if campo not in ('id', 'obra_id')}
+        for item in checklist
+    ]
+
+
+class TestCriarObrasEmLote(TesteComBanco):
+
+    prefixo = 'lote'
+
+    def test_checklist_igual_a_criar_obra(self):
+        datas = {'data_assinatura': '2025-02-01', 'data_acionamento': '2025-01-05'}
+        individual = self.db.criar_obra('Obra', 'Cliente', 100.0, '2025-01-10', **datas)
+        resultado = self.db.criar_obras_em_lote([
+            dict(nome_contrato='Obra', cliente='Cliente', valor_contrato=100.0, data_inicio='2025-01-10', **datas)
+        ])
+        self.assertEqual(resultado['erros'], [])
+        self.assertEqual(checklist_comparavel(self.db, resultado['criadas'][0]),
+                         checklist_comparavel(self.db, individual))
+
+    def test_linhas_invalidas_reportadas_e_demais_gravadas(self):
+        resultado = self.db.criar_obras_em_lote([
+            {'nome_contrato': 'Válida 1', 'cliente': 'C', 'valor_contrato': 10},
+            {'nome_contrato': '', 'cliente': 'C', 'valor_contrato': 10},
+            {'nome_contrato': 'Data ruim', 'cliente': 'C', 'valor_contrato': 10, 'data_inicio': '31/12/2025'},
+            {'nome_contrato': 'Válida 2', 'cliente': 'C', 'valor_contrato': '20.5'},
+        ])
+        self.assertEqual([erro['indice'] for erro in resultado['erros']], [1, 2])
+        self.assertEqual(len(resultado['criadas']), 2)
+        nomes = sorted(obra['nome_contrato'] for obra in self.db.listar_obras_com_resumo())
+        self.assertEqual(nomes, ['Válida 1', 'Válida 2'])
+        # Resumo e busca mantidos pelos triggers
+        self.assertTrue(all(obra['total_tarefas'] > 0 for obra in self.db.listar_obras_com_resumo()))
+        self.assertEqual(len(self.db.listar_obras('valida')), 2)
+
+    def test_ids_continuam_apos_lote(self):
+        resultado = self.db.criar_obras_em_lote(
+            {'nome_contrato': f'Obra {i}', 'cliente': 'C', 'valor_contrato': 1} for i in range(3))
+        nova = self.db.criar_obra('Depois', 'C', 1.0, '')
+        self.assertEqual(nova, resultado['criadas'][-1] + 1)
+        ids_itens = [item['id'] for obra_id in [*resultado['criadas'], nova]
+                     for item in self.db.obter_checklist(obra_id)]
+        self.assertEqual(len(ids_itens), len(set(ids_itens)))
+
+    def test_iteravel_lido_fora_da_thread_de_escrita(self):
+        threads = []
+
+        def obras():
+            for i in range(3):
+                threads.append(threading.current_thread())
+                yield {'nome_contrato': f'Obra {i}', 'cliente': 'C', 'valor_contrato': 1}
+
+        resultado = self.db.criar_obras_em_lote(obras())
+        self.assertEqual(len(resultado['criadas']), 3)
+        self.assertEqual(threads, [threading.current_thread()] * 3)
+
+    def test_falha_na_leitura_nao_abre_transacao(self):
+        def obras():
+            yield {'nome_contrato': 'Obra', 'cliente': 'C', 'valor_contrato': 1}
+            raise OSError("planilha corrompida")
+
+        with self.assertRaises(OSError):
+            self.db.criar_obras_em_lote(obras())
+        self.assertEqual(self.db.listar_obras_com_resumo(), [])
+
+
+class TestImportadorObras(TesteComBanco):
+
+    prefixo = 'importacao'
+
+    def test_conversoes(self):
+        self.assertEqual(converter_numero('R$ 1.234,56'), 1234.56)
+        self.assertEqual(converter_numero('1234.5'), 1234.5)
+        self.assertEqual(converter_data('05/03/2025'), '2025-03-05')
+        self.assertEqual(normalizar_coluna('Nome do Contrato'), 'nome_contrato')
+        self.assertEqual(normalizar_coluna('Prefixo Agência'), 'prefixo_agencia')
+        with self.assertRaises(ValueError):
+            converter_data('2025/13/45')
+
+    def test_importar_csv(self):
+        caminho = os.path.join(self.diretorio, 'obras.csv')
+        with open(caminho, 'w', encoding='cp1252', newline='') as arquivo:
+            arquivo.write('Nome do Contrato;Cliente;Valor;Data de Início;Pedido SAP\n')
+            arquivo.write('Reforma Agência;Banco;1.500,00;10/01/2025;4500\n')
+            arquivo.write(';Sem nome;100;;\n')
+            arquivo.write('Pintura;Construtora;abc;;\n')
+            arquivo.write('\n')
+            arquivo.write('Elétrica;Cliente;2000;;\n')
+
+        resultado = importar_obras(caminho, self.db)
+        self.assertEqual(len(resultado['criadas']), 2)
+        self.assertEqual([erro['linha'] for erro in resultado['erros']], [3, 4])
+
+        obra = self.db.obter_obra(resultado['criadas'][0])
+        self.assertEqual(obra['nome_contrato'], 'Reforma Agência')
+        self.assertEqual(obra['valor_contrato'], 1500.0)
+        self.assertEqual(obra['data_inicio'], '2025-01-10')
+        self.assertEqual(obra['pedido_sap'], '4500')
+
+
+if __name__ == '__main__':
+    unittest.main()
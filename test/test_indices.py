@@ -0,0 +1,94 @@
+"""
+Testes para os índices criados pelas migrações 10, 16 e 17
+Valida via EXPLAIN QUERY PLAN que as consultas frequentes usam índice em vez de varredura completa
+"""
+
+import sys
+import os
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBancoCompartilhado
+from migrations import INDICES, INDICES_DIA, INDICE_MENSAL_UNICO
+
+# Consultas críticas (mesmo formato usado em database.py, notificador e gerador)
+CONSULTAS = {
+    'obter_checklist': (
+        'SELECT * FROM obra_checklist WHERE obra_id = ? ORDER BY id', (1,)),
+    'cascata_dependencia': (
+        'SELECT id FROM obra_checklist WHERE depende_item_id = ? AND concluido = 0', (1,)),
+    'recalcular_checklist': (
+        'SELECT id FROM obra_checklist WHERE obra_id = ? AND base_calculo = ? AND concluido = 0', (1, 'inicio')),
+    'tarefa_mensal_existente': (
+        'SELECT id FROM obra_checklist WHERE obra_id = ? AND template_id = ? AND mes_referencia = ?', (1, 1, '2025-01')),
+    'verificar_prazos': ('''
+        SELECT oc.*, o.nome_contrato, o.cliente, ct.possui_reiteracao, ct.tipo_recorrencia
+        FROM obra_checklist oc
+        JOIN obras o ON oc.obra_id = o.id
+        LEFT JOIN checklist_templates ct ON oc.template_id = ct.id
+        WHERE oc.concluido = 0 AND oc.bloqueado = 0
+        AND oc.dia_limite IS NOT NULL
+        ORDER BY oc.dia_limite
+    ''', ()),
+    'tarefas_atrasadas': ('''
+        SELECT oc.*, o.nome_contrato, o.cliente
+        FROM obra_checklist oc
+        JOIN obras o ON oc.obra_id = o.id
+        WHERE oc.concluido = 0 AND oc.dia_limite < ?
+        ORDER BY oc.dia_limite
+    ''', (20000,)),
+    'tarefas_por_periodo': ('''
+        SELECT oc.id, oc.obra_id, oc.descricao, oc.data_limite, o.nome_contrato, o.cliente
+        FROM obra_checklist oc
+        JOIN obras o ON oc.obra_id = o.id
+        WHERE oc.concluido = 0 AND oc.bloqueado = 0
+          AND oc.dia_limite BETWEEN ? AND ?
+        ORDER BY oc.dia_limite, oc.id
+    ''', (20000, 20006)),
+    'listar_obras': ('SELECT * FROM obras ORDER BY data_inicio DESC', ()),
+}
+
+
+class TestIndices(TesteComBancoCompartilhado):
+
+    prefixo = 'indices'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Volume suficiente para o planejador preferir os índices após ANALYZE
+        for i in range(30):
+            cls.db.criar_obra(f'Obra {i}', 'Cliente', 1000.0, '2025-01-10')
+        with cls.db.conexao() as conn:
+            conn.execute('ANALYZE')
+
+    def _plano(self, sql, params):
+        with self.db.conexao() as conn:
+            return [row['detail'] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+    def test_indices_criados(self):
+        with self.db.conexao() as conn:
+            existentes = {row['name'] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        # Substituídos na migração 16 (por dia_limite) e na migração 17 (pelo índice único)
+        substituidos = {'idx_obra_checklist_pendentes', 'idx_obra_checklist_mes_ref'}
+        for nome, _ in INDICES + INDICES_DIA + [INDICE_MENSAL_UNICO]:
+            if nome in substituidos:
+                self.assertNotIn(nome, existentes)
+                continue
+            self.assertIn(nome, existentes)
+
+    def test_consultas_usam_indice(self):
+        for nome, (sql, params) in CONSULTAS.items():
+            with self.subTest(consulta=nome):
+                plano = self._plano(sql, params)
+                # "SCAN tabela" sem "USING INDEX" indica varredura completa
+                varreduras = [p for p in plano if p.startswith('SCAN') and 'USING' not in p]
+                self.assertFalse(varreduras, f'{nome} faz varredura completa: {plano}')
+                self.assertTrue(any('INDEX' in p for p in plano), f'{nome} não usa índice: {plano}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Testes da inicialização do schema (PRAGMA user_version) e do Database compartilhado
+Valida que a verificação de schema roda uma vez por processo e que um banco já
+migrado não executa DDL ao criar novas instâncias
+"""
+
+import sys
+import os
+import sqlite3
+import unittest
+from unittest import mock
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+import database
+from database import Database, obter_database
+import migrations
+from migrations import Migration, MigrationManager, VERSAO_SCHEMA
+
+
+class TestInicializacaoSchema(TesteComBanco):
+
+    prefixo = 'schema'
+
+    def _user_version(self):
+        conn = sqlite3.connect(self.db_name)
+        try:
+            return conn.execute('PRAGMA user_version').fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_versao_schema_corresponde_ultima_migracao(self):
+        versoes = [migration.version for migration in MigrationManager(self.db_name).migrations]
+        self.assertEqual(VERSAO_SCHEMA, max(versoes))
+
+    def test_nova_migracao_atualiza_versao_schema(self):
+        registrar = MigrationManager._register_migrations
+
+        def registrar_com_nova(manager):
+            registrar(manager)
+            manager.migrations.append(Migration(version=99, description='Nova', upgrade=lambda conn: None))
+
+        with mock.patch.object(MigrationManager, '_register_migrations', registrar_com_nova):
+            self.assertEqual(migrations._ultima_versao_registrada(), 99)
+
+    def test_user_version_gravada_apos_migracoes(self):
+        self.assertEqual(self._user_version(), VERSAO_SCHEMA)
+
+    def test_nova_instancia_nao_executa_ddl(self):
+        with mock.patch.object(database, 'run_migrations') as migracoes, \
+                mock.patch.object(Database, 'init_database') as init:
+            Database(self.db_name)
+        migracoes.assert_not_called()
+        init.assert_not_called()
+
+    def test_novo_processo_com_schema_atual_nao_migra(self):
+        # Simula outro processo: schema ainda não verificado, mas banco já migrado
+        database._schemas_prontos.discard(self.db_name)
+        with mock.patch.object(database, 'run_migrations') as migracoes:
+            Database(self.db_name)
+        migracoes.assert_not_called()
+        self.assertIn(self.db_name, database._schemas_prontos)
+
+    def test_schema_antigo_executa_migracoes(self):
+        conn = sqlite3.connect(self.db_name)
+        conn.execute('PRAGMA user_version = 0')
+        conn.close()
+        database._schemas_prontos.discard(self.db_name)
+
+        Database(self.db_name)
+        self.assertEqual(self._user_version(), VERSAO_SCHEMA)
+
+    def test_obter_database_compartilhado(self):
+        primeiro = obter_database(self.db_name)
+        try:
+            self.assertIs(obter_database(self.db_name), primeiro)
+        finally:
+            database._databases.pop(self.db_name, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Testes para a listagem paginada de obras (paginação por chave)
+Valida que as páginas concatenadas reproduzem a listagem completa, sem repetições
+"""
+
+import sys
+import os
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBancoCompartilhado
+
+
+class TestPaginacaoObras(TesteComBancoCompartilhado):
+
+    prefixo = 'paginacao'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Datas repetidas e obras sem data de início para exercitar o desempate por id
+        for i in range(23):
+            data_inicio = f'2025-0{i % 4 + 1}-10' if i % 5 else ''
+            cls.db.criar_obra(f'Obra {i:02d}', 'Cliente Paginação' if i % 2 else 'Outro', 100.0, data_inicio)
+
+    def _todas_as_paginas(self, limite, **kwargs):
+        ids, cursor, paginas = [], None, 0
+        while True:
+            pagina = self.db.listar_obras_pagina(cursor=cursor, limite=limite, **kwargs)
+            self.assertLessEqual(len(pagina['obras']), limite)
+            ids.extend(obra['id'] for obra in pagina['obras'])
+            paginas += 1
+            cursor = pagina['proximo_cursor']
+            if cursor is None:
+                return ids, paginas
+
+    def test_paginas_reproduzem_listagem_completa(self):
+        ids, paginas = self._todas_as_paginas(5)
+        self.assertEqual(paginas, 5)
+        self.assertEqual(len(ids), len(set(ids)))
+        completo = self.db.listar_obras_pagina(limite=1000)['obras']
+        self.assertEqual(ids, [obra['id'] for obra in completo])
+        # Obras sem data de início ficam no final, como em listar_obras
+        datas = [obra['data_inicio'] or '' for obra in completo]
+        self.assertEqual(datas, sorted(datas, reverse=True))
+
+    def test_ordenacao_por_nome(self):
+        ids, _ = self._todas_as_paginas(4, ordenacao='nome_contrato')
+        nomes = {obra['id']: obra['nome_contrato'] for obra in self.db.listar_obras()}
+        self.assertEqual([nomes[i] for i in ids], sorted(nomes.values()))
+
+    def test_paginacao_com_busca(self):
+        ids, _ = self._todas_as_paginas(3, filtro='paginacao')
+        self.assertEqual(sorted(ids), sorted(obra['id'] for obra in self.db.listar_obras('paginacao')))
+        self.assertEqual(len(ids), self.db.contar_obras('paginacao'))
+        self.assertEqual(self.db.contar_obras(), 23)
+
+    def test_resumo_incluido_na_pagina(self):
+        obra = self.db.listar_obras_pagina(limite=1)['obras'][0]
+        self.assertGreater(obra['total_tarefas'], 0)
+        self.assertNotIn('chave_ordenacao', obra)
+
+    def test_cursor_invalido(self):
+        cursor = self.db.listar_obras_pagina(limite=2)['proximo_cursor']
+        with self.assertRaises(ValueError):
+            self.db.listar_obras_pagina(cursor=cursor, ordenacao='nome_contrato')
+        with self.assertRaises(ValueError):
+            self.db.listar_obras_pagina(cursor='nao-e-um-cursor')
+        with self.assertRaises(ValueError):
+            self.db.listar_obras_pagina(ordenacao='valor')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Testes para o módulo pool_conexoes.py
+Valida reutilização de conexões, commit/rollback automático e compartilhamento do pool
+"""
+
+import sys
+import os
+import shutil
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import criar_banco_temporario
+from pool_conexoes import PoolConexoes, obter_pool
+from database import Database
+
+
+class TestPoolConexoes(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio, self.db_name = criar_banco_temporario('pool')
+        self.pool = PoolConexoes(self.db_name, max_ociosas=2)
+        with self.pool.conexao() as conn:
+            conn.execute('CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT)')
+
+    def tearDown(self):
+        self.pool.fechar_todas()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_reutiliza_conexao_ociosa(self):
+        """Conexão devolvida deve ser reutilizada na próxima chamada"""
+        abertas = self.pool.conexoes_abertas
+        for _ in range(10):
+            conn = self.pool.obter()
+            conn.execute('SELECT 1').fetchone()
+            conn.close()
+        self.assertEqual(self.pool.conexoes_abertas, abertas)
+
+    def test_commit_automatico(self):
+        with self.pool.conexao() as conn:
+            conn.execute("INSERT INTO itens (nome) VALUES ('a')")
+        with self.pool.conexao() as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM itens').fetchone()[0], 1)
+
+    def test_rollback_em_erro(self):
+        with self.assertRaises(ValueError):
+            with self.pool.conexao() as conn:
+                conn.execute("INSERT INTO itens (nome) VALUES ('b')")
+                raise ValueError('falha simulada')
+        with self.pool.conexao() as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM itens').fetchone()[0], 0)
+
+    def test_close_descarta_transacao_pendente(self):
+        """close() sem commit deve descartar as alterações, como o fechamento real"""
+        conn = self.pool.obter()
+        conn.execute("INSERT INTO itens (nome) VALUES ('c')")
+        conn.close()
+        with self.pool.conexao() as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM itens').fetchone()[0], 0)
+
+    def test_conexoes_simultaneas_sao_distintas(self):
+        conn1 = self.pool.obter()
+        conn2 = self.pool.obter()
+        self.assertIsNot(conn1._conn, conn2._conn)
+        conn1.close()
+        conn2.close()
+
+    def test_limite_de_ociosas(self):
+        conexoes = [self.pool.obter() for _ in range(5)]
+        for conn in conexoes:
+            conn.close()
+        self.assertLessEqual(len(self.pool._ociosas), 2)
+
+    def test_database_compartilha_pool(self):
+        db1 = Database(self.db_name)
+        db2 = Database(self.db_name)
+        self.assertIs(db1.pool, db2.pool)
+        self.assertIs(db1.pool, obter_pool(self.db_name))
+        db1.pool.fechar_todas()
+
+
+if __name__ == '__main__':
+    unittest.main()
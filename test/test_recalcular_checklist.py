@@ -0,0 +1,81 @@
+"""
+Testes para o recálculo de prazos em lote (recalcular_checklist, recalcular_checklists e
+atualizar_prazo_template)
+"""
+
+import sys
+import os
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+
+
+class TestRecalcularChecklist(TesteComBanco):
+
+    prefixo = 'recalculo'
+
+    def setUp(self):
+        super().setUp()
+        self.obra_id = self.db.criar_obra('Obra', 'Cliente', 10.0, '2099-01-10')
+
+    def _item(self, descricao, obra_id=None):
+        return next(item for item in self.db.obter_checklist(obra_id or self.obra_id)
+                    if item['descricao'] == descricao)
+
+    def test_prazo_negativo_e_reinicio_de_reiteracoes(self):
+        with self.db.conexao() as conn:
+            conn.execute("UPDATE obra_checklist SET tentativas_reiteracao = 3, status_notificacao = 'reiterando' "
+                         "WHERE obra_id = ?", (self.obra_id,))
+
+        alterados = self.db.recalcular_checklist(self.obra_id, 'data_inicio', '2025-03-01')
+
+        equipe = self._item('CONTRATAÇÃO DA EQUIPE')
+        self.assertEqual(equipe['data_limite'], '2025-02-14')
+        self.assertEqual(equipe['tentativas_reiteracao'], 0)
+        self.assertEqual(equipe['status_notificacao'], 'pendente')
+        # 2 tarefas regressivas + 2 tarefas mensais destravadas (obra já começou)
+        self.assertEqual(alterados, 4)
+        self.assertEqual(self._item('MEDIÇÃO')['bloqueado'], 0)
+
+    def test_mesma_data_nao_altera_linhas(self):
+        self.db.recalcular_checklist(self.obra_id, 'data_inicio', '2025-03-01')
+        self.assertEqual(self.db.recalcular_checklist(self.obra_id, 'data_inicio', '2025-03-01'), 0)
+
+    def test_data_futura_trava_mensais(self):
+        self.db.recalcular_checklist(self.obra_id, 'data_inicio', '2025-03-01')
+        self.db.recalcular_checklist(self.obra_id, 'data_inicio', '2099-03-01')
+        self.assertEqual(self._item('MEDIÇÃO')['bloqueado'], 1)
+
+    def test_atualizar_prazo_template_recalcula_todas_as_obras(self):
+        outra = self.db.criar_obra('Outra', 'Cliente', 10.0, '2099-02-01')
+        retorno = self._item('RETORNO PROJETO E ORÇAMENTO')
+        self.db.marcar_item_checklist(retorno['id'], True)
+        analise = self._item('ANÁLISE')
+
+        recalculados = self.db.atualizar_prazo_template(analise['template_id'], 10)
+        self.assertEqual(recalculados, 1)  # na outra obra ANÁLISE segue bloqueada (sem data base)
+
+        analise_nova = self._item('ANÁLISE')
+        self.assertEqual(analise_nova['prazo_dias'], 10)
+        self.assertGreater(analise_nova['data_limite'], analise['data_limite'])
+        self.assertEqual(self._item('ANÁLISE', outra)['prazo_dias'], 10)
+
+        equipe = self._item('CONTRATAÇÃO DA EQUIPE', outra)
+        self.db.atualizar_prazo_template(equipe['template_id'], -20)
+        self.assertEqual(self._item('CONTRATAÇÃO DA EQUIPE', outra)['data_limite'], '2099-01-12')
+
+    def test_recalcular_checklists_em_lote(self):
+        outra = self.db.criar_obra('Outra', 'Cliente', 10.0, '2099-02-01')
+        with self.db.conexao() as conn:
+            conn.execute("UPDATE obras SET data_inicio = '2025-01-01'")
+        self.assertGreater(self.db.recalcular_checklists([self.obra_id, outra]), 0)
+        for obra_id in (self.obra_id, outra):
+            self.assertEqual(self._item('CONTRATAÇÃO DA EQUIPE', obra_id)['data_limite'], '2024-12-17')
+        self.assertEqual(self.db.recalcular_checklists(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Testes para o módulo replica_local.py
+Valida leitura pela réplica, atualização após escritas (deste e de outros processos)
+e ausência de cópias quando o banco compartilhado não mudou
+"""
+
+import sys
+import os
+import sqlite3
+import time
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+from database import Database
+from escritor_banco import obter_escritor
+from replica_local import ReplicaLocal
+
+
+class TestReplicaLocal(TesteComBanco):
+
+    prefixo = 'replica'
+    nome_banco = os.path.join('compartilhado', 'replica.db')
+
+    def criar_database(self):
+        return Database(self.db_name, replica_local=False)
+
+    def setUp(self):
+        super().setUp()
+        self.replica = ReplicaLocal(self.db_name, diretorio=os.path.join(self.diretorio, 'local'), intervalo=0)
+        self.db.replica = self.replica
+        self.obra_id = self.db.criar_obra('Obra Réplica', 'Cliente', 1000.0, '2024-01-10')
+
+    def tearDown(self):
+        obter_escritor(self.db_name).parar()
+        self.replica.fechar()
+        super().tearDown()
+
+    def test_leitura_usa_arquivo_local(self):
+        obras = self.db.listar_obras()
+        self.assertEqual([obra['nome_contrato'] for obra in obras], ['Obra Réplica'])
+        self.assertTrue(os.path.exists(self.db.replica.caminho))
+        self.assertNotEqual(os.path.dirname(self.db.replica.caminho), os.path.dirname(self.db_name))
+
+    def test_escrita_propria_visivel_na_leitura_seguinte(self):
+        self.db.listar_obras()
+        item = self.db.obter_checklist(self.obra_id)[0]
+        self.db.marcar_item_checklist(item['id'], True)
+        self.assertEqual(self.db.obter_item_checklist(item['id'])['concluido'], 1)
+
+    def test_replica_invalidada_antes_do_resultado(self):
+        self.replica.intervalo = 3600
+        self.db.listar_obras()
+        invalidar = self.replica.invalidar
+
+        def invalidar_lento():
+            # Alarga a janela entre o COMMIT e a invalidação
+            time.sleep(0.1)
+            invalidar()
+
+        self.replica.invalidar = invalidar_lento
+        self.db.atualizar_campos_obra(self.obra_id, {'nome_contrato': 'Alterada'})
+        self.assertEqual(self.db.obter_obra(self.obra_id)['nome_contrato'], 'Alterada')
+
+    def test_escrita_de_outra_conexao_detectada(self):
+        self.assertEqual(self.db.contar_obras(), 1)
+        # Simula outro processo gravando direto no arquivo compartilhado
+        conn = sqlite3.connect(self.db_name)
+        conn.execute("UPDATE obras SET nome_contrato = 'Alterada' WHERE id = ?", (self.obra_id,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.db.obter_obra(self.obra_id)['nome_contrato'], 'Alterada')
+
+    def test_sem_mudanca_nao_copia(self):
+        self.db.listar_obras()
+        atualizacoes = self.db.replica.atualizacoes
+        self.db.listar_obras()
+        self.db.contar_obras()
+        self.assertEqual(self.db.replica.atualizacoes, atualizacoes)
+
+    def test_sem_replica_le_arquivo_compartilhado(self):
+        self.db.replica = None
+        self.assertEqual(self.db.contar_obras(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
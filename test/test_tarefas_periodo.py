@@ -0,0 +1,96 @@
+"""
+Testes da consulta de prazos de todas as obras por período (obter_tarefas_por_periodo)
+Valida o recorte pelo período, os filtros e a leitura preguiçosa em lotes
+"""
+
+import sys
+import os
+import types
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+import database as database_modulo
+
+# Período que cobre os prazos das obras de teste (base de criação = hoje)
+INICIO, FIM = '2024-01-01', '2099-12-31'
+
+
+class TestTarefasPorPeriodo(TesteComBanco):
+
+    prefixo = 'periodo'
+
+    def setUp(self):
+        super().setUp()
+        self.obra_a = self.db.criar_obra('Obra A', 'Cliente A', 1000.0, '2025-01-06')
+        self.obra_b = self.db.criar_obra('Obra B', 'Cliente B', 1000.0, '2025-01-06')
+
+    def _esperadas(self, inicio, fim, obra_id=None):
+        with self.db.conexao() as conn:
+            return [row['id'] for row in conn.execute('''
+                SELECT id FROM obra_checklist
+                WHERE concluido = 0 AND bloqueado = 0 AND data_limite BETWEEN ? AND ?
+                  AND (? IS NULL OR obra_id = ?)
+                ORDER BY data_limite, id
+            ''', (inicio, fim, obra_id, obra_id))]
+
+    def test_periodo_inclusivo_e_ordenado(self):
+        esperadas = self._esperadas(INICIO, FIM)
+        self.assertTrue(esperadas)
+
+        tarefas = list(self.db.obter_tarefas_por_periodo(INICIO, FIM))
+        self.assertEqual([tarefa['id'] for tarefa in tarefas], esperadas)
+        self.assertEqual({tarefa['cliente'] for tarefa in tarefas}, {'Cliente A', 'Cliente B'})
+
+        # Limites inclusivos: um período de um único dia
+        dia = tarefas[0]['data_limite']
+        um_dia = list(self.db.obter_tarefas_por_periodo(dia, dia))
+        self.assertTrue(um_dia)
+        self.assertTrue(all(tarefa['data_limite'] == dia for tarefa in um_dia))
+
+    def test_ignora_concluidas_e_bloqueadas(self):
+        tarefa = next(self.db.obter_tarefas_por_periodo(INICIO, FIM))
+        self.db.marcar_item_checklist(tarefa['id'], True)
+
+        ids = [item['id'] for item in self.db.obter_tarefas_por_periodo(INICIO, FIM)]
+        self.assertNotIn(tarefa['id'], ids)
+        with self.db.conexao() as conn:
+            bloqueadas = {row['id'] for row in conn.execute('SELECT id FROM obra_checklist WHERE bloqueado = 1')}
+        self.assertFalse(bloqueadas & set(ids))
+
+    def test_filtros(self):
+        filtradas = list(self.db.obter_tarefas_por_periodo(INICIO, FIM, {'cliente': 'Cliente B'}))
+        self.assertEqual([tarefa['id'] for tarefa in filtradas],
+                         self._esperadas(INICIO, FIM, self.obra_b))
+        # Filtros vazios são ignorados
+        self.assertEqual(len(list(self.db.obter_tarefas_por_periodo(INICIO, FIM, {'cliente': ''}))),
+                         len(self._esperadas(INICIO, FIM)))
+
+        with self.assertRaises(ValueError):
+            list(self.db.obter_tarefas_por_periodo(INICIO, FIM, {'descricao': 'x'}))
+        with self.assertRaises(ValueError):
+            list(self.db.obter_tarefas_por_periodo('01/01/2025', '2025-03-31'))
+
+    def test_iterador_preguicoso(self):
+        tarefas = self.db.obter_tarefas_por_periodo(INICIO, FIM)
+        self.assertIsInstance(tarefas, types.GeneratorType)
+
+        tamanho_original = database_modulo.TAMANHO_LOTE_LEITURA
+        database_modulo.TAMANHO_LOTE_LEITURA = 2
+        try:
+            ids = [tarefa['id'] for tarefa in self.db.obter_tarefas_por_periodo(INICIO, FIM)]
+        finally:
+            database_modulo.TAMANHO_LOTE_LEITURA = tamanho_original
+        self.assertEqual(ids, self._esperadas(INICIO, FIM))
+
+        # Interromper o iterador devolve a conexão ao pool
+        parcial = self.db.obter_tarefas_por_periodo(INICIO, FIM)
+        next(parcial)
+        parcial.close()
+        self.db.criar_obra('Obra C', 'Cliente C', 1000.0, '2025-01-06')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Testes para o módulo gerador_tarefas_recorrentes.py
+Valida a geração por conjunto das instâncias mensais (INSERT ... SELECT com ON CONFLICT
+DO NOTHING), a recuperação de meses anteriores e a remoção de duplicadas pela migração 17
+"""
+
+import sys
+import os
+import datetime
+import sqlite3
+import unittest
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_banco import TesteComBanco
+from escritor_banco import obter_escritor
+from gerador_tarefas_recorrentes import GeradorTarefasRecorrentes
+from migrations import MigrationManager, INDICE_MENSAL_UNICO
+from pool_conexoes import obter_pool
+
+
+class TestTarefasRecorrentes(TesteComBanco):
+
+    prefixo = 'recorrentes'
+
+    def setUp(self):
+        super().setUp()
+        self.gerador = GeradorTarefasRecorrentes(self.db)
+        self.hoje = datetime.date(2025, 2, 10)
+
+        self.ativa = self.db.criar_obra('Obra Ativa', 'Cliente', 1000.0, '2025-01-06')
+        self.futura = self.db.criar_obra('Obra Futura', 'Cliente', 1000.0, '2025-03-01')
+        self.concluida = self.db.criar_obra('Obra Concluída', 'Cliente', 1000.0, '2024-01-06',
+                                            status='Concluída', data_conclusao='2024-12-20')
+        with self.db.conexao() as conn:
+            self.templates = {row['id']: row['dia_referencia_mensal'] for row in conn.execute(
+                "SELECT id, dia_referencia_mensal FROM checklist_templates WHERE recorrencia = 'mensal'")}
+
+    def _instancias(self):
+        with self.db.conexao() as conn:
+            return [dict(row) for row in conn.execute('''
+                SELECT obra_id, template_id, descricao, data_limite, mes_referencia, bloqueado
+                FROM obra_checklist WHERE mes_referencia IS NOT NULL ORDER BY obra_id, template_id
+            ''')]
+
+    def test_cria_instancias_do_mes_para_obras_ativas(self):
+        resultado = self.gerador.gerar_tarefas_mensais(self.hoje)
+
+        self.assertEqual(resultado['criadas'], len(self.templates))
+        instancias = self._instancias()
+        self.assertEqual({instancia['obra_id'] for instancia in instancias}, {self.ativa})
+        for instancia in instancias:
+            dia = self.templates[instancia['template_id']]
+            self.assertEqual(instancia['data_limite'], datetime.date(2025, 2, dia).isoformat())
+            self.assertEqual(instancia['mes_referencia'], '2025-02')
+            self.assertTrue(instancia['descricao'].endswith(' - 02/2025'))
+            self.assertEqual(instancia['bloqueado'], 0)
+
+    def test_segunda_execucao_nao_duplica(self):
+        self.gerador.gerar_tarefas_mensais(self.hoje)
+        transacoes = self.db.escritor.transacoes
+
+        resultado = self.gerador.gerar_tarefas_mensais(self.hoje)
+        self.assertEqual(resultado['criadas'], 0)
+        self.assertEqual(len(self._instancias()), len(self.templates))
+        self.assertEqual(self.db.escritor.transacoes - transacoes, 1)
+
+        # Mês seguinte: novas instâncias para a mesma obra
+        self.assertEqual(self.gerador.gerar_tarefas_mensais(datetime.date(2025, 3, 2))['criadas'],
+                         2 * len(self.templates))
+
+    def test_obra_concluida_no_inicio_do_mes_fica_de_fora(self):
+        encerrada = self.db.criar_obra('Obra Encerrada', 'Cliente', 1000.0, '2024-11-04',
+                                       status='Em Andamento', data_conclusao='2025-02-05')
+
+        resultado = self.gerador.gerar_tarefas_mensais(self.hoje)
+
+        self.assertEqual(resultado['criadas'], len(self.templates))
+        self.assertNotIn(encerrada, {instancia['obra_id'] for instancia in self._instancias()})
+
+    def test_dia_inexistente_usa_ultimo_dia_do_mes(self):
+        template_id = next(iter(self.templates))
+        self.db._escrever(lambda conn: conn.execute(
+            'UPDATE checklist_templates SET dia_referencia_mensal = 31 WHERE id = ?', (template_id,)))
+
+        self.gerador.gerar_tarefas_mensais(self.hoje)
+        instancia = next(i for i in self._instancias() if i['template_id'] == template_id)
+        self.assertEqual(instancia['data_limite'], '2025-02-28')
+
+    def test_desbloqueia_itens_modelo_das_obras_ativas(self):
+        self.db._escrever(lambda conn: conn.execute(
+            "UPDATE obra_checklist SET bloqueado = 1 WHERE recorrencia = 'mensal' AND mes_referencia IS NULL"))
+
+        resultado = self.gerador.gerar_tarefas_mensais(self.hoje)
+        self.assertEqual(resultado['desbloqueadas'], len(self.templates))
+        with self.db.conexao() as conn:
+            bloqueadas = {row['obra_id'] for row in conn.execute(
+                "SELECT obra_id FROM obra_checklist WHERE recorrencia = 'mensal' AND bloqueado = 1")}
+        self.assertEqual(bloqueadas, {self.futura, self.concluida})
+
+    def test_recuperacao_simulada_nao_grava(self):
+        resultado = self.gerador.recuperar_meses_faltantes(datetime.date(2025, 2, 25), simular=True)
+
+        self.assertEqual(resultado['criadas'], 0)
+        self.assertEqual(self._instancias(), [])
+        # Obra ativa: janeiro e fevereiro; obra futura ainda não começou; concluída fica de fora
+        self.assertEqual({item['obra_id'] for item in resultado['faltantes']}, {self.ativa})
+        self.assertEqual(sorted({item['mes_referencia'] for item in resultado['faltantes']}),
+                         ['2025-01', '2025-02'])
+        self.assertEqual(len(resultado['faltantes']), 2 * len(self.templates))
+        self.assertEqual(resultado['faltantes'][0]['nome_contrato'], 'Obra Ativa')
+
+    def test_recupera_apenas_meses_faltantes(self):
+        self.gerador.gerar_tarefas_mensais(self.hoje)
+        hoje = datetime.date(2025, 4, 15)
+
+        resultado = self.gerador.recuperar_meses_faltantes(hoje)
+        # Obra ativa: janeiro, março e abril (fevereiro já existia); obra futura: março e abril
+        self.assertEqual(resultado['criadas'], 5 * len(self.templates))
+        meses_ativa = {item['mes_referencia'] for item in resultado['faltantes'] if item['obra_id'] == self.ativa}
+        self.assertEqual(meses_ativa, {'2025-01', '2025-03', '2025-04'})
+        self.assertEqual(len(self._instancias()), 6 * len(self.templates))
+        self.assertEqual(self.gerador.recuperar_meses_faltantes(hoje)['criadas'], 0)
+
+    def test_recuperacao_limitada_e_ate_a_conclusao(self):
+        self.db._escrever(lambda conn: conn.execute(
+            "UPDATE obras SET status = 'Em Andamento' WHERE id = ?", (self.concluida,)))
+
+        faltantes = self.gerador.recuperar_meses_faltantes(self.hoje, meses=1, simular=True)['faltantes']
+        meses_por_obra = {}
+        for item in faltantes:
+            meses_por_obra.setdefault(item['obra_id'], set()).add(item['mes_referencia'])
+        # Obra com conclusão em 2024-12: nada no período; obra ativa: janeiro e fevereiro
+        self.assertEqual(meses_por_obra, {self.ativa: {'2025-01', '2025-02'}})
+
+        completos = self.gerador.recuperar_meses_faltantes(self.hoje, simular=True)['faltantes']
+        meses_concluida = sorted({item['mes_referencia'] for item in completos if item['obra_id'] == self.concluida})
+        self.assertEqual(meses_concluida[0], '2024-01')
+        self.assertEqual(meses_concluida[-1], '2024-12')
+        self.assertEqual(len(meses_concluida), 12)
+
+    def test_migracao_remove_duplicadas(self):
+        self.gerador.gerar_tarefas_mensais(self.hoje)
+        obter_escritor(self.db_name).parar()
+        obter_pool(self.db_name).fechar_todas()
+
+        # Simula um banco anterior à migração 17, com uma instância repetida e já concluída
+        conn = sqlite3.connect(self.db_name)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f'DROP INDEX {INDICE_MENSAL_UNICO[0]}')
+        original = conn.execute('SELECT * FROM obra_checklist WHERE mes_referencia IS NOT NULL ORDER BY id').fetchone()
+        duplicada = conn.execute('''
+            INSERT INTO obra_checklist (obra_id, template_id, descricao, prazo_dias, data_limite,
+                                        recorrencia, mes_referencia, concluido, data_conclusao)
+            VALUES (?, ?, ?, ?, ?, 'mensal', ?, 1, '2025-02-09')
+        ''', (original['obra_id'], original['template_id'], original['descricao'], original['prazo_dias'],
+              original['data_limite'], original['mes_referencia'])).lastrowid
+        conn.execute('''
+            INSERT INTO historico_notificacoes (obra_id, tarefa_id, tipo_notificacao, data_envio)
+            VALUES (?, ?, 'tipo_a', '2025-02-08 08:00:00')
+        ''', (original['obra_id'], original['id']))
+        conn.execute('DELETE FROM schema_migrations WHERE version = 17')
+        conn.commit()
+        conn.close()
+
+        MigrationManager(self.db_name).run_migrations()
+
+        conn = sqlite3.connect(self.db_name)
+        try:
+            mantidas = conn.execute('''
+                SELECT id FROM obra_checklist WHERE obra_id = ? AND template_id = ? AND mes_referencia = ?
+            ''', (original['obra_id'], original['template_id'], original['mes_referencia'])).fetchall()
+            self.assertEqual(mantidas, [(duplicada,)])
+            historico = conn.execute('SELECT tarefa_id FROM historico_notificacoes').fetchall()
+            self.assertEqual(historico, [(duplicada,)])
+            with self.assertRaises(sqlite3.IntegrityError):
+                conn.execute('''
+                    INSERT INTO obra_checklist (obra_id, template_id, descricao, prazo_dias, mes_referencia)
+                    VALUES (?, ?, 'x', 0, ?)
+                ''', (original['obra_id'], original['template_id'], original['mes_referencia']))
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()